@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Cache Benchmark Script
+
+Measures the response cache on the critical path of the check_cache node:
+
+- backends: warm-start time and lookup latency of the memory and sqlite backends
+- similarity: index vs vectorized similarity scoring of one user's entries
+- matcher: per-intent tokenization and per-comparison scoring cost
+- lsh: MinHash/LSH candidate recall, precision and latency vs the exact index
+- corpus: cold start with the compiled, memory-mapped NLP corpus artifact
+- nodes: sync vs async check_cache workflow node under concurrent graph runs
+
+Usage:
+    python scripts/benchmark_cache.py backends --entries 10000
+    python scripts/benchmark_cache.py similarity --entries 1000 10000 100000
+    python scripts/benchmark_cache.py matcher --rounds 100000
+    python scripts/benchmark_cache.py lsh --entries 10000 100000
+    python scripts/benchmark_cache.py corpus --words 150000
+    python scripts/benchmark_cache.py nodes --concurrency 1 16 64
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+from nalai.services.cache_service import (  # noqa: E402
+    Cache,
+    SimilarityIndex,
+    TokenSimilarityMatcher,
+)
+
+logging.basicConfig(level=logging.WARNING)
+
+VERBS = ["create", "list", "get", "update", "delete", "show", "find", "add"]
+NOUNS = ["product", "order", "user", "invoice", "customer", "payment", "item"]
+
+
+def make_messages(count: int) -> list[str]:
+    """Generate distinct API-style intents."""
+    return [
+        f"{VERBS[i % len(VERBS)]} {NOUNS[(i // len(VERBS)) % len(NOUNS)]} {i}"
+        for i in range(count)
+    ]
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Get a percentile of latency samples in milliseconds."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+
+def report(name: str, samples: list[float]) -> None:
+    print(
+        f"  {name:<28} p50={percentile(samples, 0.5):8.3f}ms "
+        f"p99={percentile(samples, 0.99):8.3f}ms "
+        f"mean={statistics.mean(samples) * 1000:8.3f}ms"
+    )
+
+
+async def populate(cache: Cache, messages: list[str], users: int) -> None:
+    for i, message in enumerate(messages):
+        await cache.set_async(
+            [HumanMessage(content=message)], f"response {i}", user_id=f"user{i % users}"
+        )
+
+
+async def measure_lookups(cache: Cache, messages: list[str], users: int, rounds: int):
+    """Measure exact-key lookups and similarity lookups."""
+    get_samples, similar_samples = [], []
+    for i in range(rounds):
+        index = (i * 7919) % len(messages)
+        user_id = f"user{index % users}"
+
+        start = time.perf_counter()
+        await cache.get_async([HumanMessage(content=messages[index])], user_id)
+        get_samples.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await cache.find_similar_cached_responses_async(
+            f"please {messages[index]}", user_id, 0.8
+        )
+        similar_samples.append(time.perf_counter() - start)
+    return get_samples, similar_samples
+
+
+async def benchmark_backends(entries: int, users: int, rounds: int) -> None:
+    messages = make_messages(entries)
+    config = {"max_size": entries * 2, "ttl_seconds": 3600}
+
+    print(f"Backends: {entries} entries, {users} users, {rounds} lookups")
+
+    memory = Cache(backend="memory", config=config)
+    await populate(memory, messages, users)
+    print("memory")
+    for name, samples in zip(
+        ("get", "find_similar"),
+        await measure_lookups(memory, messages, users, rounds),
+        strict=True,
+    ):
+        report(name, samples)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cache.db")
+        sqlite_config = {**config, "sqlite_path": path}
+        await populate(Cache(backend="sqlite", config=sqlite_config), messages, users)
+
+        # Warm start: open the existing database and serve the first lookups
+        start = time.perf_counter()
+        restarted = Cache(backend="sqlite", config=sqlite_config)
+        opened = time.perf_counter() - start
+        await restarted.get_async([HumanMessage(content=messages[0])], "user0")
+        first_get = time.perf_counter() - start
+        await restarted.find_similar_cached_responses_async(messages[0], "user0", 0.8)
+        first_similar = time.perf_counter() - start
+
+        print("sqlite")
+        print(
+            f"  warm start: open={opened * 1000:.1f}ms "
+            f"first get={first_get * 1000:.1f}ms "
+            f"first similarity lookup={first_similar * 1000:.1f}ms"
+        )
+        for name, samples in zip(
+            ("get", "find_similar"),
+            await measure_lookups(restarted, messages, users, rounds),
+            strict=True,
+        ):
+            report(name, samples)
+
+
+def benchmark_similarity(sizes: list[int], rounds: int, threshold: float) -> None:
+    matcher = TokenSimilarityMatcher()
+    queries = [f"please {message}" for message in make_messages(rounds)]
+
+    print(f"Similarity: one user, {rounds} lookups, threshold {threshold}")
+    for size in sizes:
+        messages = make_messages(size)
+        print(f"{size} entries")
+        for engine in ("index", "vectorized"):
+            similarity_index = SimilarityIndex(matcher, engine=engine)
+            start = time.perf_counter()
+            for i, message in enumerate(messages):
+                similarity_index.add("user0", f"key{i}", message)
+            build = time.perf_counter() - start
+
+            samples = []
+            for query in queries:
+                vector = matcher.vectorize(query)
+                start = time.perf_counter()
+                similarity_index.search("user0", vector, threshold)
+                samples.append(time.perf_counter() - start)
+            report(f"{similarity_index.engine} (build {build:.2f}s)", samples)
+
+        # One-shot batch API over up to 10k entries (matrix built per call),
+        # best of 3 runs
+        vectors = [matcher.vectorize(message) for message in messages[:10000]]
+        query = matcher.vectorize(queries[0])
+        for name, score in (
+            (
+                "scalar loop",
+                lambda query=query, vectors=vectors: [
+                    matcher.vector_similarity(query, v) for v in vectors
+                ],
+            ),
+            (
+                "batch_similarity",
+                lambda query=query, vectors=vectors: matcher.batch_similarity(
+                    query, vectors
+                ),
+            ),
+        ):
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                score()
+                timings.append(time.perf_counter() - start)
+            print(f"  {name:<28} {len(vectors)} vectors {min(timings) * 1000:8.3f}ms")
+
+
+def benchmark_matcher(rounds: int) -> None:
+    matcher = TokenSimilarityMatcher()
+    messages = [f"please {message} for the team" for message in make_messages(1000)]
+
+    print(f"Matcher: {len(matcher.word_weights)} weighted words, {rounds} operations")
+
+    def measure(name: str, operation) -> None:
+        start = time.perf_counter()
+        for i in range(rounds):
+            operation(i)
+        elapsed = (time.perf_counter() - start) / rounds
+        print(f"  {name:<28} {elapsed * 1_000_000:8.2f}us/op")
+
+    measure("tokenize", lambda i: matcher._tokenize_and_weight(messages[i % 1000]))
+    measure("vectorize (memoized)", lambda i: matcher.vectorize(messages[i % 1000]))
+
+    vectors = [matcher.vectorize(message) for message in messages]
+    measure(
+        "vector_similarity",
+        lambda i: matcher.vector_similarity(vectors[i % 1000], vectors[i * 7 % 1000]),
+    )
+    measure(
+        "similarity (strings)",
+        lambda i: matcher.similarity(messages[i % 1000], messages[i * 7 % 1000]),
+    )
+
+
+def benchmark_lsh(sizes: list[int], rounds: int, threshold: float) -> None:
+    matcher = TokenSimilarityMatcher()
+
+    print(f"LSH vs exact index: one user, {rounds} lookups, threshold {threshold}")
+    for size in sizes:
+        messages = make_messages(size)
+        exact = SimilarityIndex(matcher, engine="index")
+        lsh = SimilarityIndex(matcher, engine="lsh", threshold=threshold)
+        for i, message in enumerate(messages):
+            exact.add("user0", f"key{i}", message)
+        start = time.perf_counter()
+        for i, message in enumerate(messages):
+            lsh.add("user0", f"key{i}", message)
+        build = time.perf_counter() - start
+
+        exact_samples, lsh_samples = [], []
+        relevant = found = retrieved = candidates = 0
+        for i in range(rounds):
+            index = (i * 7919) % size
+            # Alternate near-duplicates and rephrasings of cached intents
+            query = matcher.vectorize(
+                f"please {messages[index]}" if i % 2 else f"{messages[index]} now"
+            )
+
+            start = time.perf_counter()
+            expected = {key for key, _ in exact.search("user0", query, threshold)}
+            exact_samples.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            actual = {key for key, _ in lsh.search("user0", query, threshold)}
+            lsh_samples.append(time.perf_counter() - start)
+
+            relevant += len(expected)
+            found += len(expected & actual)
+            retrieved += len(actual)
+            candidates += len(lsh._lsh_candidates("user0", query))
+
+        print(
+            f"{size} entries: bands={lsh._lsh_bands} rows={lsh._lsh_rows} "
+            f"build={build:.2f}s"
+        )
+        print(
+            f"  recall={found / max(relevant, 1):.3f} "
+            f"precision={found / max(retrieved, 1):.3f} "
+            f"candidates/lookup={candidates / rounds:.1f} "
+            f"(candidate precision {relevant / max(candidates, 1):.3f})"
+        )
+        report("exact index", exact_samples)
+        report("lsh", lsh_samples)
+
+
+COLD_START = """
+import time
+start = time.perf_counter()
+from nalai.services.cache_service import Cache
+imported = time.perf_counter()
+cache = Cache(config={{"similarity_corpus": "nlp", "corpus_path": {path!r}}})
+cache.similarity_matcher.similarity("create product", "add a new product")
+print(imported - start, time.perf_counter() - imported)
+"""
+
+
+def synthetic_corpus(words: int):
+    """Generate a WordNet-sized corpus when the NLP data is not installed."""
+    vocabulary = [f"word{i}" for i in range(words)] + VERBS + NOUNS
+    verbs = set(vocabulary[: words // 8]) | set(VERBS)
+    nouns = set(vocabulary[words // 10 :]) | set(NOUNS)
+    adjectives = set(vocabulary[words // 2 : words // 2 + words // 5])
+    antonyms = {word: [f"un{word}"] for word in vocabulary[: words // 20]}
+    return verbs, nouns, adjectives, antonyms
+
+
+def benchmark_corpus(words: int, use_nlp: bool) -> None:
+    from nalai.services.cache_corpus import (
+        CompiledCorpus,
+        compile_corpus,
+        corpus_fingerprint,
+    )
+    from nalai.services.cache_service import load_nlp_corpus
+
+    start = time.perf_counter()
+    corpus = load_nlp_corpus() if use_nlp else synthetic_corpus(words)
+    built = time.perf_counter() - start
+    print(
+        f"Corpus: {'nlp' if use_nlp else 'synthetic'}, "
+        f"{len(corpus[0])} verbs, {len(corpus[1])} nouns, "
+        f"{len(corpus[2])} adjectives, {len(corpus[3])} antonyms "
+        f"(built in {built * 1000:.0f}ms)"
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "nlp_corpus.bin")
+        start = time.perf_counter()
+        compile_corpus(path, *corpus, corpus_fingerprint())
+        compiled = time.perf_counter() - start
+        print(
+            f"  compile artifact             {compiled * 1000:8.1f}ms "
+            f"({os.path.getsize(path) / 1024:.0f} KiB)"
+        )
+
+        start = time.perf_counter()
+        TokenSimilarityMatcher(*corpus).similarity("create product", "add product")
+        print(
+            f"  in-memory sets matcher       "
+            f"{(time.perf_counter() - start) * 1000:8.1f}ms"
+        )
+
+        start = time.perf_counter()
+        matcher = TokenSimilarityMatcher.from_corpus(CompiledCorpus(path))
+        matcher.similarity("create product", "add product")
+        print(
+            f"  mapped artifact matcher      "
+            f"{(time.perf_counter() - start) * 1000:8.1f}ms"
+        )
+
+        src = os.path.join(os.path.dirname(__file__), "..", "src")
+        result = subprocess.run(
+            [sys.executable, "-c", COLD_START.format(path=path)],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONPATH": src},
+        )
+        imported, constructed = map(float, result.stdout.split()[-2:])
+        print(
+            f"  cold process: import={imported * 1000:.0f}ms "
+            f"Cache()+first similarity={constructed * 1000:.1f}ms"
+        )
+
+
+async def benchmark_nodes(entries: int, concurrency: list[int], rounds: int) -> None:
+    """Run a check_cache -> END graph with the sync and the async node."""
+    from langgraph.graph import END, StateGraph
+
+    from nalai.config import settings
+    from nalai.core.internal.states import AgentState
+    from nalai.core.internal.workflow_nodes import WorkflowNodes
+    from nalai.services.factory import ServiceFactory
+
+    settings.cache_enabled = True
+    settings.cache_similarity_enabled = True
+    messages = make_messages(entries)
+    cache = Cache(backend="memory", config={"max_size": entries * 2})
+    await populate(cache, messages, users=1)
+    ServiceFactory._instances["cache"] = cache
+
+    nodes = WorkflowNodes()
+    graphs = {}
+    for name, node in (
+        ("sync", nodes.check_cache_with_similarity),
+        ("async", nodes.check_cache_with_similarity_async),
+    ):
+        graph = StateGraph(AgentState)
+        graph.add_node("check_cache", node)
+        graph.set_entry_point("check_cache")
+        graph.add_edge("check_cache", END)
+        graphs[name] = graph.compile()
+
+    async def run(graph, index: int) -> float:
+        # Half of the turns miss and fall through to the similarity search
+        content = messages[index % entries]
+        if index % 2:
+            content = f"please {content}"
+        start = time.perf_counter()
+        await graph.ainvoke(
+            {"messages": [HumanMessage(content=content)]},
+            {"configurable": {"user_id": "user0"}},
+        )
+        return time.perf_counter() - start
+
+    print(f"Nodes: {entries} entries, {rounds} graph runs per level")
+    for callers in concurrency:
+        print(f"{callers} concurrent callers")
+        for name, graph in graphs.items():
+            samples = []
+            start = time.perf_counter()
+            for batch in range(0, rounds, callers):
+                samples.extend(
+                    await asyncio.gather(
+                        *(
+                            run(graph, index)
+                            for index in range(batch, min(batch + callers, rounds))
+                        )
+                    )
+                )
+            elapsed = time.perf_counter() - start
+            report(f"{name} ({rounds / elapsed:,.0f} runs/s)", samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    backends = subparsers.add_parser("backends", help="Backend warm start and lookups")
+    backends.add_argument("--entries", type=int, default=10000)
+    backends.add_argument("--users", type=int, default=10)
+    backends.add_argument("--rounds", type=int, default=1000)
+
+    similarity = subparsers.add_parser("similarity", help="Similarity scoring engines")
+    similarity.add_argument(
+        "--entries", type=int, nargs="+", default=[1000, 10000, 100000]
+    )
+    similarity.add_argument("--rounds", type=int, default=200)
+    similarity.add_argument("--threshold", type=float, default=0.8)
+
+    matcher = subparsers.add_parser("matcher", help="Matcher microbenchmark")
+    matcher.add_argument("--rounds", type=int, default=100000)
+
+    lsh = subparsers.add_parser("lsh", help="LSH candidate generation vs exact")
+    lsh.add_argument("--entries", type=int, nargs="+", default=[1000, 10000, 100000])
+    lsh.add_argument("--rounds", type=int, default=500)
+    lsh.add_argument("--threshold", type=float, default=0.8)
+
+    corpus = subparsers.add_parser("corpus", help="Compiled corpus cold start")
+    corpus.add_argument("--words", type=int, default=150000)
+    corpus.add_argument(
+        "--nlp", action="store_true", help="Build from NLTK/spaCy instead"
+    )
+
+    nodes = subparsers.add_parser("nodes", help="Sync vs async check_cache node")
+    nodes.add_argument("--entries", type=int, default=1000)
+    nodes.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    nodes.add_argument("--rounds", type=int, default=1024)
+
+    args = parser.parse_args()
+
+    if args.command == "backends":
+        asyncio.run(benchmark_backends(args.entries, args.users, args.rounds))
+    elif args.command == "similarity":
+        benchmark_similarity(args.entries, args.rounds, args.threshold)
+    elif args.command == "matcher":
+        benchmark_matcher(args.rounds)
+    elif args.command == "lsh":
+        benchmark_lsh(args.entries, args.rounds, args.threshold)
+    elif args.command == "corpus":
+        benchmark_corpus(args.words, args.nlp)
+    elif args.command == "nodes":
+        asyncio.run(benchmark_nodes(args.entries, args.concurrency, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Checkpoint Benchmark Script
+
+Measures the checkpoint savers behind the conversation store:
+
+- backends: aput write throughput and latency of MemorySaver vs SQLite
+- deltas: bytes per turn and read latency of message deltas vs full snapshots
+- serde: encode/decode time and size of the default vs compact serializer
+
+Usage:
+    python scripts/benchmark_checkpoints.py backends --threads 50 --turns 20
+    python scripts/benchmark_checkpoints.py deltas --turns 10 100 1000
+    python scripts/benchmark_checkpoints.py serde --turns 10 100 1000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+from langgraph.checkpoint.base import empty_checkpoint  # noqa: E402
+from langgraph.checkpoint.memory import MemorySaver  # noqa: E402
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer  # noqa: E402
+
+from nalai.services.checkpointing_serde import (  # noqa: E402
+    CompactSerializer,
+    load_header,
+)
+from nalai.services.checkpointing_sqlite import SQLiteCheckpointSaver  # noqa: E402
+
+logging.basicConfig(level=logging.WARNING)
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Get a percentile of latency samples in milliseconds."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+
+def report(name: str, samples: list[float]) -> None:
+    print(
+        f"  {name:<28} p50={percentile(samples, 0.5):8.3f}ms "
+        f"p99={percentile(samples, 0.99):8.3f}ms "
+        f"mean={statistics.mean(samples) * 1000:8.3f}ms"
+    )
+
+
+def conversation_turn(turn: int) -> list:
+    """Get the messages one conversation turn appends."""
+    return [
+        HumanMessage(
+            content=f"list the orders of customer {turn} placed this week",
+            id=f"human-{turn}",
+        ),
+        AIMessage(
+            content=f"Customer {turn} placed 3 orders this week. " * 8,
+            id=f"ai-{turn}",
+        ),
+    ]
+
+
+async def run_thread(saver, thread_id: str, turns: int) -> list[float]:
+    """Write the checkpoints of a growing conversation and time each aput."""
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    messages: list = []
+    version = None
+    samples = []
+    for turn in range(turns):
+        messages = messages + conversation_turn(turn)
+        version = saver.get_next_version(version, None)
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {"messages": messages}
+        checkpoint["channel_versions"] = {"messages": version}
+        started = time.perf_counter()
+        config = await saver.aput(
+            config, checkpoint, {"source": "loop", "step": turn}, {"messages": version}
+        )
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def benchmark_backends(threads: int, turns: int) -> None:
+    """Compare concurrent aput throughput and latency across savers."""
+    with tempfile.TemporaryDirectory() as directory:
+        savers = {
+            "memory": MemorySaver(),
+            "sqlite": SQLiteCheckpointSaver(os.path.join(directory, "bench.db")),
+        }
+        print(f"{threads} concurrent threads x {turns} turns")
+        for name, saver in savers.items():
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                *(run_thread(saver, f"thread-{i}", turns) for i in range(threads))
+            )
+            elapsed = time.perf_counter() - started
+            samples = [sample for result in results for sample in result]
+            print(f"{name}: {len(samples) / elapsed:10.0f} puts/s")
+            report("aput", samples)
+
+            latest = [
+                saver.get_tuple({"configurable": {"thread_id": f"thread-{i}"}})
+                for i in range(threads)
+            ]
+            assert all(
+                len(t.checkpoint["channel_values"]["messages"]) == turns * 2
+                for t in latest
+            )
+        savers["sqlite"].close()
+
+
+def stored_bytes(saver: SQLiteCheckpointSaver) -> int:
+    """Get the bytes of stored checkpoints and channel values."""
+    with saver.pool.connection() as connection:
+        return connection.execute(
+            "SELECT (SELECT COALESCE(SUM(LENGTH(checkpoint) + LENGTH(metadata)), 0) "
+            "FROM checkpoints) + (SELECT COALESCE(SUM(LENGTH(blob)), 0) FROM blobs)"
+        ).fetchone()[0]
+
+
+def benchmark_deltas(turns: list[int], snapshot_interval: int, rounds: int) -> None:
+    """Compare message-channel deltas with full snapshots per turn."""
+    with tempfile.TemporaryDirectory() as directory:
+        for count in turns:
+            print(f"{count} turns")
+            for name, delta_channels in (("snapshots", ()), ("deltas", ("messages",))):
+                path = os.path.join(directory, f"{name}-{count}.db")
+                saver = SQLiteCheckpointSaver(
+                    path,
+                    delta_channels=delta_channels,
+                    snapshot_interval=snapshot_interval,
+                )
+                started = time.perf_counter()
+                asyncio.run(run_thread(saver, "thread", count))
+                elapsed = time.perf_counter() - started
+                saver.close()
+
+                # Read with a fresh saver so no write-side state is reused
+                reader = SQLiteCheckpointSaver(path, delta_channels=delta_channels)
+                config = {"configurable": {"thread_id": "thread"}}
+                samples = []
+                for _ in range(rounds):
+                    read_started = time.perf_counter()
+                    latest = reader.get_tuple(config)
+                    samples.append(time.perf_counter() - read_started)
+                assert len(latest.checkpoint["channel_values"]["messages"]) == count * 2
+                print(
+                    f"  {name:<10} {stored_bytes(reader) / count:12.0f} bytes/turn "
+                    f"write={elapsed:7.2f}s"
+                )
+                report("get_tuple latest", samples)
+                reader.close()
+
+
+def benchmark_serde(turns: list[int], rounds: int) -> None:
+    """Compare the default and compact serializers on message channels."""
+    serializers = {"default": JsonPlusSerializer(), "compact": CompactSerializer()}
+    for count in turns:
+        messages = [m for turn in range(count) for m in conversation_turn(turn)]
+        print(f"{count} turns ({len(messages)} messages)")
+        for name, serde in serializers.items():
+            encode, decode, header = [], [], []
+            for _ in range(rounds):
+                started = time.perf_counter()
+                data = serde.dumps_typed(messages)
+                encode.append(time.perf_counter() - started)
+                started = time.perf_counter()
+                assert len(serde.loads_typed(data)) == len(messages)
+                decode.append(time.perf_counter() - started)
+                started = time.perf_counter()
+                load_header(data)
+                header.append(time.perf_counter() - started)
+            print(f"  {name:<10} {len(data[1]):12d} bytes")
+            report("encode", encode)
+            report("decode", decode)
+            if load_header(data) is not None:
+                report("header only", header)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    backends = subparsers.add_parser("backends", help="Saver write throughput")
+    backends.add_argument("--threads", type=int, default=50)
+    backends.add_argument("--turns", type=int, default=20)
+
+    deltas = subparsers.add_parser("deltas", help="Message deltas vs snapshots")
+    deltas.add_argument("--turns", type=int, nargs="+", default=[10, 100, 1000])
+    deltas.add_argument("--snapshot-interval", type=int, default=32)
+    deltas.add_argument("--rounds", type=int, default=50)
+
+    serde = subparsers.add_parser("serde", help="Default vs compact serializer")
+    serde.add_argument("--turns", type=int, nargs="+", default=[10, 100, 1000])
+    serde.add_argument("--rounds", type=int, default=50)
+
+    args = parser.parse_args()
+
+    if args.command == "backends":
+        asyncio.run(benchmark_backends(args.threads, args.turns))
+    elif args.command == "deltas":
+        benchmark_deltas(args.turns, args.snapshot_interval, args.rounds)
+    elif args.command == "serde":
+        benchmark_serde(args.turns, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Model Benchmark Script
+
+Measures the model setup on the critical path of the workflow nodes:
+
+- setup: per-turn get_model_from_config cost without and with the model pool
+- limiters: rate limiter acquire latency with concurrent callers
+
+Models are only constructed, never called, so no provider is contacted;
+placeholder credentials are set for providers that require them.
+
+Usage:
+    python scripts/benchmark_models.py setup --platform openai --model gpt-4.1
+    python scripts/benchmark_models.py setup --platform aws_bedrock --turns 500
+    python scripts/benchmark_models.py limiters --callers 1 4 16 64
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+import uuid
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from nalai.config import settings  # noqa: E402
+from nalai.services.model_service import ModelManager  # noqa: E402
+from nalai.services.rate_limiting import (  # noqa: E402
+    AsyncTokenBucketRateLimiter,
+    FileLockRateLimiter,
+    SharedMemoryRateLimiter,
+)
+
+logging.basicConfig(level=logging.WARNING)
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Get a percentile of latency samples in milliseconds."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+
+def report(name: str, samples: list[float]) -> None:
+    print(
+        f"  {name:<28} p50={percentile(samples, 0.5):8.3f}ms "
+        f"p99={percentile(samples, 0.99):8.3f}ms "
+        f"mean={statistics.mean(samples) * 1000:8.3f}ms"
+    )
+
+
+def benchmark_setup(platform: str, model: str, turns: int) -> None:
+    """Time the two model lookups of each turn, as the workflow nodes do them."""
+    config = {"configurable": {"model": {"platform": platform, "name": model}}}
+    print(f"Model setup per turn ({platform}/{model}, {turns} turns)")
+    for name, pool_size in (
+        ("without pool", 0),
+        ("with pool", settings.model_pool_size),
+    ):
+        manager = ModelManager(pool_size=pool_size)
+        samples = []
+        for _ in range(turns):
+            started = time.perf_counter()
+            # select_relevant_apis, then generate_model_response
+            manager.get_model_from_config(config, disable_streaming=True)
+            manager.get_model_from_config(config)
+            samples.append(time.perf_counter() - started)
+        report(name, samples)
+
+
+async def acquire_all(limiter, callers: int, acquires: int) -> list[float]:
+    """Acquire from concurrent callers, timing each acquire."""
+    samples = []
+
+    async def caller():
+        for _ in range(acquires):
+            started = time.perf_counter()
+            await limiter.aacquire()
+            samples.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(caller() for _ in range(callers)))
+    return samples
+
+
+def benchmark_limiters(callers: list[int], acquires: int) -> None:
+    """
+    Time aacquire on a bucket that never runs dry, so the samples measure
+    the limiter's own overhead and contention rather than rate waits.
+    """
+    key = f"benchmark/{uuid.uuid4()}"
+    limiters = {
+        "file lock": lambda: FileLockRateLimiter(1e9, 10**9, 0.001),
+        "async token bucket": lambda: AsyncTokenBucketRateLimiter(1e9, 10**9),
+        "shared memory": lambda: SharedMemoryRateLimiter(1e9, 10**9, key=key),
+    }
+    for count in callers:
+        print(f"Acquire latency ({count} callers, {acquires} acquires each)")
+        for name, create in limiters.items():
+            samples = asyncio.run(acquire_all(create(), count, acquires))
+            report(name, samples)
+    SharedMemoryRateLimiter(1, 1, key=key).unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    setup = subparsers.add_parser("setup", help="Model setup with and without pool")
+    setup.add_argument("--platform", default=settings.default_model_platform)
+    setup.add_argument("--model", default=settings.default_model_id)
+    setup.add_argument("--turns", type=int, default=200)
+
+    limiters = subparsers.add_parser("limiters", help="Rate limiter acquire latency")
+    limiters.add_argument("--callers", type=int, nargs="+", default=[1, 4, 16, 64])
+    limiters.add_argument("--acquires", type=int, default=200)
+
+    args = parser.parse_args()
+
+    if args.command == "setup":
+        benchmark_setup(args.platform, args.model, args.turns)
+    elif args.command == "limiters":
+        benchmark_limiters(args.callers, args.acquires)
+
+
+if __name__ == "__main__":
+    main()
@@ -188,10 +188,45 @@ class Settings(BaseSettings):
         default=1800,
         description="Cache time-to-live in seconds (default: 1800 = 30 minutes)",
     )
+    cache_eviction_policy: str = Field(
+        alias="CACHE_EVICTION_POLICY",
+        default="lru",
+        description="Eviction policy for the memory cache backend (lru, lfu, ttl)",
+    )
+    cache_sweep_interval_seconds: float = Field(
+        alias="CACHE_SWEEP_INTERVAL_SECONDS",
+        default=60.0,
+        description="Interval in seconds between background sweeps of expired cache entries (0 disables)",
+    )
     cache_backend: str = Field(
         alias="CACHE_BACKEND",
         default="memory",
-        description="Cache backend (memory only)",
+        description="Cache backend (memory, redis, sqlite)",
+    )
+    cache_redis_url: str = Field(
+        alias="CACHE_REDIS_URL",
+        default="redis://localhost:6379/0",
+        description="Redis URL for the redis cache backend",
+    )
+    cache_redis_key_prefix: str = Field(
+        alias="CACHE_REDIS_KEY_PREFIX",
+        default="nalai:cache:",
+        description="Key prefix for entries written by the redis cache backend",
+    )
+    cache_redis_max_connections: int = Field(
+        alias="CACHE_REDIS_MAX_CONNECTIONS",
+        default=20,
+        description="Connection pool size of the redis cache backend",
+    )
+    cache_sqlite_path: str = Field(
+        alias="CACHE_SQLITE_PATH",
+        default="./cache/llm_cache.db",
+        description="Database file for the persistent sqlite cache backend",
+    )
+    cache_sqlite_mmap_size: int = Field(
+        alias="CACHE_SQLITE_MMAP_SIZE",
+        default=256 * 1024 * 1024,
+        description="Bytes of the sqlite cache database memory-mapped for reads",
     )
     # Feature Flag
     cache_tool_calls: bool = Field(
@@ -210,12 +245,77 @@ class Settings(BaseSettings):
         default=0.8,
         description="Similarity threshold for semantic cache matching (0.0-1.0)",
     )
+    cache_similarity_engine: str = Field(
+        alias="CACHE_SIMILARITY_ENGINE",
+        default="index",
+        description="Similarity scoring engine (index, vectorized, lsh)",
+    )
+    cache_similarity_corpus: str = Field(
+        alias="CACHE_SIMILARITY_CORPUS",
+        default="fallback",
+        description="Word corpus for similarity weighting (fallback, nlp)",
+    )
+    cache_corpus_path: str = Field(
+        alias="CACHE_CORPUS_PATH",
+        default="./cache/nlp_corpus.bin",
+        description="Path of the compiled NLP corpus artifact (memory-mapped)",
+    )
 
     # ===== CHECKPOINTING CONFIGURATION =====
     checkpointing_backend: str = Field(
         alias="CHECKPOINTING_BACKEND",
         default="memory",
-        description="Checkpointing backend (memory, file, postgres, redis)",
+        description="Checkpointing backend (memory, sqlite, file, postgres, redis)",
+    )
+    checkpointing_serde: str = Field(
+        alias="CHECKPOINTING_SERDE",
+        default="default",
+        description="Checkpoint serializer (default, compact); both read compact checkpoints",
+    )
+    checkpointing_read_cache_threads: int = Field(
+        alias="CHECKPOINTING_READ_CACHE_THREADS",
+        default=0,
+        description="Conversation threads whose latest checkpoints are cached in process (0, the default, disables)",
+    )
+    checkpointing_memory_max_bytes: int = Field(
+        alias="CHECKPOINTING_MEMORY_MAX_BYTES",
+        default=0,
+        description="Bytes the memory checkpointing backend keeps in memory before spilling idle threads to disk (0 disables)",
+    )
+    checkpointing_spill_path: str = Field(
+        alias="CHECKPOINTING_SPILL_PATH",
+        default="./checkpoints/spill",
+        description="Directory of threads spilled by the memory checkpointing backend",
+    )
+    checkpointing_sqlite_path: str = Field(
+        alias="CHECKPOINTING_SQLITE_PATH",
+        default="./checkpoints/checkpoints.db",
+        description="Database path of the sqlite checkpointing backend",
+    )
+    checkpointing_sqlite_pool_size: int = Field(
+        alias="CHECKPOINTING_SQLITE_POOL_SIZE",
+        default=4,
+        description="Maximum pooled connections of the sqlite checkpointing backend",
+    )
+    checkpointing_compaction_interval_seconds: float = Field(
+        alias="CHECKPOINTING_COMPACTION_INTERVAL_SECONDS",
+        default=300.0,
+        description="Interval in seconds between background checkpoint compactions (0 disables)",
+    )
+    checkpointing_max_age_hours: float = Field(
+        alias="CHECKPOINTING_MAX_AGE_HOURS",
+        default=0.0,
+        description="Age in hours after which idle conversations and old checkpoints are deleted by compaction (0, the default, keeps them)",
+    )
+    checkpointing_keep_latest: int = Field(
+        alias="CHECKPOINTING_KEEP_LATEST",
+        default=50,
+        description="Checkpoints kept per conversation thread by compaction (0 keeps all)",
+    )
+    checkpointing_max_bytes: int = Field(
+        alias="CHECKPOINTING_MAX_BYTES",
+        default=0,
+        description="Byte budget of stored checkpoints; least recently updated threads are deleted beyond it (0 disables)",
     )
     checkpointing_file_path: str = Field(
         alias="CHECKPOINTING_FILE_PATH",
@@ -255,11 +355,16 @@ class Settings(BaseSettings):
         default=None,
         description="Maximum tokens for model responses (optional)",
     )
+    model_pool_size: int = Field(
+        alias="MODEL_POOL_SIZE",
+        default=16,
+        description="Initialized chat models reused across turns, keyed by platform, model and parameters (0 disables)",
+    )
     # Feature Flag
     cross_process_rate_limiter_enabled: bool = Field(
         alias="CROSS_PROCESS_RATE_LIMITER_ENABLED",
         default=False,
-        description="Enable cross-process rate limiting for LLM API calls (useful for parallel testing)",
+        description="Share LLM API rate limits across processes through shared memory (useful for parallel testing and multi-worker servers)",
     )
 
     # Ollama configuration
@@ -298,6 +403,12 @@ class Settings(BaseSettings):
         description="Context window saturation percentage that triggers conversation history compression",
     )
 
+    chat_turn_lease_seconds: float = Field(
+        alias="CHAT_TURN_LEASE_SECONDS",
+        default=600.0,
+        description="Seconds a conversation turn holds its conversation; concurrent turns, of any worker sharing a SQLite checkpointer, are rejected until it ends or expires",
+    )
+
     # ===== CONVERSATION MANAGEMENT CONFIGURATION =====
     conversation_cleanup_interval_hours: int = Field(
         alias="CONVERSATION_CLEANUP_INTERVAL_HOURS",
@@ -343,6 +454,26 @@ class Settings(BaseSettings):
         default="data/api_specs",
         description="Directory containing API specification files",
     )
+    api_specs_reload_check_seconds: float = Field(
+        alias="API_SPECS_RELOAD_CHECK_SECONDS",
+        default=5.0,
+        description="Seconds between modification time checks of the API spec files for hot reload (0 checks on every access)",
+    )
+    api_selection_speculative: bool = Field(
+        alias="API_SELECTION_SPECULATIVE",
+        default=False,
+        description="Load the specs of likely APIs while the model selects APIs, in one graph node",
+    )
+    api_selection_prefetch_count: int = Field(
+        alias="API_SELECTION_PREFETCH_COUNT",
+        default=2,
+        description="Likely APIs whose specs are loaded ahead of the selection in speculative mode",
+    )
+    api_selection_skip_token_budget: int = Field(
+        alias="API_SELECTION_SKIP_TOKEN_BUDGET",
+        default=0,
+        description="Estimated spec tokens of the whole catalog under which every API is used without a selection call in speculative mode (0 disables)",
+    )
 
     # ===== TOOLS CONFIGURATION =====
     # Feature Flag
@@ -9,8 +9,10 @@ from .agent import (
     AccessDeniedError,
     Agent,
     ClientError,
+    ConversationBusyError,
     ConversationInfo,
     ConversationNotFoundError,
+    ConversationPage,
     Error,
     InvocationError,
     ValidationError,
@@ -60,6 +62,7 @@ __all__ = [
     "ToolCallDecision",
     "OutputMessage",
     "ConversationInfo",
+    "ConversationPage",
     "ToolCall",
     "HumanOutputMessage",
     "AssistantOutputMessage",
@@ -79,6 +82,7 @@ __all__ = [
     "Error",
     "AccessDeniedError",
     "ClientError",
+    "ConversationBusyError",
     "ConversationNotFoundError",
     "ValidationError",
     "InvocationError",
@@ -47,6 +47,18 @@ class ConversationInfo(BaseModel):
     )
 
 
+class ConversationPage(BaseModel):
+    """A page of a user's conversations, most recently updated first."""
+
+    conversations: list[ConversationInfo] = Field(
+        default_factory=list, description="Conversations in this page"
+    )
+    next_cursor: str | None = Field(
+        None, description="Cursor of the next page, or None on the last page"
+    )
+    total_count: int = Field(0, description="Total number of the user's conversations")
+
+
 # Exceptions
 class Error(Exception):
     """Base exception for agent operations."""
@@ -76,6 +88,15 @@ class ConversationNotFoundError(Error):
         super().__init__(message, "NOT_FOUND", context)
 
 
+class ConversationBusyError(Error):
+    """Raised when another turn of the conversation is in progress."""
+
+    def __init__(
+        self, message: str = "Conversation has a turn in progress", context: dict = None
+    ):
+        super().__init__(message, "CONFLICT", context)
+
+
 class ValidationError(Error):
     """Raised when request validation fails."""
 
@@ -205,6 +226,29 @@ class Agent(Protocol):
         """
         ...
 
+    async def list_conversations_page(
+        self,
+        config: dict,
+        limit: int,
+        cursor: str | None = None,
+    ) -> ConversationPage:
+        """
+        List a page of user's conversations, most recently updated first.
+
+        Args:
+            config: Agent configuration
+            limit: Maximum number of conversations in the page
+            cursor: Cursor returned with the previous page
+
+        Returns:
+            ConversationPage: Conversation summaries and the next page cursor
+
+        Raises:
+            ValidationError: If the cursor is invalid
+            InvocationError: If listing fails
+        """
+        ...
+
     async def delete_conversation(
         self,
         conversation_id: str,
@@ -5,18 +5,171 @@ This module provides a clean CRUD++ interface for managing LangGraph checkpoints
 leveraging the existing checkpointing_service for backend operations.
 """
 
+import asyncio
+import base64
+import binascii
+import bisect
 import builtins
+import json
 import logging
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
 from typing import Any
 
 from langchain_core.messages import BaseMessage
 
+from ...services.checkpointing_serde import (
+    MessagesHeader,
+    aread_messages_header,
+    message_preview,
+)
 from ...services.checkpointing_service import CheckpointingBackendError
 from ...services.factory import get_checkpointing_service
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class ConversationIndexEntry:
+    """Indexed summary of one conversation of a user."""
+
+    conversation_id: str
+    created_at: str
+    last_updated: str
+    message_count: int = 0
+    checkpoint_count: int = 0
+    preview: str | None = None
+    status: str = "active"
+
+
+class ConversationIndex:
+    """Secondary index from user_id to the user's conversations.
+
+    Keeps the conversation ids of each user with last-updated timestamps,
+    message and checkpoint counts, previews and statuses, so listing a user's
+    conversations is proportional to that user's conversation count instead
+    of all checkpoints in the system, and reading a conversation's metadata
+    does not load its checkpoints. Each user's conversations are also kept
+    sorted by (last_updated, id), so a page of the most recently updated
+    conversations costs O(page size).
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._users: dict[str, dict[str, ConversationIndexEntry]] = {}
+        self._order: dict[str, list[tuple[str, str]]] = {}
+        self.built = False
+        # Thread version of a shared checkpointer the index is current with
+        self.version = 0
+
+    def __len__(self) -> int:
+        """Number of indexed conversations across all users."""
+        return sum(len(conversations) for conversations in self._users.values())
+
+    def count(self, user_id: str) -> int:
+        """Number of conversations of a user."""
+        return len(self._users.get(user_id, {}))
+
+    def add(self, user_id: str, conversation_id: str, timestamp: str) -> None:
+        """Add a conversation, keeping an existing entry as is."""
+        conversations = self._users.setdefault(user_id, {})
+        if conversation_id not in conversations:
+            conversations[conversation_id] = ConversationIndexEntry(
+                conversation_id=conversation_id,
+                created_at=timestamp,
+                last_updated=timestamp,
+            )
+            bisect.insort(
+                self._order.setdefault(user_id, []), (timestamp, conversation_id)
+            )
+
+    def update(
+        self,
+        user_id: str,
+        conversation_id: str,
+        last_updated: str,
+        message_count: int,
+        checkpoint_count: int | None = None,
+        preview: str | None = None,
+        status: str | None = None,
+    ) -> None:
+        """Record the latest state of a conversation, adding it if missing.
+
+        States older than the indexed one are ignored; fields passed as None
+        keep their indexed values.
+        """
+        self.add(user_id, conversation_id, last_updated)
+        entry = self._users[user_id][conversation_id]
+        if last_updated < entry.last_updated:
+            return
+        if last_updated > entry.last_updated:
+            order = self._order[user_id]
+            del order[bisect.bisect_left(order, (entry.last_updated, conversation_id))]
+            bisect.insort(order, (last_updated, conversation_id))
+            entry.last_updated = last_updated
+        entry.message_count = message_count
+        if checkpoint_count is not None:
+            entry.checkpoint_count = checkpoint_count
+        if preview is not None:
+            entry.preview = preview
+        if status is not None:
+            entry.status = status
+
+    def remove(self, user_id: str, conversation_id: str) -> bool:
+        """Remove a conversation."""
+        conversations = self._users.get(user_id, {})
+        entry = conversations.pop(conversation_id, None)
+        if entry is None:
+            return False
+        order = self._order[user_id]
+        del order[bisect.bisect_left(order, (entry.last_updated, conversation_id))]
+        if not conversations:
+            del self._users[user_id]
+            del self._order[user_id]
+        return True
+
+    def get(self, user_id: str, conversation_id: str) -> ConversationIndexEntry | None:
+        """Get the entry of a conversation."""
+        return self._users.get(user_id, {}).get(conversation_id)
+
+    def conversations(self, user_id: str) -> list[ConversationIndexEntry]:
+        """Get a user's conversations, most recently updated first."""
+        conversations = self._users.get(user_id, {})
+        return [
+            conversations[conversation_id]
+            for _, conversation_id in reversed(self._order.get(user_id, []))
+        ]
+
+    def page(
+        self,
+        user_id: str,
+        limit: int,
+        after: tuple[str, str] | None = None,
+    ) -> tuple[list[ConversationIndexEntry], tuple[str, str] | None]:
+        """
+        Get a page of a user's conversations, most recently updated first.
+
+        Args:
+            user_id: User identifier
+            limit: Maximum number of conversations
+            after: (last_updated, conversation_id) of the last conversation of
+                the previous page
+
+        Returns:
+            Tuple of (entries, position of the last entry if more follow)
+        """
+        order = self._order.get(user_id, [])
+        end = bisect.bisect_left(order, after) if after else len(order)
+        start = max(end - limit, 0)
+        conversations = self._users.get(user_id, {})
+        entries = [
+            conversations[conversation_id]
+            for _, conversation_id in reversed(order[start:end])
+        ]
+        return entries, order[start] if start > 0 else None
+
+
 class Checkpoints:
     """Clean CRUD++ interface for managing LangGraph checkpoints."""
 
@@ -24,6 +177,8 @@ class Checkpoints:
         """Initialize checkpoints service."""
         self.checkpointing_service = get_checkpointing_service()
         self.checkpointer = self.checkpointing_service.get_checkpointer()
+        self.conversation_index = ConversationIndex()
+        self.checkpointing_service.add_compaction_listener(self._forget_threads)
 
     def _extract_user_from_thread_id(self, thread_id: str) -> str | None:
         """Extract user_id from thread_id format 'user:{user_id}:{conversation_id}'."""
@@ -41,43 +196,6 @@ class Checkpoints:
                 return parts[2]
         return None
 
-    def _discover_user_conversations_via_list(self, user_id: str) -> list[str]:
-        """
-        Discover conversations for a user using the checkpointer's list method.
-
-        This approach uses the checkpointer's built-in filtering capabilities
-        to find all thread_ids that belong to the specified user.
-        """
-        try:
-            discovered_conversations = set()
-
-            # Use the checkpointer's list method to get all checkpoints
-            # We pass None as config to get all checkpoints, then filter by user
-            checkpoints = self.checkpointer.list(None)
-
-            for checkpoint_tuple in checkpoints:
-                # Extract thread_id from the checkpoint config
-                config = checkpoint_tuple.config
-                thread_id = config.get("configurable", {}).get("thread_id", "")
-
-                # Check if this thread_id belongs to our user
-                thread_user_id = self._extract_user_from_thread_id(thread_id)
-                if thread_user_id == user_id:
-                    conversation_id = self._extract_conversation_from_thread_id(
-                        thread_id
-                    )
-                    if conversation_id:
-                        discovered_conversations.add(conversation_id)
-
-            logger.debug(
-                f"Discovered {len(discovered_conversations)} conversations for user {user_id}"
-            )
-            return list(discovered_conversations)
-
-        except Exception as e:
-            logger.error(f"Error discovering conversations for user {user_id}: {e}")
-            return []
-
     def _discover_user_conversations_via_storage(self, user_id: str) -> list[str]:
         """
         Fallback method: Discover conversations by scanning the checkpointer's storage.
@@ -117,6 +235,175 @@ class Checkpoints:
             )
             return []
 
+    async def _sync_conversation_index(self) -> None:
+        """
+        Bring the conversation index up to date with the checkpointer.
+
+        The first call indexes the latest checkpoint of every thread. A saver
+        shared by several processes (one with list_thread_changes) is then
+        asked on every call for the threads written or deleted since, so
+        conversations written by other workers are listed too. Other savers
+        are only written by this process, which indexes its own writes.
+        """
+        index = self.conversation_index
+        list_thread_changes = getattr(self.checkpointer, "list_thread_changes", None)
+        if index.built and list_thread_changes is None:
+            return
+
+        try:
+            if list_thread_changes is not None:
+                version, changes = await asyncio.to_thread(
+                    list_thread_changes, index.version
+                )
+            else:
+                version = 0
+                changes = [(thread_id, False) for thread_id in self._thread_ids()]
+
+            for thread_id, deleted in changes:
+                if deleted:
+                    self._forget_threads([thread_id])
+                else:
+                    await self._index_latest(thread_id)
+
+            if not index.built:
+                logger.debug(f"Indexed {len(index)} conversations")
+            index.version = version
+        except Exception as e:
+            logger.error(f"Error syncing conversation index: {e}")
+            return
+
+        index.built = True
+
+    def _thread_ids(self) -> Sequence[str]:
+        """Get the ids of all threads of the checkpointer."""
+        if hasattr(self.checkpointer, "list_thread_ids"):
+            return self.checkpointer.list_thread_ids()
+        storage = getattr(self.checkpointer, "storage", None)
+        if isinstance(storage, Mapping):
+            return builtins.list(storage)
+        return builtins.list(
+            dict.fromkeys(
+                checkpoint_tuple.config["configurable"]["thread_id"]
+                for checkpoint_tuple in self.checkpointer.list(None)
+            )
+        )
+
+    def _indexes_own_writes(self) -> bool:
+        """
+        Check whether this process indexes the conversations it writes.
+
+        Entries of a checkpointer shared by several processes are only taken
+        from its checkpoints, so every worker orders conversations by the
+        same timestamps and serves the same pages for a cursor.
+        """
+        return not hasattr(self.checkpointer, "list_thread_changes")
+
+    async def _index_latest(self, thread_id: str) -> None:
+        """Index the latest checkpoint of a user-scoped thread."""
+        if not self._extract_user_from_thread_id(thread_id):
+            return
+
+        config = {"configurable": {"thread_id": thread_id}}
+        header = await aread_messages_header(self.checkpointer, config)
+        if header:
+            await self._index_header(config, header)
+            return
+
+        checkpoint_tuple = await self.checkpointer.aget_tuple(config)
+        if checkpoint_tuple is not None:
+            await self._index_state(config, checkpoint_tuple.checkpoint)
+
+    def _thread_entry(self, thread_id: str) -> ConversationIndexEntry | None:
+        """Get the index entry of a user-scoped thread."""
+        return self.conversation_index.get(
+            self._extract_user_from_thread_id(thread_id) or "",
+            self._extract_conversation_from_thread_id(thread_id) or "",
+        )
+
+    def _is_indexed(self, thread_id: str, timestamp: str | None) -> bool:
+        """Check whether the index already holds a thread's state at timestamp."""
+        entry = self._thread_entry(thread_id)
+        return bool(
+            entry
+            and entry.checkpoint_count
+            and timestamp
+            and timestamp <= entry.last_updated
+        )
+
+    async def _index_thread(
+        self,
+        thread_id: str,
+        timestamp: str | None,
+        message_count: int,
+        checkpoint_count: int | None = None,
+        preview: str | None = None,
+        status: str | None = None,
+    ) -> None:
+        """
+        Record the latest state of a user-scoped thread in the index.
+
+        Checkpoints are counted in a worker thread when no count is given,
+        so counting a long history does not block the event loop.
+        """
+        user_id = self._extract_user_from_thread_id(thread_id)
+        conversation_id = self._extract_conversation_from_thread_id(thread_id)
+        if user_id and conversation_id:
+            if checkpoint_count is None:
+                checkpoint_count = await asyncio.to_thread(
+                    self._count_checkpoints, {"configurable": {"thread_id": thread_id}}
+                )
+            self.conversation_index.update(
+                user_id,
+                conversation_id,
+                timestamp or self._get_index_timestamp(),
+                message_count,
+                checkpoint_count=checkpoint_count,
+                preview=preview,
+                status=status,
+            )
+
+    async def _index_state(self, config: dict[str, Any], state: dict[str, Any]) -> None:
+        """Record the latest checkpoint state of a conversation in the index."""
+        configurable = config.get("configurable", {})
+        thread_id = configurable.get("thread_id", "")
+        if (
+            state
+            and not configurable.get("checkpoint_id")
+            and not self._is_indexed(thread_id, state.get("ts"))
+        ):
+            await self._index_thread(
+                thread_id,
+                state.get("ts"),
+                len(self.extract_messages(state)),
+                preview=self.extract_preview(state),
+                status=self.extract_status(state),
+            )
+
+    async def _index_header(
+        self, config: dict[str, Any], header: MessagesHeader
+    ) -> None:
+        """Record the latest message channel header of a conversation in the index."""
+        configurable = config.get("configurable", {})
+        thread_id = configurable.get("thread_id", "")
+        if not configurable.get("checkpoint_id") and not self._is_indexed(
+            thread_id, header.last_timestamp
+        ):
+            await self._index_thread(
+                thread_id,
+                header.last_timestamp,
+                header.message_count,
+                preview=header.preview,
+                status=self.extract_status(header.checkpoint),
+            )
+
+    def _forget_threads(self, thread_ids: list[str]) -> None:
+        """Drop the index entries of threads deleted by compaction."""
+        for thread_id in thread_ids:
+            user_id = self._extract_user_from_thread_id(thread_id)
+            conversation_id = self._extract_conversation_from_thread_id(thread_id)
+            if user_id and conversation_id:
+                self.conversation_index.remove(user_id, conversation_id)
+
     # ===== CRUD Operations =====
 
     async def get(self, config: dict[str, Any]) -> dict[str, Any] | None:
@@ -135,6 +422,8 @@ class Checkpoints:
                 logger.debug(
                     f"Retrieved conversation state with metadata: {state.get('metadata', {})}"
                 )
+                # Graph runs write checkpoints directly; refresh the index on read
+                await self._index_state(config, state)
             return state
         except Exception as e:
             logger.error(f"Failed to get conversation state: {e}")
@@ -190,6 +479,8 @@ class Checkpoints:
             await self.checkpointer.aput(
                 checkpoint_config, state, existing_metadata, {}
             )
+            thread_id = config.get("configurable", {}).get("thread_id", "")
+            await self.refresh_conversation({"configurable": {"thread_id": thread_id}})
             logger.debug(f"Updated checkpoint {checkpoint_id}")
             return True
         except Exception as e:
@@ -267,6 +558,15 @@ class Checkpoints:
                 metadata["last_accessed"] = current_timestamp
 
             checkpoint_id = await self.checkpointer.aput(config, state, metadata, {})
+            if self._indexes_own_writes():
+                thread_id = config.get("configurable", {}).get("thread_id", "")
+                await self._index_thread(
+                    thread_id,
+                    self._get_index_timestamp(),
+                    len(self.extract_messages(state)),
+                    checkpoint_count=self._bumped_checkpoint_count(thread_id),
+                    preview=self.extract_preview(state),
+                )
             logger.debug(
                 f"Created/updated checkpoint {checkpoint_id} with metadata: {metadata}"
             )
@@ -279,22 +579,26 @@ class Checkpoints:
 
     async def list_user_conversations(self, user_id: str) -> builtins.list[str]:
         """
-        List all conversations for a user using the checkpointer's list method.
+        List all conversations for a user from the conversation index.
 
         Args:
             user_id: User identifier
 
         Returns:
-            List of conversation IDs
+            List of conversation IDs, most recently updated first
         """
         try:
-            # Try the preferred method first (using checkpointer's list method)
-            conversations = self._discover_user_conversations_via_list(user_id)
+            await self._sync_conversation_index()
 
-            # If no conversations found, try the fallback method
-            if not conversations:
+            conversations = [
+                entry.conversation_id
+                for entry in self.conversation_index.conversations(user_id)
+            ]
+
+            # Fall back to scanning if the index could not be built
+            if not conversations and not self.conversation_index.built:
                 logger.debug(
-                    f"No conversations found via list method for user {user_id}, trying storage method"
+                    f"Conversation index unavailable for user {user_id}, trying storage method"
                 )
                 conversations = self._discover_user_conversations_via_storage(user_id)
 
@@ -305,6 +609,109 @@ class Checkpoints:
             logger.error(f"Failed to list conversations for user {user_id}: {e}")
             raise CheckpointingBackendError(f"Failed to list conversations: {e}") from e
 
+    async def page_user_conversations(
+        self, user_id: str, limit: int, cursor: str | None = None
+    ) -> tuple[builtins.list[str], str | None, int]:
+        """
+        List a page of a user's conversations from the conversation index.
+
+        Args:
+            user_id: User identifier
+            limit: Maximum number of conversations in the page
+            cursor: Cursor returned with the previous page
+
+        Returns:
+            Tuple of (conversation IDs most recently updated first, cursor of
+            the next page or None, total number of the user's conversations)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = self._decode_cursor(cursor) if cursor else None
+        try:
+            await self._sync_conversation_index()
+
+            entries, last = self.conversation_index.page(user_id, limit, after)
+            return (
+                [entry.conversation_id for entry in entries],
+                self._encode_cursor(last) if last else None,
+                self.conversation_index.count(user_id),
+            )
+
+        except Exception as e:
+            logger.error(f"Failed to page conversations for user {user_id}: {e}")
+            raise CheckpointingBackendError(f"Failed to list conversations: {e}") from e
+
+    async def record_messages(
+        self, config: dict[str, Any], messages: builtins.list[BaseMessage]
+    ) -> None:
+        """
+        Record the messages of a conversation after a graph run wrote them.
+
+        Keeps the conversation's metadata record current without reading the
+        checkpoint back.
+
+        Args:
+            config: LangGraph configuration with thread_id
+            messages: Messages of the conversation's latest checkpoint
+        """
+        if not self._indexes_own_writes():
+            return
+        thread_id = config.get("configurable", {}).get("thread_id", "")
+        await self._index_thread(
+            thread_id,
+            self._get_index_timestamp(),
+            len(messages),
+            preview=message_preview(messages),
+        )
+
+    async def refresh_conversation(self, config: dict[str, Any]) -> None:
+        """
+        Refresh the metadata record of a conversation from its latest checkpoint.
+
+        Reads the message channel header when the serializer stores one, so
+        the messages are not decoded.
+
+        Args:
+            config: LangGraph configuration with thread_id
+        """
+        try:
+            header = await aread_messages_header(self.checkpointer, config)
+            if header:
+                await self._index_header(config, header)
+            else:
+                await self.get(config)
+        except Exception as e:
+            logger.warning(f"Failed to refresh conversation record: {e}")
+
+    async def acquire_turn_lease(
+        self, thread_id: str, lease: str, seconds: float
+    ) -> bool:
+        """
+        Lease a conversation thread for one turn in a shared checkpointer.
+
+        Args:
+            thread_id: Thread of the turn
+            lease: Token identifying the lease, to release it
+            seconds: Seconds after which the lease expires if not released
+
+        Returns:
+            Whether the lease was acquired; always True for checkpointers
+            used by a single process
+        """
+        if not hasattr(self.checkpointer, "acquire_turn_lease"):
+            return True
+        return await asyncio.to_thread(
+            self.checkpointer.acquire_turn_lease, thread_id, lease, seconds
+        )
+
+    async def release_turn_lease(self, thread_id: str, lease: str) -> None:
+        """Release a turn lease taken with acquire_turn_lease."""
+        if hasattr(self.checkpointer, "release_turn_lease"):
+            await asyncio.to_thread(
+                self.checkpointer.release_turn_lease, thread_id, lease
+            )
+
     # ===== Enhanced Operations =====
 
     async def get_by_id(
@@ -424,6 +831,10 @@ class Checkpoints:
 
             # Don't manually create checkpoint - let LangGraph handle it when workflow runs
             # The thread_id will be used to identify the conversation
+            if self._indexes_own_writes():
+                self.conversation_index.add(
+                    user_id, conversation_id, self._get_index_timestamp()
+                )
             logger.info(f"Created conversation {conversation_id} for user {user_id}")
             return user_scoped_id
 
@@ -451,6 +862,7 @@ class Checkpoints:
             config = {"configurable": {"thread_id": user_scoped_id}}
 
             deleted_count = await self.delete(config)
+            self.conversation_index.remove(user_id, conversation_id)
             logger.info(
                 f"Deleted conversation {conversation_id} for user {user_id} ({deleted_count} checkpoints)"
             )
@@ -470,14 +882,22 @@ class Checkpoints:
         """
         Get conversation metadata.
 
+        Served from the conversation's metadata record once a checkpoint of
+        it has been indexed; otherwise the latest checkpoint is read.
+
         Args:
             user_id: User identifier
             conversation_id: Conversation identifier
 
         Returns:
-            Conversation metadata
+            Conversation metadata, including preview and status
         """
         try:
+            await self._sync_conversation_index()
+            entry = self.conversation_index.get(user_id, conversation_id)
+            if entry and entry.checkpoint_count:
+                return self._entry_metadata(user_id, entry)
+
             user_scoped_id = f"user:{user_id}:{conversation_id}"
             config = {"configurable": {"thread_id": user_scoped_id}}
 
@@ -490,30 +910,13 @@ class Checkpoints:
                     "last_accessed": None,
                     "message_count": 0,
                     "checkpoint_count": 0,
+                    "preview": None,
+                    "status": "active",
                 }
 
             # Extract data from state - use built-in timestamp instead of custom metadata
             builtin_timestamp = state.get("ts")  # MemorySaver's built-in timestamp
-            channel_values = state.get("channel_values", {})
-            messages = channel_values.get("messages", [])
-
-            # Convert timestamp format from +00:00 to Z format for API compatibility
-            formatted_timestamp = None
-            if builtin_timestamp:
-                try:
-                    from datetime import datetime
-
-                    # Parse the ISO timestamp from MemorySaver
-                    dt = datetime.fromisoformat(
-                        builtin_timestamp.replace("Z", "+00:00")
-                    )
-                    # Format to API-compatible format: YYYY-MM-DDTHH:MM:SS.mmmZ
-                    formatted_timestamp = dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
-                except (ValueError, AttributeError) as e:
-                    logger.warning(
-                        f"Failed to parse timestamp {builtin_timestamp}: {e}"
-                    )
-                    formatted_timestamp = None
+            formatted_timestamp = self._format_timestamp(builtin_timestamp)
 
             logger.debug(
                 f"get_conversation_metadata for {conversation_id}: builtin_timestamp={builtin_timestamp}, formatted={formatted_timestamp}"
@@ -524,8 +927,12 @@ class Checkpoints:
                 "user_id": user_id,
                 "created_at": formatted_timestamp,  # Use formatted timestamp as created_at
                 "last_accessed": formatted_timestamp,  # Use formatted timestamp as last_accessed
-                "message_count": len(messages),
-                "checkpoint_count": len(await self.list(config)),
+                "message_count": len(self.extract_messages(state)),
+                "checkpoint_count": await asyncio.to_thread(
+                    self._count_checkpoints, config
+                ),
+                "preview": self.extract_preview(state),
+                "status": self.extract_status(state),
             }
 
         except Exception as e:
@@ -536,6 +943,92 @@ class Checkpoints:
                 f"Failed to get conversation metadata: {e}"
             ) from e
 
+    async def get_conversation_summaries(
+        self, user_id: str, conversation_ids: builtins.list[str]
+    ) -> builtins.list[dict[str, Any]]:
+        """
+        Get metadata, preview and status of several conversations in one pass.
+
+        Conversations with a metadata record are served from it. Otherwise
+        the latest checkpoint of each conversation is read once, instead of the
+        separate state, checkpoint list and preview reads per conversation.
+        Message counts and previews come from the message channel header when
+        the serializer stores one, so the messages are not decoded.
+
+        Args:
+            user_id: User identifier
+            conversation_ids: Conversation identifiers
+
+        Returns:
+            Conversation summaries in the order of the given IDs
+        """
+        try:
+            await self._sync_conversation_index()
+            summaries = []
+            for conversation_id in conversation_ids:
+                entry = self.conversation_index.get(user_id, conversation_id)
+                if entry and entry.checkpoint_count:
+                    summaries.append(self._entry_metadata(user_id, entry))
+                    continue
+
+                user_scoped_id = f"user:{user_id}:{conversation_id}"
+                config = {"configurable": {"thread_id": user_scoped_id}}
+
+                header = await aread_messages_header(self.checkpointer, config)
+                if header:
+                    await self._index_header(config, header)
+                    state = header.checkpoint
+                    message_count, preview = header.message_count, header.preview
+                else:
+                    state = await self.get(config)
+                    message_count = len(self.extract_messages(state))
+                    preview = self.extract_preview(state)
+                if not state:
+                    summaries.append(
+                        {
+                            "conversation_id": conversation_id,
+                            "user_id": user_id,
+                            "created_at": None,
+                            "last_accessed": None,
+                            "message_count": 0,
+                            "checkpoint_count": 0,
+                            "preview": None,
+                            "status": "active",
+                        }
+                    )
+                    continue
+
+                formatted_timestamp = self._format_timestamp(state.get("ts"))
+                entry = self.conversation_index.get(user_id, conversation_id)
+                summaries.append(
+                    {
+                        "conversation_id": conversation_id,
+                        "user_id": user_id,
+                        "created_at": (
+                            self._format_timestamp(entry.created_at)
+                            if entry
+                            else formatted_timestamp
+                        ),
+                        "last_accessed": formatted_timestamp,
+                        "message_count": message_count,
+                        "checkpoint_count": await asyncio.to_thread(
+                            self._count_checkpoints, config
+                        ),
+                        "preview": preview,
+                        "status": self.extract_status(state),
+                    }
+                )
+
+            return summaries
+
+        except Exception as e:
+            logger.error(
+                f"Failed to get conversation summaries for user {user_id}: {e}"
+            )
+            raise CheckpointingBackendError(
+                f"Failed to get conversation summaries: {e}"
+            ) from e
+
     # ===== Utility Methods =====
 
     def extract_messages(self, state: dict[str, Any]) -> builtins.list[BaseMessage]:
@@ -565,18 +1058,9 @@ class Checkpoints:
             state: Checkpoint state dictionary
 
         Returns:
-            Preview text or None
+            Text of the first human message (or first message) or None
         """
-        if state and "channel_values" in state:
-            channel_values = state["channel_values"]
-            if "messages" in channel_values:
-                messages = channel_values["messages"]
-                if messages:
-                    # Get the first message with content
-                    for msg in messages:
-                        if hasattr(msg, "content") and msg.content:
-                            return msg.content[:256]
-        return None
+        return message_preview(self.extract_messages(state))
 
     def extract_status(self, state: dict[str, Any]) -> str:
         """
@@ -609,6 +1093,12 @@ class Checkpoints:
             Tuple of (preview, status, message_count)
         """
         try:
+            header = await aread_messages_header(self.checkpointer, config)
+            if header:
+                await self._index_header(config, header)
+                status = self.extract_status(header.checkpoint)
+                return header.preview, status, header.message_count
+
             state = await self.get(config)
             if not state:
                 return None, "active", 0
@@ -707,12 +1197,74 @@ class Checkpoints:
         checkpoint_config["configurable"]["checkpoint_id"] = checkpoint_id
         return checkpoint_config
 
+    def _entry_metadata(
+        self, user_id: str, entry: ConversationIndexEntry
+    ) -> dict[str, Any]:
+        """Get the conversation metadata held by a metadata record."""
+        return {
+            "conversation_id": entry.conversation_id,
+            "user_id": user_id,
+            "created_at": self._format_timestamp(entry.created_at),
+            "last_accessed": self._format_timestamp(entry.last_updated),
+            "message_count": entry.message_count,
+            "checkpoint_count": entry.checkpoint_count,
+            "preview": entry.preview,
+            "status": entry.status,
+        }
+
+    def _bumped_checkpoint_count(self, thread_id: str) -> int | None:
+        """Get a thread's indexed checkpoint count plus one checkpoint put."""
+        entry = self._thread_entry(thread_id)
+        return entry.checkpoint_count + 1 if entry and entry.checkpoint_count else None
+
+    def _count_checkpoints(self, config: dict[str, Any]) -> int:
+        """Count the checkpoints of a thread without deserializing them if possible."""
+        thread_id = config.get("configurable", {}).get("thread_id", "")
+        if hasattr(self.checkpointer, "count_checkpoints"):
+            return self.checkpointer.count_checkpoints(thread_id)
+        storage = getattr(self.checkpointer, "storage", None)
+        if isinstance(storage, Mapping):
+            namespaces = storage.get(thread_id, {})
+            return sum(len(checkpoints) for checkpoints in namespaces.values())
+        return len(builtins.list(self.checkpointer.list(config)))
+
+    def _format_timestamp(self, timestamp: str | None) -> str | None:
+        """Format an ISO timestamp as YYYY-MM-DDTHH:MM:SS.mmmZ for the API."""
+        if not timestamp:
+            return None
+        try:
+            # Parse the ISO timestamp from MemorySaver
+            dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+            # Format to API-compatible format: YYYY-MM-DDTHH:MM:SS.mmmZ
+            return dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+        except (ValueError, AttributeError) as e:
+            logger.warning(f"Failed to parse timestamp {timestamp}: {e}")
+            return None
+
+    def _encode_cursor(self, position: tuple[str, str]) -> str:
+        """Encode a (last_updated, conversation_id) index position as a cursor."""
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    def _decode_cursor(self, cursor: str) -> tuple[str, str]:
+        """Decode a cursor into a (last_updated, conversation_id) index position."""
+        try:
+            last_updated, conversation_id = json.loads(
+                base64.urlsafe_b64decode(cursor.encode())
+            )
+        except (binascii.Error, UnicodeError, ValueError, TypeError) as e:
+            raise ValueError(f"Invalid conversation cursor: {cursor}") from e
+        if not isinstance(last_updated, str) or not isinstance(conversation_id, str):
+            raise ValueError(f"Invalid conversation cursor: {cursor}")
+        return last_updated, conversation_id
+
     def _get_timestamp(self) -> str:
         """Get current timestamp in ISO format."""
-        from datetime import datetime
-
         return datetime.now().isoformat()
 
+    def _get_index_timestamp(self) -> str:
+        """Get current UTC timestamp in the ISO format of checkpoint timestamps."""
+        return datetime.now(UTC).isoformat()
+
 
 # Global checkpoints instance
 _checkpoints: Checkpoints | None = None
@@ -5,5 +5,6 @@ NODE_CHECK_CACHE = "check_cache"
 NODE_LOAD_API_SUMMARIES = "load_api_summaries"
 NODE_SELECT_RELEVANT_APIS = "select_relevant_apis"
 NODE_LOAD_API_SPECS = "load_api_specs"
+NODE_SELECT_AND_LOAD_APIS = "select_and_load_apis"
 NODE_CALL_MODEL = "call_model"
 NODE_CALL_API = "call_api"
@@ -5,7 +5,11 @@ This module provides the concrete implementation of agent interactions,
 handling conversation management, access control, and agent invocation.
 """
 
+import asyncio
 import logging
+import time
+import uuid
+import weakref
 from collections.abc import AsyncGenerator
 from typing import Any
 
@@ -13,6 +17,11 @@ from langchain_core.messages import BaseMessage
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.types import Command
 
+from ...config import settings
+from ...services.checkpointing_conflicts import (
+    CHECKPOINT_CAS_KEY,
+    CheckpointConflictError,
+)
 from ...utils.id_generator import (
     generate_conversation_id,
     generate_run_id,
@@ -22,8 +31,10 @@ from ..agent import (
     # Exceptions
     AccessDeniedError,
     Agent,
+    ConversationBusyError,
     ConversationInfo,
     ConversationNotFoundError,
+    ConversationPage,
     InvocationError,
     # Internal types
     StreamingChunk,
@@ -33,6 +44,7 @@ from ..messages import InputMessage, OutputMessage, ToolCallDecision
 from ..streaming import (
     ResponseCompletedEvent,
     ResponseCreatedEvent,
+    ResponseErrorEvent,
     extract_usage_from_streaming_chunks,
 )
 from .checkpoints import get_checkpoints
@@ -58,6 +70,10 @@ class LangGraphAgent(Agent):
         self.agent = workflow_graph
         self.checkpoints = get_checkpoints()
         self.audit_service = audit_service
+        # Conversation threads with a turn in progress -> (lease expiry, lease)
+        self._turns: dict[str, tuple[float, str]] = {}
+        # Releases of shared leases of dropped streams still running
+        self._releases: set[asyncio.Task] = set()
 
     def _extract_user_id_from_config(self, config: dict) -> str:
         """Extract user_id from LangGraph config."""
@@ -219,6 +235,96 @@ class LangGraphAgent(Agent):
         if not has_access:
             raise AccessDeniedError()
 
+    async def _begin_turn(self, user_id: str, conversation_id: str) -> tuple[str, str]:
+        """
+        Lease a conversation for one turn, rejecting concurrent turns.
+
+        The lease is held in this process and, when the checkpointer is
+        shared by several processes, in the checkpointer, so concurrent turns
+        of any worker are rejected before the graph runs.
+
+        Returns:
+            The thread id and lease to pass to _end_turn
+        """
+        thread_id = create_user_scoped_conversation_id(user_id, conversation_id)
+        now = time.monotonic()
+        # Expiry frees conversations of turns that never released their lease
+        expiry, _ = self._turns.get(thread_id, (0.0, None))
+        if expiry > now:
+            raise ConversationBusyError(context={"conversation_id": conversation_id})
+        lease = uuid.uuid4().hex
+        self._turns[thread_id] = (now + settings.chat_turn_lease_seconds, lease)
+        try:
+            acquired = await self.checkpoints.acquire_turn_lease(
+                thread_id, lease, settings.chat_turn_lease_seconds
+            )
+        except Exception:
+            self._release_local_turn(thread_id, lease)
+            raise
+        if not acquired:
+            self._release_local_turn(thread_id, lease)
+            raise ConversationBusyError(context={"conversation_id": conversation_id})
+        return thread_id, lease
+
+    async def _end_turn(self, thread_id: str, lease: str) -> None:
+        """Release the lease of a conversation turn, unless a later turn holds it."""
+        self._release_local_turn(thread_id, lease)
+        try:
+            await self.checkpoints.release_turn_lease(thread_id, lease)
+        except Exception as e:
+            # The shared lease expires after chat_turn_lease_seconds
+            logger.warning(f"Failed to release turn lease of {thread_id}: {e}")
+
+    def _release_local_turn(self, thread_id: str, lease: str) -> None:
+        """Release the lease of a turn held in this process."""
+        if self._turns.get(thread_id, (0.0, None))[1] == lease:
+            del self._turns[thread_id]
+
+    def _stream_turn(
+        self,
+        stream: AsyncGenerator[StreamingChunk, None],
+        thread_id: str,
+        lease: str,
+    ) -> AsyncGenerator[StreamingChunk, None]:
+        """
+        Release a turn's lease if its stream is dropped before being started.
+
+        A started stream releases the lease in its own finally block, which
+        does not run for a stream that was never iterated.
+        """
+        weakref.finalize(stream, self._drop_turn, thread_id, lease)
+        return stream
+
+    def _drop_turn(self, thread_id: str, lease: str) -> None:
+        """Release the lease of a turn whose stream was garbage collected."""
+        if self._turns.get(thread_id, (0.0, None))[1] != lease:
+            # Released when the stream ended
+            return
+        self._release_local_turn(thread_id, lease)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to release the shared lease from; it expires
+            return
+        task = loop.create_task(self.checkpoints.release_turn_lease(thread_id, lease))
+        self._releases.add(task)
+        task.add_done_callback(self._releases.discard)
+
+    def _with_checkpoint_cas(self, config: dict) -> dict:
+        """Make the turn's checkpoint writes fail if another process wrote first."""
+        return {
+            **config,
+            "configurable": {
+                **config.get("configurable", {}),
+                CHECKPOINT_CAS_KEY: True,
+            },
+        }
+
+    def _busy_event(self, conversation_id: str) -> ResponseErrorEvent:
+        """Get the error event of a streamed turn another process stored first."""
+        error = ConversationBusyError(context={"conversation_id": conversation_id})
+        return ResponseErrorEvent(conversation_id=conversation_id, error=error.message)
+
     async def _create_new_conversation(
         self, user_id: str, config: dict
     ) -> tuple[str, dict]:
@@ -251,19 +357,6 @@ class LangGraphAgent(Agent):
             preview=preview,
         )
 
-    def _extract_preview_from_messages(self, messages: list[BaseMessage]) -> str | None:
-        """Extract preview text from messages."""
-        if not messages:
-            return None
-
-        # Get the first message with content
-        for msg in messages:
-            if hasattr(msg, "content") and msg.content:
-                content = str(msg.content)
-                return content[:256] + "..." if len(content) > 256 else content
-
-        return None
-
     async def _get_conversation_info(
         self, conversation_id: str, config: dict
     ) -> ConversationInfo:
@@ -271,21 +364,17 @@ class LangGraphAgent(Agent):
         try:
             user_id = self._extract_user_id_from_config(config)
 
-            # Get conversation metadata using checkpoint operations
+            # Get conversation metadata, preview and status from its record
             metadata = await self.checkpoints.get_conversation_metadata(
                 user_id, conversation_id
             )
 
-            # Get conversation preview and status
-            user_scoped_id = create_user_scoped_conversation_id(
-                user_id, conversation_id
-            )
-            checkpoint_config = {"configurable": {"thread_id": user_scoped_id}}
-            preview, status, _ = await self.checkpoints.get_metadata(checkpoint_config)
-
             # Create conversation info using shared method
             return self._create_conversation_info_from_metadata(
-                conversation_id, metadata, status=status, preview=preview
+                conversation_id,
+                metadata,
+                status=metadata.get("status", "active"),
+                preview=metadata.get("preview"),
             )
 
         except Exception as e:
@@ -330,7 +419,8 @@ class LangGraphAgent(Agent):
                 user_id, config
             )
 
-        # Invoke agent
+        # Invoke agent, one turn per conversation at a time
+        thread_id, lease = await self._begin_turn(user_id, conversation_id)
         try:
             # transform to langchain messages
             lc_messages = [
@@ -341,8 +431,15 @@ class LangGraphAgent(Agent):
             ]
             agent_input = {"messages": lc_messages}
 
-            result = await self.agent.ainvoke(agent_input, config=updated_config)
+            result = await self.agent.ainvoke(
+                agent_input, config=self._with_checkpoint_cas(updated_config)
+            )
 
+        except CheckpointConflictError as e:
+            # Another process stored a turn of this conversation first
+            raise ConversationBusyError(
+                context={"conversation_id": conversation_id}
+            ) from e
         except Exception as e:
             logger.error(f"Agent invocation failed: {e}")
 
@@ -364,11 +461,15 @@ class LangGraphAgent(Agent):
             raise InvocationError(
                 context={"conversation_id": conversation_id}, original_exception=e
             ) from e
+        finally:
+            await self._end_turn(thread_id, lease)
 
         # Extract conversation data from the result
         result_messages = (
             result.get("messages", messages) if isinstance(result, dict) else messages
         )
+        if isinstance(result, dict) and "messages" in result:
+            await self.checkpoints.record_messages(updated_config, result_messages)
 
         # CRITICAL FIX: Filter messages to only include those from the current response cycle
         # This prevents sending the entire conversation history in each response
@@ -481,46 +582,61 @@ class LangGraphAgent(Agent):
         # Get conversation info
         conversation_info = await self._get_conversation_info(conversation_id, config)
         run_id = generate_run_id()
+        # Leased before streaming, so concurrent turns fail before streaming;
+        # the stream holds the lease until it ends, fails or is closed
+        thread_id, lease = await self._begin_turn(user_id, conversation_id)
 
         # Create streaming generator - pass through all events without filtering
         async def stream_generator():
-            # transform to langchain messages
-            lc_messages = [
-                msg.to_langchain_message()
-                if hasattr(msg, "to_langchain_message")
-                else msg
-                for msg in messages
-            ]
-            agent_input = {"messages": lc_messages}
-            # Collect messages and usage from the stream
-            collected_messages = []
-
-            response_created_event = ResponseCreatedEvent(
-                conversation_id=conversation_info.conversation_id, run_id=run_id
-            )
-            yield response_created_event
-
-            async for chunk in self.agent.astream(
-                agent_input, config, stream_mode=["updates", "messages"]
-            ):
-                # Transform langchain chunk to core model - pass through all events
-                core_chunk = transform_streaming_chunk(chunk, conversation_id)
-                yield core_chunk
-                # Collect messages for usage extraction from the original chunk
-                if hasattr(core_chunk, "usage") and core_chunk.usage:
-                    collected_messages.append(core_chunk)
-
-            # Send completion event with actual usage
-            usage_data = extract_usage_from_streaming_chunks(collected_messages)
-
-            response_completed_event = ResponseCompletedEvent(
-                conversation_id=conversation_info.conversation_id,
-                run_id=run_id,
-                usage=usage_data,
-            )
-            yield response_completed_event
-
-        return stream_generator(), conversation_info
+            try:
+                # transform to langchain messages
+                lc_messages = [
+                    msg.to_langchain_message()
+                    if hasattr(msg, "to_langchain_message")
+                    else msg
+                    for msg in messages
+                ]
+                agent_input = {"messages": lc_messages}
+                # Collect messages and usage from the stream
+                collected_messages = []
+
+                response_created_event = ResponseCreatedEvent(
+                    conversation_id=conversation_info.conversation_id, run_id=run_id
+                )
+                yield response_created_event
+
+                async for chunk in self.agent.astream(
+                    agent_input,
+                    self._with_checkpoint_cas(config),
+                    stream_mode=["updates", "messages"],
+                ):
+                    # Transform langchain chunk to core model - pass through all events
+                    core_chunk = transform_streaming_chunk(chunk, conversation_id)
+                    yield core_chunk
+                    # Collect messages for usage extraction from the original chunk
+                    if hasattr(core_chunk, "usage") and core_chunk.usage:
+                        collected_messages.append(core_chunk)
+
+                # Send completion event with actual usage
+                usage_data = extract_usage_from_streaming_chunks(collected_messages)
+                await self.checkpoints.refresh_conversation(config)
+
+                response_completed_event = ResponseCompletedEvent(
+                    conversation_id=conversation_info.conversation_id,
+                    run_id=run_id,
+                    usage=usage_data,
+                )
+                yield response_completed_event
+            except CheckpointConflictError:
+                # Another process stored a turn of this conversation first
+                yield self._busy_event(conversation_info.conversation_id)
+            finally:
+                await self._end_turn(thread_id, lease)
+
+        return (
+            self._stream_turn(stream_generator(), thread_id, lease),
+            conversation_info,
+        )
 
     async def list_conversations(
         self,
@@ -537,43 +653,63 @@ class LangGraphAgent(Agent):
         try:
             # Get all conversations for the user
             conversation_ids = await self.checkpoints.list_user_conversations(user_id)
-            conversations = []
+            conversations = await self._get_conversation_infos(
+                user_id, conversation_ids
+            )
 
-            for conversation_id in conversation_ids:
-                # Get conversation metadata
-                metadata = await self.checkpoints.get_conversation_metadata(
-                    user_id, conversation_id
-                )
+            # Audit successful conversation list retrieval
+            await self._audit_event(
+                user_id, "conversation_list", "list_conversations_success", True, config
+            )
 
-                # Extract preview from messages if available
-                preview = None
-                if metadata.get("message_count", 0) > 0:
-                    # Get conversation state to extract preview
-                    user_scoped_id = create_user_scoped_conversation_id(
-                        user_id, conversation_id
-                    )
-                    checkpoint_config = {"configurable": {"thread_id": user_scoped_id}}
-                    checkpoint_state = await self.checkpoints.get(checkpoint_config)
-                    if checkpoint_state:
-                        messages = self.checkpoints.extract_messages(checkpoint_state)
-                        preview = self._extract_preview_from_messages(messages)
-
-                # Create conversation info
-                conversation_info = self._create_conversation_info_from_metadata(
-                    conversation_id,
-                    metadata,
-                    status="active",
-                    preview=preview,
-                )
+            return conversations
 
-                conversations.append(conversation_info)
+        except Exception as e:
+            # Audit failed conversation list retrieval
+            await self._audit_event(
+                user_id, "conversation_list", "list_conversations_failed", False, config
+            )
+            logger.error(f"Failed to list conversations: {e}")
+            raise InvocationError("Failed to list conversations") from e
+
+    async def list_conversations_page(
+        self,
+        config: dict,
+        limit: int,
+        cursor: str | None = None,
+    ) -> ConversationPage:
+        """List a page of user's conversations using the conversation index."""
+        user_id = self._extract_user_id_from_config(config)
+
+        # Audit conversation list access
+        await self._audit_event(
+            user_id, "conversation_list", "list_conversations", True, config
+        )
+
+        try:
+            (
+                conversation_ids,
+                next_cursor,
+                total_count,
+            ) = await self.checkpoints.page_user_conversations(user_id, limit, cursor)
+        except ValueError as e:
+            raise ValidationError(str(e)) from e
+
+        try:
+            conversations = await self._get_conversation_infos(
+                user_id, conversation_ids
+            )
 
             # Audit successful conversation list retrieval
             await self._audit_event(
                 user_id, "conversation_list", "list_conversations_success", True, config
             )
 
-            return conversations
+            return ConversationPage(
+                conversations=conversations,
+                next_cursor=next_cursor,
+                total_count=total_count,
+            )
 
         except Exception as e:
             # Audit failed conversation list retrieval
@@ -583,6 +719,23 @@ class LangGraphAgent(Agent):
             logger.error(f"Failed to list conversations: {e}")
             raise InvocationError("Failed to list conversations") from e
 
+    async def _get_conversation_infos(
+        self, user_id: str, conversation_ids: list[str]
+    ) -> list[ConversationInfo]:
+        """Get conversation infos of several conversations in one pass."""
+        summaries = await self.checkpoints.get_conversation_summaries(
+            user_id, conversation_ids
+        )
+        return [
+            self._create_conversation_info_from_metadata(
+                summary["conversation_id"],
+                summary,
+                status=summary["status"],
+                preview=summary["preview"],
+            )
+            for summary in summaries
+        ]
+
     async def load_conversation(
         self,
         conversation_id: str,
@@ -712,19 +865,29 @@ class LangGraphAgent(Agent):
         )
 
         # Invoke agent with resume command using ResumeDecision directly
+        thread_id, lease = await self._begin_turn(user_id, conversation_id)
         try:
             result = await self.agent.ainvoke(
-                Command(resume=[resume_decision.model_dump()]), config=config
+                Command(resume=[resume_decision.model_dump()]),
+                config=self._with_checkpoint_cas(config),
             )
+        except CheckpointConflictError as e:
+            raise ConversationBusyError(
+                context={"conversation_id": conversation_id}
+            ) from e
         except Exception as e:
             logger.error(f"Agent resume invocation failed: {e}")
             raise InvocationError(
                 "Failed to resume conversation",
                 context={"conversation_id": conversation_id},
             ) from e
+        finally:
+            await self._end_turn(thread_id, lease)
 
         # Extract conversation data from the result
         result_messages = result.get("messages", []) if isinstance(result, dict) else []
+        if isinstance(result, dict) and "messages" in result:
+            await self.checkpoints.record_messages(config, result_messages)
 
         # CRITICAL FIX: Filter messages to only include those from the current response cycle
         # This prevents sending the entire conversation history in each response
@@ -768,43 +931,56 @@ class LangGraphAgent(Agent):
 
         # Get conversation info
         conversation_info = await self._get_conversation_info(conversation_id, config)
+        # Leased before streaming, so concurrent turns fail before streaming;
+        # the stream holds the lease until it ends, fails or is closed
+        thread_id, lease = await self._begin_turn(user_id, conversation_id)
 
         # Create streaming generator using ResumeDecision directly
         async def stream_generator():
-            run_id = generate_run_id()
+            try:
+                run_id = generate_run_id()
 
-            response_created_event = ResponseCreatedEvent(
-                conversation_id=conversation_info.conversation_id, run_id=run_id
-            )
-            yield response_created_event
-
-            # Collect messages and usage from the stream
-            collected_messages = []
-            resume_command = [resume_decision.model_dump()]
-
-            async for chunk in self.agent.astream(
-                Command(resume=resume_command),
-                config,
-                stream_mode=["updates", "messages"],
-            ):
-                # Transform chunk to core model - pass through all events
-                core_chunk = transform_streaming_chunk(chunk, conversation_id)
-                yield core_chunk
-                # Collect messages for usage extraction from the original chunk
-                if hasattr(core_chunk, "usage") and core_chunk.usage:
-                    collected_messages.append(core_chunk)
-
-            # Send completion event with actual usage
-            usage_data = extract_usage_from_streaming_chunks(collected_messages)
-
-            response_completed_event = ResponseCompletedEvent(
-                conversation_id=conversation_info.conversation_id,
-                run_id=run_id,
-                usage=usage_data,
-            )
-            yield response_completed_event
-
-        return stream_generator(), conversation_info
+                response_created_event = ResponseCreatedEvent(
+                    conversation_id=conversation_info.conversation_id, run_id=run_id
+                )
+                yield response_created_event
+
+                # Collect messages and usage from the stream
+                collected_messages = []
+                resume_command = [resume_decision.model_dump()]
+
+                async for chunk in self.agent.astream(
+                    Command(resume=resume_command),
+                    self._with_checkpoint_cas(config),
+                    stream_mode=["updates", "messages"],
+                ):
+                    # Transform chunk to core model - pass through all events
+                    core_chunk = transform_streaming_chunk(chunk, conversation_id)
+                    yield core_chunk
+                    # Collect messages for usage extraction from the original chunk
+                    if hasattr(core_chunk, "usage") and core_chunk.usage:
+                        collected_messages.append(core_chunk)
+
+                # Send completion event with actual usage
+                usage_data = extract_usage_from_streaming_chunks(collected_messages)
+                await self.checkpoints.refresh_conversation(config)
+
+                response_completed_event = ResponseCompletedEvent(
+                    conversation_id=conversation_info.conversation_id,
+                    run_id=run_id,
+                    usage=usage_data,
+                )
+                yield response_completed_event
+            except CheckpointConflictError:
+                # Another process stored a turn of this conversation first
+                yield self._busy_event(conversation_info.conversation_id)
+            finally:
+                await self._end_turn(thread_id, lease)
+
+        return (
+            self._stream_turn(stream_generator(), thread_id, lease),
+            conversation_info,
+        )
 
     async def resume_from_checkpoint(
         self,
@@ -14,6 +14,8 @@ class AgentState(InputSchema):
     selected_apis: dict[str, str] | None
     cache_hit: bool | None
     cache_miss: bool | None
+    # Chained digest of the message contents (see conversation_digest)
+    cache_key_digest: dict[str, Any] | None
 
 
 class OutputSchema(InputSchema):
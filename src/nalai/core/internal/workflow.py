@@ -3,6 +3,11 @@ LangGraph workflow construction and management.
 
 This module handles the creation and compilation of the API Assistant
 workflow using LangGraph's StateGraph.
+
+On a cache miss the graph loads the API summaries, lets the model select
+relevant APIs and loads their specs, in three nodes. In speculative mode
+(API_SELECTION_SPECULATIVE) one node does all three and loads likely specs
+while the model selects, to shorten the time to the first token.
 """
 
 from typing import Any
@@ -13,7 +18,7 @@ from langgraph.graph import StateGraph
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import ToolNode
 
-from ...config import BaseRuntimeConfiguration
+from ...config import BaseRuntimeConfiguration, settings
 from ...services.factory import get_api_service
 from .constants import (
     NODE_CALL_API,
@@ -21,6 +26,7 @@ from .constants import (
     NODE_CHECK_CACHE,
     NODE_LOAD_API_SPECS,
     NODE_LOAD_API_SUMMARIES,
+    NODE_SELECT_AND_LOAD_APIS,
     NODE_SELECT_RELEVANT_APIS,
 )
 from .interrupts import add_human_in_the_loop
@@ -62,35 +68,54 @@ def create_and_compile_workflow(
         output=OutputSchema,
     )
 
-    # Add workflow nodes
+    # Add workflow nodes (cache and model nodes are async so that the cache
+    # and the model are awaited on the event loop of the running graph)
     workflow_graph.add_node(
-        NODE_CHECK_CACHE, workflow_nodes.check_cache_with_similarity
+        NODE_CHECK_CACHE, workflow_nodes.check_cache_with_similarity_async
     )
     workflow_graph.set_entry_point(NODE_CHECK_CACHE)
-    api_service = get_api_service()
-    workflow_graph.add_node(NODE_LOAD_API_SUMMARIES, api_service.load_api_summaries)
-    workflow_graph.add_node(
-        NODE_SELECT_RELEVANT_APIS, workflow_nodes.select_relevant_apis
-    )
+    if settings.api_selection_speculative:
+        workflow_graph.add_node(
+            NODE_SELECT_AND_LOAD_APIS, workflow_nodes.select_and_load_apis_async
+        )
+    else:
+        api_service = get_api_service()
+        workflow_graph.add_node(NODE_LOAD_API_SUMMARIES, api_service.load_api_summaries)
+        workflow_graph.add_node(
+            NODE_SELECT_RELEVANT_APIS, workflow_nodes.select_relevant_apis
+        )
+        workflow_graph.add_node(
+            NODE_LOAD_API_SPECS, api_service.load_openapi_specifications
+        )
     workflow_graph.add_node(
-        NODE_LOAD_API_SPECS, api_service.load_openapi_specifications
+        NODE_CALL_MODEL, workflow_nodes.generate_model_response_async
     )
-    workflow_graph.add_node(NODE_CALL_MODEL, workflow_nodes.generate_model_response)
     workflow_graph.add_node(NODE_CALL_API, available_tools[NODE_CALL_API])
 
     # Add workflow edges
-    workflow_graph.add_conditional_edges(
-        NODE_CHECK_CACHE,
-        workflow_nodes.determine_cache_action,
-        [NODE_LOAD_API_SUMMARIES, NODE_CALL_MODEL],
-    )
-    workflow_graph.add_edge(NODE_LOAD_API_SUMMARIES, NODE_SELECT_RELEVANT_APIS)
-    workflow_graph.add_conditional_edges(
-        NODE_SELECT_RELEVANT_APIS,
-        workflow_nodes.determine_next_step,
-        [NODE_LOAD_API_SPECS, NODE_CALL_MODEL],
-    )
-    workflow_graph.add_edge(NODE_LOAD_API_SPECS, NODE_CALL_MODEL)
+    if settings.api_selection_speculative:
+        workflow_graph.add_conditional_edges(
+            NODE_CHECK_CACHE,
+            workflow_nodes.determine_cache_action,
+            {
+                NODE_LOAD_API_SUMMARIES: NODE_SELECT_AND_LOAD_APIS,
+                NODE_CALL_MODEL: NODE_CALL_MODEL,
+            },
+        )
+        workflow_graph.add_edge(NODE_SELECT_AND_LOAD_APIS, NODE_CALL_MODEL)
+    else:
+        workflow_graph.add_conditional_edges(
+            NODE_CHECK_CACHE,
+            workflow_nodes.determine_cache_action,
+            [NODE_LOAD_API_SUMMARIES, NODE_CALL_MODEL],
+        )
+        workflow_graph.add_edge(NODE_LOAD_API_SUMMARIES, NODE_SELECT_RELEVANT_APIS)
+        workflow_graph.add_conditional_edges(
+            NODE_SELECT_RELEVANT_APIS,
+            workflow_nodes.determine_next_step,
+            [NODE_LOAD_API_SPECS, NODE_CALL_MODEL],
+        )
+        workflow_graph.add_edge(NODE_LOAD_API_SPECS, NODE_CALL_MODEL)
     workflow_graph.add_edge(NODE_CALL_API, NODE_CALL_MODEL)
     workflow_graph.add_conditional_edges(
         NODE_CALL_MODEL,
@@ -6,22 +6,32 @@ of the LangGraph workflow, including API selection, caching,
 model response generation, and tool execution.
 """
 
-import json
+import asyncio
 import logging
 import traceback
 from typing import Any, Literal, cast
 
-from langchain_core.messages import AIMessage
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import RunnableConfig
 from langgraph.constants import END
 
 from ...config import settings
 from ...prompts.prompts import format_template_with_variables, load_prompt_template
-from ...services.factory import get_cache_service, get_model_service
+from ...services.cache_service import conversation_digest
+from ...services.factory import (
+    get_api_service,
+    get_cache_service,
+    get_model_service,
+)
 from ...tools.http_requests import HttpRequestsToolkit
-from ...utils.chat_history import compress_conversation_history_if_needed
-from ..agent import SelectedApis
+from ...utils.chat_history import (
+    compress_conversation_history_if_needed,
+    estimate_messages_tokens,
+)
+from ..agent import SelectApi, SelectedApis
 from .constants import (
     NODE_CALL_API,
     NODE_CALL_MODEL,
@@ -88,6 +98,92 @@ class WorkflowNodes:
         Selects the most relevant APIs based on the conversation history and summaries.
         """
 
+        model, prompt_value = WorkflowNodes._api_selection_call(state, config)
+        response = cast(AIMessage, self._invoke_model(model, prompt_value, config))
+
+        state["selected_apis"] = response.selected_apis
+        # Don't add the JSON message to conversation history - it's internal metadata
+        return {"messages": [], **state}
+
+    async def select_and_load_apis_async(
+        self, state: AgentState, config: RunnableConfig
+    ) -> dict[str, Any]:
+        """
+        Speculative version of the load_api_summaries, select_relevant_apis and
+        load_api_specs nodes, run as one node.
+
+        The specs of the APIs most likely to be selected, by the words they
+        share with the last user message, are loaded in the default executor
+        while the model selects APIs. Specs of APIs that were not selected are
+        discarded. When the specs of the whole catalog fit the selection skip
+        token budget, every API is used without a selection call.
+        """
+        api_service = get_api_service()
+        api_summaries = api_service.get_api_summaries()
+        state = {**state, "api_summaries": api_summaries}
+
+        skip_token_budget = settings.api_selection_skip_token_budget
+        if (
+            skip_token_budget > 0
+            and await asyncio.to_thread(api_service.estimate_catalog_tokens)
+            <= skip_token_budget
+        ):
+            logger.debug("API catalog fits the token budget - skipping selection")
+            selected_apis = [
+                SelectApi(
+                    api_title=str(summary.get("title", "")),
+                    api_version=str(summary.get("version", "")),
+                )
+                for summary in api_summaries
+            ]
+            prefetched_specs = {}
+        else:
+            likely_apis = api_service.rank_api_summaries(
+                self._last_human_text(state.get("messages", [])),
+                api_summaries,
+                settings.api_selection_prefetch_count,
+            )
+            prefetch = asyncio.create_task(
+                asyncio.to_thread(
+                    self._load_api_specs, api_service, likely_apis, api_summaries
+                )
+            )
+            try:
+                model, prompt_value = WorkflowNodes._api_selection_call(state, config)
+                response = await self._ainvoke_model(model, prompt_value, config)
+            except BaseException:
+                prefetch.cancel()
+                raise
+            selected_apis = response.selected_apis
+            prefetched_specs = await prefetch
+
+        state["selected_apis"] = selected_apis
+        if selected_apis:
+            api_specs = []
+            prefetch_hits = 0
+            for selected_api in selected_apis:
+                key = (selected_api.api_title, str(selected_api.api_version))
+                if key in prefetched_specs:
+                    prefetch_hits += 1
+                    api_spec = prefetched_specs[key]
+                else:
+                    api_spec = await asyncio.to_thread(
+                        api_service.load_api_spec, *key, api_summaries
+                    )
+                if api_spec is not None:
+                    api_specs.append(api_spec)
+            state["api_specs"] = api_specs
+            logger.debug(
+                f"Selected {len(selected_apis)} APIs, {prefetch_hits} of "
+                f"{len(prefetched_specs)} prefetched specs used"
+            )
+        return {"messages": [], **state}
+
+    @staticmethod
+    def _api_selection_call(
+        state: AgentState, config: RunnableConfig
+    ) -> tuple[Any, Any]:
+        """Build the structured output model and the prompt selecting APIs."""
         # Disable streaming due to issue with ChatBedrockConverse lib. https://github.com/langchain-ai/langchain/issues/27962
         # Even calling it with invoke fails when the graph is streamed with .astream_events(...)
         prompt, model = WorkflowNodes.create_prompt_and_model(
@@ -103,12 +199,28 @@ class WorkflowNodes:
         prompt_value = prompt.invoke(
             {"messages": conversation_messages, "api_summaries": api_summaries_text}
         )
+        return model, prompt_value
 
-        response = cast(AIMessage, model.invoke(prompt_value, config))
+    @staticmethod
+    def _last_human_text(conversation_messages: list) -> str:
+        """Get the text of the last user message."""
+        for message in reversed(conversation_messages):
+            if isinstance(message, HumanMessage):
+                return get_model_service().extract_message_content(message)
+        return ""
 
-        state["selected_apis"] = response.selected_apis
-        # Don't add the JSON message to conversation history - it's internal metadata
-        return {"messages": [], **state}
+    @staticmethod
+    def _load_api_specs(
+        api_service: Any,
+        likely_apis: list[dict[str, Any]],
+        api_summaries: list[dict[str, Any]],
+    ) -> dict[tuple[str, str], dict[str, Any] | None]:
+        """Load the specs of likely APIs, keyed by title and version."""
+        api_specs = {}
+        for summary in likely_apis:
+            key = (str(summary.get("title", "")), str(summary.get("version", "")))
+            api_specs[key] = api_service.load_api_spec(*key, api_summaries)
+        return api_specs
 
     def check_cache_with_similarity(
         self, state: AgentState, config: RunnableConfig
@@ -116,6 +228,93 @@ class WorkflowNodes:
         """
         Check cache for exact or similar responses before proceeding with the workflow.
         """
+        context = self._cache_check_context(state, config)
+        if isinstance(context, dict):
+            return context
+        conversation_messages, user_id, cache_key_digest = context
+
+        # Check cache service
+        cache_service = get_cache_service()
+
+        # 1. Exact match first
+        cached_result = cache_service.get(
+            conversation_messages, user_id, message_digest=cache_key_digest["digest"]
+        )
+        if cached_result:
+            logger.info("Cache hit (exact match) for messages")
+            return self._cache_hit_result(
+                conversation_messages, *cached_result, cache_key_digest
+            )
+
+        # 2. Similarity search (for the last human message) - only if enabled
+        if settings.cache_similarity_enabled:
+            last_human_message = self._last_message_content(conversation_messages)
+            if last_human_message:
+                similar_responses = cache_service.find_similar_cached_responses(
+                    last_human_message, user_id, settings.cache_similarity_threshold
+                )
+                if similar_responses:
+                    return self._similar_cache_hit_result(
+                        conversation_messages, similar_responses[0], cache_key_digest
+                    )
+
+        # 3. No cache hit, proceed to load API summaries
+        return self._cache_miss_result(conversation_messages, cache_key_digest)
+
+    async def check_cache_with_similarity_async(
+        self, state: AgentState, config: RunnableConfig
+    ) -> dict[str, list[AIMessage]]:
+        """
+        Async version: check cache for exact or similar responses.
+
+        Awaits the cache directly instead of going through its sync wrappers,
+        which start a thread and an event loop per call inside a running loop.
+        """
+        context = self._cache_check_context(state, config)
+        if isinstance(context, dict):
+            return context
+        conversation_messages, user_id, cache_key_digest = context
+
+        cache_service = get_cache_service()
+
+        # 1. Exact match first
+        cached_result = await cache_service.get_async(
+            conversation_messages, user_id, message_digest=cache_key_digest["digest"]
+        )
+        if cached_result:
+            logger.info("Cache hit (exact match) for messages")
+            return self._cache_hit_result(
+                conversation_messages, *cached_result, cache_key_digest
+            )
+
+        # 2. Similarity search (for the last human message) - only if enabled
+        if settings.cache_similarity_enabled:
+            last_human_message = self._last_message_content(conversation_messages)
+            if last_human_message:
+                similar_responses = (
+                    await cache_service.find_similar_cached_responses_async(
+                        last_human_message, user_id, settings.cache_similarity_threshold
+                    )
+                )
+                if similar_responses:
+                    return self._similar_cache_hit_result(
+                        conversation_messages, similar_responses[0], cache_key_digest
+                    )
+
+        # 3. No cache hit, proceed to load API summaries
+        return self._cache_miss_result(conversation_messages, cache_key_digest)
+
+    @staticmethod
+    def _cache_check_context(
+        state: AgentState, config: RunnableConfig
+    ) -> tuple[list, str, dict[str, Any]] | dict[str, Any]:
+        """
+        Prepare a cache check.
+
+        Returns:
+            (messages, user_id, cache_key_digest) to look up, or the cache miss
+            result when the cache is not consulted for this request
+        """
         conversation_messages = state.get("messages", [])
 
         # Check if caching is enabled globally
@@ -145,59 +344,66 @@ class WorkflowNodes:
         if config and "configurable" in config:
             user_id = config["configurable"].get("user_id", "anonymous")
 
-        # Check cache service
-        cache_service = get_cache_service()
-
-        # 1. Exact match first
-        cached_result = cache_service.get(conversation_messages, user_id)
-        if cached_result:
-            cached_response, cached_tool_calls = cached_result
-            logger.info("Cache hit (exact match) for messages")
-
-            # Create AIMessage from cached response
-            response = AIMessage(content=cached_response)
-            if cached_tool_calls:
-                response.tool_calls = cached_tool_calls
-
-            conversation_messages = conversation_messages + [response]
-            result = {"messages": conversation_messages, "cache_hit": True}
-            logger.debug(f"Returning exact cache hit result: {result}")
-            return result
-
-        # 2. Similarity search (for the last human message) - only if enabled
-        if settings.cache_similarity_enabled:
-            last_human_message = None
-            for message in reversed(conversation_messages):
-                if hasattr(message, "content") and message.content:
-                    last_human_message = message.content
-                    break
-
-            if last_human_message:
-                similar_responses = cache_service.find_similar_cached_responses(
-                    last_human_message, user_id, settings.cache_similarity_threshold
-                )
+        # Extend the conversation digest by this turn's messages only
+        cache_key_digest = conversation_digest(
+            conversation_messages, state.get("cache_key_digest")
+        )
+        return conversation_messages, user_id, cache_key_digest
 
-                if similar_responses:
-                    best_content, best_response, best_tool_calls, similarity_score = (
-                        similar_responses[0]
-                    )
-                    logger.info(
-                        f"Cache hit (similarity) for message matches '{best_content}' (score: {similarity_score:.2f})"
-                    )
+    @staticmethod
+    def _last_message_content(conversation_messages: list) -> Any:
+        """Get the content of the last message that has content."""
+        for message in reversed(conversation_messages):
+            if hasattr(message, "content") and message.content:
+                return message.content
+        return None
 
-                    # Create AIMessage from cached response
-                    response = AIMessage(content=best_response)
-                    if best_tool_calls:
-                        response.tool_calls = best_tool_calls
+    @staticmethod
+    def _cache_hit_result(
+        conversation_messages: list,
+        cached_response: str,
+        cached_tool_calls: list | None,
+        cache_key_digest: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Append the cached response to the conversation as a cache hit."""
+        # Create AIMessage from cached response
+        response = AIMessage(content=cached_response)
+        if cached_tool_calls:
+            response.tool_calls = cached_tool_calls
+
+        result = {
+            "messages": conversation_messages + [response],
+            "cache_hit": True,
+            "cache_key_digest": cache_key_digest,
+        }
+        logger.debug(f"Returning cache hit result: {result}")
+        return result
 
-                    conversation_messages = conversation_messages + [response]
-                    result = {"messages": conversation_messages, "cache_hit": True}
-                    logger.debug(f"Returning cache hit result: {result}")
-                    return result
+    @staticmethod
+    def _similar_cache_hit_result(
+        conversation_messages: list,
+        best_match: tuple[str, str, list | None, float],
+        cache_key_digest: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Append the best similar cached response as a cache hit."""
+        best_content, best_response, best_tool_calls, similarity_score = best_match
+        logger.info(
+            f"Cache hit (similarity) for message matches '{best_content}' (score: {similarity_score:.2f})"
+        )
+        return WorkflowNodes._cache_hit_result(
+            conversation_messages, best_response, best_tool_calls, cache_key_digest
+        )
 
-        # 3. No cache hit, proceed to load API summaries
+    @staticmethod
+    def _cache_miss_result(
+        conversation_messages: list, cache_key_digest: dict[str, Any]
+    ) -> dict[str, Any]:
         logger.debug("No cache hit, proceeding to load API summaries")
-        result = {"messages": conversation_messages, "cache_miss": True}
+        result = {
+            "messages": conversation_messages,
+            "cache_miss": True,
+            "cache_key_digest": cache_key_digest,
+        }
         logger.debug(f"Returning cache miss result: {result}")
         return result
 
@@ -266,63 +472,67 @@ class WorkflowNodes:
         Returns:
             Dictionary with the updated conversation messages
         """
+        mock_model = self._cached_response_model(conversation_messages)
+        if mock_model is None:
+            logger.warning("Cache hit but no AI message found")
+            return {"messages": conversation_messages}
+
+        # Use the mock model to generate the response
+        response = cast(AIMessage, mock_model.invoke(conversation_messages, config))
+        return self._cached_model_result(conversation_messages, response)
+
+    async def _handle_cached_model_response_async(
+        self, conversation_messages: list, config: RunnableConfig
+    ) -> dict[str, list[AIMessage]]:
+        """Async version of _handle_cached_model_response."""
+        mock_model = self._cached_response_model(conversation_messages)
+        if mock_model is None:
+            logger.warning("Cache hit but no AI message found")
+            return {"messages": conversation_messages}
+
+        response = cast(
+            AIMessage, await mock_model.ainvoke(conversation_messages, config)
+        )
+        return self._cached_model_result(conversation_messages, response)
+
+    @staticmethod
+    def _cached_response_model(conversation_messages: list) -> BaseChatModel | None:
+        """
+        Create a model that replays the cached response as a single streaming event.
 
+        Returns:
+            The mock model, or None if the conversation has no AI message
+        """
         logger.debug(
             "Cache hit detected in generate_model_response - creating single streaming event"
         )
         # Find the last AI message (which should be the cached response)
-        last_ai_message = None
         for message in reversed(conversation_messages):
             if isinstance(message, AIMessage):
-                last_ai_message = message
-                break
-
-        if last_ai_message:
-            # For cache hits, we need to create a mock model that returns the cached content
-            # This will generate a single streaming event with the full content
-            cached_content = last_ai_message.content
-            cached_tool_calls = getattr(last_ai_message, "tool_calls", None)
-
-            # Create a mock model that returns the cached content as a single chunk
-            from langchain_core.language_models import BaseChatModel
-            from langchain_core.outputs import ChatGeneration, ChatResult
-
-            class MockCachedModel(BaseChatModel):
-                def __init__(self, cached_content: str, cached_tool_calls=None):
-                    super().__init__()
-                    self._cached_content = cached_content
-                    self._cached_tool_calls = cached_tool_calls
-
-                def _generate(self, messages, stop=None, run_manager=None, **kwargs):
-                    # Create a mock response with the cached content
-                    response = AIMessage(content=self._cached_content)
-                    if self._cached_tool_calls:
-                        response.tool_calls = self._cached_tool_calls
-
-                    return ChatResult(generations=[ChatGeneration(message=response)])
-
-                @property
-                def _llm_type(self) -> str:
-                    return "mock_cached"
-
-            # Use the mock model to generate the response
-            mock_model = MockCachedModel(cached_content, cached_tool_calls)
-            response = cast(AIMessage, mock_model.invoke(conversation_messages, config))
+                return MockCachedModel(
+                    message.content, getattr(message, "tool_calls", None)
+                )
+        return None
 
-            # Add the response to the conversation
-            conversation_messages = conversation_messages + [response]
+    @staticmethod
+    def _cached_model_result(
+        conversation_messages: list, response: AIMessage
+    ) -> dict[str, list[AIMessage]]:
+        # Add the response to the conversation
+        conversation_messages = conversation_messages + [response]
 
-            logger.debug(
-                f"Created single streaming event for cache hit with content: {cached_content[:100]}..."
-            )
-            return {"messages": conversation_messages}
-        else:
-            logger.warning("Cache hit but no AI message found")
-            return {"messages": conversation_messages}
+        logger.debug(
+            f"Created single streaming event for cache hit with content: {response.content[:100]}..."
+        )
+        return {"messages": conversation_messages}
 
     def _cache_model_response(
-        self, conversation_messages: list, response: AIMessage, config: RunnableConfig
-    ) -> None:
+        self,
+        conversation_messages: list,
+        response: AIMessage,
+        config: RunnableConfig,
+        cache_key_digest: dict[str, Any] | None = None,
+    ) -> dict[str, Any] | None:
         """
         Caches the response if caching is enabled and conditions are met.
 
@@ -330,9 +540,65 @@ class WorkflowNodes:
             conversation_messages: The conversation messages to cache
             response: The AI response to cache
             config: Runtime configuration containing cache settings
+            cache_key_digest: Digest of an earlier state of the conversation
+
+        Returns:
+            The digest of the cached conversation, or None if nothing was cached
+        """
+        user_id = self._cacheable_response_user(response, config)
+        if user_id is None:
+            return None
+
+        cache_key_digest = conversation_digest(conversation_messages, cache_key_digest)
+        get_cache_service().set(
+            messages=conversation_messages,
+            response=response.content,
+            tool_calls=response.tool_calls,
+            user_id=user_id,
+            message_digest=cache_key_digest["digest"],
+        )
+        logger.debug(
+            f"Cached response for {len(conversation_messages)} messages (user: {user_id})"
+        )
+        return cache_key_digest
+
+    async def _cache_model_response_async(
+        self,
+        conversation_messages: list,
+        response: AIMessage,
+        config: RunnableConfig,
+        cache_key_digest: dict[str, Any] | None = None,
+    ) -> dict[str, Any] | None:
+        """Async version of _cache_model_response."""
+        user_id = self._cacheable_response_user(response, config)
+        if user_id is None:
+            return None
+
+        cache_key_digest = conversation_digest(conversation_messages, cache_key_digest)
+        await get_cache_service().set_async(
+            messages=conversation_messages,
+            response=response.content,
+            tool_calls=response.tool_calls,
+            user_id=user_id,
+            message_digest=cache_key_digest["digest"],
+        )
+        logger.debug(
+            f"Cached response for {len(conversation_messages)} messages (user: {user_id})"
+        )
+        return cache_key_digest
+
+    @staticmethod
+    def _cacheable_response_user(
+        response: AIMessage, config: RunnableConfig
+    ) -> str | None:
+        """
+        Get the user to cache a response for.
+
+        Returns:
+            The user ID, or None if the response should not be cached
         """
         if not settings.cache_enabled:
-            return
+            return None
 
         # Check if cache is disabled for this specific request
         cache_disabled = False
@@ -341,29 +607,18 @@ class WorkflowNodes:
 
         if cache_disabled:
             logger.debug("Cache disabled for this request - skipping cache storage")
-            return
+            return None
 
         # Don't cache responses with empty content (especially tool-only responses)
         if not response.content or not response.content.strip():
             logger.debug("Skipping cache for empty content response")
-            return
-
-        cache_service = get_cache_service()
+            return None
 
         # Extract user ID from config for cache isolation
         user_id = "anonymous"
         if config and "configurable" in config:
             user_id = config["configurable"].get("user_id", "anonymous")
-
-        cache_service.set(
-            messages=conversation_messages,
-            response=response.content,
-            tool_calls=response.tool_calls,
-            user_id=user_id,
-        )
-        logger.debug(
-            f"Cached response for {len(conversation_messages)} messages (user: {user_id})"
-        )
+        return user_id
 
     def generate_model_response(
         self, state: AgentState, config: RunnableConfig
@@ -384,9 +639,102 @@ class WorkflowNodes:
             config, NODE_CALL_MODEL
         )
 
-        api_specs = state.get("api_specs", "")
-        api_specs_json = json.dumps(api_specs) if api_specs else ""
+        conversation_messages, compressed_messages = self._compress_history(
+            conversation_messages, model
+        )
+        prompt_value, model = self._prepare_model_call(
+            state, prompt_template, model, conversation_messages
+        )
+        response = cast(AIMessage, self._invoke_model(model, prompt_value, config))
+
+        # Cache the final response for future use
+        cache_key_digest = self._cache_model_response(
+            conversation_messages, response, config, state.get("cache_key_digest")
+        )
+        return self._model_response_result(
+            conversation_messages, response, compressed_messages, cache_key_digest
+        )
+
+    async def generate_model_response_async(
+        self, state: AgentState, config: RunnableConfig
+    ) -> dict[str, list[AIMessage]]:
+        """
+        Async version: generates a response using the AI model.
+
+        The model and the cache are awaited on the event loop; only history
+        compression, which may summarize with a blocking model call, runs in
+        the loop's default executor.
+        """
+        conversation_messages = state.get("messages", [])
+
+        if settings.cache_enabled and state.get("cache_hit"):
+            return await self._handle_cached_model_response_async(
+                conversation_messages, config
+            )
+
+        prompt_template, model = WorkflowNodes.create_prompt_and_model(
+            config, NODE_CALL_MODEL
+        )
+
+        conversation_messages, compressed_messages = await asyncio.to_thread(
+            self._compress_history, conversation_messages, model
+        )
+        prompt_value, model = self._prepare_model_call(
+            state, prompt_template, model, conversation_messages
+        )
+        response = cast(
+            AIMessage, await self._ainvoke_model(model, prompt_value, config)
+        )
+
+        cache_key_digest = await self._cache_model_response_async(
+            conversation_messages, response, config, state.get("cache_key_digest")
+        )
+        return self._model_response_result(
+            conversation_messages, response, compressed_messages, cache_key_digest
+        )
+
+    @staticmethod
+    def _invoke_model(model: Any, prompt_value: Any, config: RunnableConfig) -> Any:
+        """
+        Invoke a model within the tokens-per-minute limit of the configured model.
+
+        The estimated input tokens are reserved before the call and reconciled
+        with the usage the provider reports, when the response carries it.
+        """
+        rate_limiter = get_model_service().get_token_rate_limiter(config)
+        if rate_limiter is None:
+            return model.invoke(prompt_value, config)
+        reservation = rate_limiter.reserve(
+            estimate_messages_tokens(prompt_value.to_messages())
+        )
+        response = model.invoke(prompt_value, config)
+        used_tokens = _used_tokens(response)
+        if used_tokens is not None:
+            rate_limiter.reconcile(reservation, used_tokens)
+        return response
 
+    @staticmethod
+    async def _ainvoke_model(
+        model: Any, prompt_value: Any, config: RunnableConfig
+    ) -> Any:
+        """Async version of _invoke_model."""
+        rate_limiter = get_model_service().get_token_rate_limiter(config)
+        if rate_limiter is None:
+            return await model.ainvoke(prompt_value, config)
+        reservation = await rate_limiter.areserve(
+            estimate_messages_tokens(prompt_value.to_messages())
+        )
+        response = await model.ainvoke(prompt_value, config)
+        used_tokens = _used_tokens(response)
+        if used_tokens is not None:
+            rate_limiter.reconcile(reservation, used_tokens)
+        return response
+
+    @staticmethod
+    def _compress_history(
+        conversation_messages: list, model: BaseChatModel
+    ) -> tuple[list, list | None]:
+        """Compress the conversation history if it approaches the context window."""
         compressed_messages = None
         try:
             conversation_messages, compressed_messages = (
@@ -400,6 +748,21 @@ class WorkflowNodes:
             logger.error("failed to compress message history: %s\n", error)
         except Exception:
             logger.error("uncaught exception: %s", traceback.format_exc())
+        return conversation_messages, compressed_messages
+
+    def _prepare_model_call(
+        self,
+        state: AgentState,
+        prompt_template: ChatPromptTemplate,
+        model: Any,
+        conversation_messages: list,
+    ) -> tuple[Any, Any]:
+        """Build the prompt and bind the HTTP tools when API calls are enabled."""
+        api_specs = state.get("api_specs", "")
+        # Specs from the registry reuse their JSON serialized at load time
+        api_specs_json = (
+            get_api_service().serialize_api_specs(api_specs) if api_specs else ""
+        )
 
         prompt_value = prompt_template.invoke(
             {"messages": conversation_messages, "api_specs": api_specs_json}
@@ -407,16 +770,52 @@ class WorkflowNodes:
 
         if settings.api_calls_enabled is True:
             model = model.bind_tools(self.http_toolkit.get_tools())
+        return prompt_value, model
 
-        if settings.api_calls_enabled is True:
-            model = model.bind_tools(self.http_toolkit.get_tools())
-        response = cast(AIMessage, model.invoke(prompt_value, config))
-
-        # Cache the final response for future use
-        self._cache_model_response(conversation_messages, response, config)
-
+    @staticmethod
+    def _model_response_result(
+        conversation_messages: list,
+        response: AIMessage,
+        compressed_messages: list | None,
+        cache_key_digest: dict[str, Any] | None,
+    ) -> dict[str, Any]:
         conversation_messages = conversation_messages + [response]
         if compressed_messages:
             conversation_messages = conversation_messages + compressed_messages
 
+        if cache_key_digest:
+            return {
+                "messages": conversation_messages,
+                "cache_key_digest": cache_key_digest,
+            }
         return {"messages": conversation_messages}
+
+
+class MockCachedModel(BaseChatModel):
+    """Chat model that returns a cached response as a single chunk."""
+
+    def __init__(self, cached_content: str, cached_tool_calls=None):
+        super().__init__()
+        self._cached_content = cached_content
+        self._cached_tool_calls = cached_tool_calls
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        # Create a mock response with the cached content
+        response = AIMessage(content=self._cached_content)
+        if self._cached_tool_calls:
+            response.tool_calls = self._cached_tool_calls
+
+        return ChatResult(generations=[ChatGeneration(message=response)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self._generate(messages, stop, run_manager, **kwargs)
+
+    @property
+    def _llm_type(self) -> str:
+        return "mock_cached"
+
+
+def _used_tokens(response: Any) -> int | None:
+    """Get the input and output tokens reported with a model response."""
+    usage = response.usage_metadata if isinstance(response, AIMessage) else None
+    return usage.get("total_tokens") if usage else None
@@ -40,13 +40,14 @@ class CacheService(Protocol):
     """Public interface for cache service implementations."""
 
     async def get(
-        self, messages: list[Any], user_id: str
+        self, messages: list[Any], user_id: str, message_digest: str | None = None
     ) -> tuple[Any, list[Any]] | None:
         """Get cached response for messages and user.
 
         Args:
             messages: List of conversation messages
             user_id: User identifier for cache isolation
+            message_digest: Precomputed chained digest of the message contents
 
         Returns:
             tuple[Any, list[Any]] | None: Cached (response, tool_calls) or None
@@ -60,6 +61,7 @@ class CacheService(Protocol):
         tool_calls: list[Any] | None,
         user_id: str,
         ttl_seconds: int = 3600,
+        message_digest: str | None = None,
     ) -> None:
         """Set cached response for messages and user.
 
@@ -69,6 +71,7 @@ class CacheService(Protocol):
             tool_calls: List of tool calls (if any)
             user_id: User identifier for cache isolation
             ttl_seconds: Time-to-live in seconds
+            message_digest: Precomputed chained digest of the message contents
         """
         ...
 
@@ -114,6 +117,18 @@ class ModelService(Protocol):
         """
         ...
 
+    def get_token_rate_limiter(self, config: dict[str, Any]) -> Any:
+        """Get the tokens-per-minute rate limiter of the configured model.
+
+        Args:
+            config: Model configuration dictionary
+
+        Returns:
+            Any: Rate limiter with reserve, areserve and reconcile, or None
+            if the model has no token limit
+        """
+        ...
+
     def get_model_id_from_config(self, config: dict[str, Any]) -> str:
         """Get model ID from configuration.
 
@@ -176,6 +191,67 @@ class APIService(Protocol):
         """
         ...
 
+    def preload(self) -> None:
+        """Parse the API summaries and specifications ahead of the first turn."""
+        ...
+
+    def get_api_summaries(self) -> list[dict[str, Any]]:
+        """Get the API summaries of the configured data path.
+
+        Returns:
+            list[dict[str, Any]]: API summaries
+        """
+        ...
+
+    def load_api_spec(
+        self, api_title: str, api_version: Any, api_summaries: list[dict[str, Any]]
+    ) -> dict[str, Any] | None:
+        """Load the OpenAPI specification of one API.
+
+        Args:
+            api_title: Title of the API
+            api_version: Version of the API
+            api_summaries: API summaries naming the specification files
+
+        Returns:
+            dict[str, Any] | None: Specification, or None if unavailable
+        """
+        ...
+
+    def serialize_api_specs(self, api_specs: list[dict[str, Any]]) -> str:
+        """Serialize OpenAPI specifications to JSON for a model prompt.
+
+        Args:
+            api_specs: Specifications to serialize
+
+        Returns:
+            str: JSON array of the specifications
+        """
+        ...
+
+    def rank_api_summaries(
+        self, text: str, api_summaries: list[dict[str, Any]], limit: int
+    ) -> list[dict[str, Any]]:
+        """Rank API summaries by how well they match a text.
+
+        Args:
+            text: Text to match
+            api_summaries: API summaries to rank
+            limit: Maximum number of summaries returned
+
+        Returns:
+            list[dict[str, Any]]: Best matching summaries
+        """
+        ...
+
+    def estimate_catalog_tokens(self) -> int:
+        """Estimate the prompt tokens of the specifications of all APIs.
+
+        Returns:
+            int: Estimated token count
+        """
+        ...
+
 
 class AuditService(Protocol):
     """Public interface for audit service implementations."""
@@ -142,6 +142,14 @@ data: {"id": "run_2b1c3d4e5f6g7h8", "conversation": "conv_2b1c3d4e5f6g7h8", "usa
                     },
                 },
             },
+            409: {
+                "description": "Another turn of the conversation is in progress",
+                "content": {
+                    "application/json": {
+                        "example": {"detail": "Conversation has a turn in progress"}
+                    },
+                },
+            },
             422: {
                 "description": "Validation error",
                 "content": {
@@ -8,7 +8,7 @@ and conversation endpoints with access control integration.
 import functools
 import logging
 
-from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.responses import StreamingResponse
 
 from ..config import settings
@@ -16,6 +16,7 @@ from ..core import (
     AccessDeniedError,
     Agent,
     ClientError,
+    ConversationBusyError,
     ConversationNotFoundError,
     InvocationError,
     ValidationError,
@@ -46,6 +47,9 @@ OPENAPI_TAGS = [
     },
 ]
 
+# Page size of the conversation list when only a cursor is given
+DEFAULT_CONVERSATIONS_PAGE_SIZE = 100
+
 # Application metadata
 APP_TITLE = "API Assistant"
 APP_VERSION = "1.0.0"
@@ -107,6 +111,8 @@ def handle_agent_errors(func):
             raise HTTPException(status_code=403, detail=e.message) from e
         except ConversationNotFoundError as e:
             raise HTTPException(status_code=404, detail=e.message) from e
+        except ConversationBusyError as e:
+            raise HTTPException(status_code=409, detail=e.message) from e
         except ClientError as e:
             # Client errors (4xx) should be returned with their original status and message
             raise HTTPException(status_code=e.http_status, detail=e.message) from e
@@ -192,7 +198,7 @@ def create_conversations_api(app: FastAPI, agent: Agent) -> None:
         response_model=ListConversationsResponse,
         tags=["Conversations"],
         summary="List Conversations",
-        description="List all conversations that the current user has access to. Returns conversation IDs, metadata, and previews.",
+        description="List all conversations that the current user has access to, most recently updated first. Returns conversation IDs, metadata, and previews. Pass `limit` to get a page of conversations and the returned `next_cursor` as `cursor` to get the next page.",
         responses={
             200: {
                 "description": "Conversations listed successfully",
@@ -212,15 +218,41 @@ def create_conversations_api(app: FastAPI, agent: Agent) -> None:
                     },
                 },
             },
+            422: {
+                "description": "Invalid pagination cursor",
+                "content": {
+                    "application/json": {
+                        "example": {"detail": "Invalid conversation cursor"}
+                    },
+                },
+            },
         },
     )
     @handle_agent_errors
-    async def list_conversations(req: Request) -> ListConversationsResponse:
+    async def list_conversations(
+        req: Request,
+        limit: int | None = Query(
+            None, ge=1, le=1000, description="Maximum number of conversations"
+        ),
+        cursor: str | None = Query(
+            None, max_length=1000, description="next_cursor of the previous page"
+        ),
+    ) -> ListConversationsResponse:
         """
         List conversations endpoint that returns all conversations accessible to the current user.
         """
         agent_config = create_runtime_config(req)
-        conversation_infos = await agent.list_conversations(agent_config)
+        next_cursor = None
+        if limit is None and cursor is None:
+            conversation_infos = await agent.list_conversations(agent_config)
+            total_count = len(conversation_infos)
+        else:
+            page = await agent.list_conversations_page(
+                agent_config, limit or DEFAULT_CONVERSATIONS_PAGE_SIZE, cursor
+            )
+            conversation_infos = page.conversations
+            next_cursor = page.next_cursor
+            total_count = page.total_count
 
         conversation_summaries = [
             ConversationSummary(
@@ -237,7 +269,8 @@ def create_conversations_api(app: FastAPI, agent: Agent) -> None:
 
         return ListConversationsResponse(
             conversations=conversation_summaries,
-            total_count=len(conversation_summaries),
+            total_count=total_count,
+            next_cursor=next_cursor,
         )
 
     # Delete conversation endpoint
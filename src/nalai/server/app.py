@@ -6,6 +6,7 @@ routes, and agent initialization.
 """
 
 import logging
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request
@@ -14,6 +15,11 @@ from fastapi.responses import RedirectResponse
 
 from ..config import settings
 from ..core import create_agent
+from ..services.checkpointing_service import (
+    get_checkpointing_service,
+    get_compaction_policy,
+)
+from ..services.factory import get_api_service
 from ..utils.logging import setup_logging
 from .api_agent import create_agent_api
 from .api_conversations import (
@@ -81,7 +87,32 @@ else:
     )
     logger.info("OpenAPI endpoints disabled")
 
-app = FastAPI(**openapi_config)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Load the API catalog once and run background checkpoint compaction
+    while the server is up.
+    """
+    api_service = get_api_service()
+    try:
+        api_service.preload()
+        if settings.api_selection_skip_token_budget > 0:
+            api_service.estimate_catalog_tokens()
+    except FileNotFoundError as error:
+        logger.warning(f"API catalog not preloaded: {error}")
+
+    checkpointing_service = get_checkpointing_service()
+    if settings.checkpointing_compaction_interval_seconds > 0:
+        checkpointing_service.start_compaction(
+            get_compaction_policy(),
+            settings.checkpointing_compaction_interval_seconds,
+        )
+    yield
+    await checkpointing_service.stop_compaction()
+
+
+app = FastAPI(**openapi_config, lifespan=lifespan)
 
 # Configure CORS from environment variable
 allowed_origins = settings.cors_origins_list
@@ -244,6 +244,11 @@ class ListConversationsResponse(BaseModel):
         description="Total number of conversations",
         ge=0,  # Must be non-negative
     )
+    next_cursor: str | None = Field(
+        None,
+        description="Cursor of the next page of conversations, absent on the last page",
+        max_length=1000,
+    )
 
     @field_validator("conversations")
     @classmethod
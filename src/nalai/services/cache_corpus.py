@@ -0,0 +1,443 @@
+"""
+Compiled, memory-mapped word corpus for cache similarity matching.
+
+Building the NLP corpus walks every WordNet synset, which takes seconds and
+hundreds of MB per process. The derived word classes and antonyms are instead
+compiled once into a compact binary artifact of sorted string tables:
+
+- lexicon: every verb, noun and adjective with a bitmask of its word classes
+- antonyms: sorted words with their comma-joined antonyms
+
+Workers memory-map the artifact read-only, so lookups binary-search shared
+page-cache pages instead of per-process sets. The artifact header records a
+fingerprint of the corpus sources; a mismatch triggers a rebuild, written to a
+temporary file and atomically renamed so concurrent workers never see a
+partial artifact.
+"""
+
+import functools
+import hashlib
+import importlib.metadata
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from collections.abc import Callable, Iterator, Mapping, Set
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CORPUS_MAGIC = b"NALAICRP"
+CORPUS_FORMAT_VERSION = 1
+
+# Word class bits of the lexicon
+VERB = 1
+NOUN = 2
+ADJECTIVE = 4
+
+# magic, version, fingerprint, then (offset, length) of the seven sections:
+# lexicon offsets, lexicon blob, lexicon flags, antonym key offsets,
+# antonym key blob, antonym value offsets, antonym value blob
+_HEADER = struct.Struct("<8sI32s14Q")
+
+CorpusBuilder = Callable[[], tuple[set[str], set[str], set[str], dict[str, list[str]]]]
+
+
+class CorpusFormatError(Exception):
+    """Raised when a corpus artifact is missing, truncated or outdated."""
+
+    pass
+
+
+class SortedStringTable:
+    """Sorted UTF-8 strings addressed by a uint32 offset array."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets.cast("I")
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return self.get_bytes(index).decode("utf-8")
+
+    def get_bytes(self, index: int) -> bytes:
+        return bytes(self._blob[self._offsets[index] : self._offsets[index + 1]])
+
+    def find(self, word: str) -> int:
+        """Get the index of a word, or -1 if it is not in the table."""
+        target = word.encode("utf-8")
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self.get_bytes(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self) and self.get_bytes(low) == target:
+            return low
+        return -1
+
+
+class MappedWordSet(Set):
+    """Read-only set of the lexicon words carrying a word class bit."""
+
+    def __init__(self, corpus: "CompiledCorpus", word_class: int):
+        self._corpus = corpus
+        self._word_class = word_class
+        self._size: int | None = None
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and bool(
+            self._corpus.word_classes(word) & self._word_class
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        lexicon, flags = self._corpus.lexicon, self._corpus.flags
+        for index in range(len(lexicon)):
+            if flags[index] & self._word_class:
+                yield lexicon[index]
+
+    def __len__(self) -> int:
+        if self._size is None:
+            self._size = sum(
+                1 for flag in self._corpus.flags if flag & self._word_class
+            )
+        return self._size
+
+
+class MappedAntonyms(Mapping):
+    """Read-only mapping of words to their antonyms."""
+
+    def __init__(self, corpus: "CompiledCorpus"):
+        self._keys = corpus.antonym_keys
+        self._values = corpus.antonym_values
+        # Hot words are few; memoize lookups so similarity checks stay O(1)
+        self._lookup = functools.lru_cache(maxsize=65536)(self._find)
+
+    def __getitem__(self, word: str) -> tuple[str, ...]:
+        antonyms = self._lookup(word)
+        if antonyms is None:
+            raise KeyError(word)
+        return antonyms
+
+    def get(self, word: str, default=None):
+        antonyms = self._lookup(word)
+        return default if antonyms is None else antonyms
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self._lookup(word) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._keys[index] for index in range(len(self._keys)))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _find(self, word: str) -> tuple[str, ...] | None:
+        index = self._keys.find(word)
+        if index < 0:
+            return None
+        return tuple(self._values[index].split(","))
+
+
+class MappedWordWeights(Mapping):
+    """Word-to-weight table resolved from the lexicon word classes.
+
+    Precedence matches the merged table of TokenSimilarityMatcher: verb, noun,
+    adjective, then the fixed article and preposition lists.
+    """
+
+    def __init__(
+        self,
+        corpus: "CompiledCorpus",
+        token_weights: dict[str, float],
+        articles: frozenset[str],
+        prepositions: frozenset[str],
+    ):
+        self._corpus = corpus
+        self._token_weights = token_weights
+        self._articles = articles
+        self._prepositions = prepositions
+        self._lookup = functools.lru_cache(maxsize=65536)(self._weight)
+
+    def __getitem__(self, word: str) -> float:
+        weight = self._lookup(word)
+        if weight is None:
+            raise KeyError(word)
+        return weight
+
+    def get(self, word: str, default=None):
+        weight = self._lookup(word)
+        return default if weight is None else weight
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._corpus.lexicon_words()
+        for word in self._articles | self._prepositions:
+            if not self._corpus.word_classes(word):
+                yield word
+
+    def __len__(self) -> int:
+        return len(self._corpus.lexicon) + sum(
+            1
+            for word in self._articles | self._prepositions
+            if not self._corpus.word_classes(word)
+        )
+
+    def _weight(self, word: str) -> float | None:
+        word_classes = self._corpus.word_classes(word)
+        if word_classes & VERB:
+            return self._token_weights["verb"]
+        if word_classes & NOUN:
+            return self._token_weights["noun"]
+        if word_classes & ADJECTIVE:
+            return self._token_weights["adjective"]
+        if word in self._articles:
+            return self._token_weights["article"]
+        if word in self._prepositions:
+            return self._token_weights["preposition"]
+        return None
+
+
+class CompiledCorpus:
+    """Memory-mapped corpus artifact."""
+
+    def __init__(self, path: str | Path):
+        """Map an artifact read-only.
+
+        Raises:
+            CorpusFormatError: If the file is not a valid artifact of this format
+        """
+        self.path = Path(path)
+        try:
+            with open(self.path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise CorpusFormatError(f"Cannot map corpus {self.path}: {e}") from e
+
+        if len(self._mmap) < _HEADER.size:
+            raise CorpusFormatError(f"Truncated corpus artifact: {self.path}")
+        magic, version, fingerprint, *sections = _HEADER.unpack_from(self._mmap)
+        if magic != CORPUS_MAGIC or version != CORPUS_FORMAT_VERSION:
+            raise CorpusFormatError(f"Unsupported corpus artifact: {self.path}")
+        if any(
+            offset + length > len(self._mmap)
+            for offset, length in zip(sections[::2], sections[1::2], strict=True)
+        ):
+            raise CorpusFormatError(f"Truncated corpus artifact: {self.path}")
+
+        self.fingerprint = fingerprint.hex()
+        view = memoryview(self._mmap)
+        (
+            lexicon_offsets,
+            lexicon_blob,
+            self.flags,
+            antonym_key_offsets,
+            antonym_key_blob,
+            antonym_value_offsets,
+            antonym_value_blob,
+        ) = (
+            view[offset : offset + length]
+            for offset, length in zip(sections[::2], sections[1::2], strict=True)
+        )
+        self.lexicon = SortedStringTable(lexicon_offsets, lexicon_blob)
+        self.antonym_keys = SortedStringTable(antonym_key_offsets, antonym_key_blob)
+        self.antonym_values = _StringArray(antonym_value_offsets, antonym_value_blob)
+
+        self.verbs = MappedWordSet(self, VERB)
+        self.nouns = MappedWordSet(self, NOUN)
+        self.adjectives = MappedWordSet(self, ADJECTIVE)
+        self.antonyms = MappedAntonyms(self)
+
+    def word_classes(self, word: str) -> int:
+        """Get the word class bits of a word (0 if it is not in the lexicon)."""
+        index = self.lexicon.find(word)
+        return self.flags[index] if index >= 0 else 0
+
+    def lexicon_words(self) -> Iterator[str]:
+        return (self.lexicon[index] for index in range(len(self.lexicon)))
+
+    def word_weights(
+        self,
+        token_weights: dict[str, float],
+        articles: frozenset[str],
+        prepositions: frozenset[str],
+    ) -> MappedWordWeights:
+        """Get a word-to-weight table backed by the lexicon."""
+        return MappedWordWeights(self, token_weights, articles, prepositions)
+
+
+class _StringArray:
+    """UTF-8 strings addressed by a uint32 offset array (unsorted)."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets.cast("I")
+        self._blob = blob
+
+    def __getitem__(self, index: int) -> str:
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return bytes(self._blob[start:end]).decode("utf-8")
+
+
+def _pack_strings(strings: list[str]) -> tuple[bytes, bytes]:
+    """Pack strings into (uint32 offsets, blob)."""
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = [0]
+    for item in encoded:
+        offsets.append(offsets[-1] + len(item))
+    return struct.pack(f"<{len(offsets)}I", *offsets), b"".join(encoded)
+
+
+def compile_corpus(
+    path: str | Path,
+    verbs: set[str],
+    nouns: set[str],
+    adjectives: set[str],
+    antonyms: dict[str, list[str]],
+    fingerprint: str,
+) -> Path:
+    """
+    Compile word sets into a corpus artifact.
+
+    Args:
+        path: Artifact path; written atomically
+        verbs: Verb words
+        nouns: Noun words
+        adjectives: Adjective words
+        antonyms: Words mapped to their antonyms
+        fingerprint: Hex sha256 fingerprint of the corpus sources
+
+    Returns:
+        The artifact path
+    """
+    path = Path(path)
+    flags: dict[str, int] = {}
+    for words, word_class in ((verbs, VERB), (nouns, NOUN), (adjectives, ADJECTIVE)):
+        for word in words:
+            flags[word] = flags.get(word, 0) | word_class
+
+    # Sort by UTF-8 bytes, the order the binary search compares in
+    lexicon = sorted(flags, key=lambda word: word.encode("utf-8"))
+    antonym_keys = sorted(
+        (word for word, values in antonyms.items() if values),
+        key=lambda word: word.encode("utf-8"),
+    )
+    sections = [
+        *_pack_strings(lexicon),
+        bytes(flags[word] for word in lexicon),
+        *_pack_strings(antonym_keys),
+        *_pack_strings([",".join(antonyms[word]) for word in antonym_keys]),
+    ]
+
+    layout = []
+    offset = _HEADER.size
+    for section in sections:
+        # Keep uint32 offset arrays 4-byte aligned for memoryview.cast
+        offset += -offset % 4
+        layout.extend((offset, len(section)))
+        offset += len(section)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(
+                _HEADER.pack(
+                    CORPUS_MAGIC,
+                    CORPUS_FORMAT_VERSION,
+                    bytes.fromhex(fingerprint),
+                    *layout,
+                )
+            )
+            for section_offset, section in zip(layout[::2], sections, strict=True):
+                f.write(b"\0" * (section_offset - f.tell()))
+                f.write(section)
+        os.replace(temporary, path)
+    except BaseException:
+        Path(temporary).unlink(missing_ok=True)
+        raise
+
+    logger.info(
+        f"Compiled corpus artifact {path}: {len(lexicon)} words, "
+        f"{len(antonym_keys)} antonym entries"
+    )
+    return path
+
+
+def _package_version(name: str) -> str:
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return ""
+
+
+def _wordnet_data_stamp() -> str:
+    """Locate the WordNet data without importing NLTK and stamp its mtime.
+
+    Searches the same locations as nltk.data.path.
+    """
+    candidates = [
+        *filter(None, os.environ.get("NLTK_DATA", "").split(os.pathsep)),
+        os.path.expanduser("~/nltk_data"),
+        os.path.join(sys.prefix, "nltk_data"),
+        os.path.join(sys.prefix, "share", "nltk_data"),
+        os.path.join(sys.prefix, "lib", "nltk_data"),
+        "/usr/share/nltk_data",
+        "/usr/local/share/nltk_data",
+        "/usr/lib/nltk_data",
+        "/usr/local/lib/nltk_data",
+    ]
+    for directory in candidates:
+        for name in ("wordnet", "wordnet.zip"):
+            data = os.path.join(directory, "corpora", name)
+            if os.path.exists(data):
+                return f"{data}:{os.stat(data).st_mtime_ns}"
+    return ""
+
+
+def corpus_fingerprint() -> str:
+    """
+    Fingerprint the corpus sources without importing the NLP libraries.
+
+    Covers the artifact format, the NLTK and spaCy versions, the spaCy model
+    version and the location and modification time of the WordNet data.
+    """
+    sources = [
+        f"format={CORPUS_FORMAT_VERSION}",
+        f"nltk={_package_version('nltk')}",
+        f"spacy={_package_version('spacy')}",
+        f"spacy_model={_package_version('en_core_web_sm')}",
+        f"wordnet={_wordnet_data_stamp()}",
+    ]
+    return hashlib.sha256("\n".join(sources).encode("utf-8")).hexdigest()
+
+
+def load_compiled_corpus(
+    path: str | Path, builder: CorpusBuilder, fingerprint: str | None = None
+) -> CompiledCorpus:
+    """
+    Map the corpus artifact, rebuilding it first if it is missing or stale.
+
+    Args:
+        path: Artifact path
+        builder: Callable returning (verbs, nouns, adjectives, antonyms)
+        fingerprint: Expected source fingerprint (computed if None)
+
+    Returns:
+        The mapped corpus
+    """
+    fingerprint = fingerprint or corpus_fingerprint()
+    try:
+        corpus = CompiledCorpus(path)
+        if corpus.fingerprint == fingerprint:
+            return corpus
+        logger.info(f"Corpus artifact {path} is stale, rebuilding")
+    except CorpusFormatError as e:
+        logger.info(f"Building corpus artifact: {e}")
+
+    verbs, nouns, adjectives, antonyms = builder()
+    compile_corpus(path, verbs, nouns, adjectives, antonyms, fingerprint)
+    return CompiledCorpus(path)
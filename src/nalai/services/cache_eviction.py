@@ -0,0 +1,333 @@
+"""
+Eviction policies and expiry sweeping for the in-memory cache backend.
+
+Policies track cache keys in ordered dicts or heaps so that recording an
+access, recording an insert and selecting a victim are O(1) or O(log n):
+
+- lru: least recently used entry is evicted first
+- lfu: least frequently used entry (by CacheEntry.hit_count) is evicted first,
+  ties broken by recency
+- ttl: entry closest to expiration is evicted first
+
+Expired entries are reclaimed by a background sweeper thread shared by all
+registered backends instead of scanning the whole cache on reads.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import TYPE_CHECKING, Protocol
+
+from ..config import settings
+
+if TYPE_CHECKING:
+    from .cache_service import CacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+class ExpiryQueue:
+    """Min-heap of cache keys ordered by expiration time with lazy deletion."""
+
+    def __init__(self):
+        self._heap: list[tuple[datetime, int, str]] = []
+        self._expires: dict[str, tuple[datetime, int]] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def push(self, key: str, expires_at: datetime) -> None:
+        """Track (or re-track) the expiration time of a key."""
+        item = (expires_at, next(self._counter))
+        self._expires[key] = item
+        heapq.heappush(self._heap, (*item, key))
+        self._compact()
+
+    def discard(self, key: str) -> None:
+        """Stop tracking a key; its heap slot is dropped lazily."""
+        self._expires.pop(key, None)
+        self._compact()
+
+    def peek(self) -> tuple[str, datetime] | None:
+        """Get the key that expires soonest without removing it."""
+        while self._heap:
+            expires_at, sequence, key = self._heap[0]
+            if self._expires.get(key) == (expires_at, sequence):
+                return key, expires_at
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_expired(self, now: datetime | None = None) -> list[str]:
+        """Remove and return all keys that expired at or before now."""
+        now = now or datetime.now()
+        expired = []
+        while (soonest := self.peek()) is not None and soonest[1] <= now:
+            key = soonest[0]
+            heapq.heappop(self._heap)
+            del self._expires[key]
+            expired.append(key)
+        return expired
+
+    def clear(self) -> None:
+        """Stop tracking all keys."""
+        self._heap.clear()
+        self._expires.clear()
+
+    def _compact(self) -> None:
+        """Rebuild the heap once stale slots outnumber live ones."""
+        if len(self._heap) > 2 * len(self._expires) + 64:
+            self._heap = [(*item, key) for key, item in self._expires.items()]
+            heapq.heapify(self._heap)
+
+
+class EvictionPolicy(ABC):
+    """Abstract base class for cache eviction policies."""
+
+    name: str = ""
+
+    @abstractmethod
+    def on_insert(self, key: str, entry: "CacheEntry") -> None:
+        """Record that a key was inserted or overwritten."""
+        pass
+
+    @abstractmethod
+    def on_access(self, key: str, entry: "CacheEntry") -> None:
+        """Record a cache hit on a key."""
+        pass
+
+    @abstractmethod
+    def on_remove(self, key: str) -> None:
+        """Record that a key was removed from the cache."""
+        pass
+
+    @abstractmethod
+    def select_victim(self) -> str | None:
+        """Select the key to evict next, without removing it."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Forget all tracked keys."""
+        pass
+
+
+class LRUEvictionPolicy(EvictionPolicy):
+    """Evicts the least recently used key."""
+
+    name = "lru"
+
+    def __init__(self):
+        self._order: OrderedDict[str, None] = OrderedDict()
+
+    def on_insert(self, key: str, entry: "CacheEntry") -> None:
+        self._order[key] = None
+        self._order.move_to_end(key)
+
+    def on_access(self, key: str, entry: "CacheEntry") -> None:
+        if key in self._order:
+            self._order.move_to_end(key)
+
+    def on_remove(self, key: str) -> None:
+        self._order.pop(key, None)
+
+    def select_victim(self) -> str | None:
+        return next(iter(self._order), None)
+
+    def clear(self) -> None:
+        self._order.clear()
+
+
+class LFUEvictionPolicy(EvictionPolicy):
+    """Evicts the least frequently used key, using CacheEntry.hit_count.
+
+    Keys are grouped in per-frequency buckets ordered by recency, so ties
+    between equally used keys are broken LRU-style.
+    """
+
+    name = "lfu"
+
+    def __init__(self):
+        self._frequencies: dict[str, int] = {}
+        self._buckets: dict[int, OrderedDict[str, None]] = {}
+        self._min_frequency = 0
+
+    def on_insert(self, key: str, entry: "CacheEntry") -> None:
+        self.on_remove(key)
+        self._add(key, entry.hit_count)
+        self._min_frequency = min(self._min_frequency, entry.hit_count)
+        if len(self._frequencies) == 1:
+            self._min_frequency = entry.hit_count
+
+    def on_access(self, key: str, entry: "CacheEntry") -> None:
+        frequency = self._frequencies.get(key)
+        if frequency is None:
+            return
+        self._discard(key, frequency)
+        self._add(key, entry.hit_count)
+        # The minimum only ever lower-bounds the live frequencies; it is
+        # advanced here for the common single-hit step and recomputed lazily
+        if (
+            frequency == self._min_frequency
+            and frequency not in self._buckets
+            and entry.hit_count == frequency + 1
+        ):
+            self._min_frequency = entry.hit_count
+
+    def on_remove(self, key: str) -> None:
+        frequency = self._frequencies.get(key)
+        if frequency is not None:
+            self._discard(key, frequency)
+
+    def select_victim(self) -> str | None:
+        if not self._buckets:
+            return None
+        if self._min_frequency not in self._buckets:
+            # Only happens after removals; distinct frequencies are few
+            self._min_frequency = min(self._buckets)
+        return next(iter(self._buckets[self._min_frequency]))
+
+    def clear(self) -> None:
+        self._frequencies.clear()
+        self._buckets.clear()
+        self._min_frequency = 0
+
+    def _add(self, key: str, frequency: int) -> None:
+        self._frequencies[key] = frequency
+        self._buckets.setdefault(frequency, OrderedDict())[key] = None
+
+    def _discard(self, key: str, frequency: int) -> None:
+        del self._frequencies[key]
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[frequency]
+
+
+class TTLEvictionPolicy(EvictionPolicy):
+    """Evicts the key closest to expiration."""
+
+    name = "ttl"
+
+    def __init__(self):
+        self._queue = ExpiryQueue()
+
+    def on_insert(self, key: str, entry: "CacheEntry") -> None:
+        self._queue.push(key, entry.expires_at)
+
+    def on_access(self, key: str, entry: "CacheEntry") -> None:
+        pass
+
+    def on_remove(self, key: str) -> None:
+        self._queue.discard(key)
+
+    def select_victim(self) -> str | None:
+        soonest = self._queue.peek()
+        return soonest[0] if soonest else None
+
+    def clear(self) -> None:
+        self._queue.clear()
+
+
+EVICTION_POLICIES: dict[str, type[EvictionPolicy]] = {
+    LRUEvictionPolicy.name: LRUEvictionPolicy,
+    LFUEvictionPolicy.name: LFUEvictionPolicy,
+    TTLEvictionPolicy.name: TTLEvictionPolicy,
+}
+
+
+def create_eviction_policy(name: str) -> EvictionPolicy:
+    """Create an eviction policy by name (lru, lfu or ttl)."""
+    policy_class = EVICTION_POLICIES.get(name.lower())
+    if policy_class is None:
+        raise ValueError(
+            f"Unsupported cache eviction policy: {name}. "
+            f"Supported policies: {', '.join(EVICTION_POLICIES)}"
+        )
+    return policy_class()
+
+
+class SweepableBackend(Protocol):
+    """Backend that can reclaim its expired entries synchronously."""
+
+    def reclaim_expired(self) -> int:
+        """Remove expired entries and return how many were removed."""
+        ...
+
+
+class CacheExpirySweeper:
+    """Background thread that periodically reclaims expired cache entries.
+
+    Backends are held by weak reference, so registering a backend does not
+    keep it alive; a single daemon thread serves every registered backend.
+    """
+
+    def __init__(self, interval_seconds: float):
+        """Initialize the sweeper; the thread starts on first registration."""
+        self.interval_seconds = interval_seconds
+        self._backends: weakref.WeakSet = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.total_reclaimed = 0
+
+    def register(self, backend: SweepableBackend) -> None:
+        """Register a backend for periodic sweeping."""
+        with self._lock:
+            self._backends.add(backend)
+            if self._thread is None or not self._thread.is_alive():
+                self._stop_event.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="cache-expiry-sweeper", daemon=True
+                )
+                self._thread.start()
+
+    def unregister(self, backend: SweepableBackend) -> None:
+        """Stop sweeping a backend."""
+        with self._lock:
+            self._backends.discard(backend)
+
+    def sweep_once(self) -> int:
+        """Reclaim expired entries of all registered backends once."""
+        with self._lock:
+            backends = list(self._backends)
+
+        reclaimed = 0
+        for backend in backends:
+            try:
+                reclaimed += backend.reclaim_expired()
+            except Exception as e:
+                logger.warning(f"Cache expiry sweep failed: {e}")
+
+        if reclaimed:
+            self.total_reclaimed += reclaimed
+            logger.debug(f"Cache expiry sweeper reclaimed {reclaimed} entries")
+        return reclaimed
+
+    def stop(self) -> None:
+        """Stop the sweeper thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_seconds + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            self.sweep_once()
+
+
+# Global sweeper instance
+_expiry_sweeper: CacheExpirySweeper | None = None
+
+
+def get_expiry_sweeper() -> CacheExpirySweeper:
+    """Get the process-wide cache expiry sweeper."""
+    global _expiry_sweeper
+    if _expiry_sweeper is None:
+        _expiry_sweeper = CacheExpirySweeper(settings.cache_sweep_interval_seconds)
+    return _expiry_sweeper
@@ -7,44 +7,64 @@ This module provides a comprehensive caching solution for LLM responses with:
 2. Token-based similarity search for semantic matching
 3. Configurable tool call caching
 4. Performance optimizations with TTL and size limits
-5. Backend abstraction for pluggable storage (memory only)
+5. Backend abstraction for pluggable storage (memory, redis, sqlite)
 6. Async interface for better performance
+7. Per-user inverted token index so similarity lookups only score candidates
 
 The cache service uses a backend abstraction pattern that allows for
-different storage implementations. Currently only in-memory backend is supported.
+different storage implementations. The in-memory backend is process-local;
+the redis backend is shared by all worker processes and the sqlite backend
+(in cache_sqlite) persists entries on local disk across restarts.
 """
 
+import asyncio
+import functools
 import hashlib
+import importlib.util
+import json
 import logging
+import re
+import threading
+import weakref
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, TypedDict
 
 from langchain_core.messages import BaseMessage
 
 from ..config import settings
 from ..core.services import CacheService as CacheServiceProtocol
+from .cache_corpus import CompiledCorpus, load_compiled_corpus
+from .cache_eviction import ExpiryQueue, create_eviction_policy, get_expiry_sweeper
+from .cache_similarity import (
+    NUMPY_AVAILABLE,
+    LSHBuckets,
+    MinHasher,
+    TermMatrix,
+    lsh_parameters,
+)
 
 logger = logging.getLogger(__name__)
 
-# Import NLP libraries for comprehensive word corpus
-try:
-    import nltk
-    from nltk.corpus import wordnet
-
-    NLTK_AVAILABLE = True
-except ImportError:
-    NLTK_AVAILABLE = False
+# NLP libraries for the comprehensive word corpus are imported only when the
+# corpus artifact is (re)built, since importing NLTK alone costs ~200ms
+NLTK_AVAILABLE = importlib.util.find_spec("nltk") is not None
+if not NLTK_AVAILABLE:
     logger.warning("NLTK not available, falling back to basic token matching")
 
+SPACY_AVAILABLE = importlib.util.find_spec("spacy") is not None
+if not SPACY_AVAILABLE:
+    logger.warning("spaCy not available, falling back to basic token matching")
+
+# Redis client is only required for the redis cache backend
 try:
-    import spacy
+    import redis.asyncio as aioredis
 
-    SPACY_AVAILABLE = True
+    REDIS_AVAILABLE = True
 except ImportError:
-    SPACY_AVAILABLE = False
-    logger.warning("spaCy not available, falling back to basic token matching")
+    REDIS_AVAILABLE = False
 
 
 @dataclass
@@ -107,6 +127,9 @@ class CacheEntry:
 class CacheBackend(ABC):
     """Abstract base class for cache backends."""
 
+    # Whether entries are shared with other processes (e.g. a network store)
+    shared: bool = False
+
     @abstractmethod
     async def get(self, key: str) -> CacheEntry | None:
         """Get cache entry from backend."""
@@ -144,80 +167,471 @@ class CacheBackend(ABC):
         """Clear all entries for a specific user."""
         pass
 
+    async def get_many(self, keys: list[str]) -> dict[str, CacheEntry]:
+        """Get live cache entries for the given keys without counting hits.
+
+        Backends should override this with a batched lookup; the default
+        implementation falls back to a full scan.
+        """
+        wanted = set(keys)
+        return {
+            key: entry
+            for key, entry in await self.get_all_entries()
+            if key in wanted and not entry.is_expired()
+        }
+
+    async def purge_expired(self) -> int:
+        """Remove expired entries and return how many were removed.
+
+        Backends with native expiry (e.g. server-side TTLs) can keep the
+        default, which reclaims nothing.
+        """
+        return 0
+
+    async def get_user_keys(self, user_id: str) -> list[str]:
+        """Get the keys of all live entries of a user.
+
+        Backends should override this with an indexed lookup; the default
+        implementation falls back to a full scan.
+        """
+        user_prefix = f"user:{user_id}:"
+        return [
+            key
+            for key, _ in await self.get_all_entries()
+            if key.startswith(user_prefix)
+        ]
+
+    async def get_user_version(self, user_id: str) -> int | None:
+        """Get a counter that changes whenever entries are added for a user.
+
+        Shared backends use it to skip resyncing a user's similarity index
+        while nothing was added; None means the backend keeps no counter.
+        Removed entries are dropped from the index lazily by lookups.
+        """
+        return None
+
 
 class InMemoryCacheBackend(CacheBackend):
-    """In-memory cache backend with TTL support."""
+    """In-memory cache backend with TTL support and pluggable eviction.
 
-    def __init__(self, max_size: int = 1000, default_ttl_seconds: int = 1800):
+    Eviction is delegated to an EvictionPolicy (lru, lfu or ttl) so that get,
+    set and evict stay O(1)/O(log n) when the cache is full. Expired entries
+    are reclaimed by the background expiry sweeper and lazily on access, and
+    statistics are maintained incrementally instead of scanning all entries.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        default_ttl_seconds: int = 1800,
+        eviction_policy: str = "lru",
+        sweep_expired: bool = True,
+    ):
         """Initialize in-memory cache backend."""
         self._cache: dict[str, CacheEntry] = {}
         self.max_size = max_size
         self.default_ttl_seconds = default_ttl_seconds
+        self.eviction_policy = create_eviction_policy(eviction_policy)
+        self._expiry = ExpiryQueue()
+        # The expiry sweeper runs in its own thread
+        self._lock = threading.RLock()
+
+        # Incrementally maintained statistics
+        self._total_size = 0
+        self._total_hits = 0
+        self._user_counts: dict[str, int] = {}
+        self._evictions = 0
+        self._expired_reclaimed = 0
+
+        if sweep_expired and settings.cache_sweep_interval_seconds > 0:
+            get_expiry_sweeper().register(self)
+
         logger.debug(
-            f"In-memory cache backend initialized with max_size={max_size}, ttl={default_ttl_seconds}s"
+            f"In-memory cache backend initialized with max_size={max_size}, ttl={default_ttl_seconds}s, eviction={self.eviction_policy.name}"
         )
 
     async def get(self, key: str) -> CacheEntry | None:
         """Get cache entry from memory."""
-        entry = self._cache.get(key)
-        if not entry:
+        with self._lock:
+            entry = self._cache.get(key)
+            if not entry:
+                return None
+
+            # Check expiration
+            if entry.is_expired():
+                self._remove(key)
+                self._expired_reclaimed += 1
+                return None
+
+            # Update hit count
+            entry.hit_count += 1
+            self._total_hits += 1
+            self.eviction_policy.on_access(key, entry)
+            return entry
+
+    async def set(
+        self, key: str, entry: CacheEntry, ttl_seconds: int | None = None
+    ) -> None:
+        """Set cache entry in memory."""
+        # Update expiration if TTL provided
+        if ttl_seconds is not None:
+            entry.expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
+
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+
+            # Check size limit and evict if necessary
+            while len(self._cache) >= self.max_size:
+                if not self._evict_one():
+                    break
+
+            self._cache[key] = entry
+            self._total_size += len(str(entry.response))
+            self._total_hits += entry.hit_count
+            user_id = entry.user_id or "anonymous"
+            self._user_counts[user_id] = self._user_counts.get(user_id, 0) + 1
+            self.eviction_policy.on_insert(key, entry)
+            self._expiry.push(key, entry.expires_at)
+
+    async def delete(self, key: str) -> bool:
+        """Delete cache entry from memory."""
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+                return True
+            return False
+
+    async def clear(self) -> None:
+        """Clear all cache entries from memory."""
+        with self._lock:
+            self._cache.clear()
+            self.eviction_policy.clear()
+            self._expiry.clear()
+            self._total_size = 0
+            self._total_hits = 0
+            self._user_counts.clear()
+
+    async def get_stats(self) -> dict[str, Any]:
+        """Get memory cache statistics."""
+        with self._lock:
+            total_entries = len(self._cache)
+            return {
+                "backend": "memory",
+                "total_entries": total_entries,
+                "max_size": self.max_size,
+                "total_size_bytes": self._total_size,
+                "total_hits": self._total_hits,
+                "users": len(self._user_counts),
+                "entries_per_user": dict(self._user_counts),
+                "utilization_percent": (total_entries / self.max_size) * 100
+                if self.max_size > 0
+                else 0,
+                "eviction_policy": self.eviction_policy.name,
+                "evictions": self._evictions,
+                "expired_entries": self._expired_reclaimed,
+            }
+
+    async def get_all_entries(self) -> list[tuple[str, CacheEntry]]:
+        """Get all cache entries for similarity search."""
+        with self._lock:
+            return [
+                (key, entry)
+                for key, entry in self._cache.items()
+                if not entry.is_expired()
+            ]
+
+    async def get_many(self, keys: list[str]) -> dict[str, CacheEntry]:
+        """Get live cache entries for the given keys without counting hits."""
+        entries = {}
+        with self._lock:
+            for key in keys:
+                entry = self._cache.get(key)
+                if entry is not None and not entry.is_expired():
+                    entries[key] = entry
+        return entries
+
+    async def clear_user_entries(self, user_id: str) -> int:
+        """Clear all entries for a specific user."""
+        user_prefix = f"user:{user_id}:"
+        with self._lock:
+            keys_to_delete = [
+                key for key in self._cache.keys() if key.startswith(user_prefix)
+            ]
+
+            for key in keys_to_delete:
+                self._remove(key)
+
+        return len(keys_to_delete)
+
+    async def purge_expired(self) -> int:
+        """Remove expired entries and return how many were removed."""
+        return self.reclaim_expired()
+
+    def reclaim_expired(self) -> int:
+        """Remove expired entries in O(k log n) using the expiry queue."""
+        with self._lock:
+            reclaimed = 0
+            for key in self._expiry.pop_expired():
+                entry = self._cache.get(key)
+                if entry is not None and entry.is_expired():
+                    self._remove(key)
+                    reclaimed += 1
+
+            self._expired_reclaimed += reclaimed
+
+        if reclaimed:
+            logger.debug(f"Cleaned {reclaimed} expired cache entries")
+        return reclaimed
+
+    def _evict_one(self) -> bool:
+        """Evict a single entry, preferring already expired ones."""
+        soonest = self._expiry.peek()
+        if soonest is not None and soonest[1] <= datetime.now():
+            victim = soonest[0]
+            self._expired_reclaimed += 1
+        else:
+            victim = self.eviction_policy.select_victim()
+            if victim is None:
+                return False
+            self._evictions += 1
+
+        self._remove(victim)
+        logger.debug(f"Evicted cache entry: {victim}")
+        return True
+
+    def _remove(self, key: str) -> CacheEntry | None:
+        """Remove an entry and update policy, expiry and statistics."""
+        entry = self._cache.pop(key, None)
+        if entry is None:
             return None
 
-        # Check expiration
-        if entry.is_expired():
-            del self._cache[key]
+        self.eviction_policy.on_remove(key)
+        self._expiry.discard(key)
+        self._total_size -= len(str(entry.response))
+        self._total_hits -= entry.hit_count
+        user_id = entry.user_id or "anonymous"
+        remaining = self._user_counts.get(user_id, 0) - 1
+        if remaining > 0:
+            self._user_counts[user_id] = remaining
+        else:
+            self._user_counts.pop(user_id, None)
+        return entry
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared cache backend speaking the Redis protocol.
+
+    Entries are stored as hashes holding the serialized CacheEntry and its hit
+    counter, with a server-side expiry. Sorted sets scored by expiration time
+    index all keys and each user's keys, so per-user clears and statistics
+    never scan the keyspace. A hash of per-user version counters tells
+    workers when their similarity index of a user is out of date.
+    Multi-command operations are sent as a single pipeline and hit/miss
+    counters are kept server-side for all workers.
+    """
+
+    shared = True
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        key_prefix: str = "nalai:cache:",
+        max_size: int = 1000,
+        default_ttl_seconds: int = 1800,
+        max_connections: int = 20,
+        client_factory: Callable[[], Any] | None = None,
+    ):
+        """
+        Initialize redis cache backend.
+
+        Args:
+            url: Redis connection URL
+            key_prefix: Prefix for all keys written by this backend
+            max_size: Maximum number of entries (soonest expiring evicted first)
+            default_ttl_seconds: Default entry TTL
+            max_connections: Connection pool size per event loop
+            client_factory: Optional factory for redis clients (e.g. fakeredis)
+        """
+        if client_factory is None and not REDIS_AVAILABLE:
+            raise ImportError(
+                "The redis package is required for the redis cache backend. "
+                "Install it with: pip install redis"
+            )
+
+        self.url = url
+        self.key_prefix = key_prefix
+        self.max_size = max_size
+        self.default_ttl_seconds = default_ttl_seconds
+        self.max_connections = max_connections
+        self._client_factory = client_factory
+        # Async connections are bound to the event loop that created them
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+        self._index_key = f"{key_prefix}index"
+        self._owners_key = f"{key_prefix}owners"
+        self._users_key = f"{key_prefix}users"
+        self._stats_key = f"{key_prefix}stats"
+        self._versions_key = f"{key_prefix}versions"
+
+        logger.debug(
+            f"Redis cache backend initialized with max_size={max_size}, ttl={default_ttl_seconds}s"
+        )
+
+    def _client(self) -> Any:
+        """Get the pooled client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            if self._client_factory is not None:
+                client = self._client_factory()
+            else:
+                pool = aioredis.ConnectionPool.from_url(
+                    self.url,
+                    max_connections=self.max_connections,
+                    decode_responses=True,
+                )
+                client = aioredis.Redis(connection_pool=pool)
+            self._clients[loop] = client
+        return client
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self.key_prefix}entry:{key}"
+
+    def _user_index_key(self, user_id: str) -> str:
+        return f"{self.key_prefix}user:{user_id}"
+
+    @staticmethod
+    def _decode(data: dict[str, str]) -> CacheEntry | None:
+        """Decode a stored entry hash."""
+        if not data or "data" not in data:
             return None
+        entry = CacheEntry.from_dict(json.loads(data["data"]))
+        entry.hit_count = int(data.get("hits", 0))
+        return entry
+
+    async def get(self, key: str) -> CacheEntry | None:
+        """Get cache entry from redis."""
+        client = self._client()
+        entry = self._decode(await client.hgetall(self._entry_key(key)))
 
-        # Update hit count
+        if entry is None or entry.is_expired():
+            await client.hincrby(self._stats_key, "misses", 1)
+            return None
+
+        # Update hit count; re-applying the expiry keeps a hash recreated by a
+        # concurrent expiration from outliving the entry
         entry.hit_count += 1
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.hincrby(self._entry_key(key), "hits", 1)
+            pipe.pexpireat(
+                self._entry_key(key), int(entry.expires_at.timestamp() * 1000)
+            )
+            pipe.hincrby(self._stats_key, "hits", 1)
+            await pipe.execute()
         return entry
 
     async def set(
         self, key: str, entry: CacheEntry, ttl_seconds: int | None = None
     ) -> None:
-        """Set cache entry in memory."""
+        """Set cache entry in redis."""
         # Update expiration if TTL provided
         if ttl_seconds is not None:
             entry.expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
 
-        # Check size limit and evict if necessary
-        if len(self._cache) >= self.max_size and key not in self._cache:
-            await self._evict_oldest()
+        user_id = entry.user_id or "anonymous"
+        expires_at = entry.expires_at.timestamp()
+        entry_key = self._entry_key(key)
+
+        client = self._client()
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.delete(entry_key)
+            pipe.hset(
+                entry_key,
+                mapping={
+                    "data": json.dumps(entry.to_dict(), default=str),
+                    "hits": entry.hit_count,
+                },
+            )
+            pipe.pexpireat(entry_key, int(expires_at * 1000))
+            pipe.zadd(self._index_key, {key: expires_at})
+            pipe.zadd(self._user_index_key(user_id), {key: expires_at})
+            pipe.hset(self._owners_key, key, user_id)
+            pipe.sadd(self._users_key, user_id)
+            pipe.hincrby(self._versions_key, user_id, 1)
+            await pipe.execute()
 
-        self._cache[key] = entry
+        await self._enforce_max_size()
 
     async def delete(self, key: str) -> bool:
-        """Delete cache entry from memory."""
-        if key in self._cache:
-            del self._cache[key]
-            return True
-        return False
+        """Delete cache entry from redis."""
+        return await self.delete_many([key]) > 0
+
+    async def delete_many(self, keys: list[str]) -> int:
+        """Delete entries and their index memberships in one pipeline."""
+        if not keys:
+            return 0
+
+        client = self._client()
+        owners = await client.hmget(self._owners_key, keys)
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.delete(*[self._entry_key(key) for key in keys])
+            pipe.zrem(self._index_key, *keys)
+            pipe.hdel(self._owners_key, *keys)
+            for key, user_id in zip(keys, owners, strict=True):
+                if user_id is not None:
+                    pipe.zrem(self._user_index_key(user_id), key)
+            results = await pipe.execute()
+        return int(results[0])
 
     async def clear(self) -> None:
-        """Clear all cache entries from memory."""
-        self._cache.clear()
+        """Clear all cache entries from redis."""
+        client = self._client()
+        keys = await client.zrange(self._index_key, 0, -1)
+        users = await client.smembers(self._users_key)
+        async with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.delete(self._entry_key(key))
+            for user_id in users:
+                pipe.delete(self._user_index_key(user_id))
+            pipe.delete(self._index_key, self._owners_key, self._users_key)
+            await pipe.execute()
 
     async def get_stats(self) -> dict[str, Any]:
-        """Get memory cache statistics."""
-        # Clean expired entries
-        await self._clean_expired()
-
-        total_entries = len(self._cache)
-        total_size = sum(len(str(entry.response)) for entry in self._cache.values())
-        total_hits = sum(entry.hit_count for entry in self._cache.values())
+        """Get redis cache statistics including the shared hit ratio."""
+        await self.purge_expired()
+
+        client = self._client()
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.zcard(self._index_key)
+            pipe.smembers(self._users_key)
+            pipe.hgetall(self._stats_key)
+            total_entries, users, counters = await pipe.execute()
+
+        users = sorted(users)
+        async with client.pipeline(transaction=False) as pipe:
+            for user_id in users:
+                pipe.zcard(self._user_index_key(user_id))
+            user_sizes = await pipe.execute()
+        user_counts = {
+            user_id: count
+            for user_id, count in zip(users, user_sizes, strict=True)
+            if count
+        }
 
-        # Count entries per user
-        user_counts = {}
-        for entry in self._cache.values():
-            user_id = entry.user_id or "anonymous"
-            user_counts[user_id] = user_counts.get(user_id, 0) + 1
+        hits = int(counters.get("hits", 0))
+        misses = int(counters.get("misses", 0))
+        lookups = hits + misses
 
         return {
-            "backend": "memory",
+            "backend": "redis",
             "total_entries": total_entries,
             "max_size": self.max_size,
-            "total_size_bytes": total_size,
-            "total_hits": total_hits,
+            "total_hits": hits,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "evictions": int(counters.get("evictions", 0)),
             "users": len(user_counts),
             "entries_per_user": user_counts,
             "utilization_percent": (total_entries / self.max_size) * 100
@@ -227,47 +641,164 @@ class InMemoryCacheBackend(CacheBackend):
 
     async def get_all_entries(self) -> list[tuple[str, CacheEntry]]:
         """Get all cache entries for similarity search."""
-        # Clean expired entries first
-        await self._clean_expired()
-        return list(self._cache.items())
+        client = self._client()
+        keys = await client.zrangebyscore(self._index_key, self._now(), "+inf")
+        return list((await self.get_many(keys)).items())
+
+    async def get_many(self, keys: list[str]) -> dict[str, CacheEntry]:
+        """Get live cache entries for the given keys in one pipeline."""
+        if not keys:
+            return {}
+
+        client = self._client()
+        async with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.hgetall(self._entry_key(key))
+            results = await pipe.execute()
+
+        entries = {}
+        for key, data in zip(keys, results, strict=True):
+            entry = self._decode(data)
+            if entry is not None and not entry.is_expired():
+                entries[key] = entry
+        return entries
+
+    async def get_user_keys(self, user_id: str) -> list[str]:
+        """Get the keys of all live entries of a user from the user index."""
+        client = self._client()
+        return await client.zrangebyscore(
+            self._user_index_key(user_id), self._now(), "+inf"
+        )
+
+    async def get_user_version(self, user_id: str) -> int | None:
+        """Get the version counter of a user's entries."""
+        return int(await self._client().hget(self._versions_key, user_id) or 0)
 
     async def clear_user_entries(self, user_id: str) -> int:
-        """Clear all entries for a specific user."""
-        user_prefix = f"user:{user_id}:"
-        keys_to_delete = [
-            key for key in self._cache.keys() if key.startswith(user_prefix)
+        """Clear all entries for a specific user using the user index."""
+        client = self._client()
+        user_index_key = self._user_index_key(user_id)
+        keys = await client.zrange(user_index_key, 0, -1)
+
+        async with client.pipeline(transaction=False) as pipe:
+            if keys:
+                pipe.delete(*[self._entry_key(key) for key in keys])
+                pipe.zrem(self._index_key, *keys)
+                pipe.hdel(self._owners_key, *keys)
+            pipe.delete(user_index_key)
+            pipe.srem(self._users_key, user_id)
+            pipe.hincrby(self._versions_key, user_id, 1)
+            results = await pipe.execute()
+
+        return int(results[0]) if keys else 0
+
+    async def purge_expired(self) -> int:
+        """Drop index entries whose keys were expired by the server."""
+        client = self._client()
+        expired = await client.zrangebyscore(self._index_key, "-inf", self._now())
+        if not expired:
+            return 0
+
+        await self.delete_many(expired)
+        logger.debug(f"Cleaned {len(expired)} expired cache index entries")
+        return len(expired)
+
+    async def _enforce_max_size(self) -> None:
+        """Evict the soonest expiring entries while the cache is over capacity."""
+        client = self._client()
+        excess = await client.zcard(self._index_key) - self.max_size
+        if excess <= 0:
+            return
+
+        await self.purge_expired()
+        excess = await client.zcard(self._index_key) - self.max_size
+        if excess <= 0:
+            return
+
+        victims = [
+            key
+            for key, _ in await client.zrange(
+                self._index_key, 0, excess - 1, withscores=True
+            )
         ]
+        evicted = await self.delete_many(victims)
+        await client.hincrby(self._stats_key, "evictions", evicted)
+        logger.debug(f"Evicted {evicted} cache entries")
 
-        for key in keys_to_delete:
-            del self._cache[key]
+    @staticmethod
+    def _now() -> float:
+        return datetime.now().timestamp()
 
-        return len(keys_to_delete)
 
-    async def _evict_oldest(self) -> None:
-        """Evict oldest entries when cache is full."""
-        if not self._cache:
-            return
+class ConversationDigest(TypedDict):
+    """Chained hash of a conversation's message contents.
 
-        # Find oldest entry by created_at time
-        oldest_key = min(
-            self._cache.keys(),
-            key=lambda k: self._cache[k].created_at,
-        )
+    Stored in the agent state so the cache key of a conversation can be
+    extended by the new messages of a turn instead of rehashing the history.
+    """
 
-        del self._cache[oldest_key]
-        logger.debug(f"Evicted oldest cache entry: {oldest_key}")
+    count: int  # Number of messages covered
+    message_id: str | None  # Id of the last covered message
+    digest: str  # Chained SHA-256 hex digest ("" if no message has content)
 
-    async def _clean_expired(self) -> int:
-        """Clean expired entries and return count of cleaned entries."""
-        expired_keys = [key for key, entry in self._cache.items() if entry.is_expired()]
 
-        for key in expired_keys:
-            del self._cache[key]
+def conversation_digest(
+    messages: list[BaseMessage], previous: ConversationDigest | None = None
+) -> ConversationDigest:
+    """
+    Compute the chained content digest of a conversation.
 
-        if expired_keys:
-            logger.debug(f"Cleaned {len(expired_keys)} expired cache entries")
+    Each message with content extends the digest as
+    sha256(previous_digest | content), so a previous digest is reused when it
+    still covers a prefix of the messages (checked via the id of its last
+    message) and only the new messages are hashed. Messages are treated as
+    immutable once they carry an id; rewritten histories (e.g. after
+    compression) get new ids and are rehashed from the start.
 
-        return len(expired_keys)
+    Args:
+        messages: Conversation messages
+        previous: Digest of an earlier state of the same conversation
+
+    Returns:
+        Digest covering all messages
+    """
+    start, digest = 0, ""
+    if (
+        previous
+        and previous.get("message_id") is not None
+        and 0 < previous["count"] <= len(messages)
+        and getattr(messages[previous["count"] - 1], "id", None)
+        == previous["message_id"]
+    ):
+        start, digest = previous["count"], previous["digest"]
+
+    for message in messages[start:]:
+        if hasattr(message, "content") and message.content:
+            digest = hashlib.sha256(f"{digest}|{message.content}".encode()).hexdigest()
+
+    return ConversationDigest(
+        count=len(messages),
+        message_id=getattr(messages[-1], "id", None) if messages else None,
+        digest=digest,
+    )
+
+
+# Word-boundary tokenizer shared by all matchers
+TOKEN_PATTERN = re.compile(r"\b\w+\b")
+
+ARTICLES = frozenset({"a", "an", "the"})
+PREPOSITIONS = frozenset(
+    {"in", "on", "at", "to", "for", "with", "by", "from", "of", "about"}
+)
+
+
+@dataclass(frozen=True)
+class IntentVector:
+    """Precomputed token representation of an intent used for similarity scoring."""
+
+    tokens: dict[str, float]  # Weighted tokens used for weighted Jaccard
+    words: frozenset[str]  # Same tokens as a set, used for antonym detection
+    total_weight: float = 0.0
 
 
 class TokenSimilarityMatcher:
@@ -278,6 +809,9 @@ class TokenSimilarityMatcher:
     - Antonym detection for false positive prevention
     - Domain-agnostic word coverage
     - Semantic relationship understanding
+
+    The corpora are merged into a single word-to-weight table, rebuilt whenever
+    a corpus is replaced, and recently vectorized intents are memoized.
     """
 
     def __init__(
@@ -286,6 +820,7 @@ class TokenSimilarityMatcher:
         nouns: set[str] | None = None,
         adjectives: set[str] | None = None,
         antonyms: dict[str, list[str]] | None = None,
+        vector_cache_size: int = 1024,
     ):
         """Initialize the enhanced token similarity matcher.
 
@@ -294,6 +829,7 @@ class TokenSimilarityMatcher:
             nouns: Set of noun words for weighting
             adjectives: Set of adjective words for weighting
             antonyms: Dictionary mapping words to their antonyms for false positive detection
+            vector_cache_size: Maximum number of memoized intent vectors
         """
         # Token weights for different word types
         self.token_weights = {
@@ -305,6 +841,12 @@ class TokenSimilarityMatcher:
             "other": 1.0,  # everything else
         }
 
+        self._word_weights: Mapping[str, float] | None = None
+        self._corpus: CompiledCorpus | None = None
+        self._cached_vectorize = functools.lru_cache(maxsize=vector_cache_size)(
+            self._vectorize
+        )
+
         # Initialize corpus from injected data or load fallback
         if (
             verbs is not None
@@ -329,6 +871,49 @@ class TokenSimilarityMatcher:
         self.adjectives = adjectives
         self.antonyms = antonyms
 
+    @property
+    def verbs(self) -> set[str]:
+        return self._verbs
+
+    @verbs.setter
+    def verbs(self, verbs: set[str]) -> None:
+        self._verbs = verbs
+        self._invalidate()
+
+    @property
+    def nouns(self) -> set[str]:
+        return self._nouns
+
+    @nouns.setter
+    def nouns(self, nouns: set[str]) -> None:
+        self._nouns = nouns
+        self._invalidate()
+
+    @property
+    def adjectives(self) -> set[str]:
+        return self._adjectives
+
+    @adjectives.setter
+    def adjectives(self, adjectives: set[str]) -> None:
+        self._adjectives = adjectives
+        self._invalidate()
+
+    @property
+    def antonyms(self) -> dict[str, list[str]]:
+        return self._antonyms
+
+    @antonyms.setter
+    def antonyms(self, antonyms: dict[str, list[str]]) -> None:
+        self._antonyms = antonyms
+        self._invalidate()
+
+    @property
+    def word_weights(self) -> Mapping[str, float]:
+        """Word-to-weight table merged from all corpora (built on first use)."""
+        if self._word_weights is None:
+            self._word_weights = self._build_word_weights()
+        return self._word_weights
+
     def similarity(self, intent1: str, intent2: str) -> float:
         """
         Calculate similarity between two intents using token-based matching.
@@ -343,21 +928,130 @@ class TokenSimilarityMatcher:
         if not intent1 or not intent2:
             return 0.0
 
+        return self.vector_similarity(self.vectorize(intent1), self.vectorize(intent2))
+
+    def vectorize(self, intent: str) -> IntentVector:
+        """
+        Precompute the token representation of an intent.
+
+        Vectors are memoized per intent string; they must not be mutated.
+
+        Args:
+            intent: The intent string to vectorize
+
+        Returns:
+            IntentVector that can be scored repeatedly without re-tokenizing
+        """
+        return self._cached_vectorize(intent)
+
+    def vector_similarity(self, vector1: IntentVector, vector2: IntentVector) -> float:
+        """
+        Calculate similarity between two precomputed intent vectors.
+
+        Args:
+            vector1: First intent vector
+            vector2: Second intent vector
+
+        Returns:
+            Similarity score between 0.0 and 1.0
+        """
         # Check for false positives (semantic opposites)
-        if self._is_likely_false_positive(intent1, intent2):
+        if self._has_antonym_pair(vector1.words, vector2.words):
             return 0.0
 
-        # Tokenize and weight both intents
-        tokens1 = self._tokenize_and_weight(intent1.lower())
-        tokens2 = self._tokenize_and_weight(intent2.lower())
-
-        if not tokens1 or not tokens2:
+        if not vector1.tokens or not vector2.tokens:
             return 0.0
 
-        # Calculate weighted Jaccard similarity
-        similarity = self._weighted_jaccard_similarity(tokens1, tokens2)
+        # Weighted Jaccard: sum of max = sum of both totals - sum of min
+        intersection = self._intersection_weight(vector1.tokens, vector2.tokens)
+        union = vector1.total_weight + vector2.total_weight - intersection
+        return intersection / union if union > 0.0 else 0.0
 
-        return similarity
+    def batch_similarity(
+        self, query: IntentVector, vectors: list[IntentVector]
+    ) -> list[float]:
+        """
+        Score a query against many intent vectors at once.
+
+        Builds a sparse weighted term matrix and scores it with vectorized
+        min/max sums when NumPy is available; otherwise scores one by one.
+
+        Args:
+            query: Vectorized query intent
+            vectors: Vectorized intents to score
+
+        Returns:
+            Similarity scores in the order of vectors
+        """
+        if not NUMPY_AVAILABLE or not query.tokens:
+            return [self.vector_similarity(query, vector) for vector in vectors]
+
+        matrix = TermMatrix(capacity=len(vectors))
+        matrix.extend(
+            [
+                (str(row), vector.tokens, vector.words, vector.total_weight)
+                for row, vector in enumerate(vectors)
+            ]
+        )
+
+        scores = matrix.scores(
+            query.tokens, query.total_weight, self.antonyms_of(query.words)
+        )
+        return [
+            float(score) if vector.tokens else 0.0
+            for score, vector in zip(scores, vectors, strict=True)
+        ]
+
+    def antonyms_of(self, words: set[str] | frozenset[str]) -> set[str]:
+        """Get all antonyms of the given words."""
+        antonyms = set()
+        for word in words:
+            antonyms.update(self.antonyms.get(word, ()))
+        return antonyms
+
+    def _vectorize(self, intent: str) -> IntentVector:
+        """Tokenize and weight an intent (memoized by vectorize)."""
+        tokens = self._tokenize_and_weight(intent)
+        return IntentVector(
+            tokens=tokens,
+            words=frozenset(tokens),
+            total_weight=sum(tokens.values()),
+        )
+
+    @classmethod
+    def from_corpus(
+        cls, corpus: CompiledCorpus, vector_cache_size: int = 1024
+    ) -> "TokenSimilarityMatcher":
+        """Create a matcher whose word lookups are served by a mapped corpus."""
+        matcher = cls(
+            verbs=corpus.verbs,
+            nouns=corpus.nouns,
+            adjectives=corpus.adjectives,
+            antonyms=corpus.antonyms,
+            vector_cache_size=vector_cache_size,
+        )
+        matcher._corpus = corpus
+        return matcher
+
+    def _invalidate(self) -> None:
+        """Drop derived lookup tables after a corpus changed."""
+        self._word_weights = None
+        self._corpus = None
+        self._cached_vectorize.cache_clear()
+
+    def _build_word_weights(self) -> Mapping[str, float]:
+        """Merge the corpora into one table, higher-priority word types last."""
+        if self._corpus is not None:
+            return self._corpus.word_weights(self.token_weights, ARTICLES, PREPOSITIONS)
+
+        word_weights = dict.fromkeys(PREPOSITIONS, self.token_weights["preposition"])
+        word_weights.update(dict.fromkeys(ARTICLES, self.token_weights["article"]))
+        word_weights.update(
+            dict.fromkeys(self.adjectives, self.token_weights["adjective"])
+        )
+        word_weights.update(dict.fromkeys(self.nouns, self.token_weights["noun"]))
+        word_weights.update(dict.fromkeys(self.verbs, self.token_weights["verb"]))
+        return word_weights
 
     def _tokenize_and_weight(self, intent: str) -> dict[str, float]:
         """
@@ -369,17 +1063,12 @@ class TokenSimilarityMatcher:
         Returns:
             Dictionary mapping tokens to their weights
         """
-        # Simple tokenization (split on whitespace and punctuation)
-        import re
-
-        tokens = re.findall(r"\b\w+\b", intent.lower())
-
-        weighted_tokens = {}
-        for token in tokens:
-            weight = self._get_token_weight(token)
-            weighted_tokens[token] = weight
-
-        return weighted_tokens
+        word_weights = self.word_weights
+        other = self.token_weights["other"]
+        return {
+            token: word_weights.get(token, other)
+            for token in TOKEN_PATTERN.findall(intent.lower())
+        }
 
     def _get_token_weight(self, word: str) -> float:
         """
@@ -391,29 +1080,21 @@ class TokenSimilarityMatcher:
         Returns:
             Weight for the token
         """
-        if word in self.verbs:
-            return self.token_weights["verb"]
-        elif word in self.nouns:
-            return self.token_weights["noun"]
-        elif word in self.adjectives:
-            return self.token_weights["adjective"]
-        elif word in {"a", "an", "the"}:
-            return self.token_weights["article"]
-        elif word in {
-            "in",
-            "on",
-            "at",
-            "to",
-            "for",
-            "with",
-            "by",
-            "from",
-            "of",
-            "about",
-        }:
-            return self.token_weights["preposition"]
-        else:
-            return self.token_weights["other"]
+        return self.word_weights.get(word, self.token_weights["other"])
+
+    @staticmethod
+    def _intersection_weight(
+        tokens1: dict[str, float], tokens2: dict[str, float]
+    ) -> float:
+        """Sum of the minimum weights of the tokens shared by two token sets."""
+        if len(tokens1) > len(tokens2):
+            tokens1, tokens2 = tokens2, tokens1
+        intersection_weight = 0.0
+        for token, weight1 in tokens1.items():
+            weight2 = tokens2.get(token)
+            if weight2 is not None:
+                intersection_weight += min(weight1, weight2)
+        return intersection_weight
 
     def _weighted_jaccard_similarity(
         self, tokens1: dict[str, float], tokens2: dict[str, float]
@@ -428,24 +1109,12 @@ class TokenSimilarityMatcher:
         Returns:
             Weighted Jaccard similarity score
         """
-        # Get all unique tokens
-        all_tokens = set(tokens1.keys()) | set(tokens2.keys())
-
-        if not all_tokens:
-            return 0.0
-
-        # Calculate intersection and union with weights
-        intersection_weight = 0.0
-        union_weight = 0.0
-
-        for token in all_tokens:
-            weight1 = tokens1.get(token, 0.0)
-            weight2 = tokens2.get(token, 0.0)
-
-            intersection_weight += min(weight1, weight2)
-            union_weight += max(weight1, weight2)
+        intersection_weight = self._intersection_weight(tokens1, tokens2)
+        union_weight = (
+            sum(tokens1.values()) + sum(tokens2.values()) - intersection_weight
+        )
 
-        if union_weight == 0.0:
+        if union_weight <= 0.0:
             return 0.0
 
         return intersection_weight / union_weight
@@ -461,19 +1130,256 @@ class TokenSimilarityMatcher:
         Returns:
             True if intents are likely opposites
         """
-        tokens1 = set(intent1.lower().split())
-        tokens2 = set(intent2.lower().split())
+        return self._has_antonym_pair(
+            self.vectorize(intent1).words, self.vectorize(intent2).words
+        )
 
-        # Check for antonym pairs
-        for token1 in tokens1:
-            if token1 in self.antonyms:
-                for antonym in self.antonyms[token1]:
-                    if antonym in tokens2:
-                        return True
+    def _has_antonym_pair(
+        self, words1: set[str] | frozenset[str], words2: set[str] | frozenset[str]
+    ) -> bool:
+        """Check if any word in the first set has an antonym in the second set."""
+        antonyms = self.antonyms
+        for word1 in words1:
+            word_antonyms = antonyms.get(word1)
+            if word_antonyms and not words2.isdisjoint(word_antonyms):
+                return True
 
         return False
 
 
+SIMILARITY_ENGINES = ("index", "vectorized", "lsh")
+
+
+class SimilarityIndex:
+    """Per-user inverted token index over cached intents.
+
+    Maps each token to the cache keys whose intent contains it and keeps the
+    precomputed intent vector of every key, so a similarity lookup scores only
+    the entries that can still reach the threshold instead of the whole cache.
+
+    Scoring engines:
+    - index: score the candidates from the inverted index one by one
+    - vectorized: score all of a user's entries at once against a sparse
+      weighted term matrix (requires NumPy, otherwise falls back to index)
+    - lsh: score only the entries sharing a MinHash band bucket with the
+      query; approximate, banded for the configured threshold (requires NumPy,
+      otherwise falls back to index)
+    """
+
+    # Tolerance for floating point comparisons in the pruning bounds
+    _EPSILON = 1e-9
+
+    def __init__(
+        self,
+        matcher: TokenSimilarityMatcher,
+        engine: str = "index",
+        threshold: float | None = None,
+    ):
+        """Initialize an empty index using the given matcher for vectorization.
+
+        Args:
+            matcher: Matcher used to vectorize and score intents
+            engine: Scoring engine (index, vectorized, lsh)
+            threshold: Similarity threshold the LSH bands are tuned for
+        """
+        if engine not in SIMILARITY_ENGINES:
+            raise ValueError(
+                f"Unsupported similarity engine: {engine}. "
+                f"Supported engines: {', '.join(SIMILARITY_ENGINES)}"
+            )
+        if engine in ("vectorized", "lsh") and not NUMPY_AVAILABLE:
+            logger.warning("NumPy not available, falling back to index similarity")
+            engine = "index"
+
+        self.matcher = matcher
+        self.engine = engine
+        self._postings: dict[str, dict[str, set[str]]] = {}
+        self._vectors: dict[str, tuple[str, IntentVector]] = {}
+        self._user_keys: dict[str, set[str]] = {}
+        self._matrices: dict[str, TermMatrix] = {}
+        self._buckets: dict[str, LSHBuckets] = {}
+        if engine == "lsh":
+            self._lsh_bands, self._lsh_rows = lsh_parameters(
+                threshold
+                if threshold is not None
+                else settings.cache_similarity_threshold
+            )
+            self._minhasher = MinHasher(num_perm=self._lsh_bands * self._lsh_rows)
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def keys(self) -> list[str]:
+        """Get all indexed cache keys."""
+        return list(self._vectors.keys())
+
+    def user_keys(self, user_id: str) -> set[str]:
+        """Get the indexed cache keys of a user."""
+        return set(self._user_keys.get(user_id, ()))
+
+    def add(self, user_id: str, key: str, intent: str) -> None:
+        """Index (or re-index) the intent stored under a cache key."""
+        self.remove(key)
+
+        vector = self.matcher.vectorize(intent)
+        if not vector.tokens:
+            return
+
+        self._vectors[key] = (user_id, vector)
+        self._user_keys.setdefault(user_id, set()).add(key)
+        postings = self._postings.setdefault(user_id, {})
+        for token in vector.tokens:
+            postings.setdefault(token, set()).add(key)
+
+        if self.engine == "vectorized":
+            matrix = self._matrices.get(user_id)
+            if matrix is None:
+                matrix = self._matrices[user_id] = TermMatrix()
+            matrix.append(key, vector.tokens, vector.words, vector.total_weight)
+        elif self.engine == "lsh":
+            buckets = self._buckets.get(user_id)
+            if buckets is None:
+                buckets = self._buckets[user_id] = LSHBuckets(
+                    self._lsh_bands, self._lsh_rows
+                )
+            buckets.insert(key, self._minhasher.signature(vector.tokens))
+
+    def remove(self, key: str) -> bool:
+        """Remove a cache key from the index."""
+        indexed = self._vectors.pop(key, None)
+        if indexed is None:
+            return False
+
+        user_id, vector = indexed
+        user_keys = self._user_keys.get(user_id, set())
+        user_keys.discard(key)
+        if not user_keys:
+            self._user_keys.pop(user_id, None)
+
+        postings = self._postings.get(user_id, {})
+        for token in vector.tokens:
+            keys = postings.get(token)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del postings[token]
+        if not postings:
+            self._postings.pop(user_id, None)
+
+        matrix = self._matrices.get(user_id)
+        if matrix is not None and matrix.remove(key):
+            if not matrix:
+                del self._matrices[user_id]
+            elif matrix.dead_rows > len(matrix):
+                self._rebuild_matrix(user_id)
+
+        buckets = self._buckets.get(user_id)
+        if buckets is not None and buckets.remove(key) and not buckets:
+            del self._buckets[user_id]
+        return True
+
+    def clear_user(self, user_id: str) -> int:
+        """Remove all indexed keys of a user and return how many were removed."""
+        self._postings.pop(user_id, None)
+        self._matrices.pop(user_id, None)
+        self._buckets.pop(user_id, None)
+        keys = self._user_keys.pop(user_id, set())
+        for key in keys:
+            self._vectors.pop(key, None)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all keys from the index."""
+        self._postings.clear()
+        self._vectors.clear()
+        self._user_keys.clear()
+        self._matrices.clear()
+        self._buckets.clear()
+
+    def search(
+        self, user_id: str, query: IntentVector, threshold: float
+    ) -> list[tuple[str, float]]:
+        """
+        Find indexed keys of a user whose intent similarity reaches the threshold.
+
+        Args:
+            user_id: User whose entries are searched
+            query: Vectorized query intent
+            threshold: Minimum similarity score
+
+        Returns:
+            List of (cache_key, similarity_score) tuples in no particular order
+        """
+        postings = self._postings.get(user_id)
+        if not postings or not query.tokens:
+            return []
+
+        if self.engine == "vectorized":
+            matrix = self._matrices[user_id]
+            scores = matrix.scores(
+                query.tokens, query.total_weight, self.matcher.antonyms_of(query.words)
+            )
+            return matrix.matches(scores, threshold)
+
+        query_weight = query.total_weight
+        if self.engine == "lsh" and threshold > 0:
+            candidates = self._lsh_candidates(user_id, query)
+        elif threshold <= 0:
+            candidates = set(self._user_keys.get(user_id, ()))
+        else:
+            # Prefix filtering: a token weighs the same in every intent, so the
+            # overlap with any entry is bounded by the weight of the shared query
+            # tokens, and a match needs an overlap of at least threshold * weight
+            # of the query. Taking the heaviest query tokens until the rest can
+            # no longer reach that bound yields a complete candidate set.
+            required = threshold * query_weight - self._EPSILON
+            remaining = query_weight
+            candidates = set()
+            for token, weight in sorted(
+                query.tokens.items(),
+                key=lambda item: (-item[1], len(postings.get(item[0], ()))),
+            ):
+                if remaining < required:
+                    break
+                candidates.update(postings.get(token, ()))
+                remaining -= weight
+
+        matches = []
+        for key in candidates:
+            vector = self._vectors[key][1]
+            # Weighted Jaccard is bounded by the ratio of the total weights
+            if threshold > 0 and (
+                vector.total_weight < threshold * query_weight - self._EPSILON
+                or query_weight < threshold * vector.total_weight - self._EPSILON
+            ):
+                continue
+            similarity = self.matcher.vector_similarity(query, vector)
+            if similarity >= threshold:
+                matches.append((key, similarity))
+
+        return matches
+
+    def _lsh_candidates(self, user_id: str, query: IntentVector) -> set[str]:
+        """Get the keys of a user sharing an LSH band bucket with the query."""
+        buckets = self._buckets.get(user_id)
+        if buckets is None:
+            return set()
+        return buckets.candidates(self._minhasher.signature(query.tokens))
+
+    def _rebuild_matrix(self, user_id: str) -> None:
+        """Compact a user's term matrix by dropping removed rows."""
+        keys = self._user_keys.get(user_id, ())
+        matrix = TermMatrix(capacity=len(keys))
+        matrix.extend(
+            [
+                (key, vector.tokens, vector.words, vector.total_weight)
+                for key in keys
+                for vector in (self._vectors[key][1],)
+            ]
+        )
+        self._matrices[user_id] = matrix
+
+
 class Cache(CacheServiceProtocol):
     """Manages caching for API assistant requests with token-based similarity search.
 
@@ -482,8 +1388,9 @@ class Cache(CacheServiceProtocol):
     2. Implements user-scoped caching for identity privacy
     3. Configurable tool call caching to handle time-varying results
     4. Optimized similarity search with early termination
-    5. Backend abstraction for pluggable storage (memory only)
+    5. Backend abstraction for pluggable storage (memory, redis, sqlite)
     6. Async interface for better performance
+    7. Inverted token index built at set time for sub-linear similarity lookups
     """
 
     def __init__(self, backend: str = "memory", config: dict[str, Any] | None = None):
@@ -491,28 +1398,77 @@ class Cache(CacheServiceProtocol):
         Initialize cache service with specified backend.
 
         Args:
-            backend: Cache backend type (only "memory" supported)
+            backend: Cache backend type ("memory", "redis" or "sqlite")
             config: Backend-specific configuration
         """
         self.backend_type = backend
         self.config = config or {}
-        self.similarity_matcher = TokenSimilarityMatcher()
+        self.similarity_matcher = create_similarity_matcher(
+            self.config.get("similarity_corpus", settings.cache_similarity_corpus),
+            self.config.get("corpus_path", settings.cache_corpus_path),
+        )
+        self.similarity_index = SimilarityIndex(
+            self.similarity_matcher,
+            engine=self.config.get(
+                "similarity_engine", settings.cache_similarity_engine
+            ),
+            threshold=self.config.get(
+                "similarity_threshold", settings.cache_similarity_threshold
+            ),
+        )
+        max_size = self.config.get("max_size", settings.cache_max_size)
+        # Keys evicted by the backend are dropped from the index lazily; a full
+        # reconciliation runs once the index outgrows the backend by this limit
+        self._similarity_index_limit = max(2 * max_size, 1)
+        # User -> backend version of the user's entries last indexed
+        self._similarity_versions: dict[str, int] = {}
+
+        ttl_seconds = self.config.get("ttl_seconds", settings.cache_ttl_seconds)
 
         if backend == "memory":
-            max_size = self.config.get("max_size", settings.cache_max_size)
-            ttl_seconds = self.config.get("ttl_seconds", settings.cache_ttl_seconds)
+            eviction_policy = self.config.get(
+                "eviction_policy", settings.cache_eviction_policy
+            )
             self.backend = InMemoryCacheBackend(
-                max_size=max_size, default_ttl_seconds=ttl_seconds
+                max_size=max_size,
+                default_ttl_seconds=ttl_seconds,
+                eviction_policy=eviction_policy,
+            )
+        elif backend == "redis":
+            self.backend = RedisCacheBackend(
+                url=self.config.get("redis_url", settings.cache_redis_url),
+                key_prefix=self.config.get(
+                    "redis_key_prefix", settings.cache_redis_key_prefix
+                ),
+                max_size=max_size,
+                default_ttl_seconds=ttl_seconds,
+                max_connections=self.config.get(
+                    "redis_max_connections", settings.cache_redis_max_connections
+                ),
+            )
+        elif backend == "sqlite":
+            from .cache_sqlite import SQLiteCacheBackend
+
+            self.backend = SQLiteCacheBackend(
+                path=self.config.get("sqlite_path", settings.cache_sqlite_path),
+                max_size=max_size,
+                default_ttl_seconds=ttl_seconds,
+                mmap_size=self.config.get(
+                    "sqlite_mmap_size", settings.cache_sqlite_mmap_size
+                ),
             )
         else:
             raise ValueError(
-                f"Unsupported cache backend: {backend}. Only 'memory' is supported."
+                f"Unsupported cache backend: {backend}. Supported backends: memory, redis, sqlite."
             )
 
         logger.debug(f"Cache service initialized with backend: {backend}")
 
     async def get_async(
-        self, messages: list[BaseMessage], user_id: str = "anonymous"
+        self,
+        messages: list[BaseMessage],
+        user_id: str = "anonymous",
+        message_digest: str | None = None,
     ) -> tuple[str, list[dict[str, Any]]] | None:
         """
         Async version: Get a cached response for the given messages with user isolation.
@@ -520,11 +1476,12 @@ class Cache(CacheServiceProtocol):
         Args:
             messages: List of conversation messages
             user_id: User identifier for cache isolation
+            message_digest: Precomputed conversation_digest() of the messages
 
         Returns:
             Tuple of (response, tool_calls) if found and not expired, None otherwise
         """
-        message_key = self._extract_user_scoped_key(messages, user_id)
+        message_key = self._extract_user_scoped_key(messages, user_id, message_digest)
 
         if not message_key:
             logger.debug("No message key available")
@@ -539,6 +1496,7 @@ class Cache(CacheServiceProtocol):
         if entry.is_expired():
             logger.debug(f"Cache entry expired for messages: {message_key[:8]}...")
             await self.backend.delete(message_key)
+            self.similarity_index.remove(message_key)
             return None
 
         logger.info(
@@ -550,7 +1508,10 @@ class Cache(CacheServiceProtocol):
         return entry.response, tool_calls
 
     def get(
-        self, messages: list[BaseMessage], user_id: str = "anonymous"
+        self,
+        messages: list[BaseMessage],
+        user_id: str = "anonymous",
+        message_digest: str | None = None,
     ) -> tuple[str, list[dict[str, Any]]] | None:
         """
         Synchronous wrapper for get_async.
@@ -572,15 +1533,15 @@ class Cache(CacheServiceProtocol):
 
                 with concurrent.futures.ThreadPoolExecutor() as executor:
                     future = executor.submit(
-                        asyncio.run, self.get_async(messages, user_id)
+                        asyncio.run, self.get_async(messages, user_id, message_digest)
                     )
                     return future.result()
             else:
                 # We're in a sync context, safe to run
-                return asyncio.run(self.get_async(messages, user_id))
+                return asyncio.run(self.get_async(messages, user_id, message_digest))
         except RuntimeError:
             # No event loop, safe to create one
-            return asyncio.run(self.get_async(messages, user_id))
+            return asyncio.run(self.get_async(messages, user_id, message_digest))
 
     async def find_similar_cached_responses_async(
         self,
@@ -604,35 +1565,35 @@ class Cache(CacheServiceProtocol):
 
         threshold = similarity_threshold or settings.cache_similarity_threshold
 
-        # Get all entries from backend
-        all_entries = await self.backend.get_all_entries()
+        if self.backend.shared:
+            await self._sync_similarity_index(user_id)
 
-        # Find similar contents using token-based similarity (user-scoped)
-        similar_contents = []
-        user_prefix = f"user:{user_id}:"
+        # Score only the user's indexed entries that share enough tokens
+        query = self.similarity_matcher.vectorize(message_content)
+        matches = self.similarity_index.search(user_id, query, threshold)
+        if not matches:
+            return []
 
-        for message_key, entry in all_entries:
-            # Only check entries for the same user
-            if not message_key.startswith(user_prefix):
+        entries = await self.backend.get_many([key for key, _ in matches])
+
+        similar_contents = []
+        for message_key, similarity in matches:
+            entry = entries.get(message_key)
+            if entry is None or entry.is_expired():
+                # Entry was evicted or expired in the backend since it was indexed
+                self.similarity_index.remove(message_key)
                 continue
 
-            if not entry.is_expired() and entry.original_message:
-                # Calculate similarity between current message and cached message
-                similarity = self.similarity_matcher.similarity(
-                    message_content, entry.original_message
+            # Return tool calls only if caching is enabled
+            tool_calls = entry.tool_calls if settings.cache_tool_calls else []
+            similar_contents.append(
+                (
+                    entry.original_message,
+                    entry.response,
+                    tool_calls,
+                    similarity,
                 )
-
-                if similarity >= threshold:
-                    # Return tool calls only if caching is enabled
-                    tool_calls = entry.tool_calls if settings.cache_tool_calls else []
-                    similar_contents.append(
-                        (
-                            entry.original_message,
-                            entry.response,
-                            tool_calls,
-                            similarity,
-                        )
-                    )
+            )
 
         # Sort by similarity score (highest first)
         similar_contents.sort(key=lambda x: x[3], reverse=True)
@@ -691,6 +1652,7 @@ class Cache(CacheServiceProtocol):
         tool_calls: list[dict[str, Any]] | None = None,
         user_id: str = "anonymous",
         ttl_seconds: int | None = None,
+        message_digest: str | None = None,
     ) -> None:
         """
         Async version: Cache a response for the given messages with user isolation.
@@ -701,8 +1663,9 @@ class Cache(CacheServiceProtocol):
             tool_calls: Optional tool calls from the response
             user_id: User identifier for cache isolation
             ttl_seconds: Optional custom TTL in seconds
+            message_digest: Precomputed conversation_digest() of the messages
         """
-        message_key = self._extract_user_scoped_key(messages, user_id)
+        message_key = self._extract_user_scoped_key(messages, user_id, message_digest)
 
         if not message_key:
             logger.debug("Could not extract message key, skipping cache")
@@ -733,6 +1696,11 @@ class Cache(CacheServiceProtocol):
         # Store in backend
         await self.backend.set(message_key, entry, ttl_seconds)
 
+        # Index the original message for similarity lookups
+        self.similarity_index.add(user_id, message_key, original_message)
+        if len(self.similarity_index) > self._similarity_index_limit:
+            await self._reconcile_similarity_index()
+
         logger.debug(
             f"Cached response for messages: {message_key[:8]}... (user: {user_id})"
         )
@@ -744,6 +1712,7 @@ class Cache(CacheServiceProtocol):
         tool_calls: list[dict[str, Any]] | None = None,
         user_id: str = "anonymous",
         ttl_seconds: int | None = None,
+        message_digest: str | None = None,
     ) -> None:
         """
         Synchronous wrapper for set_async.
@@ -765,43 +1734,101 @@ class Cache(CacheServiceProtocol):
                     future = executor.submit(
                         asyncio.run,
                         self.set_async(
-                            messages, response, tool_calls, user_id, ttl_seconds
+                            messages,
+                            response,
+                            tool_calls,
+                            user_id,
+                            ttl_seconds,
+                            message_digest,
                         ),
                     )
                     future.result()
             else:
                 # We're in a sync context, safe to run
                 asyncio.run(
-                    self.set_async(messages, response, tool_calls, user_id, ttl_seconds)
+                    self.set_async(
+                        messages,
+                        response,
+                        tool_calls,
+                        user_id,
+                        ttl_seconds,
+                        message_digest,
+                    )
                 )
         except RuntimeError:
             # No event loop, safe to create one
             asyncio.run(
-                self.set_async(messages, response, tool_calls, user_id, ttl_seconds)
+                self.set_async(
+                    messages,
+                    response,
+                    tool_calls,
+                    user_id,
+                    ttl_seconds,
+                    message_digest,
+                )
             )
 
     def _extract_user_scoped_key(
-        self, messages: list[BaseMessage], user_id: str
+        self,
+        messages: list[BaseMessage],
+        user_id: str,
+        message_digest: str | None = None,
     ) -> str:
-        """Extract a user-scoped cache key from message content."""
-        if not messages:
-            return ""
+        """Extract a user-scoped cache key from message content.
 
-        # Create a string representation of all message contents
-        message_contents = []
-        for message in messages:
-            if hasattr(message, "content") and message.content:
-                message_contents.append(str(message.content))
+        Args:
+            messages: Conversation messages
+            user_id: User identifier for cache isolation
+            message_digest: Precomputed conversation_digest() of the messages
+        """
+        if message_digest is None:
+            if not messages:
+                return ""
+            message_digest = conversation_digest(messages)["digest"]
 
-        if not message_contents:
+        if not message_digest:
             return ""
 
-        # Join all message contents and hash for consistent cache keys
-        combined_content = "|".join(message_contents)
-        content_hash = hashlib.sha256(combined_content.encode()).hexdigest()
-
         # Create user-scoped key
-        return f"user:{user_id}:{content_hash}"
+        return f"user:{user_id}:{message_digest}"
+
+    async def _sync_similarity_index(self, user_id: str) -> None:
+        """Index a user's entries written by other processes to a shared backend.
+
+        The user's keys are only listed when the backend version of the
+        user's entries differs from the one last indexed.
+        """
+        version = await self.backend.get_user_version(user_id)
+        if version is not None and self._similarity_versions.get(user_id) == version:
+            return
+
+        live_keys = set(await self.backend.get_user_keys(user_id))
+        indexed_keys = self.similarity_index.user_keys(user_id)
+
+        for key in indexed_keys - live_keys:
+            self.similarity_index.remove(key)
+
+        missing_keys = live_keys - indexed_keys
+        if missing_keys:
+            entries = await self.backend.get_many(list(missing_keys))
+            for key, entry in entries.items():
+                self.similarity_index.add(user_id, key, entry.original_message)
+
+        if version is not None:
+            self._similarity_versions[user_id] = version
+
+    async def _reconcile_similarity_index(self) -> int:
+        """Drop indexed keys that no longer exist in the backend."""
+        indexed_keys = self.similarity_index.keys()
+        live_keys = await self.backend.get_many(indexed_keys)
+        removed = 0
+        for key in indexed_keys:
+            if key not in live_keys and self.similarity_index.remove(key):
+                removed += 1
+
+        if removed:
+            logger.debug(f"Removed {removed} stale keys from similarity index")
+        return removed
 
     def _extract_intent_key(self, canonical_intent: str) -> str:
         """Extract a cache key from canonical intent (kept for compatibility)."""
@@ -813,8 +1840,7 @@ class Cache(CacheServiceProtocol):
 
     async def clear_expired_async(self) -> int:
         """Async version: Clear expired cache entries and return count of cleared entries."""
-        stats = await self.backend.get_stats()
-        return stats.get("expired_entries", 0)
+        return await self.backend.purge_expired()
 
     def clear_expired(self) -> int:
         """Synchronous wrapper for clear_expired_async."""
@@ -875,6 +1901,8 @@ class Cache(CacheServiceProtocol):
     async def clear_async(self) -> None:
         """Async version: Clear all cache entries."""
         await self.backend.clear()
+        self.similarity_index.clear()
+        self._similarity_versions.clear()
         logger.info("Cleared all cache entries")
 
     def clear(self) -> None:
@@ -900,6 +1928,8 @@ class Cache(CacheServiceProtocol):
     async def clear_user_cache_async(self, user_id: str) -> int:
         """Async version: Clear all cache entries for a specific user."""
         count = await self.backend.clear_user_entries(user_id)
+        self.similarity_index.clear_user(user_id)
+        self._similarity_versions.pop(user_id, None)
         logger.info(f"Cleared {count} cache entries for user: {user_id}")
         return count
 
@@ -1010,6 +2040,9 @@ def load_nlp_corpus() -> tuple[set[str], set[str], set[str], dict[str, list[str]
 
     if NLTK_AVAILABLE:
         try:
+            import nltk
+            from nltk.corpus import wordnet
+
             # Download required NLTK data
             nltk.download("punkt", quiet=True)
             nltk.download("averaged_perceptron_tagger", quiet=True)
@@ -1051,6 +2084,8 @@ def load_nlp_corpus() -> tuple[set[str], set[str], set[str], dict[str, list[str]
 
     if SPACY_AVAILABLE:
         try:
+            import spacy
+
             # Load spaCy model for additional word classification
             nlp = spacy.load("en_core_web_sm")
 
@@ -1069,12 +2104,50 @@ def load_nlp_corpus() -> tuple[set[str], set[str], set[str], dict[str, list[str]
     return verbs, nouns, adjectives, antonyms
 
 
+@functools.lru_cache(maxsize=4)
+def get_compiled_corpus(path: str) -> CompiledCorpus:
+    """Map the NLP corpus artifact once per process, building it if stale."""
+    return load_compiled_corpus(path, load_nlp_corpus)
+
+
+def create_similarity_matcher(
+    corpus: str = "fallback", corpus_path: str | None = None
+) -> TokenSimilarityMatcher:
+    """
+    Create a similarity matcher for the configured word corpus.
+
+    Args:
+        corpus: "fallback" for the bundled word lists, "nlp" for the compiled
+            NLTK/spaCy corpus artifact
+        corpus_path: Path of the compiled corpus artifact
+
+    Returns:
+        Similarity matcher; falls back to the bundled word lists if the NLP
+        corpus is unavailable
+    """
+    if corpus == "fallback":
+        return TokenSimilarityMatcher()
+    if corpus != "nlp":
+        raise ValueError(
+            f"Unsupported similarity corpus: {corpus}. Supported corpora: fallback, nlp"
+        )
+
+    try:
+        compiled = get_compiled_corpus(corpus_path or settings.cache_corpus_path)
+    except Exception as e:
+        logger.warning(f"Failed to load NLP corpus, using fallback corpus: {e}")
+        return TokenSimilarityMatcher()
+    if not len(compiled.lexicon):
+        logger.warning("NLP corpus is empty, using fallback corpus")
+        return TokenSimilarityMatcher()
+    return TokenSimilarityMatcher.from_corpus(compiled)
+
+
 def get_cache_service() -> Cache:
     """Get the global cache service instance."""
     if not hasattr(get_cache_service, "_instance"):
-        # Initialize with memory backend only
         get_cache_service._instance = Cache(
-            backend="memory",
+            backend=settings.cache_backend,
             config={
                 "max_size": settings.cache_max_size,
                 "ttl_seconds": settings.cache_ttl_seconds,
@@ -0,0 +1,333 @@
+"""
+Vectorized similarity scoring and candidate generation for the response cache.
+
+Cached intents of a user are kept in a sparse weighted term matrix (CSR-like
+arrays of token columns and weights per row). A query is scored against all
+rows at once: the weighted Jaccard intersection is the per-row sum of
+element-wise minimums, and the union follows from the row and query totals
+(sum of max = sum a + sum b - sum of min), so no Python loop runs per entry.
+
+For very large caches, MinHash signatures banded into LSH buckets select a
+bounded candidate set that is then scored exactly. Token weights are honoured
+by hashing each token once per half unit of weight, so signature agreement
+approximates the weighted Jaccard similarity the matcher computes.
+
+NumPy is optional; callers fall back to scalar scoring when it is missing.
+"""
+
+import functools
+import logging
+import math
+import zlib
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class TermMatrix:
+    """Append-only sparse weighted term matrix with tombstoned row removal.
+
+    Rows hold the weighted tokens of one intent plus its words for antonym
+    detection, mapped to columns of the matrix's own vocabularies. Storage
+    grows by doubling, so appends are amortized O(row size); removed rows are
+    masked out until the owner compacts the matrix.
+    """
+
+    def __init__(self, capacity: int = 64):
+        """Initialize an empty matrix."""
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy is required for vectorized similarity scoring")
+
+        capacity = max(capacity, 1)
+        self.keys: list[str | None] = []
+        self.rows: dict[str, int] = {}
+        self.dead_rows = 0
+        self._token_vocabulary: dict[str, int] = {}
+        self._word_vocabulary: dict[str, int] = {}
+
+        self._row_weights = np.zeros(capacity)
+        self._live = np.zeros(capacity, dtype=bool)
+
+        self._token_nnz = 0
+        self._token_columns = np.zeros(capacity, dtype=np.int64)
+        self._token_weights = np.zeros(capacity)
+        self._token_rows = np.zeros(capacity, dtype=np.int64)
+
+        self._word_nnz = 0
+        self._word_columns = np.zeros(capacity, dtype=np.int64)
+        self._word_rows = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self) -> int:
+        """Number of live rows."""
+        return len(self.rows)
+
+    def append(
+        self,
+        key: str,
+        tokens: dict[str, float],
+        words: frozenset[str],
+        total_weight: float,
+    ) -> None:
+        """Append a row for the given key (the key must not be present)."""
+        self.extend([(key, tokens, words, total_weight)])
+
+    def extend(
+        self, rows: list[tuple[str, dict[str, float], frozenset[str], float]]
+    ) -> None:
+        """Append rows of (key, tokens, words, total_weight) in one batch."""
+        token_vocabulary = self._token_vocabulary
+        word_vocabulary = self._word_vocabulary
+        first_row = len(self.keys)
+        token_columns, token_weights, token_rows = [], [], []
+        word_columns, word_rows, row_weights = [], [], []
+
+        for row, (key, tokens, words, total_weight) in enumerate(rows, first_row):
+            self.keys.append(key)
+            self.rows[key] = row
+            row_weights.append(total_weight)
+            for token, weight in tokens.items():
+                token_columns.append(
+                    token_vocabulary.setdefault(token, len(token_vocabulary))
+                )
+                token_weights.append(weight)
+            token_rows.extend([row] * len(tokens))
+            for word in words:
+                word_columns.append(
+                    word_vocabulary.setdefault(word, len(word_vocabulary))
+                )
+            word_rows.extend([row] * len(words))
+
+        end = len(self.keys)
+        self._row_weights = self._grow(self._row_weights, end)
+        self._live = self._grow(self._live, end)
+        self._row_weights[first_row:end] = row_weights
+        self._live[first_row:end] = True
+
+        end = self._token_nnz + len(token_columns)
+        self._token_columns = self._grow(self._token_columns, end)
+        self._token_weights = self._grow(self._token_weights, end)
+        self._token_rows = self._grow(self._token_rows, end)
+        self._token_columns[self._token_nnz : end] = token_columns
+        self._token_weights[self._token_nnz : end] = token_weights
+        self._token_rows[self._token_nnz : end] = token_rows
+        self._token_nnz = end
+
+        end = self._word_nnz + len(word_columns)
+        self._word_columns = self._grow(self._word_columns, end)
+        self._word_rows = self._grow(self._word_rows, end)
+        self._word_columns[self._word_nnz : end] = word_columns
+        self._word_rows[self._word_nnz : end] = word_rows
+        self._word_nnz = end
+
+    def remove(self, key: str) -> bool:
+        """Mask out the row of a key."""
+        row = self.rows.pop(key, None)
+        if row is None:
+            return False
+
+        self.keys[row] = None
+        self._live[row] = False
+        self.dead_rows += 1
+        return True
+
+    def scores(
+        self,
+        query_tokens: dict[str, float],
+        query_total_weight: float,
+        antonym_words: set[str],
+    ) -> "np.ndarray":
+        """
+        Score a query against every row at once.
+
+        Args:
+            query_tokens: Weighted tokens of the query
+            query_total_weight: Total weight of the query tokens
+            antonym_words: Antonyms of the query words; rows containing any score 0
+
+        Returns:
+            Array of weighted Jaccard scores per row; removed rows score -1.0
+        """
+        row_count = len(self.keys)
+        query = np.zeros(len(self._token_vocabulary) + 1)
+        for token, weight in query_tokens.items():
+            column = self._token_vocabulary.get(token)
+            if column is not None:
+                query[column] = weight
+
+        columns = self._token_columns[: self._token_nnz]
+        minimums = np.minimum(self._token_weights[: self._token_nnz], query[columns])
+        intersection = np.bincount(
+            self._token_rows[: self._token_nnz], weights=minimums, minlength=row_count
+        )
+        union = self._row_weights[:row_count] + query_total_weight - intersection
+        scores = np.divide(
+            intersection, union, out=np.zeros(row_count), where=union > 0
+        )
+
+        antonym_word_columns = [
+            self._word_vocabulary[word]
+            for word in antonym_words
+            if word in self._word_vocabulary
+        ]
+        if antonym_word_columns:
+            words = self._word_columns[: self._word_nnz]
+            opposite = self._word_rows[: self._word_nnz][
+                np.isin(words, antonym_word_columns)
+            ]
+            scores[opposite] = 0.0
+
+        scores[~self._live[:row_count]] = -1.0
+        return scores
+
+    def matches(
+        self, scores: "np.ndarray", threshold: float
+    ) -> list[tuple[str, float]]:
+        """Get (key, score) pairs of rows scoring at least the threshold."""
+        selected = np.nonzero(scores >= max(threshold, 0.0))[0]
+        return [(self.keys[row], float(scores[row])) for row in selected]
+
+    @staticmethod
+    def _grow(array: "np.ndarray", size: int) -> "np.ndarray":
+        """Double the capacity of an array until it can hold size items."""
+        if size <= len(array):
+            return array
+        capacity = len(array)
+        while capacity < size:
+            capacity *= 2
+        grown = np.zeros(capacity, dtype=array.dtype)
+        grown[: len(array)] = array
+        return grown
+
+
+# Mersenne prime modulus of the universal hash family used for MinHash
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+@functools.lru_cache(maxsize=64)
+def lsh_parameters(
+    threshold: float, num_perm: int = 128, false_negative_weight: float = 0.9
+) -> tuple[int, int]:
+    """
+    Choose (bands, rows) for a similarity threshold.
+
+    Minimizes the weighted probability mass of false positives (pairs below the
+    threshold sharing a bucket) and false negatives (pairs above it sharing
+    none) under the LSH S-curve 1 - (1 - s^rows)^bands. False negatives are
+    weighted heavily since they turn cache hits into misses.
+
+    Args:
+        threshold: Similarity threshold the buckets should separate at
+        num_perm: Number of MinHash permutations (bands * rows <= num_perm)
+        false_negative_weight: Weight of false negatives (0.0-1.0)
+
+    Returns:
+        Tuple of (bands, rows)
+    """
+
+    def integrate(function, start: float, end: float, steps: int = 100) -> float:
+        step = (end - start) / steps
+        return sum(function(start + (i + 0.5) * step) for i in range(steps)) * step
+
+    best, best_error = (1, 1), math.inf
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+
+            def collision(s: float, bands: int = bands, rows: int = rows) -> float:
+                return 1 - (1 - s**rows) ** bands
+
+            false_positive = integrate(collision, 0.0, threshold)
+            false_negative = integrate(lambda s: 1 - collision(s), threshold, 1.0)
+            error = (
+                1 - false_negative_weight
+            ) * false_positive + false_negative_weight * false_negative
+            if error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+class MinHasher:
+    """Computes weighted MinHash signatures of token sets.
+
+    Each token contributes one shingle per half unit of weight (a verb with
+    weight 2.0 becomes four shingles), so that heavier tokens dominate the
+    signature the same way they dominate the weighted Jaccard score.
+    """
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        """Initialize random hash permutations."""
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy is required for MinHash signatures")
+
+        generator = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        # a * h + b stays below 2**64 for 32-bit token hashes
+        self._a = generator.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = generator.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+    def signature(self, tokens: dict[str, float]) -> "np.ndarray":
+        """Compute the signature of weighted tokens (must not be empty)."""
+        hashes = np.fromiter(
+            (
+                zlib.crc32(f"{token}#{copy}".encode())
+                for token, weight in tokens.items()
+                for copy in range(max(1, round(weight * 2)))
+            ),
+            dtype=np.uint64,
+        )
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+
+class LSHBuckets:
+    """Band buckets of MinHash signatures for candidate generation."""
+
+    def __init__(self, bands: int, rows: int):
+        """Initialize empty buckets for signatures of bands * rows values."""
+        self.bands = bands
+        self.rows = rows
+        self._buckets: dict[tuple[int, bytes], set[str]] = {}
+        self._keys: dict[str, list[tuple[int, bytes]]] = {}
+
+    def __len__(self) -> int:
+        """Number of bucketed keys."""
+        return len(self._keys)
+
+    def insert(self, key: str, signature: "np.ndarray") -> None:
+        """Add a key to the bucket of each band of its signature."""
+        self.remove(key)
+        band_keys = self._band_keys(signature)
+        self._keys[key] = band_keys
+        for band_key in band_keys:
+            self._buckets.setdefault(band_key, set()).add(key)
+
+    def remove(self, key: str) -> bool:
+        """Remove a key from its buckets."""
+        band_keys = self._keys.pop(key, None)
+        if band_keys is None:
+            return False
+        for band_key in band_keys:
+            bucket = self._buckets[band_key]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band_key]
+        return True
+
+    def candidates(self, signature: "np.ndarray") -> set[str]:
+        """Get keys sharing at least one band bucket with a signature."""
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        return candidates
+
+    def _band_keys(self, signature: "np.ndarray") -> list[tuple[int, bytes]]:
+        rows = self.rows
+        return [
+            (band, signature[band * rows : (band + 1) * rows].tobytes())
+            for band in range(self.bands)
+        ]
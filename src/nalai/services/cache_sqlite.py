@@ -0,0 +1,384 @@
+"""
+Persistent cache backend on a local SQLite database.
+
+Entries are stored with their CacheEntry.to_dict() payload in WAL mode with
+memory-mapped reads, so the cache survives pod restarts and can be shared by
+the worker processes of one host.
+
+sqlite3 calls block, and a write waits up to the busy timeout for the
+database lock held by another process, so the async methods run them in the
+default executor instead of on the event loop. Each executor thread keeps
+its own connection.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from ..config import settings
+from .cache_eviction import get_expiry_sweeper
+from .cache_service import CacheBackend, CacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Persistent cache backend on a local SQLite database.
+
+    Entries are indexed by (user_id, expires_at) and expires_at, which turns
+    per-user clears, user key listings and expiry into index range
+    operations. Per-user version counters tell workers when their similarity
+    index of a user is out of date.
+    """
+
+    shared = True
+
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            key TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            hit_count INTEGER NOT NULL DEFAULT 0,
+            size_bytes INTEGER NOT NULL DEFAULT 0,
+            data TEXT NOT NULL
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_cache_entries_user "
+        "ON cache_entries (user_id, expires_at)",
+        "CREATE INDEX IF NOT EXISTS idx_cache_entries_expires "
+        "ON cache_entries (expires_at)",
+        """
+        CREATE TABLE IF NOT EXISTS cache_user_versions (
+            user_id TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """,
+    )
+
+    _BUMP_USER_VERSION = (
+        "INSERT INTO cache_user_versions (user_id, version) VALUES (?, 1) "
+        "ON CONFLICT (user_id) DO UPDATE SET version = version + 1"
+    )
+
+    # SQLite limits the number of bound parameters per statement
+    _BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        path: str = "./cache/llm_cache.db",
+        max_size: int = 1000,
+        default_ttl_seconds: int = 1800,
+        mmap_size: int = 256 * 1024 * 1024,
+        sweep_expired: bool = True,
+    ):
+        """
+        Initialize sqlite cache backend.
+
+        Args:
+            path: Database file path
+            max_size: Maximum number of entries (soonest expiring evicted first)
+            default_ttl_seconds: Default entry TTL
+            mmap_size: Bytes of the database file memory-mapped for reads
+            sweep_expired: Register with the background expiry sweeper
+        """
+        self.path = path
+        self.max_size = max_size
+        self.default_ttl_seconds = default_ttl_seconds
+        self.mmap_size = mmap_size
+        # sqlite3 connections cannot be shared between threads
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connection()
+        with connection:
+            for statement in self._SCHEMA:
+                connection.execute(statement)
+        self.reclaim_expired()
+        self._approximate_count = self._count()
+
+        if sweep_expired and settings.cache_sweep_interval_seconds > 0:
+            get_expiry_sweeper().register(self)
+
+        logger.debug(
+            f"SQLite cache backend initialized at {path} with {self._approximate_count} entries, max_size={max_size}"
+        )
+
+    async def get(self, key: str) -> CacheEntry | None:
+        """Get cache entry from sqlite."""
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(
+        self, key: str, entry: CacheEntry, ttl_seconds: int | None = None
+    ) -> None:
+        """Set cache entry in sqlite."""
+        # Update expiration if TTL provided
+        if ttl_seconds is not None:
+            entry.expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
+
+        await asyncio.to_thread(self._set, key, entry)
+
+    async def delete(self, key: str) -> bool:
+        """Delete cache entry from sqlite."""
+        return await asyncio.to_thread(self._delete, key)
+
+    async def clear(self) -> None:
+        """Clear all cache entries from sqlite."""
+        await asyncio.to_thread(self._clear)
+
+    async def get_stats(self) -> dict[str, Any]:
+        """Get sqlite cache statistics."""
+        total_entries, total_size, total_hits, user_counts = await asyncio.to_thread(
+            self._totals
+        )
+        lookups = self._hits + self._misses
+
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "total_entries": total_entries,
+            "max_size": self.max_size,
+            "total_size_bytes": total_size,
+            "total_hits": total_hits,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "evictions": self._evictions,
+            "users": len(user_counts),
+            "entries_per_user": user_counts,
+            "utilization_percent": (total_entries / self.max_size) * 100
+            if self.max_size > 0
+            else 0,
+        }
+
+    async def get_all_entries(self) -> list[tuple[str, CacheEntry]]:
+        """Get all cache entries for similarity search."""
+        return await asyncio.to_thread(self._get_all_entries)
+
+    async def get_many(self, keys: list[str]) -> dict[str, CacheEntry]:
+        """Get live cache entries for the given keys in batched queries."""
+        return await asyncio.to_thread(self._get_many, keys)
+
+    async def get_user_keys(self, user_id: str) -> list[str]:
+        """Get the keys of all live entries of a user from the user index."""
+        return await asyncio.to_thread(self._get_user_keys, user_id)
+
+    async def get_user_version(self, user_id: str) -> int | None:
+        """Get the version counter of a user's entries."""
+        return await asyncio.to_thread(self._get_user_version, user_id)
+
+    async def clear_user_entries(self, user_id: str) -> int:
+        """Clear all entries for a specific user with an index range delete."""
+        return await asyncio.to_thread(self._clear_user_entries, user_id)
+
+    async def purge_expired(self) -> int:
+        """Remove expired entries and return how many were removed."""
+        return await asyncio.to_thread(self.reclaim_expired)
+
+    def reclaim_expired(self) -> int:
+        """Remove expired entries with an index range delete."""
+        with self._connection() as connection:
+            cursor = connection.execute(
+                "DELETE FROM cache_entries WHERE expires_at <= ?", (self._now(),)
+            )
+
+        if cursor.rowcount:
+            logger.debug(f"Cleaned {cursor.rowcount} expired cache entries")
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the connections of all threads."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        # Threads reconnect on their next call
+        self._local = threading.local()
+
+    # ===== Private Helpers =====
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the connection of the current thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _count(self) -> int:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE expires_at > ?",
+                (self._now(),),
+            )
+            .fetchone()
+        )
+        return row[0]
+
+    @staticmethod
+    def _decode(data: str, hit_count: int) -> CacheEntry:
+        entry = CacheEntry.from_dict(json.loads(data))
+        entry.hit_count = hit_count
+        return entry
+
+    def _get(self, key: str) -> CacheEntry | None:
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT data, hit_count FROM cache_entries WHERE key = ? AND expires_at > ?",
+            (key, self._now()),
+        ).fetchone()
+
+        if row is None:
+            with self._lock:
+                self._misses += 1
+            return None
+
+        # Update hit count
+        with connection:
+            connection.execute(
+                "UPDATE cache_entries SET hit_count = hit_count + 1 WHERE key = ?",
+                (key,),
+            )
+        with self._lock:
+            self._hits += 1
+        return self._decode(row[0], row[1] + 1)
+
+    def _set(self, key: str, entry: CacheEntry) -> None:
+        user_id = entry.user_id or "anonymous"
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(key, user_id, expires_at, hit_count, size_bytes, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    user_id,
+                    entry.expires_at.timestamp(),
+                    entry.hit_count,
+                    len(str(entry.response)),
+                    json.dumps(entry.to_dict(), default=str),
+                ),
+            )
+            connection.execute(self._BUMP_USER_VERSION, (user_id,))
+
+        # Replacements overcount, which only triggers an earlier exact recount
+        self._approximate_count += 1
+        if self._approximate_count > self.max_size:
+            self._enforce_max_size()
+
+    def _delete(self, key: str) -> bool:
+        with self._connection() as connection:
+            cursor = connection.execute(
+                "DELETE FROM cache_entries WHERE key = ?", (key,)
+            )
+        return cursor.rowcount > 0
+
+    def _clear(self) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM cache_entries")
+        self._approximate_count = 0
+
+    def _totals(self) -> tuple[int, int, int, dict[str, int]]:
+        """Get the entry count, size, hit count and entries per user."""
+        connection = self._connection()
+        now = self._now()
+        total_entries, total_size, total_hits = connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0), COALESCE(SUM(hit_count), 0) "
+            "FROM cache_entries WHERE expires_at > ?",
+            (now,),
+        ).fetchone()
+        user_counts = dict(
+            connection.execute(
+                "SELECT user_id, COUNT(*) FROM cache_entries "
+                "WHERE expires_at > ? GROUP BY user_id",
+                (now,),
+            ).fetchall()
+        )
+        return total_entries, total_size, total_hits, user_counts
+
+    def _get_all_entries(self) -> list[tuple[str, CacheEntry]]:
+        rows = self._connection().execute(
+            "SELECT key, data, hit_count FROM cache_entries WHERE expires_at > ?",
+            (self._now(),),
+        )
+        return [(key, self._decode(data, hits)) for key, data, hits in rows]
+
+    def _get_many(self, keys: list[str]) -> dict[str, CacheEntry]:
+        connection = self._connection()
+        now = self._now()
+        entries = {}
+        for start in range(0, len(keys), self._BATCH_SIZE):
+            batch = keys[start : start + self._BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            rows = connection.execute(
+                "SELECT key, data, hit_count FROM cache_entries "
+                f"WHERE key IN ({placeholders}) AND expires_at > ?",
+                (*batch, now),
+            )
+            for key, data, hits in rows:
+                entries[key] = self._decode(data, hits)
+        return entries
+
+    def _get_user_keys(self, user_id: str) -> list[str]:
+        rows = self._connection().execute(
+            "SELECT key FROM cache_entries WHERE user_id = ? AND expires_at > ?",
+            (user_id, self._now()),
+        )
+        return [key for (key,) in rows]
+
+    def _get_user_version(self, user_id: str) -> int:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT version FROM cache_user_versions WHERE user_id = ?",
+                (user_id,),
+            )
+            .fetchone()
+        )
+        return row[0] if row else 0
+
+    def _clear_user_entries(self, user_id: str) -> int:
+        with self._connection() as connection:
+            cursor = connection.execute(
+                "DELETE FROM cache_entries WHERE user_id = ?", (user_id,)
+            )
+            connection.execute(self._BUMP_USER_VERSION, (user_id,))
+        return cursor.rowcount
+
+    def _enforce_max_size(self) -> None:
+        """Evict the soonest expiring entries while the cache is over capacity."""
+        self.reclaim_expired()
+        count = self._count()
+        excess = count - self.max_size
+        if excess > 0:
+            with self._connection() as connection:
+                connection.execute(
+                    "DELETE FROM cache_entries WHERE key IN ("
+                    "SELECT key FROM cache_entries ORDER BY expires_at LIMIT ?)",
+                    (excess,),
+                )
+            with self._lock:
+                self._evictions += excess
+            count -= excess
+            logger.debug(f"Evicted {excess} cache entries")
+        self._approximate_count = count
+
+    @staticmethod
+    def _now() -> float:
+        return datetime.now().timestamp()
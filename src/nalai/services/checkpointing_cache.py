@@ -0,0 +1,368 @@
+"""
+Per-process read-through cache of checkpoint tuples.
+
+A chat turn reads the latest checkpoint of its thread several times: access
+validation, conversation metadata and LangGraph's own aget_tuple before the
+graph runs. CachedCheckpointSaver sits in front of any checkpoint saver and
+serves those repeated reads from memory, so a turn reaches the backend at
+most once before its first write. That saves a round trip per read when the
+backend is remote.
+
+Entries are kept per thread in least recently used order and hold the latest
+checkpoint tuple of each namespace plus a few older versions, keyed by
+checkpoint id. Every put, put_writes and delete_thread going through the
+cache invalidates the thread. A read that races with such a write is not
+cached, so the cache never serves a checkpoint older than the last write it
+saw. Writes made directly on the wrapped saver (background compaction) must
+call invalidate or clear.
+
+Writes of other processes sharing the backend do not go through the cache.
+When the wrapped saver counts the writes of each thread (get_thread_version,
+as the SQLite saver does), every cached thread is validated against that
+version, a single indexed query, before it is served. Savers shared between
+processes without thread versions must not be cached.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+
+from .checkpointing_serde import (
+    MessagesHeader,
+    aread_messages_header,
+    read_messages_header,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CachedThread:
+    """Cached checkpoint tuples of one thread."""
+
+    # checkpoint_ns -> checkpoint id of the latest checkpoint
+    latest: dict[str, str] = field(default_factory=dict)
+    # (checkpoint_ns, checkpoint id) -> tuple, least recently used first
+    versions: OrderedDict[tuple[str, str], CheckpointTuple] = field(
+        default_factory=OrderedDict
+    )
+    # Version of the thread in the wrapped saver, read before the tuples
+    thread_version: int | None = None
+
+
+class CachedCheckpointSaver(BaseCheckpointSaver):
+    """Checkpoint saver caching the checkpoint tuples read from another saver."""
+
+    def __init__(
+        self, saver: BaseCheckpointSaver, max_threads: int, max_versions: int = 4
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            saver: Checkpoint saver to read through and write to
+            max_threads: Threads kept in the cache
+            max_versions: Checkpoint versions kept per thread
+        """
+        super().__init__(serde=saver.serde)
+        self.saver = saver
+        self.max_threads = max_threads
+        self.max_versions = max_versions
+        self._threads: OrderedDict[str, _CachedThread] = OrderedDict()
+        # Reads in flight per thread; invalidation drops their token
+        self._pending: dict[str, object] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._stale = 0
+
+    def __getattr__(self, name: str) -> Any:
+        # Backend extras (storage, count_checkpoints, ...) pass through
+        if name == "saver":
+            raise AttributeError(name)
+        return getattr(self.saver, name)
+
+    @property
+    def config_specs(self) -> list:
+        """Configuration options of the wrapped saver."""
+        return self.saver.config_specs
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Get a checkpoint tuple from the cache or the wrapped saver."""
+        thread_version = None
+        if hasattr(self.saver, "get_thread_version"):
+            thread_version = self.saver.get_thread_version(_thread_id(config))
+        cached, token = self._lookup(config, thread_version)
+        if token is None:
+            return cached
+        return self._store(config, token, self.saver.get_tuple(config), thread_version)
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Async version of get_tuple."""
+        thread_version = None
+        if hasattr(self.saver, "get_thread_version"):
+            thread_version = await asyncio.to_thread(
+                self.saver.get_thread_version, _thread_id(config)
+            )
+        cached, token = self._lookup(config, thread_version)
+        if token is None:
+            return cached
+        return self._store(
+            config, token, await self.saver.aget_tuple(config), thread_version
+        )
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List checkpoints of the wrapped saver."""
+        return self.saver.list(config, filter=filter, before=before, limit=limit)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Async version of list."""
+        async for checkpoint_tuple in self.saver.alist(
+            config, filter=filter, before=before, limit=limit
+        ):
+            yield checkpoint_tuple
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Store a checkpoint and invalidate its thread."""
+        try:
+            return self.saver.put(config, checkpoint, metadata, new_versions)
+        finally:
+            self.invalidate(_thread_id(config))
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Async version of put."""
+        try:
+            return await self.saver.aput(config, checkpoint, metadata, new_versions)
+        finally:
+            self.invalidate(_thread_id(config))
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Store pending writes and invalidate their thread."""
+        try:
+            self.saver.put_writes(config, writes, task_id, task_path)
+        finally:
+            self.invalidate(_thread_id(config))
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Async version of put_writes."""
+        try:
+            await self.saver.aput_writes(config, writes, task_id, task_path)
+        finally:
+            self.invalidate(_thread_id(config))
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete a thread and drop it from the cache."""
+        try:
+            self.saver.delete_thread(thread_id)
+        finally:
+            self.invalidate(thread_id)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Async version of delete_thread."""
+        try:
+            await self.saver.adelete_thread(thread_id)
+        finally:
+            self.invalidate(thread_id)
+
+    def get_next_version(self, current: Any, channel: Any) -> Any:
+        """Get the next channel version from the wrapped saver."""
+        return self.saver.get_next_version(current, channel)
+
+    def get_messages_header(self, config: RunnableConfig) -> MessagesHeader | None:
+        """Read a message channel header from the wrapped saver."""
+        return read_messages_header(self.saver, config)
+
+    async def aget_messages_header(
+        self, config: RunnableConfig
+    ) -> MessagesHeader | None:
+        """Async version of get_messages_header."""
+        return await aread_messages_header(self.saver, config)
+
+    def invalidate(self, thread_id: str) -> None:
+        """Drop a thread from the cache, including reads still in flight."""
+        with self._lock:
+            self._threads.pop(thread_id, None)
+            self._pending.pop(thread_id, None)
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every thread from the cache."""
+        with self._lock:
+            self._threads.clear()
+            self._pending.clear()
+            self._invalidations += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            return {
+                "max_threads": self.max_threads,
+                "max_versions": self.max_versions,
+                "threads": len(self._threads),
+                "checkpoints": sum(len(t.versions) for t in self._threads.values()),
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+                "stale": self._stale,
+            }
+
+    # ===== Private Helpers =====
+
+    def _lookup(
+        self, config: RunnableConfig, thread_version: int | None = None
+    ) -> tuple[CheckpointTuple | None, object | None]:
+        """
+        Look up a checkpoint tuple in the cache.
+
+        Args:
+            config: LangGraph configuration with thread_id
+            thread_version: Current version of the thread in the wrapped
+                saver; a cached thread of another version is dropped
+
+        Returns:
+            A copy of the cached tuple and None on a hit, or None and the
+            token to store the backend read with on a miss
+        """
+        thread_id = _thread_id(config)
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        with self._lock:
+            cached = self._threads.get(thread_id)
+            if cached is not None and cached.thread_version != thread_version:
+                # Written by another process sharing the backend
+                del self._threads[thread_id]
+                self._stale += 1
+                cached = None
+            if cached is not None:
+                checkpoint_id = get_checkpoint_id(config) or cached.latest.get(
+                    checkpoint_ns
+                )
+                key = (checkpoint_ns, checkpoint_id)
+                if key in cached.versions:
+                    self._hits += 1
+                    cached.versions.move_to_end(key)
+                    self._threads.move_to_end(thread_id)
+                    return _copy_tuple(cached.versions[key]), None
+            self._misses += 1
+            # Concurrent misses of a thread replace the token; only the
+            # last read started is cached
+            token = self._pending[thread_id] = object()
+            return None, token
+
+    def _store(
+        self,
+        config: RunnableConfig,
+        token: object,
+        checkpoint_tuple: CheckpointTuple | None,
+        thread_version: int | None = None,
+    ) -> CheckpointTuple | None:
+        """Cache a backend read unless its thread was written meanwhile."""
+        if checkpoint_tuple is None:
+            return None
+        thread_id = _thread_id(config)
+        with self._lock:
+            if self._pending.get(thread_id) is not token:
+                return checkpoint_tuple
+            del self._pending[thread_id]
+
+            stored = checkpoint_tuple.config["configurable"]
+            checkpoint_ns = stored.get("checkpoint_ns", "")
+            key = (checkpoint_ns, stored["checkpoint_id"])
+            cached = self._threads.get(thread_id)
+            if cached is None or cached.thread_version != thread_version:
+                cached = self._threads[thread_id] = _CachedThread(
+                    thread_version=thread_version
+                )
+            self._threads.move_to_end(thread_id)
+            cached.versions[key] = checkpoint_tuple
+            cached.versions.move_to_end(key)
+            if get_checkpoint_id(config) is None:
+                cached.latest[checkpoint_ns] = key[1]
+
+            latest = set(cached.latest.items())
+            for old in [k for k in cached.versions if k not in latest]:
+                if len(cached.versions) <= self.max_versions:
+                    break
+                del cached.versions[old]
+            while len(self._threads) > self.max_threads:
+                self._threads.popitem(last=False)
+        return _copy_tuple(checkpoint_tuple)
+
+
+def _thread_id(config: RunnableConfig) -> str:
+    """Get the thread id of a config."""
+    return str(config["configurable"]["thread_id"])
+
+
+def _copy_tuple(checkpoint_tuple: CheckpointTuple) -> CheckpointTuple:
+    """Copy a checkpoint tuple so callers cannot mutate the cached one."""
+    checkpoint = {
+        key: value.copy() if isinstance(value, dict | list) else value
+        for key, value in checkpoint_tuple.checkpoint.items()
+    }
+    if isinstance(checkpoint.get("versions_seen"), dict):
+        checkpoint["versions_seen"] = {
+            node: dict(versions)
+            for node, versions in checkpoint["versions_seen"].items()
+        }
+    return checkpoint_tuple._replace(
+        checkpoint=checkpoint,
+        metadata=dict(checkpoint_tuple.metadata or {}),
+        pending_writes=(
+            list(checkpoint_tuple.pending_writes)
+            if checkpoint_tuple.pending_writes is not None
+            else None
+        ),
+    )
@@ -0,0 +1,424 @@
+"""
+Compaction of LangGraph checkpoints.
+
+Checkpoint savers keep every super-step of every thread, so their storage
+only grows unless it is compacted. A compaction pass applies a
+CompactionPolicy:
+
+- threads whose latest checkpoint is older than max_age_hours are deleted,
+  as are the older checkpoints of live threads
+- only the keep_latest newest checkpoints of each thread are kept
+- while the store exceeds max_bytes, the least recently updated threads
+  are deleted
+
+Checkpoints with a pending interrupt (interrupt writes and no child
+checkpoint yet) are never reclaimed, and neither are their threads, so an
+interrupted conversation can always be resumed.
+
+CheckpointCompactor runs passes periodically on the event loop and keeps
+metrics of the reclaimed items and the time spent.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.constants import INTERRUPT
+
+logger = logging.getLogger(__name__)
+
+# (thread_id, checkpoint_ns, checkpoint_id)
+CheckpointKey = tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class CompactionPolicy:
+    """Limits applied by a compaction pass; None disables a limit."""
+
+    max_age_hours: float | None = None
+    keep_latest: int | None = None
+    max_bytes: int | None = None
+
+
+@dataclass
+class CompactionResult:
+    """Outcome of one compaction pass."""
+
+    checkpoints_reclaimed: int = 0
+    bytes_reclaimed: int = 0
+    threads_reclaimed: list[str] = field(default_factory=list)
+    duration_seconds: float = 0.0
+
+
+@dataclass(frozen=True)
+class CheckpointRecord:
+    """What compaction needs to know about one stored checkpoint."""
+
+    thread_id: str
+    checkpoint_ns: str
+    checkpoint_id: str
+    parent_checkpoint_id: str | None
+    timestamp: float
+    interrupted: bool
+
+    @property
+    def key(self) -> CheckpointKey:
+        return (self.thread_id, self.checkpoint_ns, self.checkpoint_id)
+
+
+def pending_interrupts(records: Iterable[CheckpointRecord]) -> set[CheckpointKey]:
+    """Get the checkpoints with interrupt writes that were not resumed yet."""
+    records = list(records)
+    parents = {
+        (record.thread_id, record.checkpoint_ns, record.parent_checkpoint_id)
+        for record in records
+        if record.parent_checkpoint_id
+    }
+    return {
+        record.key
+        for record in records
+        if record.interrupted and record.key not in parents
+    }
+
+
+def select_expired(
+    records: Iterable[CheckpointRecord],
+    policy: CompactionPolicy,
+    now: float | None = None,
+) -> list[CheckpointKey]:
+    """
+    Select the checkpoints reclaimed by the age and keep_latest limits.
+
+    The latest checkpoint of a live thread and pending interrupts are kept.
+    """
+    records = list(records)
+    protected = pending_interrupts(records)
+    cutoff = (
+        (now or time.time()) - policy.max_age_hours * 3600
+        if policy.max_age_hours is not None
+        else None
+    )
+
+    threads: dict[str, list[CheckpointRecord]] = defaultdict(list)
+    for record in records:
+        threads[record.thread_id].append(record)
+
+    expired = []
+    for thread_records in threads.values():
+        keys = {record.key for record in thread_records}
+        latest = max(record.timestamp for record in thread_records)
+        if cutoff is not None and latest < cutoff and not keys & protected:
+            expired.extend(record.key for record in thread_records)
+            continue
+
+        namespaces: dict[str, list[CheckpointRecord]] = defaultdict(list)
+        for record in thread_records:
+            namespaces[record.checkpoint_ns].append(record)
+        for namespace_records in namespaces.values():
+            namespace_records.sort(key=lambda r: r.checkpoint_id, reverse=True)
+            for position, record in enumerate(namespace_records[1:], start=1):
+                if record.key in protected:
+                    continue
+                if (policy.keep_latest and position >= policy.keep_latest) or (
+                    cutoff is not None and record.timestamp < cutoff
+                ):
+                    expired.append(record.key)
+    return expired
+
+
+def select_over_budget(
+    usage: dict[str, tuple[float, int]],
+    max_bytes: int,
+    protected_threads: set[str],
+) -> list[str]:
+    """
+    Select the least recently updated threads to delete to fit a byte budget.
+
+    Args:
+        usage: thread_id -> (last update timestamp, stored bytes)
+        max_bytes: Byte budget of the store
+        protected_threads: Threads that must not be deleted
+
+    Returns:
+        Thread ids to delete, least recently updated first
+    """
+    total = sum(size for _, size in usage.values())
+    evicted = []
+    for thread_id, (_, size) in sorted(usage.items(), key=lambda item: item[1][0]):
+        if total <= max_bytes:
+            break
+        if thread_id in protected_threads:
+            continue
+        evicted.append(thread_id)
+        total -= size
+    return evicted
+
+
+def compact_memory_saver(
+    saver: InMemorySaver, policy: CompactionPolicy, now: float | None = None
+) -> CompactionResult:
+    """
+    Compact the checkpoints of a MemorySaver.
+
+    MemorySaver mutates its dicts on the caller's thread, so this runs on the
+    event loop, or in a worker thread holding the lock of a LockedMemorySaver.
+    """
+    started = time.perf_counter()
+    size_before = _memory_usage(saver)
+    records = _memory_records(saver)
+    expired = select_expired(records, policy, now)
+    touched = _delete_memory_checkpoints(saver, expired)
+    reclaimed = len(expired)
+
+    if policy.max_bytes is not None:
+        usage = _memory_usage_by_thread(saver)
+        if sum(size for _, size in usage.values()) > policy.max_bytes:
+            protected = {key[0] for key in pending_interrupts(_memory_records(saver))}
+            for thread_id in select_over_budget(usage, policy.max_bytes, protected):
+                reclaimed += sum(
+                    len(checkpoints)
+                    for checkpoints in saver.storage.get(thread_id, {}).values()
+                )
+                saver.delete_thread(thread_id)
+                touched.add(thread_id)
+
+    return CompactionResult(
+        checkpoints_reclaimed=reclaimed,
+        bytes_reclaimed=max(size_before - _memory_usage(saver), 0),
+        threads_reclaimed=sorted(
+            thread_id for thread_id in touched if thread_id not in saver.storage
+        ),
+        duration_seconds=time.perf_counter() - started,
+    )
+
+
+def compact_checkpointer(
+    checkpointer: BaseCheckpointSaver, policy: CompactionPolicy
+) -> CompactionResult:
+    """Compact a checkpoint saver that supports compaction."""
+    if hasattr(checkpointer, "compact"):
+        return checkpointer.compact(policy)
+    if isinstance(checkpointer, InMemorySaver):
+        return compact_memory_saver(checkpointer, policy)
+    logger.warning(
+        f"Checkpointer {type(checkpointer).__name__} does not support compaction"
+    )
+    return CompactionResult()
+
+
+class CheckpointCompactor:
+    """Periodic background compaction of checkpoints with metrics."""
+
+    def __init__(
+        self,
+        compact: Callable[[CompactionPolicy], Awaitable[CompactionResult]],
+        policy: CompactionPolicy,
+        interval_seconds: float,
+    ):
+        """
+        Initialize the compactor.
+
+        Args:
+            compact: Coroutine function running one compaction pass
+            policy: Limits applied by each pass
+            interval_seconds: Seconds between passes
+        """
+        self.compact = compact
+        self.policy = policy
+        self.interval_seconds = interval_seconds
+        self._task: asyncio.Task | None = None
+        self._metrics: dict[str, Any] = {
+            "runs": 0,
+            "failures": 0,
+            "checkpoints_reclaimed": 0,
+            "threads_reclaimed": 0,
+            "bytes_reclaimed": 0,
+            "total_seconds": 0.0,
+            "last_run_seconds": None,
+            "last_run_at": None,
+            "last_error": None,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start periodic compaction on the running event loop."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="checkpoint-compaction")
+            logger.info(
+                f"Checkpoint compaction started (every {self.interval_seconds}s)"
+            )
+
+    async def stop(self) -> None:
+        """Stop periodic compaction and wait for the current pass to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Checkpoint compaction stopped")
+
+    async def run_once(self) -> CompactionResult:
+        """Run one compaction pass and record its metrics."""
+        started = time.perf_counter()
+        try:
+            result = await self.compact(self.policy)
+        except Exception as e:
+            self._metrics["failures"] += 1
+            self._metrics["last_error"] = str(e)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self._metrics["runs"] += 1
+            self._metrics["total_seconds"] += elapsed
+            self._metrics["last_run_seconds"] = elapsed
+            self._metrics["last_run_at"] = datetime.now().isoformat()
+
+        self._metrics["checkpoints_reclaimed"] += result.checkpoints_reclaimed
+        self._metrics["threads_reclaimed"] += len(result.threads_reclaimed)
+        self._metrics["bytes_reclaimed"] += result.bytes_reclaimed
+        self._metrics["last_error"] = None
+        if result.checkpoints_reclaimed:
+            logger.info(
+                f"Compaction reclaimed {result.checkpoints_reclaimed} checkpoints, "
+                f"{len(result.threads_reclaimed)} threads and "
+                f"{result.bytes_reclaimed} bytes in {elapsed:.3f}s"
+            )
+        return result
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Get cumulative compaction metrics."""
+        return {
+            **self._metrics,
+            "running": self.running,
+            "interval_seconds": self.interval_seconds,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Checkpoint compaction failed: {e}")
+
+
+# ===== MemorySaver Helpers =====
+
+
+def _memory_records(saver: InMemorySaver) -> list[CheckpointRecord]:
+    records = []
+    for thread_id, namespaces in list(saver.storage.items()):
+        for checkpoint_ns, checkpoints in list(namespaces.items()):
+            for checkpoint_id, (checkpoint, _, parent) in list(checkpoints.items()):
+                writes = saver.writes.get((thread_id, checkpoint_ns, checkpoint_id), {})
+                records.append(
+                    CheckpointRecord(
+                        thread_id=thread_id,
+                        checkpoint_ns=checkpoint_ns,
+                        checkpoint_id=checkpoint_id,
+                        parent_checkpoint_id=parent,
+                        timestamp=_timestamp(saver.serde.loads_typed(checkpoint)),
+                        interrupted=any(
+                            write[1] == INTERRUPT for write in list(writes.values())
+                        ),
+                    )
+                )
+    return records
+
+
+def _delete_memory_checkpoints(
+    saver: InMemorySaver, keys: list[CheckpointKey]
+) -> set[str]:
+    """Delete checkpoints, their writes and unreferenced blobs; return threads."""
+    namespaces = set()
+    for thread_id, checkpoint_ns, checkpoint_id in keys:
+        saver.storage.get(thread_id, {}).get(checkpoint_ns, {}).pop(checkpoint_id, None)
+        saver.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+        namespaces.add((thread_id, checkpoint_ns))
+
+    for thread_id, checkpoint_ns in namespaces:
+        checkpoints = saver.storage.get(thread_id, {}).get(checkpoint_ns, {})
+        referenced = {
+            (channel, version)
+            for checkpoint, _, _ in list(checkpoints.values())
+            for channel, version in saver.serde.loads_typed(checkpoint)[
+                "channel_versions"
+            ].items()
+        }
+        for key in list(saver.blobs.keys()):
+            if key[:2] == (thread_id, checkpoint_ns) and key[2:] not in referenced:
+                saver.blobs.pop(key, None)
+        if not checkpoints and thread_id in saver.storage:
+            saver.storage[thread_id].pop(checkpoint_ns, None)
+            if not saver.storage[thread_id]:
+                del saver.storage[thread_id]
+    return {thread_id for thread_id, _ in namespaces}
+
+
+def _memory_usage_by_thread(saver: InMemorySaver) -> dict[str, tuple[float, int]]:
+    usage: dict[str, tuple[float, int]] = {}
+    for thread_id, namespaces in list(saver.storage.items()):
+        latest, size = 0.0, 0
+        for checkpoints in list(namespaces.values()):
+            for checkpoint, metadata, _ in list(checkpoints.values()):
+                latest = max(latest, _timestamp(saver.serde.loads_typed(checkpoint)))
+                size += _typed_size(checkpoint) + _typed_size(metadata)
+        usage[thread_id] = (latest, size)
+    for key, blob in list(saver.blobs.items()):
+        if key[0] in usage:
+            latest, size = usage[key[0]]
+            usage[key[0]] = (latest, size + _typed_size(blob))
+    for key, writes in list(saver.writes.items()):
+        if key[0] in usage:
+            latest, size = usage[key[0]]
+            usage[key[0]] = (
+                latest,
+                size + sum(_typed_size(write[2]) for write in list(writes.values())),
+            )
+    return usage
+
+
+def _memory_usage(saver: InMemorySaver) -> int:
+    return (
+        sum(
+            _typed_size(checkpoint) + _typed_size(metadata)
+            for namespaces in list(saver.storage.values())
+            for checkpoints in list(namespaces.values())
+            for checkpoint, metadata, _ in list(checkpoints.values())
+        )
+        + sum(_typed_size(blob) for blob in list(saver.blobs.values()))
+        + sum(
+            _typed_size(write[2])
+            for writes in list(saver.writes.values())
+            for write in list(writes.values())
+        )
+    )
+
+
+def _typed_size(value: tuple[str, bytes] | Any) -> int:
+    """Get the byte size of a serde (type, data) pair."""
+    try:
+        return len(value[1] or b"")
+    except (IndexError, TypeError):
+        return 0
+
+
+def _timestamp(checkpoint: dict[str, Any]) -> float:
+    """Get the checkpoint timestamp as epoch seconds."""
+    try:
+        return datetime.fromisoformat(checkpoint["ts"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return time.time()
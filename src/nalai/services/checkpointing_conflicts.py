@@ -0,0 +1,19 @@
+"""
+Conflict detection between processes writing the same conversation.
+
+Checkpoint savers shared by several processes can make the checkpoint
+writes of a turn conditional: a put whose config sets CHECKPOINT_CAS_KEY
+is a compare-and-set on the checkpoint it continues from, and fails with
+CheckpointConflictError once another process moved the thread past it.
+Savers without shared state ignore the key.
+"""
+
+# Configurable key making put a compare-and-set on the parent checkpoint id;
+# LangGraph does not copy dunder keys into checkpoint metadata
+CHECKPOINT_CAS_KEY = "__checkpoint_cas"
+
+
+class CheckpointConflictError(Exception):
+    """Raised when a thread moved past the checkpoint a put continues from."""
+
+    pass
@@ -0,0 +1,167 @@
+"""
+Thread-safe in-memory checkpoint saver.
+
+LangGraph's MemorySaver mutates its dicts on the caller's thread, and its
+async methods run on the event loop, so compacting it in a worker thread
+would race with graph runs. LockedMemorySaver guards its state with a lock
+and runs its async methods in worker threads, so a compaction pass holding
+the lock runs off the event loop without blocking it.
+"""
+
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+from .checkpointing_compaction import (
+    CompactionPolicy,
+    CompactionResult,
+    compact_memory_saver,
+)
+from .checkpointing_serde import MessagesHeader, memory_messages_header
+
+
+class LockedMemorySaver(InMemorySaver):
+    """MemorySaver whose reads, writes and compaction hold a lock."""
+
+    def __init__(self, *, serde=None):
+        """
+        Initialize the saver.
+
+        Args:
+            serde: Serializer of checkpoints, metadata and channel values
+        """
+        super().__init__(serde=serde)
+        self._lock = threading.RLock()
+
+    # ===== Checkpointer API =====
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Get a checkpoint tuple."""
+        with self._lock:
+            return super().get_tuple(config)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List checkpoints of a snapshot taken under the lock."""
+        with self._lock:
+            results = [*super().list(config, filter=filter, before=before, limit=limit)]
+        yield from results
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint."""
+        with self._lock:
+            return super().put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Save pending writes."""
+        with self._lock:
+            super().put_writes(config, writes, task_id, task_path)
+
+    def get_messages_header(self, config: RunnableConfig) -> MessagesHeader | None:
+        """Read a message channel header without decoding the messages."""
+        with self._lock:
+            return memory_messages_header(self, config)
+
+    def list_thread_ids(self) -> Sequence[str]:
+        """Get the ids of the stored threads."""
+        with self._lock:
+            return [*self.storage]
+
+    def count_checkpoints(self, thread_id: str) -> int:
+        """Count the checkpoints of a thread."""
+        with self._lock:
+            namespaces = self.storage.get(thread_id, {})
+            return sum(len(checkpoints) for checkpoints in namespaces.values())
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete a thread."""
+        with self._lock:
+            super().delete_thread(thread_id)
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Async version of get_tuple."""
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Async version of list."""
+        checkpoint_tuples = self.list(config, filter=filter, before=before, limit=limit)
+        while (
+            checkpoint_tuple := await asyncio.to_thread(next, checkpoint_tuples, None)
+        ) is not None:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Async version of put."""
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Async version of put_writes."""
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def aget_messages_header(
+        self, config: RunnableConfig
+    ) -> MessagesHeader | None:
+        """Async version of get_messages_header."""
+        return await asyncio.to_thread(self.get_messages_header, config)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Async version of delete_thread."""
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    # ===== Compaction =====
+
+    def compact(
+        self, policy: CompactionPolicy, now: float | None = None
+    ) -> CompactionResult:
+        """Compact the stored checkpoints while holding the lock."""
+        with self._lock:
+            return compact_memory_saver(self, policy, now)
@@ -0,0 +1,231 @@
+"""
+Compact checkpoint serializer with header-only reads of message channels.
+
+CompactSerializer is LangGraph's JsonPlusSerializer with a binary fast path
+for message lists, the values of the growing "messages" channel. Instead of
+one pydantic extension per message carrying its module, class name and every
+field, each message is stored as its type plus the fields that differ from
+their defaults, all in one msgpack document.
+
+The encoded list is prefixed with a small header holding the message count
+and the first human message text, so conversation listings can read them
+without decoding the messages. Every other value, and data written by the
+default serializer, goes through JsonPlusSerializer unchanged, so the
+compact serializer reads checkpoints written by either one.
+
+LangGraph's own serializer cannot decode compact message lists, so the
+"default" setting writes with JsonPlusSerializer but keeps the compact
+decoder: switching back from "compact" keeps existing checkpoints readable.
+"""
+
+import logging
+import struct
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import ormsgpack
+from langchain_core.messages import BaseMessage, HumanMessage, messages_from_dict
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, get_checkpoint_id
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+logger = logging.getLogger(__name__)
+
+MESSAGES_TYPE = "msgpack+messages"
+PREVIEW_LENGTH = 256
+
+# Message types messages_from_dict can rebuild
+_MESSAGE_TYPES = frozenset(
+    {
+        "human",
+        "ai",
+        "system",
+        "chat",
+        "function",
+        "tool",
+        "remove",
+        "HumanMessageChunk",
+        "AIMessageChunk",
+        "SystemMessageChunk",
+        "ChatMessageChunk",
+        "FunctionMessageChunk",
+        "ToolMessageChunk",
+    }
+)
+_HEADER_LENGTH = struct.Struct(">I")
+
+
+@dataclass
+class MessagesHeader:
+    """Summary of the message channel of a checkpoint."""
+
+    message_count: int
+    preview: str | None
+    last_timestamp: str | None
+    checkpoint: dict[str, Any]
+
+
+class CompactSerializer(JsonPlusSerializer):
+    """JsonPlusSerializer storing message lists compactly behind a header."""
+
+    def __init__(self, *args: Any, compact_writes: bool = True, **kwargs: Any):
+        """
+        Initialize the serializer.
+
+        Args:
+            compact_writes: Whether message lists are written compactly; if
+                False, only reading compact message lists is supported
+        """
+        super().__init__(*args, **kwargs)
+        self.compact_writes = compact_writes
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        """Serialize a value, using the compact encoding for message lists."""
+        if self.compact_writes and _is_message_list(obj):
+            body_type, body = super().dumps_typed(
+                [_dump_message(message) for message in obj]
+            )
+            if body_type == "msgpack":
+                header = ormsgpack.packb(messages_header(obj))
+                return MESSAGES_TYPE, _HEADER_LENGTH.pack(len(header)) + header + body
+        return super().dumps_typed(obj)
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        """Deserialize a value written by this or the default serializer."""
+        if data[0] == MESSAGES_TYPE:
+            (length,) = _HEADER_LENGTH.unpack_from(data[1])
+            body = data[1][_HEADER_LENGTH.size + length :]
+            return messages_from_dict(
+                [
+                    {"type": dumped.pop("type"), "data": dumped}
+                    for dumped in super().loads_typed(("msgpack", body))
+                ]
+            )
+        return super().loads_typed(data)
+
+
+def get_serde(name: str) -> JsonPlusSerializer:
+    """
+    Get a checkpoint serializer by name.
+
+    Args:
+        name: "default" for LangGraph's encoding or "compact"
+
+    Returns:
+        The serializer; both read compact message lists
+    """
+    if name == "compact":
+        return CompactSerializer()
+    if name == "default":
+        return CompactSerializer(compact_writes=False)
+    raise ValueError(f"Unsupported checkpoint serializer: {name}")
+
+
+def messages_header(messages: Sequence[BaseMessage]) -> dict[str, Any]:
+    """Get the header of a message list."""
+    return {"count": len(messages), "preview": message_preview(messages)}
+
+
+def message_preview(messages: Sequence[BaseMessage]) -> str | None:
+    """Get the text of the first human message, or of the first message."""
+    first = next((m for m in messages if getattr(m, "content", None)), None)
+    human = next(
+        (m for m in messages if isinstance(m, HumanMessage) and m.content), first
+    )
+    return str(human.content)[:PREVIEW_LENGTH] if human else None
+
+
+def load_header(data: tuple[str, bytes | None]) -> dict[str, Any] | None:
+    """
+    Read the header of a serialized message list without decoding it.
+
+    Returns:
+        The header, or None if the value was not written by CompactSerializer
+    """
+    if data[0] != MESSAGES_TYPE or not data[1]:
+        return None
+    (length,) = _HEADER_LENGTH.unpack_from(data[1])
+    return ormsgpack.unpackb(
+        data[1][_HEADER_LENGTH.size : _HEADER_LENGTH.size + length]
+    )
+
+
+def read_messages_header(
+    checkpointer: BaseCheckpointSaver, config: RunnableConfig
+) -> MessagesHeader | None:
+    """
+    Read the message channel header of a thread's latest or given checkpoint.
+
+    Returns:
+        The header, or None if the checkpointer or the stored value does not
+        support header-only reads and the checkpoint must be loaded instead
+    """
+    if hasattr(checkpointer, "get_messages_header"):
+        return checkpointer.get_messages_header(config)
+    if isinstance(checkpointer, InMemorySaver):
+        return memory_messages_header(checkpointer, config)
+    return None
+
+
+async def aread_messages_header(
+    checkpointer: BaseCheckpointSaver, config: RunnableConfig
+) -> MessagesHeader | None:
+    """Async version of read_messages_header."""
+    if hasattr(checkpointer, "aget_messages_header"):
+        return await checkpointer.aget_messages_header(config)
+    return read_messages_header(checkpointer, config)
+
+
+def memory_messages_header(
+    saver: InMemorySaver, config: RunnableConfig, channel: str = "messages"
+) -> MessagesHeader | None:
+    """Read the message channel header of a checkpoint kept by a MemorySaver."""
+    configurable = config["configurable"]
+    thread_id = configurable["thread_id"]
+    checkpoint_ns = configurable.get("checkpoint_ns", "")
+    # Avoid creating empty defaultdict entries for unknown threads
+    checkpoints = saver.storage.get(thread_id, {}).get(checkpoint_ns)
+    if not checkpoints:
+        return None
+    checkpoint_id = get_checkpoint_id(config) or max(checkpoints)
+    if checkpoint_id not in checkpoints:
+        return None
+
+    checkpoint = saver.serde.loads_typed(checkpoints[checkpoint_id][0])
+    version = checkpoint["channel_versions"].get(channel)
+    if version is None:
+        header = {"count": 0, "preview": None}
+    else:
+        blob = saver.blobs.get((thread_id, checkpoint_ns, channel, version))
+        header = load_header(blob) if blob else None
+    if header is None:
+        return None
+    return MessagesHeader(
+        message_count=header["count"],
+        preview=header["preview"],
+        last_timestamp=checkpoint.get("ts"),
+        checkpoint=checkpoint,
+    )
+
+
+def _is_message_list(value: Any) -> bool:
+    """Check that a value is a non-empty list of built-in message classes."""
+    return (
+        isinstance(value, list)
+        and bool(value)
+        and all(
+            isinstance(message, BaseMessage)
+            and message.type in _MESSAGE_TYPES
+            and type(message).__module__.startswith("langchain_core.messages")
+            for message in value
+        )
+    )
+
+
+def _dump_message(message: BaseMessage) -> dict[str, Any]:
+    """Dump a message as its type and the fields differing from defaults."""
+    dumped = message.model_dump(exclude_defaults=True)
+    dumped["type"] = message.type
+    return dumped
@@ -9,16 +9,25 @@ import asyncio
 import logging
 import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from contextlib import asynccontextmanager
 from typing import Any
 
-# Import actual LangGraph checkpointers
-from langgraph.checkpoint.memory import MemorySaver
-
 # Note: Other checkpointers (PostgresSaver, RedisSaver) are not available in this version
 # They will fall back to MemorySaver when requested
 from ..config import settings
 from ..core.services import CheckpointingService as CheckpointingServiceProtocol
+from .checkpointing_cache import CachedCheckpointSaver
+from .checkpointing_compaction import (
+    CheckpointCompactor,
+    CompactionPolicy,
+    CompactionResult,
+    compact_checkpointer,
+)
+from .checkpointing_memory import LockedMemorySaver
+from .checkpointing_serde import get_serde
+from .checkpointing_spill import SpillingMemorySaver
+from .checkpointing_sqlite import SQLiteCheckpointSaver
 
 logger = logging.getLogger(__name__)
 
@@ -58,13 +67,35 @@ class CheckpointingBackend(ABC):
         """Clean up old checkpoints and return count of cleaned items."""
         pass
 
+    async def compact(self, policy: CompactionPolicy) -> CompactionResult:
+        """Reclaim checkpoints according to a compaction policy."""
+        checkpointer = self.get_checkpointer()
+        if isinstance(checkpointer, LockedMemorySaver):
+            # The saver locks its state, so compact it off the event loop
+            return await asyncio.to_thread(checkpointer.compact, policy)
+        # Plain MemorySavers are mutated on the event loop, so compact them there
+        return compact_checkpointer(checkpointer, policy)
+
 
 class MemoryCheckpointingBackend(CheckpointingBackend):
     """In-memory checkpointing backend using LangGraph's MemorySaver."""
 
-    def __init__(self):
-        """Initialize in-memory checkpointing backend."""
-        self.checkpointer = MemorySaver()
+    def __init__(self, max_bytes: int = 0, spill_path: str | None = None, serde=None):
+        """
+        Initialize in-memory checkpointing backend.
+
+        Args:
+            max_bytes: Bytes kept in memory before idle threads are spilled to
+                spill_path (0 keeps everything in memory)
+            spill_path: Directory of spilled threads
+            serde: Serializer of checkpoints (LangGraph's default if None)
+        """
+        if max_bytes > 0:
+            self.checkpointer = SpillingMemorySaver(
+                max_bytes, spill_path or settings.checkpointing_spill_path, serde=serde
+            )
+        else:
+            self.checkpointer = LockedMemorySaver(serde=serde)
         self._last_health_check = time.time()
         logger.debug("In-memory checkpointing backend initialized")
 
@@ -74,14 +105,16 @@ class MemoryCheckpointingBackend(CheckpointingBackend):
 
     async def get_stats(self) -> dict[str, Any]:
         """Get checkpointing statistics."""
-        # MemorySaver doesn't provide statistics, so we return basic info
-        return {
+        stats = {
             "backend": "memory",
             "type": "in_memory",
             "description": "LangGraph MemorySaver - in-memory checkpointing",
             "health_status": "healthy",
             "last_health_check": self._last_health_check,
         }
+        if isinstance(self.checkpointer, SpillingMemorySaver):
+            stats["spill"] = self.checkpointer.get_stats()
+        return stats
 
     async def health_check(self) -> bool:
         """Check if the backend is healthy."""
@@ -95,9 +128,58 @@ class MemoryCheckpointingBackend(CheckpointingBackend):
 
     async def cleanup_old_checkpoints(self, max_age_hours: int = 24) -> int:
         """Clean up old checkpoints and return count of cleaned items."""
-        # Memory backend doesn't support cleanup - data is ephemeral
-        logger.debug("Memory backend cleanup not supported - data is ephemeral")
-        return 0
+        result = await self.compact(CompactionPolicy(max_age_hours=max_age_hours))
+        return result.checkpoints_reclaimed
+
+
+class SQLiteCheckpointingBackend(CheckpointingBackend):
+    """Durable checkpointing backend on a local SQLite database."""
+
+    def __init__(self, path: str, pool_size: int = 4, serde=None):
+        """Initialize sqlite checkpointing backend."""
+        self.path = path
+        self.checkpointer = SQLiteCheckpointSaver(
+            path, pool_size=pool_size, serde=serde
+        )
+        self._last_health_check = time.time()
+        logger.info(f"SQLite checkpointing backend initialized at {path}")
+
+    def get_checkpointer(self):
+        """Get the SQLiteCheckpointSaver instance."""
+        return self.checkpointer
+
+    async def get_stats(self) -> dict[str, Any]:
+        """Get checkpointing statistics."""
+        stats = await asyncio.to_thread(self.checkpointer.get_stats)
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "type": "database",
+            "description": "SQLite checkpointing in WAL mode",
+            "health_status": "healthy",
+            "last_health_check": self._last_health_check,
+            **stats,
+        }
+
+    async def health_check(self) -> bool:
+        """Check if the backend is healthy."""
+        try:
+            healthy = await asyncio.to_thread(self.checkpointer.health_check)
+            self._last_health_check = time.time()
+            return healthy
+        except Exception as e:
+            logger.error(f"SQLite backend health check failed: {e}")
+            return False
+
+    async def cleanup_old_checkpoints(self, max_age_hours: int = 24) -> int:
+        """Clean up old checkpoints and return count of cleaned items."""
+        return await asyncio.to_thread(
+            self.checkpointer.cleanup_old_checkpoints, max_age_hours
+        )
+
+    async def compact(self, policy: CompactionPolicy) -> CompactionResult:
+        """Reclaim checkpoints according to a compaction policy."""
+        return await asyncio.to_thread(self.checkpointer.compact, policy)
 
 
 class FileCheckpointingBackend(CheckpointingBackend):
@@ -107,7 +189,11 @@ class FileCheckpointingBackend(CheckpointingBackend):
         """Initialize file-based checkpointing backend."""
         self.file_path = file_path
         # This backend is not available in this version, so it will fall back to MemorySaver
-        self.checkpointer = MemorySaver()
+        logger.warning(
+            "File checkpointing is not available, conversations are kept in memory "
+            "only; use the sqlite backend for durable local checkpoints"
+        )
+        self.checkpointer = LockedMemorySaver()
         self._last_health_check = time.time()
         logger.info(f"File checkpointing backend initialized with path: {file_path}")
 
@@ -139,9 +225,9 @@ class FileCheckpointingBackend(CheckpointingBackend):
 
     async def cleanup_old_checkpoints(self, max_age_hours: int = 24) -> int:
         """Clean up old checkpoints and return count of cleaned items."""
-        # TODO: Implement file system cleanup
-        logger.debug("File backend cleanup not implemented")
-        return 0
+        # The fallback MemorySaver is compacted in memory
+        result = await self.compact(CompactionPolicy(max_age_hours=max_age_hours))
+        return result.checkpoints_reclaimed
 
 
 class PostgresCheckpointingBackend(CheckpointingBackend):
@@ -151,7 +237,11 @@ class PostgresCheckpointingBackend(CheckpointingBackend):
         """Initialize PostgreSQL checkpointing backend."""
         self.connection_string = connection_string
         # This backend is not available in this version, so it will fall back to MemorySaver
-        self.checkpointer = MemorySaver()
+        logger.warning(
+            "PostgreSQL checkpointing is not available, conversations are kept in "
+            "memory only; use the sqlite backend for durable local checkpoints"
+        )
+        self.checkpointer = LockedMemorySaver()
         self._last_health_check = time.time()
 
     def get_checkpointer(self):
@@ -182,9 +272,9 @@ class PostgresCheckpointingBackend(CheckpointingBackend):
 
     async def cleanup_old_checkpoints(self, max_age_hours: int = 24) -> int:
         """Clean up old checkpoints and return count of cleaned items."""
-        # TODO: Implement PostgreSQL cleanup
-        logger.debug("PostgreSQL backend cleanup not implemented")
-        return 0
+        # The fallback MemorySaver is compacted in memory
+        result = await self.compact(CompactionPolicy(max_age_hours=max_age_hours))
+        return result.checkpoints_reclaimed
 
 
 class RedisCheckpointingBackend(CheckpointingBackend):
@@ -194,7 +284,11 @@ class RedisCheckpointingBackend(CheckpointingBackend):
         """Initialize Redis checkpointing backend."""
         self.redis_url = redis_url
         # This backend is not available in this version, so it will fall back to MemorySaver
-        self.checkpointer = MemorySaver()
+        logger.warning(
+            "Redis checkpointing is not available, conversations are kept in "
+            "memory only; use the sqlite backend for durable local checkpoints"
+        )
+        self.checkpointer = LockedMemorySaver()
         self._last_health_check = time.time()
 
     def get_checkpointer(self):
@@ -225,9 +319,9 @@ class RedisCheckpointingBackend(CheckpointingBackend):
 
     async def cleanup_old_checkpoints(self, max_age_hours: int = 24) -> int:
         """Clean up old checkpoints and return count of cleaned items."""
-        # TODO: Implement Redis cleanup
-        logger.debug("Redis backend cleanup not implemented")
-        return 0
+        # The fallback MemorySaver is compacted in memory
+        result = await self.compact(CompactionPolicy(max_age_hours=max_age_hours))
+        return result.checkpoints_reclaimed
 
 
 class Checkpointer(CheckpointingServiceProtocol):
@@ -239,9 +333,24 @@ class Checkpointer(CheckpointingServiceProtocol):
         self.config = config or {}
         self._retry_attempts = 3
         self._retry_delay = 1.0  # seconds
+        self.compactor: CheckpointCompactor | None = None
+        self._compaction_listeners: list[Callable[[list[str]], None]] = []
 
+        serde = get_serde(self.config.get("serde", "default"))
         if backend == "memory":
-            self.backend = MemoryCheckpointingBackend()
+            self.backend = MemoryCheckpointingBackend(
+                max_bytes=self.config.get("memory_max_bytes", 0),
+                spill_path=self.config.get("spill_path"),
+                serde=serde,
+            )
+        elif backend == "sqlite":
+            self.backend = SQLiteCheckpointingBackend(
+                self.config.get("sqlite_path", settings.checkpointing_sqlite_path),
+                pool_size=self.config.get(
+                    "sqlite_pool_size", settings.checkpointing_sqlite_pool_size
+                ),
+                serde=serde,
+            )
         elif backend == "file":
             file_path = self.config.get("file_path", settings.checkpointing_file_path)
             self.backend = FileCheckpointingBackend(file_path)
@@ -260,10 +369,19 @@ class Checkpointer(CheckpointingServiceProtocol):
         else:
             raise ValueError(f"Unsupported checkpointing backend: {backend}")
 
+        read_cache_threads = self.config.get("read_cache_threads", 0)
+        self.read_cache: CachedCheckpointSaver | None = None
+        if read_cache_threads > 0:
+            self.read_cache = CachedCheckpointSaver(
+                self.backend.get_checkpointer(), read_cache_threads
+            )
+
         logger.debug(f"Checkpointing service initialized with backend: {backend}")
 
     def get_checkpointer(self):
         """Get LangGraph checkpoint saver instance."""
+        if self.read_cache is not None:
+            return self.read_cache
         return self.backend.get_checkpointer()
 
     async def get_stats(self) -> dict[str, Any]:
@@ -273,6 +391,10 @@ class Checkpointer(CheckpointingServiceProtocol):
             stats["backend_type"] = self.backend_type
             stats["retry_attempts"] = self._retry_attempts
             stats["retry_delay"] = self._retry_delay
+            if self.compactor is not None:
+                stats["compaction"] = self.compactor.get_metrics()
+            if self.read_cache is not None:
+                stats["read_cache"] = self.read_cache.get_stats()
             return stats
         except Exception as e:
             logger.error(f"Failed to get checkpointing stats: {e}")
@@ -296,6 +418,42 @@ class Checkpointer(CheckpointingServiceProtocol):
                 f"Failed to cleanup checkpoints: {e}"
             ) from e
 
+    async def compact(self, policy: CompactionPolicy) -> CompactionResult:
+        """Reclaim checkpoints according to a compaction policy."""
+        try:
+            result = await self.backend.compact(policy)
+        except Exception as e:
+            logger.error(f"Checkpointing compaction failed: {e}")
+            raise CheckpointingBackendError(
+                f"Failed to compact checkpoints: {e}"
+            ) from e
+
+        # Compaction writes to the backend saver directly, behind the cache
+        if self.read_cache is not None and result.checkpoints_reclaimed:
+            self.read_cache.clear()
+        if result.threads_reclaimed:
+            for listener in self._compaction_listeners:
+                listener(result.threads_reclaimed)
+        return result
+
+    def add_compaction_listener(self, listener: Callable[[list[str]], None]) -> None:
+        """Register a callback receiving the thread ids deleted by compaction."""
+        self._compaction_listeners.append(listener)
+
+    def start_compaction(
+        self, policy: CompactionPolicy, interval_seconds: float
+    ) -> CheckpointCompactor:
+        """Start periodic background compaction on the running event loop."""
+        if self.compactor is None:
+            self.compactor = CheckpointCompactor(self.compact, policy, interval_seconds)
+        self.compactor.start()
+        return self.compactor
+
+    async def stop_compaction(self) -> None:
+        """Stop periodic background compaction."""
+        if self.compactor is not None:
+            await self.compactor.stop()
+
     @asynccontextmanager
     async def checkpoint_operation(self, operation_name: str):
         """Context manager for checkpoint operations with retry logic."""
@@ -340,6 +498,12 @@ def get_checkpointing_service() -> Checkpointer:
     if _checkpointing_service is None:
         backend = settings.checkpointing_backend
         config = {
+            "serde": settings.checkpointing_serde,
+            "read_cache_threads": settings.checkpointing_read_cache_threads,
+            "memory_max_bytes": settings.checkpointing_memory_max_bytes,
+            "spill_path": settings.checkpointing_spill_path,
+            "sqlite_path": settings.checkpointing_sqlite_path,
+            "sqlite_pool_size": settings.checkpointing_sqlite_pool_size,
             "file_path": settings.checkpointing_file_path,
             "connection_string": settings.checkpointing_postgres_url,
             "redis_url": settings.checkpointing_redis_url,
@@ -348,6 +512,15 @@ def get_checkpointing_service() -> Checkpointer:
     return _checkpointing_service
 
 
+def get_compaction_policy() -> CompactionPolicy:
+    """Get the checkpoint compaction policy from settings."""
+    return CompactionPolicy(
+        max_age_hours=settings.checkpointing_max_age_hours or None,
+        keep_latest=settings.checkpointing_keep_latest or None,
+        max_bytes=settings.checkpointing_max_bytes or None,
+    )
+
+
 def set_checkpointing_service(checkpointing_service: Checkpointer) -> None:
     """Set the global checkpointing service instance."""
     global _checkpointing_service
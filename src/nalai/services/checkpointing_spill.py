@@ -0,0 +1,469 @@
+"""
+Byte-budgeted in-memory checkpoint saver that spills idle threads to disk.
+
+SpillingMemorySaver is LangGraph's MemorySaver with a budget on the bytes
+of serialized checkpoints, channel values and writes it keeps in memory.
+When a write exceeds the budget, the least recently touched threads are
+moved to one file each in a local spill directory; reading or writing a
+spilled thread faults it back in. Idle conversations then cost disk space
+instead of memory on single-node deployments.
+
+Spill files hold the already-serialized checkpoint data, so spilling and
+faulting in never deserialize channel values. Listing all threads reads the
+spilled ones from their files without faulting them in, one thread at a
+time, and the async methods run in worker threads so spill file I/O stays
+off the event loop.
+"""
+
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.constants import INTERRUPT
+
+from .checkpointing_compaction import CompactionPolicy, CompactionResult
+from .checkpointing_memory import LockedMemorySaver
+from .checkpointing_serde import MessagesHeader, memory_messages_header
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SpilledThread:
+    """A thread whose checkpoints live in a spill file."""
+
+    path: Path
+    type: str
+    size: int
+    checkpoints: int
+    latest: float
+    interrupted: bool
+
+
+class SpillingMemorySaver(LockedMemorySaver):
+    """MemorySaver keeping at most max_bytes in memory, spilling idle threads."""
+
+    def __init__(self, max_bytes: int, spill_path: str, *, serde=None):
+        """
+        Initialize the saver.
+
+        Args:
+            max_bytes: Budget of serialized bytes kept in memory
+            spill_path: Directory of the spill files
+            serde: Serializer of checkpoints, metadata and channel values
+        """
+        super().__init__(serde=serde)
+        self.max_bytes = max_bytes
+        self.spill_path = Path(spill_path)
+        self.spill_path.mkdir(parents=True, exist_ok=True)
+        # Resident threads in least recently touched order -> serialized bytes
+        self._resident: OrderedDict[str, int] = OrderedDict()
+        # Blob and write keys of each resident thread, to spill without scans
+        self._blob_keys: defaultdict[str, set[tuple]] = defaultdict(set)
+        self._write_keys: defaultdict[str, set[tuple]] = defaultdict(set)
+        self._spilled: dict[str, SpilledThread] = {}
+        self._resident_bytes = 0
+        self._spills = 0
+        self._fault_ins = 0
+
+        # Spill files of a previous process are not tracked; start clean
+        for stale in self.spill_path.glob("*.spill"):
+            stale.unlink(missing_ok=True)
+
+    # ===== Checkpointer API =====
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Get a checkpoint tuple, faulting its thread in if spilled."""
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            self._fault_in(thread_id)
+            checkpoint_tuple = super().get_tuple(config)
+            self._touch(thread_id)
+            self._enforce_budget(keep=thread_id)
+        return checkpoint_tuple
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        List checkpoints one thread at a time.
+
+        Listing one thread faults it in; listing all threads reads spilled
+        threads from their files without faulting them in.
+        """
+        if config:
+            thread_id = config["configurable"]["thread_id"]
+            with self._lock:
+                self._fault_in(thread_id)
+                results = [
+                    *super().list(config, filter=filter, before=before, limit=limit)
+                ]
+                self._touch(thread_id)
+                self._enforce_budget(keep=thread_id)
+            yield from results
+            return
+
+        remaining = limit
+        for thread_id in self.list_thread_ids():
+            if remaining is not None and remaining <= 0:
+                return
+            results = self._list_thread(thread_id, filter, before, remaining)
+            if remaining is not None:
+                remaining -= len(results)
+            yield from results
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint and spill idle threads if over budget."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        with self._lock:
+            self._fault_in(thread_id)
+            result = super().put(config, checkpoint, metadata, new_versions)
+
+            stored = self.storage[thread_id][checkpoint_ns][checkpoint["id"]]
+            size = _typed_size(stored[0]) + _typed_size(stored[1])
+            for channel, version in new_versions.items():
+                key = (thread_id, checkpoint_ns, channel, version)
+                self._blob_keys[thread_id].add(key)
+                size += _typed_size(self.blobs[key])
+            self._touch(thread_id, size)
+            self._enforce_budget(keep=thread_id)
+        return result
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Save pending writes and spill idle threads if over budget."""
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        key = (thread_id, configurable["checkpoint_ns"], configurable["checkpoint_id"])
+        with self._lock:
+            self._fault_in(thread_id)
+            before = _writes_size(self.writes.get(key, {}))
+            super().put_writes(config, writes, task_id, task_path)
+            self._write_keys[thread_id].add(key)
+            self._touch(thread_id, _writes_size(self.writes.get(key, {})) - before)
+            self._enforce_budget(keep=thread_id)
+
+    def get_messages_header(self, config: RunnableConfig) -> MessagesHeader | None:
+        """Read a message channel header, faulting its thread in if spilled."""
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            self._fault_in(thread_id)
+            header = memory_messages_header(self, config)
+            self._touch(thread_id)
+            self._enforce_budget(keep=thread_id)
+        return header
+
+    def list_thread_ids(self) -> Sequence[str]:
+        """Get the ids of the resident and spilled threads."""
+        with self._lock:
+            return [*self.storage, *self._spilled]
+
+    def count_checkpoints(self, thread_id: str) -> int:
+        """Count the checkpoints of a resident or spilled thread."""
+        with self._lock:
+            spilled = self._spilled.get(thread_id)
+            if spilled:
+                return spilled.checkpoints
+            namespaces = self.storage.get(thread_id, {})
+            return sum(len(checkpoints) for checkpoints in namespaces.values())
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete a thread from memory and the spill store."""
+        with self._lock:
+            if thread_id in self.storage:
+                del self.storage[thread_id]
+            for key in self._blob_keys.pop(thread_id, ()):
+                self.blobs.pop(key, None)
+            for key in self._write_keys.pop(thread_id, ()):
+                self.writes.pop(key, None)
+            self._resident_bytes -= self._resident.pop(thread_id, 0)
+            spilled = self._spilled.pop(thread_id, None)
+            if spilled:
+                spilled.path.unlink(missing_ok=True)
+
+    # ===== Compaction =====
+
+    def compact(
+        self, policy: CompactionPolicy, now: float | None = None
+    ) -> CompactionResult:
+        """
+        Compact resident threads and age out spilled ones.
+
+        Spilled threads are reclaimed whole once their latest checkpoint is
+        older than max_age_hours unless they have a pending interrupt; the
+        other limits apply to them once they are faulted back in.
+        """
+        with self._lock:
+            result = super().compact(policy, now)
+            self._recount()
+
+            if policy.max_age_hours is not None:
+                cutoff = (now or time.time()) - policy.max_age_hours * 3600
+                for thread_id, spilled in list(self._spilled.items()):
+                    if spilled.latest < cutoff and not spilled.interrupted:
+                        self.delete_thread(thread_id)
+                        result.checkpoints_reclaimed += spilled.checkpoints
+                        result.bytes_reclaimed += spilled.size
+                        result.threads_reclaimed.append(thread_id)
+        return result
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get memory budget and spill statistics."""
+        with self._lock:
+            return {
+                "max_bytes": self.max_bytes,
+                "resident_bytes": self._resident_bytes,
+                "resident_threads": len(self._resident),
+                "spilled_threads": len(self._spilled),
+                "spilled_bytes": sum(s.size for s in self._spilled.values()),
+                "spills": self._spills,
+                "fault_ins": self._fault_ins,
+                "spill_path": str(self.spill_path),
+            }
+
+    # ===== Private Helpers =====
+
+    def _list_thread(
+        self,
+        thread_id: str,
+        filter: dict[str, Any] | None,
+        before: RunnableConfig | None,
+        limit: int | None,
+    ) -> Sequence[CheckpointTuple]:
+        """List the checkpoints of one thread without faulting it in."""
+        thread_config: RunnableConfig = {"configurable": {"thread_id": thread_id}}
+        with self._lock:
+            spilled = self._spilled.get(thread_id)
+            if spilled is None:
+                if thread_id not in self.storage:
+                    return []
+                return [
+                    *super().list(
+                        thread_config, filter=filter, before=before, limit=limit
+                    )
+                ]
+            data = spilled.path.read_bytes()
+
+        # Decode the spill file into a scratch saver, outside the lock
+        scratch = InMemorySaver(serde=self.serde)
+        _restore_thread(
+            scratch, thread_id, self.serde.loads_typed((spilled.type, data))
+        )
+        return [*scratch.list(thread_config, filter=filter, before=before, limit=limit)]
+
+    def _touch(self, thread_id: str, added_bytes: int = 0) -> None:
+        """Mark a resident thread as most recently touched."""
+        namespaces = self.storage.get(thread_id)
+        if not namespaces or not any(namespaces.values()):
+            # Reads of unknown threads leave empty defaultdict entries behind
+            self.storage.pop(thread_id, None)
+            return
+        self._resident[thread_id] = self._resident.get(thread_id, 0) + added_bytes
+        self._resident.move_to_end(thread_id)
+        self._resident_bytes += added_bytes
+
+    def _enforce_budget(self, keep: str) -> None:
+        """Spill least recently touched threads until within the budget."""
+        while self._resident_bytes > self.max_bytes:
+            victim = next(
+                (thread_id for thread_id in self._resident if thread_id != keep),
+                None,
+            )
+            if victim is None:
+                break
+            self._spill(victim)
+
+    def _spill(self, thread_id: str) -> None:
+        """Move a resident thread to its spill file."""
+        namespaces = self.storage.pop(thread_id, {})
+        blobs = [
+            (key, self.blobs.pop(key))
+            for key in self._blob_keys.pop(thread_id, ())
+            if key in self.blobs
+        ]
+        writes = [
+            (key, self.writes.pop(key))
+            for key in self._write_keys.pop(thread_id, ())
+            if key in self.writes
+        ]
+        self._resident_bytes -= self._resident.pop(thread_id, 0)
+
+        payload = {
+            "storage": {
+                checkpoint_ns: {
+                    checkpoint_id: [list(checkpoint), list(metadata), parent]
+                    for checkpoint_id, (checkpoint, metadata, parent) in (
+                        checkpoints.items()
+                    )
+                }
+                for checkpoint_ns, checkpoints in namespaces.items()
+            },
+            "blobs": [[list(key[1:]), list(blob)] for key, blob in blobs],
+            "writes": [
+                [
+                    list(key[1:]),
+                    [
+                        [task_id, idx, channel, list(value), task_path]
+                        for (task_id, idx), (_, channel, value, task_path) in (
+                            inner.items()
+                        )
+                    ],
+                ]
+                for key, inner in writes
+            ],
+        }
+        data_type, data = self.serde.dumps_typed(payload)
+        path = self.spill_path / (
+            hashlib.sha256(thread_id.encode()).hexdigest() + ".spill"
+        )
+        temporary = path.with_suffix(".tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
+
+        checkpoints = [
+            self.serde.loads_typed(checkpoint)
+            for thread_checkpoints in namespaces.values()
+            for checkpoint, _, _ in thread_checkpoints.values()
+        ]
+        self._spilled[thread_id] = SpilledThread(
+            path=path,
+            type=data_type,
+            size=len(data),
+            checkpoints=len(checkpoints),
+            latest=max((_timestamp(c) for c in checkpoints), default=time.time()),
+            interrupted=any(
+                write[1] == INTERRUPT for _, inner in writes for write in inner.values()
+            ),
+        )
+        self._spills += 1
+        logger.debug(f"Spilled thread {thread_id} ({len(data)} bytes)")
+
+    def _fault_in(self, thread_id: str) -> None:
+        """Load a spilled thread back into memory."""
+        spilled = self._spilled.pop(thread_id, None)
+        if spilled is None:
+            return
+        payload = self.serde.loads_typed((spilled.type, spilled.path.read_bytes()))
+        spilled.path.unlink(missing_ok=True)
+
+        size, blob_keys, write_keys = _restore_thread(self, thread_id, payload)
+        self._blob_keys[thread_id] |= blob_keys
+        self._write_keys[thread_id] |= write_keys
+
+        self._fault_ins += 1
+        self._touch(thread_id, size)
+        logger.debug(f"Faulted in thread {thread_id} ({size} bytes)")
+
+    def _recount(self) -> None:
+        """Recompute resident sizes and keys after external mutation."""
+        self._blob_keys.clear()
+        self._write_keys.clear()
+        sizes = {
+            thread_id: sum(
+                _typed_size(checkpoint) + _typed_size(metadata)
+                for checkpoints in namespaces.values()
+                for checkpoint, metadata, _ in checkpoints.values()
+            )
+            for thread_id, namespaces in self.storage.items()
+        }
+        for key, blob in self.blobs.items():
+            if key[0] in sizes:
+                self._blob_keys[key[0]].add(key)
+                sizes[key[0]] += _typed_size(blob)
+        for key, inner in self.writes.items():
+            if key[0] in sizes:
+                self._write_keys[key[0]].add(key)
+                sizes[key[0]] += _writes_size(inner)
+
+        self._resident = OrderedDict(
+            (thread_id, sizes[thread_id])
+            for thread_id in [*self._resident, *sizes]
+            if thread_id in sizes
+        )
+        self._resident_bytes = sum(self._resident.values())
+
+
+def _restore_thread(
+    saver: InMemorySaver, thread_id: str, payload: dict[str, Any]
+) -> tuple[int, set[tuple], set[tuple]]:
+    """
+    Load the payload of a spill file into a MemorySaver.
+
+    Returns:
+        Tuple of (serialized bytes loaded, blob keys, write keys)
+    """
+    size = 0
+    for checkpoint_ns, checkpoints in payload["storage"].items():
+        for checkpoint_id, (checkpoint, metadata, parent) in checkpoints.items():
+            saver.storage[thread_id][checkpoint_ns][checkpoint_id] = (
+                tuple(checkpoint),
+                tuple(metadata),
+                parent,
+            )
+            size += _typed_size(checkpoint) + _typed_size(metadata)
+    blob_keys = set()
+    for key, blob in payload["blobs"]:
+        blob_key = (thread_id, *key)
+        saver.blobs[blob_key] = tuple(blob)
+        blob_keys.add(blob_key)
+        size += _typed_size(blob)
+    write_keys = set()
+    for key, inner in payload["writes"]:
+        write_key = (thread_id, *key)
+        saver.writes[write_key] = {
+            (task_id, idx): (task_id, channel, tuple(value), task_path)
+            for task_id, idx, channel, value, task_path in inner
+        }
+        write_keys.add(write_key)
+        size += sum(_typed_size(write[3]) for write in inner)
+    return size, blob_keys, write_keys
+
+
+def _typed_size(value: Sequence[Any]) -> int:
+    """Get the byte size of a serde (type, data) pair."""
+    return len(value[1] or b"")
+
+
+def _writes_size(writes: dict[tuple, tuple]) -> int:
+    """Get the serialized bytes of one checkpoint's pending writes."""
+    return sum(_typed_size(write[2]) for write in writes.values())
+
+
+def _timestamp(checkpoint: dict[str, Any]) -> float:
+    """Get the checkpoint timestamp as epoch seconds."""
+    try:
+        return datetime.fromisoformat(checkpoint["ts"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return time.time()
@@ -0,0 +1,1208 @@
+"""
+Durable LangGraph checkpoint saver on a local SQLite database.
+
+Checkpoints are stored the way LangGraph's MemorySaver keeps them: the
+checkpoint document without its channel values, plus one blob per
+(channel, version), so a super-step only writes the channels it changed.
+Pending writes are kept per checkpoint and task.
+
+Message channels grow with every turn, so their versions are stored as
+deltas (RemoveMessage ops plus appended messages) against an earlier
+version of the channel, with a full snapshot every few versions. Reads
+rebuild the value from the nearest snapshot. Deltas carry the header of
+the full message list, so with the compact serializer conversation listings
+read the message count and preview of any version without rebuilding it.
+
+Every write bumps a version of its thread taken from one database-wide
+sequence, so processes sharing the database can ask which threads changed
+since the version they last saw.
+
+A put whose config sets CHECKPOINT_CAS_KEY is a compare-and-set: it only
+succeeds if the checkpoint it continues from is still the latest of its
+thread, so of two processes running a turn on the same conversation only
+the first one's checkpoints are stored. Turn leases, taken before a turn
+runs its graph, let the second process reject the turn before any work.
+
+The database runs in WAL mode, so readers never block the single writer.
+Connections come from a small pool shared by worker threads, and the async
+methods run the blocking calls in the default executor.
+"""
+
+import asyncio
+import contextlib
+import logging
+import queue
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator, Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from langchain_core.messages import BaseMessage, RemoveMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.constants import INTERRUPT
+
+from .checkpointing_compaction import (
+    CheckpointRecord,
+    CompactionPolicy,
+    CompactionResult,
+    pending_interrupts,
+    select_expired,
+    select_over_budget,
+)
+from .checkpointing_conflicts import CHECKPOINT_CAS_KEY, CheckpointConflictError
+from .checkpointing_serde import MessagesHeader, load_header, messages_header
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteConnectionPool:
+    """Fixed-size pool of SQLite connections usable from any thread."""
+
+    def __init__(self, path: str, size: int = 4, mmap_size: int = 256 * 1024 * 1024):
+        """
+        Initialize the pool; connections are opened on first use.
+
+        Args:
+            path: Database file path
+            size: Maximum number of open connections
+            mmap_size: Bytes of the database file memory-mapped for reads
+        """
+        self.path = path
+        self.size = max(size, 1)
+        self.mmap_size = mmap_size
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        return connection
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, waiting for one if all are in use."""
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            connection = self._open() if can_open else self._idle.get()
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        """Close the idle connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._opened -= 1
+
+
+class SQLiteCheckpointSaver(BaseCheckpointSaver[str]):
+    """LangGraph checkpoint saver persisting to a local SQLite database."""
+
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            thread_id TEXT NOT NULL,
+            checkpoint_ns TEXT NOT NULL DEFAULT '',
+            checkpoint_id TEXT NOT NULL,
+            parent_checkpoint_id TEXT,
+            checkpoint_ts REAL NOT NULL,
+            type TEXT NOT NULL,
+            checkpoint BLOB NOT NULL,
+            metadata_type TEXT NOT NULL,
+            metadata BLOB NOT NULL,
+            PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS blobs (
+            thread_id TEXT NOT NULL,
+            checkpoint_ns TEXT NOT NULL DEFAULT '',
+            channel TEXT NOT NULL,
+            version TEXT NOT NULL,
+            type TEXT NOT NULL,
+            blob BLOB,
+            base_version TEXT,
+            PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS writes (
+            thread_id TEXT NOT NULL,
+            checkpoint_ns TEXT NOT NULL DEFAULT '',
+            checkpoint_id TEXT NOT NULL,
+            task_id TEXT NOT NULL,
+            idx INTEGER NOT NULL,
+            channel TEXT NOT NULL,
+            type TEXT NOT NULL,
+            value BLOB,
+            task_path TEXT NOT NULL DEFAULT '',
+            PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_checkpoints_thread_ts "
+        "ON checkpoints (thread_id, checkpoint_ts)",
+        "CREATE INDEX IF NOT EXISTS idx_checkpoints_ts ON checkpoints (checkpoint_ts)",
+        """
+        CREATE TABLE IF NOT EXISTS thread_versions (
+            thread_id TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            deleted INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_thread_versions_version "
+        "ON thread_versions (version)",
+        # Databases written before thread versions existed start at version 1
+        "INSERT INTO thread_versions (thread_id, version) "
+        "SELECT DISTINCT thread_id, 1 FROM checkpoints "
+        "WHERE NOT EXISTS (SELECT 1 FROM thread_versions)",
+        """
+        CREATE TABLE IF NOT EXISTS turn_leases (
+            thread_id TEXT PRIMARY KEY,
+            lease TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        ) WITHOUT ROWID
+        """,
+    )
+
+    # One statement, so the new version is read under the write lock
+    _BUMP_THREAD_VERSION = (
+        "INSERT INTO thread_versions (thread_id, version, deleted) "
+        "SELECT ?, COALESCE(MAX(version), 0) + 1, ? FROM thread_versions WHERE true "
+        "ON CONFLICT (thread_id) DO UPDATE SET "
+        "version = excluded.version, deleted = excluded.deleted"
+    )
+
+    def __init__(
+        self,
+        path: str = "./checkpoints/checkpoints.db",
+        pool_size: int = 4,
+        mmap_size: int = 256 * 1024 * 1024,
+        *,
+        serde=None,
+        delta_channels: Sequence[str] = ("messages",),
+        snapshot_interval: int = 32,
+        max_cached_threads: int = 1024,
+    ):
+        """
+        Initialize the saver, creating the database if needed.
+
+        Args:
+            path: Database file path
+            pool_size: Maximum number of pooled connections
+            mmap_size: Bytes of the database file memory-mapped for reads
+            serde: Serializer of checkpoints, metadata and channel values
+            delta_channels: Message channels stored as deltas
+            snapshot_interval: Versions between full snapshots of a channel
+            max_cached_threads: Latest channel values kept as delta bases
+        """
+        super().__init__(serde=serde)
+        self.path = path
+        self.delta_channels = frozenset(delta_channels)
+        self.snapshot_interval = max(snapshot_interval, 1)
+        self.max_cached_threads = max_cached_threads
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.pool = SQLiteConnectionPool(path, pool_size, mmap_size)
+        # SQLite has a single writer; serialize writers instead of busy-waiting
+        self._write_lock = threading.Lock()
+        # (thread_id, checkpoint_ns, channel) -> (version, messages, depth) of
+        # the last stored version, the base of the next delta
+        self._delta_bases: OrderedDict[tuple[str, str, str], tuple[str, list, int]] = (
+            OrderedDict()
+        )
+        self._delta_bases_lock = threading.Lock()
+
+        with self._writer() as connection:
+            for statement in self._SCHEMA:
+                connection.execute(statement)
+
+        logger.debug(f"SQLite checkpoint saver initialized at {path}")
+
+    @contextlib.contextmanager
+    def _writer(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for one write transaction."""
+        with self._write_lock, self.pool.connection() as connection:
+            with connection:
+                yield connection
+
+    # ===== Sync API =====
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Get the checkpoint of a config, or the latest one of its thread."""
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+
+        with self.pool.connection() as connection:
+            if checkpoint_id:
+                row = connection.execute(
+                    "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                    "metadata_type, metadata FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = connection.execute(
+                    "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                    "metadata_type, metadata FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            return self._load_tuple(connection, thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List checkpoints, newest first per thread, matching the criteria."""
+        clauses, parameters = [], []
+        if config:
+            configurable = config["configurable"]
+            clauses.append("thread_id = ?")
+            parameters.append(configurable["thread_id"])
+            if configurable.get("checkpoint_ns") is not None:
+                clauses.append("checkpoint_ns = ?")
+                parameters.append(configurable["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                parameters.append(checkpoint_id)
+        if before and (before_checkpoint_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            parameters.append(before_checkpoint_id)
+
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "type, checkpoint, metadata_type, metadata FROM checkpoints"
+        )
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY thread_id, checkpoint_ns, checkpoint_id DESC"
+        if limit is not None and not filter:
+            query += " LIMIT ?"
+            parameters.append(limit)
+
+        with self.pool.connection() as connection:
+            rows = connection.execute(query, parameters).fetchall()
+            results = []
+            for thread_id, checkpoint_ns, *row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                if filter:
+                    metadata = self.serde.loads_typed((row[4], row[5]))
+                    if not all(
+                        value == metadata.get(key) for key, value in filter.items()
+                    ):
+                        continue
+                results.append(
+                    self._load_tuple(connection, thread_id, checkpoint_ns, row)
+                )
+        yield from results
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint and the channel values of its new versions."""
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        document = checkpoint.copy()
+        values: dict[str, Any] = document.pop("channel_values")  # type: ignore[misc]
+
+        blobs, deltas = [], {}
+        for channel, version in new_versions.items():
+            version = str(version)
+            value = values.get(channel)
+            delta = self._encode_delta(
+                thread_id, checkpoint_ns, channel, version, value
+            )
+            if delta:
+                deltas[channel] = delta
+            elif channel in values:
+                blobs.append(
+                    (thread_id, checkpoint_ns, channel, version)
+                    + self.serde.dumps_typed(value)
+                    + (None,)
+                )
+            else:
+                blobs.append(
+                    (thread_id, checkpoint_ns, channel, version, "empty", None, None)
+                )
+        checkpoint_type, checkpoint_data = self.serde.dumps_typed(document)
+        metadata_type, metadata_data = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+
+        with self._writer() as connection:
+            if configurable.get(CHECKPOINT_CAS_KEY):
+                self._check_latest(
+                    connection,
+                    thread_id,
+                    checkpoint_ns,
+                    configurable.get("checkpoint_id"),
+                    checkpoint["id"],
+                )
+            for channel, (base_version, row) in deltas.items():
+                # Fall back to a snapshot if the base was deleted meanwhile
+                if not self._blob_exists(
+                    connection, thread_id, checkpoint_ns, channel, base_version
+                ):
+                    version = str(new_versions[channel])
+                    row = (thread_id, checkpoint_ns, channel, version) + (
+                        self.serde.dumps_typed(values[channel]) + (None,)
+                    )
+                    self._remember_delta_base(
+                        thread_id, checkpoint_ns, channel, version, values[channel], 0
+                    )
+                blobs.append(row)
+            connection.executemany(
+                "INSERT OR REPLACE INTO blobs "
+                "(thread_id, checkpoint_ns, channel, version, type, blob, "
+                "base_version) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                blobs,
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, "
+                "checkpoint_id, parent_checkpoint_id, checkpoint_ts, type, "
+                "checkpoint, metadata_type, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    configurable.get("checkpoint_id"),
+                    self._timestamp(checkpoint),
+                    checkpoint_type,
+                    checkpoint_data,
+                    metadata_type,
+                    metadata_data,
+                ),
+            )
+            connection.execute(self._BUMP_THREAD_VERSION, (thread_id, 0))
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Save the pending writes of a task for a checkpoint."""
+        configurable = config["configurable"]
+        rows = [
+            (
+                configurable["thread_id"],
+                configurable.get("checkpoint_ns", ""),
+                configurable["checkpoint_id"],
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                *self.serde.dumps_typed(value),
+                task_path,
+            )
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        # Special channels (errors, interrupts) overwrite; regular writes are
+        # idempotent per task and index, matching MemorySaver
+        verb = (
+            "INSERT OR REPLACE"
+            if all(channel in WRITES_IDX_MAP for channel, _ in writes)
+            else "INSERT OR IGNORE"
+        )
+        with self._writer() as connection:
+            connection.executemany(
+                f"{verb} INTO writes (thread_id, checkpoint_ns, checkpoint_id, "
+                "task_id, idx, channel, type, value, task_path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            connection.execute(
+                self._BUMP_THREAD_VERSION, (configurable["thread_id"], 0)
+            )
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete all checkpoints, blobs and writes of a thread."""
+        with self._writer() as connection:
+            for table in ("checkpoints", "blobs", "writes"):
+                connection.execute(
+                    f"DELETE FROM {table} WHERE thread_id = ?",
+                    (thread_id,),
+                )
+            connection.execute(self._BUMP_THREAD_VERSION, (thread_id, 1))
+        self._forget_delta_bases({thread_id})
+
+    def get_messages_header(
+        self, config: RunnableConfig, channel: str = "messages"
+    ) -> MessagesHeader | None:
+        """
+        Read the message channel header of a checkpoint without its messages.
+
+        Returns:
+            The header, or None if the stored value has no header
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+
+        with self.pool.connection() as connection:
+            if checkpoint_id:
+                row = connection.execute(
+                    "SELECT type, checkpoint FROM checkpoints WHERE thread_id = ? "
+                    "AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = connection.execute(
+                    "SELECT type, checkpoint FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            checkpoint = self.serde.loads_typed(row)
+            version = checkpoint["channel_versions"].get(channel)
+            blob = (
+                self._load_blob(
+                    connection, thread_id, checkpoint_ns, channel, str(version)
+                )
+                if version is not None
+                else None
+            )
+
+        if version is None or (blob is not None and blob[0] == "empty"):
+            header = {"count": 0, "preview": None}
+        elif blob is None:
+            return None
+        elif blob[2] is None:
+            header = load_header(blob[:2])
+        else:
+            header = self.serde.loads_typed(blob[:2]).get("header")
+        if header is None:
+            return None
+        return MessagesHeader(
+            message_count=header["count"],
+            preview=header["preview"],
+            last_timestamp=checkpoint.get("ts"),
+            checkpoint=checkpoint,
+        )
+
+    def get_thread_version(self, thread_id: str) -> int:
+        """
+        Get the version of a thread, which changes with every write to it.
+
+        Versions are shared by all processes using the database, and 0 means
+        the thread was never written.
+        """
+        with self.pool.connection() as connection:
+            row = connection.execute(
+                "SELECT version FROM thread_versions WHERE thread_id = ?",
+                (thread_id,),
+            ).fetchone()
+        return row[0] if row else 0
+
+    def list_thread_changes(
+        self, after: int = 0
+    ) -> tuple[int, Sequence[tuple[str, bool]]]:
+        """
+        List the threads written or deleted by any process after a version.
+
+        Args:
+            after: Version returned by the previous call, 0 for all threads
+
+        Returns:
+            Tuple of (latest version, [(thread_id, deleted)] oldest change first)
+        """
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                "SELECT thread_id, version, deleted FROM thread_versions "
+                "WHERE version > ? ORDER BY version",
+                (after,),
+            ).fetchall()
+        latest = rows[-1][1] if rows else after
+        return latest, [(thread_id, bool(deleted)) for thread_id, _, deleted in rows]
+
+    def acquire_turn_lease(self, thread_id: str, lease: str, seconds: float) -> bool:
+        """
+        Lease a thread for one turn across all processes using the database.
+
+        Args:
+            thread_id: Thread of the turn
+            lease: Token identifying the lease, to release it
+            seconds: Seconds after which the lease expires if not released
+
+        Returns:
+            Whether the lease was acquired, False while another lease holds
+            the thread
+        """
+        now = time.time()
+        with self._writer() as connection:
+            cursor = connection.execute(
+                "INSERT INTO turn_leases (thread_id, lease, expires_at) "
+                "VALUES (?, ?, ?) "
+                "ON CONFLICT (thread_id) DO UPDATE SET "
+                "lease = excluded.lease, expires_at = excluded.expires_at "
+                "WHERE turn_leases.expires_at <= ?",
+                (thread_id, lease, now + seconds, now),
+            )
+            return cursor.rowcount == 1
+
+    def release_turn_lease(self, thread_id: str, lease: str) -> None:
+        """Release a turn lease unless it expired and was taken by another turn."""
+        with self._writer() as connection:
+            connection.execute(
+                "DELETE FROM turn_leases WHERE thread_id = ? AND lease = ?",
+                (thread_id, lease),
+            )
+
+    def count_checkpoints(self, thread_id: str) -> int:
+        """Count the checkpoints of a thread without loading them."""
+        with self.pool.connection() as connection:
+            return connection.execute(
+                "SELECT COUNT(*) FROM checkpoints WHERE thread_id = ?", (thread_id,)
+            ).fetchone()[0]
+
+    def get_next_version(self, current: str | None, channel: None) -> str:
+        """Get a monotonically increasing channel version (as MemorySaver)."""
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # ===== Async API =====
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Async version of get_tuple."""
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Async version of list."""
+        results = await asyncio.to_thread(
+            lambda: [*self.list(config, filter=filter, before=before, limit=limit)]
+        )
+        for checkpoint_tuple in results:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Async version of put."""
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Async version of put_writes."""
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Async version of delete_thread."""
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    async def aget_messages_header(
+        self, config: RunnableConfig, channel: str = "messages"
+    ) -> MessagesHeader | None:
+        """Async version of get_messages_header."""
+        return await asyncio.to_thread(self.get_messages_header, config, channel)
+
+    # ===== Maintenance =====
+
+    def cleanup_old_checkpoints(self, max_age_hours: float = 24) -> int:
+        """
+        Delete checkpoints older than max_age_hours.
+
+        Threads whose latest checkpoint is older are deleted entirely; other
+        threads keep their latest checkpoint and the blobs it references.
+
+        Returns:
+            Number of deleted checkpoints
+        """
+        policy = CompactionPolicy(max_age_hours=max_age_hours)
+        return self.compact(policy).checkpoints_reclaimed
+
+    def compact(
+        self, policy: CompactionPolicy, now: float | None = None
+    ) -> CompactionResult:
+        """
+        Reclaim checkpoints according to a compaction policy.
+
+        Only the selected checkpoints are deleted, so checkpoints written while
+        the pass runs are kept. The byte budget applies to the stored bytes of
+        checkpoints, blobs and writes; freed pages are reused by later writes.
+        """
+        started = time.perf_counter()
+        size_before = self._stored_bytes()
+        expired = select_expired(self._checkpoint_records(), policy, now)
+        with self._writer() as connection:
+            self.delete_checkpoints(connection, expired)
+        reclaimed = len(expired)
+        touched = {thread_id for thread_id, *_ in expired}
+
+        if policy.max_bytes is not None:
+            usage = self._stored_bytes_by_thread()
+            protected = {
+                key[0] for key in pending_interrupts(self._checkpoint_records())
+            }
+            evicted = select_over_budget(usage, policy.max_bytes, protected)
+            if evicted:
+                with self._writer() as connection:
+                    keys = connection.execute(
+                        "SELECT thread_id, checkpoint_ns, checkpoint_id "
+                        "FROM checkpoints WHERE thread_id IN "
+                        f"({', '.join('?' * len(evicted))})",
+                        evicted,
+                    ).fetchall()
+                    self.delete_checkpoints(connection, keys)
+                reclaimed += len(keys)
+                touched.update(evicted)
+
+        with self.pool.connection() as connection:
+            remaining = {
+                thread_id
+                for (thread_id,) in connection.execute(
+                    "SELECT DISTINCT thread_id FROM checkpoints"
+                )
+            }
+        threads = sorted(touched - remaining)
+        self._forget_delta_bases(set(threads))
+
+        result = CompactionResult(
+            checkpoints_reclaimed=reclaimed,
+            bytes_reclaimed=max(size_before - self._stored_bytes(), 0),
+            threads_reclaimed=threads,
+            duration_seconds=time.perf_counter() - started,
+        )
+        if reclaimed:
+            logger.info(
+                f"Compacted {reclaimed} checkpoints and {len(threads)} threads "
+                f"({result.bytes_reclaimed} bytes)"
+            )
+        return result
+
+    def delete_checkpoints(
+        self,
+        connection: sqlite3.Connection,
+        checkpoints: Sequence[tuple[str, str, str]],
+    ) -> None:
+        """
+        Delete (thread_id, checkpoint_ns, checkpoint_id) checkpoints in a transaction.
+
+        Blobs no longer referenced by any remaining checkpoint of the affected
+        threads are deleted as well.
+        """
+        connection.executemany(
+            "DELETE FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            checkpoints,
+        )
+        connection.executemany(
+            "DELETE FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            checkpoints,
+        )
+
+        for thread_id, checkpoint_ns in {(t, ns) for t, ns, _ in checkpoints}:
+            referenced = set()
+            for checkpoint_type, data in connection.execute(
+                "SELECT type, checkpoint FROM checkpoints "
+                "WHERE thread_id = ? AND checkpoint_ns = ?",
+                (thread_id, checkpoint_ns),
+            ):
+                versions = self.serde.loads_typed((checkpoint_type, data))
+                referenced.update(
+                    (channel, str(version))
+                    for channel, version in versions["channel_versions"].items()
+                )
+            blobs = {
+                (channel, version): base_version
+                for channel, version, base_version in connection.execute(
+                    "SELECT channel, version, base_version FROM blobs "
+                    "WHERE thread_id = ? AND checkpoint_ns = ?",
+                    (thread_id, checkpoint_ns),
+                )
+            }
+            # Keep the delta chains of referenced versions down to their snapshot
+            pending = list(referenced)
+            while pending:
+                channel, version = pending.pop()
+                base_version = blobs.get((channel, version))
+                if base_version and (channel, base_version) not in referenced:
+                    referenced.add((channel, base_version))
+                    pending.append((channel, base_version))
+            connection.executemany(
+                "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? "
+                "AND channel = ? AND version = ?",
+                [
+                    (thread_id, checkpoint_ns, channel, version)
+                    for channel, version in blobs
+                    if (channel, version) not in referenced
+                ],
+            )
+
+        for thread_id in {thread_id for thread_id, _, _ in checkpoints}:
+            remaining = connection.execute(
+                "SELECT EXISTS (SELECT 1 FROM checkpoints WHERE thread_id = ?)",
+                (thread_id,),
+            ).fetchone()[0]
+            connection.execute(
+                self._BUMP_THREAD_VERSION, (thread_id, int(not remaining))
+            )
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get row counts and the database size."""
+        with self.pool.connection() as connection:
+            threads, checkpoints = connection.execute(
+                "SELECT COUNT(DISTINCT thread_id), COUNT(*) FROM checkpoints"
+            ).fetchone()
+            blobs = connection.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+            writes = connection.execute("SELECT COUNT(*) FROM writes").fetchone()[0]
+            page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+            page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+        return {
+            "threads": threads,
+            "checkpoints": checkpoints,
+            "blobs": blobs,
+            "writes": writes,
+            "size_bytes": page_count * page_size,
+        }
+
+    def health_check(self) -> bool:
+        """Check that the database answers queries."""
+        with self.pool.connection() as connection:
+            return connection.execute("SELECT 1").fetchone() == (1,)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.pool.close()
+
+    # ===== Private Helpers =====
+
+    def _checkpoint_records(self) -> Sequence[CheckpointRecord]:
+        """Get the compaction records of all stored checkpoints."""
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, "
+                "parent_checkpoint_id, checkpoint_ts, EXISTS ("
+                "SELECT 1 FROM writes AS w WHERE w.thread_id = c.thread_id "
+                "AND w.checkpoint_ns = c.checkpoint_ns "
+                "AND w.checkpoint_id = c.checkpoint_id AND w.channel = ?"
+                ") FROM checkpoints AS c",
+                (INTERRUPT,),
+            ).fetchall()
+        return [
+            CheckpointRecord(
+                thread_id=thread_id,
+                checkpoint_ns=checkpoint_ns,
+                checkpoint_id=checkpoint_id,
+                parent_checkpoint_id=parent_checkpoint_id,
+                timestamp=timestamp,
+                interrupted=bool(interrupted),
+            )
+            for (
+                thread_id,
+                checkpoint_ns,
+                checkpoint_id,
+                parent_checkpoint_id,
+                timestamp,
+                interrupted,
+            ) in rows
+        ]
+
+    def _stored_bytes_by_thread(self) -> dict[str, tuple[float, int]]:
+        """Get the last update timestamp and stored bytes of each thread."""
+        with self.pool.connection() as connection:
+            usage = {
+                thread_id: (latest, size)
+                for thread_id, latest, size in connection.execute(
+                    "SELECT thread_id, MAX(checkpoint_ts), "
+                    "SUM(LENGTH(checkpoint) + LENGTH(metadata)) "
+                    "FROM checkpoints GROUP BY thread_id"
+                )
+            }
+            for table, column in (("blobs", "blob"), ("writes", "value")):
+                for thread_id, size in connection.execute(
+                    f"SELECT thread_id, SUM(COALESCE(LENGTH({column}), 0)) "
+                    f"FROM {table} GROUP BY thread_id"
+                ):
+                    if thread_id in usage:
+                        latest, total = usage[thread_id]
+                        usage[thread_id] = (latest, total + size)
+        return usage
+
+    def _stored_bytes(self) -> int:
+        """Get the stored bytes of checkpoints, blobs and writes."""
+        with self.pool.connection() as connection:
+            return connection.execute(
+                "SELECT "
+                "(SELECT COALESCE(SUM(LENGTH(checkpoint) + LENGTH(metadata)), 0) "
+                "FROM checkpoints) + "
+                "(SELECT COALESCE(SUM(LENGTH(blob)), 0) FROM blobs) + "
+                "(SELECT COALESCE(SUM(LENGTH(value)), 0) FROM writes)"
+            ).fetchone()[0]
+
+    def _check_latest(
+        self,
+        connection: sqlite3.Connection,
+        thread_id: str,
+        checkpoint_ns: str,
+        parent_checkpoint_id: str | None,
+        checkpoint_id: str,
+    ) -> None:
+        """Check, in the write transaction, that the parent is the latest."""
+        # Take the database write lock before reading, so that no other
+        # process can store a checkpoint between the check and the insert
+        connection.execute("BEGIN IMMEDIATE")
+        row = connection.execute(
+            "SELECT checkpoint_id FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id DESC LIMIT 1",
+            (thread_id, checkpoint_ns),
+        ).fetchone()
+        latest = row[0] if row else None
+        if latest not in (parent_checkpoint_id, checkpoint_id):
+            raise CheckpointConflictError(
+                f"Thread {thread_id} moved to checkpoint {latest} "
+                f"since checkpoint {parent_checkpoint_id}"
+            )
+
+    def _load_tuple(
+        self,
+        connection: sqlite3.Connection,
+        thread_id: str,
+        checkpoint_ns: str,
+        row: Sequence[Any],
+    ) -> CheckpointTuple:
+        """Build a checkpoint tuple from a checkpoints row."""
+        (
+            checkpoint_id,
+            parent_checkpoint_id,
+            checkpoint_type,
+            checkpoint_data,
+            metadata_type,
+            metadata_data,
+        ) = row
+        checkpoint = self.serde.loads_typed((checkpoint_type, checkpoint_data))
+        writes = connection.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_blobs(
+                    connection,
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["channel_versions"],
+                ),
+            },
+            metadata=self.serde.loads_typed((metadata_type, metadata_data)),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((value_type, value)))
+                for task_id, channel, value_type, value in writes
+            ],
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+        )
+
+    def _load_blobs(
+        self,
+        connection: sqlite3.Connection,
+        thread_id: str,
+        checkpoint_ns: str,
+        versions: ChannelVersions,
+    ) -> dict[str, Any]:
+        """Load the channel values of the given channel versions."""
+        channel_values: dict[str, Any] = {}
+        for channel, version in versions.items():
+            row = self._load_blob(
+                connection, thread_id, checkpoint_ns, channel, str(version)
+            )
+            if row is None or row[0] == "empty":
+                continue
+            if row[2] is None:
+                value, depth = self.serde.loads_typed(row[:2]), 0
+            else:
+                value, depth = self._load_delta(
+                    connection, thread_id, checkpoint_ns, channel, row
+                )
+            channel_values[channel] = value
+            if channel in self.delta_channels and isinstance(value, list):
+                # After a restart, continue delta chains from the first read
+                self._remember_delta_base(
+                    thread_id,
+                    checkpoint_ns,
+                    channel,
+                    str(version),
+                    value,
+                    depth,
+                    replace=False,
+                )
+        return channel_values
+
+    def _load_blob(
+        self,
+        connection: sqlite3.Connection,
+        thread_id: str,
+        checkpoint_ns: str,
+        channel: str,
+        version: str,
+    ) -> tuple[str, bytes | None, str | None] | None:
+        """Load the (type, blob, base_version) row of a channel version."""
+        return connection.execute(
+            "SELECT type, blob, base_version FROM blobs WHERE thread_id = ? "
+            "AND checkpoint_ns = ? AND channel = ? AND version = ?",
+            (thread_id, checkpoint_ns, channel, version),
+        ).fetchone()
+
+    def _blob_exists(
+        self,
+        connection: sqlite3.Connection,
+        thread_id: str,
+        checkpoint_ns: str,
+        channel: str,
+        version: str,
+    ) -> bool:
+        """Check that a channel version is stored."""
+        return (
+            connection.execute(
+                "SELECT 1 FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? "
+                "AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, version),
+            ).fetchone()
+            is not None
+        )
+
+    def _load_delta(
+        self,
+        connection: sqlite3.Connection,
+        thread_id: str,
+        checkpoint_ns: str,
+        channel: str,
+        row: tuple[str, bytes | None, str | None],
+    ) -> tuple[Sequence[BaseMessage], int]:
+        """
+        Rebuild a delta-encoded channel value from its nearest snapshot.
+
+        Returns:
+            The messages and the number of deltas applied
+        """
+        chain = []
+        while row[2] is not None:
+            chain.append(self.serde.loads_typed(row[:2]))
+            row = self._load_blob(connection, thread_id, checkpoint_ns, channel, row[2])
+            if row is None:
+                raise ValueError(
+                    f"Missing delta base of channel {channel!r} in thread {thread_id}"
+                )
+        messages = self.serde.loads_typed(row[:2])
+        for delta in reversed(chain):
+            messages = self._apply_delta(messages, delta["ops"])
+        return messages, len(chain)
+
+    def _encode_delta(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        channel: str,
+        version: str,
+        value: Any,
+    ) -> tuple[str, tuple] | None:
+        """
+        Encode a message channel version against the last stored version.
+
+        Returns:
+            (base_version, blob row) or None to store a full snapshot
+        """
+        if channel not in self.delta_channels or not isinstance(value, list):
+            return None
+        with self._delta_bases_lock:
+            base = self._delta_bases.get((thread_id, checkpoint_ns, channel))
+
+        ops = None
+        depth = 0
+        if base and base[0] != version and base[2] + 1 < self.snapshot_interval:
+            ops = self._message_ops(base[1], value)
+            depth = base[2] + 1
+        self._remember_delta_base(
+            thread_id,
+            checkpoint_ns,
+            channel,
+            version,
+            value,
+            0 if ops is None else depth,
+        )
+        if ops is None:
+            return None
+
+        delta_type, delta_data = self.serde.dumps_typed(
+            {"depth": depth, "ops": ops, "header": messages_header(value)}
+        )
+        return base[0], (
+            thread_id,
+            checkpoint_ns,
+            channel,
+            version,
+            delta_type,
+            delta_data,
+            base[0],
+        )
+
+    @staticmethod
+    def _message_ops(
+        previous: Sequence[BaseMessage], current: Sequence[BaseMessage]
+    ) -> Sequence[BaseMessage] | None:
+        """
+        Get the RemoveMessage and appended messages turning previous into current.
+
+        Returns:
+            The ops, or None if current is not an append/removal of previous
+        """
+        if not all(isinstance(message, BaseMessage) for message in current):
+            return None
+        current_ids = {message.id for message in current}
+        removed = [message.id for message in previous if message.id not in current_ids]
+        if None in removed:
+            return None
+        removed_ids = set(removed)
+        kept = [message for message in previous if message.id not in removed_ids]
+        if len(kept) > len(current) or any(
+            old is not new and old != new
+            for old, new in zip(kept, current, strict=False)
+        ):
+            return None
+        return [
+            *(RemoveMessage(id=message_id) for message_id in removed),
+            *current[len(kept) :],
+        ]
+
+    @staticmethod
+    def _apply_delta(
+        messages: Sequence[BaseMessage], ops: Sequence[BaseMessage]
+    ) -> Sequence[BaseMessage]:
+        """Apply RemoveMessage ops and appended messages to a message list."""
+        removed_ids = {op.id for op in ops if isinstance(op, RemoveMessage)}
+        return [
+            *(message for message in messages if message.id not in removed_ids),
+            *(op for op in ops if not isinstance(op, RemoveMessage)),
+        ]
+
+    def _remember_delta_base(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        channel: str,
+        version: str,
+        messages: Sequence[BaseMessage],
+        depth: int,
+        replace: bool = True,
+    ) -> None:
+        """Keep the latest version of a message channel as the next delta base."""
+        key = (thread_id, checkpoint_ns, channel)
+        with self._delta_bases_lock:
+            if not replace and key in self._delta_bases:
+                return
+            self._delta_bases[key] = (version, list(messages), depth)
+            self._delta_bases.move_to_end(key)
+            while len(self._delta_bases) > self.max_cached_threads:
+                self._delta_bases.popitem(last=False)
+
+    def _forget_delta_bases(self, thread_ids: set[str]) -> None:
+        """Drop the delta bases of deleted threads."""
+        with self._delta_bases_lock:
+            for key in [key for key in self._delta_bases if key[0] in thread_ids]:
+                del self._delta_bases[key]
+
+    @staticmethod
+    def _timestamp(checkpoint: Checkpoint) -> float:
+        """Get the checkpoint timestamp as epoch seconds."""
+        try:
+            return datetime.fromisoformat(checkpoint["ts"]).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return time.time()
@@ -4,9 +4,21 @@ Model service for AI model configuration and management.
 Handles model initialization, configuration, and context window
 management across multiple providers (AWS Bedrock, Ollama).
 Provides rate limiting, retry logic, and metadata management.
+
+Initialized chat models are pooled per platform, model and initialization
+parameters, so the provider clients, their connection pools and the rate
+limiter of a model are reused across turns instead of being rebuilt on
+every model call.
+
+Models with a tokens-per-minute quota also get a token rate limiter, shared
+by all calls to the model in the process. Callers reserve the estimated
+input tokens of a call and reconcile them with the reported usage.
 """
 
 import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
 from typing import Any, Literal
 
 from langchain.chat_models import init_chat_model
@@ -17,7 +29,11 @@ from pydantic import ValidationError
 
 from ..config import BaseRuntimeConfiguration, settings
 from ..core.services import ModelService as ModelServiceProtocol
-from .rate_limiting.factory import create_model_rate_limiter
+from .rate_limiting import TokenRateLimiter
+from .rate_limiting.factory import (
+    create_model_rate_limiter,
+    create_model_token_rate_limiter,
+)
 
 AWS_BEDROCK_PLATFORM = "aws_bedrock"
 OLLAMA_PLATFORM = "ollama"
@@ -33,6 +49,19 @@ class ModelManager(ModelServiceProtocol):
     extraction, and context window management across different providers.
     """
 
+    def __init__(self, pool_size: int | None = None):
+        """Initialize the model manager.
+        Args:
+            pool_size: Initialized models kept for reuse (0 disables pooling),
+                defaults to the MODEL_POOL_SIZE setting
+        """
+        self.pool_size = settings.model_pool_size if pool_size is None else pool_size
+        # (platform, model id, init parameters) -> model, least recently used first
+        self._model_pool: OrderedDict[tuple, BaseChatModel] = OrderedDict()
+        self._model_pool_lock = threading.Lock()
+        # (platform, model id) -> token rate limiter, None without a token limit
+        self._token_rate_limiters: dict[tuple[str, str], TokenRateLimiter | None] = {}
+
     @staticmethod
     def extract_message_content(message: BaseMessage) -> str:
         """Extract text content from a message object.
@@ -244,7 +273,62 @@ class ModelManager(ModelServiceProtocol):
         if "temperature" not in kwargs:
             kwargs["temperature"] = 0
 
+        if self.pool_size <= 0:
+            return ModelManager.initialize_chat_model(
+                model_id=model_name, model_provider=model_provider, **kwargs
+            )
+
+        key = (model_provider, model_name, _pool_key(kwargs))
+        with self._model_pool_lock:
+            model = self._model_pool.get(key)
+            if model is not None:
+                self._model_pool.move_to_end(key)
+                return model
+
+        # Initialize outside the lock; a concurrent miss keeps the first model
         model = ModelManager.initialize_chat_model(
             model_id=model_name, model_provider=model_provider, **kwargs
         )
+        with self._model_pool_lock:
+            model = self._model_pool.setdefault(key, model)
+            self._model_pool.move_to_end(key)
+            while len(self._model_pool) > self.pool_size:
+                self._model_pool.popitem(last=False)
         return model
+
+    def get_token_rate_limiter(self, config: RunnableConfig) -> TokenRateLimiter | None:
+        """Get the tokens-per-minute rate limiter of the configured model.
+        Args:
+            config: Runtime configuration containing model settings
+        Returns:
+            TokenRateLimiter | None: Rate limiter shared by calls to the model,
+            or None if the model has no token limit
+        """
+        model_config = ModelManager.get_model_config(config)
+        key = (
+            model_config.get("platform", settings.default_model_platform),
+            model_config.get("name", settings.default_model_id),
+        )
+        with self._model_pool_lock:
+            if key not in self._token_rate_limiters:
+                self._token_rate_limiters[key] = create_model_token_rate_limiter(*key)
+            return self._token_rate_limiters[key]
+
+    def clear_model_pool(self) -> None:
+        """Drop all pooled models, e.g. after credentials were rotated."""
+        with self._model_pool_lock:
+            self._model_pool.clear()
+
+
+def _pool_key(kwargs: dict[str, Any]) -> tuple:
+    """Get a hashable key of model initialization parameters."""
+    return tuple(sorted((name, _hashable(value)) for name, value in kwargs.items()))
+
+
+def _hashable(value: Any) -> Hashable:
+    """Get a value, or its repr if it cannot be hashed."""
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
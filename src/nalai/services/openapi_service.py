@@ -3,41 +3,239 @@ API service for managing API specifications and summaries.
 
 This service handles loading and management of API specifications,
 summaries, and related metadata.
+
+The files of an API specs directory are parsed once into an OpenAPIRegistry:
+summaries indexed by title and version, and specs kept with their JSON
+serialization, so turns neither re-read YAML nor re-serialize specs for the
+model prompt. The registry checks the modification times of its files at
+most every API_SPECS_RELOAD_CHECK_SECONDS and reparses the ones that changed,
+so specs can be updated without a restart.
+
+The service can also rank summaries by the words they share with a user
+message, which the speculative API selection uses to start loading likely
+specs before the model has selected any.
 """
 
+import json
 import logging
+import math
 import os
+import re
+import threading
+import time
+from dataclasses import dataclass
 from typing import Any
 
 import yaml
 
 from ..config import settings
 from ..core.services import APIService as APIServiceProtocol
+from ..utils.chat_history import get_token_ids_simplistic
 
 logger = logging.getLogger(__name__)
 
+_WORD_PATTERN = re.compile(r"[a-z0-9]{3,}")
+
+
+@dataclass
+class _ParsedSpec:
+    """An OpenAPI specification parsed from a file."""
+
+    mtime_ns: int
+    spec: dict[str, Any]
+    spec_json: str
+
+
+class OpenAPIRegistry:
+    """Parsed API summaries and specifications of one API specs directory."""
+
+    def __init__(self, specs_path: str, reload_check_seconds: float):
+        """
+        Initialize an empty registry; files are parsed on first access.
+
+        Args:
+            specs_path: Directory containing api_summaries.yaml and the specs
+            reload_check_seconds: Seconds between modification time checks
+        """
+        self.specs_path = specs_path
+        self.reload_check_seconds = reload_check_seconds
+        self._summaries_path = os.path.join(specs_path, "api_summaries.yaml")
+        self._summaries_mtime_ns: int | None = None
+        self._summaries: list[dict[str, Any]] = []
+        # (title, version) -> summary
+        self._index: dict[tuple[str, str], dict[str, Any]] = {}
+        # Spec file path -> parsed spec, and id of the spec dict -> parsed spec
+        self._specs: dict[str, _ParsedSpec] = {}
+        self._specs_by_id: dict[int, _ParsedSpec] = {}
+        self._catalog_tokens: int | None = None
+        self._checked_at = -math.inf
+        self._lock = threading.RLock()
+
+    def summaries(self) -> list[dict[str, Any]]:
+        """Get the API summaries."""
+        with self._lock:
+            self._check_for_changes()
+            return self._summaries
+
+    def find_summary(self, api_title: str, api_version: Any) -> dict[str, Any] | None:
+        """Get the summary of an API by title and version."""
+        with self._lock:
+            self._check_for_changes()
+            return self._index.get((str(api_title), str(api_version)))
+
+    def load_spec(self, openapi_file: str) -> dict[str, Any] | None:
+        """
+        Get a parsed specification, parsing its file on first access.
+
+        Args:
+            openapi_file: Spec file path relative to the specs directory
+
+        Returns:
+            The specification, or None if the file is missing or invalid
+        """
+        spec_file_path = os.path.join(self.specs_path, openapi_file)
+        with self._lock:
+            self._check_for_changes()
+            parsed = self._specs.get(spec_file_path)
+            if parsed is not None:
+                return parsed.spec
+
+            mtime_ns = _mtime_ns(spec_file_path)
+            if mtime_ns is None:
+                logger.error(f"API spec file not found: {spec_file_path}")
+                return None
+
+            logger.debug(f"Loading API spec from: {spec_file_path}")
+            try:
+                with open(spec_file_path, encoding="utf-8") as spec_file:
+                    spec = yaml.safe_load(spec_file)
+                parsed = _ParsedSpec(mtime_ns, spec, json.dumps(spec))
+            except Exception as error:
+                logger.error(f"Failed to load API spec {spec_file_path}: {error}")
+                return None
+            self._specs[spec_file_path] = parsed
+            self._specs_by_id[id(spec)] = parsed
+            return spec
+
+    def is_current(self, api_summaries: list[dict[str, Any]]) -> bool:
+        """Check whether summaries are the ones this registry last parsed."""
+        with self._lock:
+            return api_summaries is self._summaries
+
+    def spec_json(self, spec: dict[str, Any]) -> str | None:
+        """Get the cached JSON of a spec returned by this registry."""
+        with self._lock:
+            parsed = self._specs_by_id.get(id(spec))
+            return parsed.spec_json if parsed and parsed.spec is spec else None
+
+    def catalog_tokens(self) -> int:
+        """Estimate the prompt tokens of the specifications of all APIs."""
+        with self._lock:
+            self._check_for_changes()
+            if self._catalog_tokens is None:
+                catalog_tokens = 0
+                for summary in self._summaries:
+                    openapi_file = summary.get("openapi_file")
+                    spec = self.load_spec(openapi_file) if openapi_file else None
+                    if spec is not None:
+                        catalog_tokens += len(
+                            get_token_ids_simplistic(self.spec_json(spec))
+                        )
+                self._catalog_tokens = catalog_tokens
+            return self._catalog_tokens
+
+    def preload(self) -> None:
+        """Parse the summaries and every spec they name."""
+        for summary in self.summaries():
+            if summary.get("openapi_file"):
+                self.load_spec(summary["openapi_file"])
+
+    # ===== Private Helpers =====
+
+    def _check_for_changes(self) -> None:
+        """Reparse the files modified since the last check, if one is due."""
+        now = time.monotonic()
+        if (
+            self._summaries_mtime_ns is not None
+            and now - self._checked_at < self.reload_check_seconds
+        ):
+            return
+        self._checked_at = now
+
+        mtime_ns = _mtime_ns(self._summaries_path)
+        if mtime_ns is None:
+            raise FileNotFoundError(
+                f"API summaries file not found: {self._summaries_path}"
+            )
+        if mtime_ns != self._summaries_mtime_ns:
+            if self._summaries_mtime_ns is not None:
+                logger.info(f"Reloading API summaries from: {self._summaries_path}")
+            else:
+                logger.debug(f"Loading API summaries from: {self._summaries_path}")
+            with open(self._summaries_path, encoding="utf-8") as summaries_file:
+                self._summaries = yaml.safe_load(summaries_file) or []
+            self._index = {
+                (str(summary.get("title")), str(summary.get("version"))): summary
+                for summary in self._summaries
+            }
+            self._summaries_mtime_ns = mtime_ns
+            self._catalog_tokens = None
+
+        for spec_file_path, parsed in list(self._specs.items()):
+            if _mtime_ns(spec_file_path) != parsed.mtime_ns:
+                logger.info(f"API spec changed, reloading: {spec_file_path}")
+                del self._specs[spec_file_path]
+                del self._specs_by_id[id(parsed.spec)]
+                self._catalog_tokens = None
+
 
 class OpenAPIManager(APIServiceProtocol):
     """Service for managing API operations."""
 
-    def load_api_summaries(self, state: dict[str, Any]) -> dict[str, Any]:
+    def __init__(self, reload_check_seconds: float | None = None):
         """
-        Load API summaries from the configured data path.
+        Initialize the service.
+
+        Args:
+            reload_check_seconds: Seconds between modification time checks of
+                the spec files, defaults to API_SPECS_RELOAD_CHECK_SECONDS
         """
-        summaries_file_path = os.path.join(
-            settings.api_specs_path, "api_summaries.yaml"
+        self.reload_check_seconds = (
+            settings.api_specs_reload_check_seconds
+            if reload_check_seconds is None
+            else reload_check_seconds
         )
+        # API specs path -> registry
+        self._registries: dict[str, OpenAPIRegistry] = {}
+        self._lock = threading.Lock()
 
-        if not os.path.exists(summaries_file_path):
-            raise FileNotFoundError(
-                f"API summaries file not found: {summaries_file_path}"
-            )
+    def get_registry(self) -> OpenAPIRegistry:
+        """Get the registry of the configured API specs path."""
+        specs_path = settings.api_specs_path
+        with self._lock:
+            registry = self._registries.get(specs_path)
+            if registry is None:
+                registry = self._registries[specs_path] = OpenAPIRegistry(
+                    specs_path, self.reload_check_seconds
+                )
+            return registry
 
-        logger.debug(f"Loading API summaries from: {summaries_file_path}")
-        with open(summaries_file_path, encoding="utf-8") as summaries_file:
-            api_summaries = yaml.safe_load(summaries_file)
-            state["api_summaries"] = api_summaries
-            return state
+    def preload(self) -> None:
+        """Parse the API summaries and specs ahead of the first turn."""
+        self.get_registry().preload()
+
+    def get_api_summaries(self) -> list[dict[str, Any]]:
+        """
+        Get the API summaries of the configured data path.
+        """
+        return self.get_registry().summaries()
+
+    def load_api_summaries(self, state: dict[str, Any]) -> dict[str, Any]:
+        """
+        Load API summaries from the configured data path.
+        """
+        state["api_summaries"] = self.get_api_summaries()
+        return state
 
     def load_openapi_specifications(self, state: dict[str, Any]) -> dict[str, Any]:
         """
@@ -51,35 +249,114 @@ class OpenAPIManager(APIServiceProtocol):
         loaded_api_specs = []
 
         for selected_api in selected_apis:
-            api_title = selected_api.api_title
-            api_version = selected_api.api_version
+            api_spec = self.load_api_spec(
+                selected_api.api_title, selected_api.api_version, api_summaries
+            )
+            if api_spec is not None:
+                loaded_api_specs.append(api_spec)
 
-            # Find the corresponding API summary to get the openapi_file
-            openapi_file_path = None
-            for api_summary in api_summaries:
-                if api_summary.get("title") == api_title and str(
-                    api_summary.get("version")
-                ) == str(api_version):
-                    openapi_file_path = api_summary.get("openapi_file")
-                    break
+        state["api_specs"] = loaded_api_specs
+        return state
 
-            if not openapi_file_path:
-                logger.warning(f"No openapi_file found for {api_title} v{api_version}")
-                continue
+    def load_api_spec(
+        self, api_title: str, api_version: Any, api_summaries: list[dict[str, Any]]
+    ) -> dict[str, Any] | None:
+        """
+        Load the OpenAPI specification of one API.
 
-            spec_file_path = os.path.join(settings.api_specs_path, openapi_file_path)
+        Args:
+            api_title: Title of the API
+            api_version: Version of the API
+            api_summaries: API summaries naming the specification files
 
-            if not os.path.exists(spec_file_path):
-                logger.error(f"API spec file not found: {spec_file_path}")
-                continue
+        Returns:
+            The specification, or None if it is missing or cannot be parsed
+        """
+        registry = self.get_registry()
+        if registry.is_current(api_summaries):
+            api_summary = registry.find_summary(api_title, api_version)
+        else:
+            # Summaries restored from a checkpoint are matched one by one
+            api_summary = next(
+                (
+                    summary
+                    for summary in api_summaries
+                    if summary.get("title") == api_title
+                    and str(summary.get("version")) == str(api_version)
+                ),
+                None,
+            )
 
-            logger.debug(f"Loading API spec from: {spec_file_path}")
-            try:
-                with open(spec_file_path, encoding="utf-8") as spec_file:
-                    api_spec = yaml.safe_load(spec_file)
-                    loaded_api_specs.append(api_spec)
-            except Exception as error:
-                logger.error(f"Failed to load API spec for {api_title}: {error}")
+        openapi_file_path = api_summary.get("openapi_file") if api_summary else None
+        if not openapi_file_path:
+            logger.warning(f"No openapi_file found for {api_title} v{api_version}")
+            return None
+        return registry.load_spec(openapi_file_path)
 
-        state["api_specs"] = loaded_api_specs
-        return state
+    def serialize_api_specs(self, api_specs: list[dict[str, Any]]) -> str:
+        """
+        Serialize specifications to JSON for a model prompt.
+
+        Specs loaded through the registry reuse their cached JSON; the result
+        is the same as json.dumps(api_specs).
+        """
+        if not isinstance(api_specs, list):
+            return json.dumps(api_specs)
+        registry = self.get_registry()
+        return (
+            "["
+            + ", ".join(
+                registry.spec_json(spec) or json.dumps(spec) for spec in api_specs
+            )
+            + "]"
+        )
+
+    def rank_api_summaries(
+        self, text: str, api_summaries: list[dict[str, Any]], limit: int
+    ) -> list[dict[str, Any]]:
+        """
+        Rank API summaries by the words they share with a text.
+
+        Args:
+            text: Text to match, typically the last user message
+            api_summaries: API summaries to rank
+            limit: Maximum number of summaries returned
+
+        Returns:
+            The best matching summaries, sharing at least one word with the text
+        """
+        words = _words(text)
+        scored = []
+        for index, api_summary in enumerate(api_summaries):
+            summary_text = " ".join(
+                [
+                    str(api_summary.get("title", "")),
+                    str(api_summary.get("description", "")),
+                    " ".join(api_summary.get("methods", [])),
+                ]
+            )
+            score = len(words & _words(summary_text))
+            if score:
+                scored.append((-score, index, api_summary))
+        return [api_summary for _, _, api_summary in sorted(scored)[:limit]]
+
+    def estimate_catalog_tokens(self) -> int:
+        """
+        Estimate the prompt tokens of the specifications of all APIs.
+
+        The estimate is computed once per version of the catalog.
+        """
+        return self.get_registry().catalog_tokens()
+
+
+def _mtime_ns(path: str) -> int | None:
+    """Get the modification time of a file, or None if it does not exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _words(text: str) -> set[str]:
+    """Get the lowercase words of a text, ignoring very short ones."""
+    return set(_WORD_PATTERN.findall(text.lower()))
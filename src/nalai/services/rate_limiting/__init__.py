@@ -1,16 +1,31 @@
 """Rate limiting module for model access control."""
 
-from .factory import DefaultRateLimiterFactory, create_model_rate_limiter
+from .factory import (
+    DefaultRateLimiterFactory,
+    create_model_rate_limiter,
+    create_model_token_rate_limiter,
+)
 from .interfaces import RateLimiterConfig, RateLimiterInterface
-from .rate_limiters import FileLockRateLimiter
+from .rate_limiters import (
+    AsyncTokenBucketRateLimiter,
+    FileLockRateLimiter,
+    SharedMemoryRateLimiter,
+    TokenRateLimiter,
+    TokenReservation,
+)
 from .utils import get_default_rate_limiter_class, is_test_environment
 
 __all__ = [
     "RateLimiterConfig",
     "RateLimiterInterface",
+    "AsyncTokenBucketRateLimiter",
     "FileLockRateLimiter",
+    "SharedMemoryRateLimiter",
+    "TokenRateLimiter",
+    "TokenReservation",
     "is_test_environment",
     "get_default_rate_limiter_class",
     "create_model_rate_limiter",
+    "create_model_token_rate_limiter",
     "DefaultRateLimiterFactory",
 ]
@@ -11,6 +11,7 @@ from .interfaces import (
     RateLimiterFactoryInterface,
     RateLimiterInterface,
 )
+from .rate_limiters import SharedMemoryRateLimiter, TokenRateLimiter
 from .utils import get_default_rate_limiter_class
 
 logger = logging.getLogger(__name__)
@@ -24,15 +25,13 @@ class DefaultRateLimiterFactory(RateLimiterFactoryInterface):
         rate_limiter_class: type[BaseRateLimiter] | None = None,
         config_overrides: dict[str, RateLimiterConfig] | None = None,
     ):
-        # Use FileLockRateLimiter if explicitly enabled or in test environment
-        if settings.cross_process_rate_limiter_enabled:
-            from .rate_limiters import FileLockRateLimiter
-
-            self.rate_limiter_class = FileLockRateLimiter
+        # Share buckets across processes only if explicitly enabled
+        if rate_limiter_class is not None:
+            self.rate_limiter_class = rate_limiter_class
+        elif settings.cross_process_rate_limiter_enabled:
+            self.rate_limiter_class = SharedMemoryRateLimiter
         else:
-            self.rate_limiter_class = (
-                rate_limiter_class or get_default_rate_limiter_class()
-            )
+            self.rate_limiter_class = get_default_rate_limiter_class()
         self.config_overrides = config_overrides or {}
 
     def create_rate_limiter(
@@ -55,9 +54,14 @@ class DefaultRateLimiterFactory(RateLimiterFactoryInterface):
             if model_config_key in self.config_overrides:
                 config = self.config_overrides[model_config_key]
 
-            # Remove limiter_type from the config before passing to rate limiter
+            # Remove limiter_type and the token limit, which has its own
+            # limiter, from the config before passing to rate limiter
             rate_limiter_config = config.model_dump(exclude_unset=True)
             rate_limiter_config.pop("limiter_type", None)
+            rate_limiter_config.pop("tokens_per_minute", None)
+            if issubclass(self.rate_limiter_class, SharedMemoryRateLimiter):
+                # One shared bucket per model across processes
+                rate_limiter_config["key"] = model_config_key
 
             rate_limiter_instance = self.rate_limiter_class(**rate_limiter_config)
             logger.debug(
@@ -87,11 +91,13 @@ RATE_LIMITERS_CONFIG: dict[str, RateLimiterConfig] = {
         requests_per_second=1.5,  # 100 RPM (~1.67 RPS)
         check_every_n_seconds=0.1,  # 10 times / second
         max_bucket_size=10,  # 2 requests at burst
+        tokens_per_minute=200_000,  # Bedrock on-demand quota, input and output
     ),
     "aws_bedrock/anthropic.claude-sonnet-20240620-v1:0": RateLimiterConfig(
         requests_per_second=1.5,  # 100 RPM (~1.67 RPS)
         check_every_n_seconds=0.1,  # 10 times / second
         max_bucket_size=10,  # 2 requests at burst
+        tokens_per_minute=200_000,  # Bedrock on-demand quota, input and output
     ),
     # Ollama Models
     # Removed: "ollama/cnjack/mistral-samll-3.1:24b-it-q4_k_s": RateLimiterConfig(
@@ -153,3 +159,27 @@ def create_model_rate_limiter(
     config = get_rate_limiter_config(model_platform, model)
     factory = factory or default_factory
     return factory.create_rate_limiter(model_platform, model, config)
+
+
+def create_model_token_rate_limiter(
+    model_platform: str, model: str
+) -> TokenRateLimiter | None:
+    """
+    Create a tokens-per-minute rate limiter for the specified model.
+
+    Args:
+        model_platform: The platform (e.g., aws_bedrock, ollama)
+        model: The model identifier
+
+    Returns:
+        Optional[TokenRateLimiter]: Rate limiter instance or None if the model
+        has no token limit
+    """
+    config = get_rate_limiter_config(model_platform, model)
+    if not config.tokens_per_minute:
+        return None
+    logger.debug(
+        f"Created TokenRateLimiter for {model_platform}/{model} "
+        f"with {config.tokens_per_minute} tokens per minute"
+    )
+    return TokenRateLimiter(config.tokens_per_minute)
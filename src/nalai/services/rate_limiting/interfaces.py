@@ -21,6 +21,10 @@ class RateLimiterConfig(BaseModel):
     file_path: str | None = Field(
         default=None, description="Optional file path for file-based rate limiters"
     )
+    tokens_per_minute: int | None = Field(
+        default=None,
+        description="Model tokens (input and output) allowed per minute, None for no limit",
+    )
 
 
 class RateLimiterInterface(Protocol):
@@ -1,12 +1,23 @@
 """Rate limiter implementations."""
 
+import asyncio
 import atexit
+import contextlib
 import fcntl
+import hashlib
+import heapq
+import itertools
 import json
 import logging
+import math
 import os
+import struct
 import tempfile
+import threading
 import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from multiprocessing import resource_tracker, shared_memory
 from pathlib import Path
 from typing import Any
 
@@ -232,3 +243,407 @@ class FileLockRateLimiter(BaseRateLimiter, RateLimiterInterface):
             bool: True if tokens were acquired, False otherwise
         """
         return self.acquire(blocking=blocking)
+
+
+class AsyncTokenBucketRateLimiter(BaseRateLimiter, RateLimiterInterface):
+    """
+    An in-process token bucket that never touches disk on the acquire path.
+
+    A blocked caller takes its tokens at once, leaving the bucket in debt,
+    and sleeps until the debt is refilled. Waiting callers are therefore
+    served in arrival order, without polling, and the async path only ever
+    awaits asyncio.sleep.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        max_bucket_size: int,
+        check_every_n_seconds: float = 0.1,
+        **_: Any,
+    ):
+        """
+        Initialize the rate limiter with a full bucket.
+
+        Args:
+            requests_per_second: Tokens added to the bucket per second
+            max_bucket_size: Maximum number of tokens in the bucket
+            check_every_n_seconds: Accepted for configuration compatibility;
+                waits are computed from the refill rate instead of polled
+        """
+        self.requests_per_second = requests_per_second
+        self.max_bucket_size = max_bucket_size
+        self.check_every_n_seconds = check_every_n_seconds
+        self._tokens = float(max_bucket_size)
+        self._last_update = time.monotonic()
+        # Guards the bucket against worker threads; held for a few operations
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1, *, blocking: bool = True) -> bool:
+        """
+        Acquire tokens from the rate limiter.
+
+        Args:
+            tokens: Number of tokens to acquire (default: 1)
+            blocking: If True, waits until the tokens are available
+                     If False, returns immediately if they are not
+
+        Returns:
+            bool: True if tokens were acquired, False otherwise
+        """
+        wait = self._reserve(tokens, blocking)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def aacquire(self, tokens: float = 1, *, blocking: bool = True) -> bool:
+        """Async version of acquire."""
+        wait = self._reserve(tokens, blocking)
+        if wait is None:
+            return False
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._refund(tokens)
+                raise
+        return True
+
+    def _reserve(self, tokens: float, blocking: bool) -> float | None:
+        """Take tokens from the bucket and get the seconds to wait for them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, wait = _take_tokens(
+                self._tokens,
+                now - self._last_update,
+                tokens,
+                self.requests_per_second,
+                self.max_bucket_size,
+                blocking,
+            )
+            self._last_update = now
+            return wait
+
+    def _refund(self, tokens: float) -> None:
+        """Give back the tokens of a cancelled wait."""
+        with self._lock:
+            self._tokens = min(self.max_bucket_size, self._tokens + tokens)
+
+
+class SharedMemoryRateLimiter(BaseRateLimiter, RateLimiterInterface):
+    """
+    A token bucket shared by all processes using the same key.
+
+    The bucket lives in a small multiprocessing.shared_memory segment holding
+    the token count and the time of its last update. Updates take an
+    exclusive flock on the segment's own descriptor, which is held for a
+    struct unpack and pack only; the acquire path never opens, reads or
+    writes files. The segment outlives the processes using it, so workers
+    restarted by the server keep the shared budget.
+    """
+
+    _STATE = struct.Struct("dd")  # tokens, last update (monotonic, 0 = unset)
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        max_bucket_size: int,
+        check_every_n_seconds: float = 0.1,
+        key: str | None = None,
+        **_: Any,
+    ):
+        """
+        Initialize the rate limiter, creating or attaching its segment.
+
+        Args:
+            requests_per_second: Tokens added to the bucket per second
+            max_bucket_size: Maximum number of tokens in the bucket
+            check_every_n_seconds: Accepted for configuration compatibility;
+                waits are computed from the refill rate instead of polled
+            key: Name of the shared budget, e.g. "platform/model"; defaults
+                to one budget per rate configuration
+        """
+        self.requests_per_second = requests_per_second
+        self.max_bucket_size = max_bucket_size
+        self.check_every_n_seconds = check_every_n_seconds
+        self.key = key or f"{requests_per_second}/{max_bucket_size}"
+        self.name = "nalai_rl_" + hashlib.sha256(self.key.encode()).hexdigest()[:16]
+        try:
+            self._segment = shared_memory.SharedMemory(
+                self.name, create=True, size=self._STATE.size
+            )
+        except FileExistsError:
+            self._segment = shared_memory.SharedMemory(self.name)
+        # Keep the segment when this process exits; other processes share it
+        with contextlib.suppress(Exception):
+            resource_tracker.unregister(self._segment._name, "shared_memory")
+        # flock is per open file, so threads of this process need their own lock
+        self._thread_lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1, *, blocking: bool = True) -> bool:
+        """
+        Acquire tokens from the rate limiter.
+
+        Args:
+            tokens: Number of tokens to acquire (default: 1)
+            blocking: If True, waits until the tokens are available
+                     If False, returns immediately if they are not
+
+        Returns:
+            bool: True if tokens were acquired, False otherwise
+        """
+        wait = self._reserve(tokens, blocking)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def aacquire(self, tokens: float = 1, *, blocking: bool = True) -> bool:
+        """Async version of acquire."""
+        wait = self._reserve(tokens, blocking)
+        if wait is None:
+            return False
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._update(lambda state, now: (state[0] + tokens, state[1], None))
+                raise
+        return True
+
+    def unlink(self) -> None:
+        """Remove the shared segment; processes attached to it keep their view."""
+        # unlink unregisters the segment, so register it back first
+        resource_tracker.register(self._segment._name, "shared_memory")
+        with contextlib.suppress(FileNotFoundError):
+            self._segment.unlink()
+
+    def _reserve(self, tokens: float, blocking: bool) -> float | None:
+        """Take tokens from the shared bucket and get the seconds to wait."""
+
+        def take(state: tuple[float, float], now: float):
+            available, last_update = state
+            if last_update == 0.0:
+                # First use of a new segment
+                available, last_update = float(self.max_bucket_size), now
+            available, wait = _take_tokens(
+                available,
+                now - last_update,
+                tokens,
+                self.requests_per_second,
+                self.max_bucket_size,
+                blocking,
+            )
+            return available, now, wait
+
+        return self._update(take)
+
+    def _update(self, update) -> Any:
+        """Apply an update to the shared state atomically across processes."""
+        buffer = self._segment.buf
+        with self._thread_lock:
+            fcntl.flock(self._segment._fd, fcntl.LOCK_EX)
+            try:
+                state = self._STATE.unpack_from(buffer)
+                available, last_update, result = update(state, time.monotonic())
+                available = min(available, self.max_bucket_size)
+                self._STATE.pack_into(buffer, 0, available, last_update)
+                return result
+            finally:
+                fcntl.flock(self._segment._fd, fcntl.LOCK_UN)
+
+
+def _take_tokens(
+    available: float,
+    elapsed: float,
+    tokens: float,
+    requests_per_second: float,
+    max_bucket_size: float,
+    blocking: bool,
+) -> tuple[float, float | None]:
+    """
+    Refill a token bucket and take tokens from it.
+
+    Returns:
+        The tokens left, which are negative while blocked callers wait,
+        and the seconds to wait for the tokens, or None if not blocking
+        and the tokens are not available
+    """
+    available = min(max_bucket_size, available + max(elapsed, 0) * requests_per_second)
+    if available >= tokens:
+        return available - tokens, 0.0
+    if not blocking:
+        return available, None
+    available -= tokens
+    return available, -available / requests_per_second
+
+
+@dataclass
+class TokenReservation:
+    """Model tokens taken from a TokenRateLimiter for one model call."""
+
+    tokens: float
+
+
+@dataclass(order=True)
+class _TokenWaiter:
+    """A call waiting for tokens, ordered by its virtual finish time."""
+
+    finish_time: float
+    sequence: int
+    tokens: float = field(compare=False)
+    wake: Callable[[], None] = field(compare=False)
+
+
+class TokenRateLimiter:
+    """
+    A tokens-per-minute budget of model calls.
+
+    Calls reserve their estimated input tokens before they are sent and
+    reconcile the reservation with the tokens the provider reports
+    afterwards, so the budget tracks what the provider actually counts.
+
+    When the budget runs short, waiting calls are served by virtual finish
+    time: their arrival plus the time the budget needs to refill their
+    tokens. Short interactive calls thus overtake long ones that arrived
+    shortly before them, while a long call is never starved by a stream of
+    later short ones.
+    """
+
+    def __init__(self, tokens_per_minute: int):
+        """
+        Initialize the rate limiter with a full budget.
+
+        Args:
+            tokens_per_minute: Model tokens allowed per minute, which is
+                also the largest reservation
+        """
+        self.tokens_per_minute = tokens_per_minute
+        self._tokens_per_second = tokens_per_minute / 60
+        self._tokens = float(tokens_per_minute)
+        self._last_update = time.monotonic()
+        self._waiters: list[_TokenWaiter] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float) -> TokenReservation:
+        """
+        Reserve tokens, blocking until they are available.
+
+        Args:
+            tokens: Estimated tokens of the call
+
+        Returns:
+            TokenReservation: The reservation to reconcile after the call
+        """
+        reservation = TokenReservation(min(tokens, self.tokens_per_minute))
+        event = threading.Event()
+        waiter = self._take_or_enqueue(reservation.tokens, event.set)
+        while waiter is not None:
+            with self._lock:
+                event.clear()
+                wait = self._serve(waiter)
+            if wait == 0:
+                break
+            event.wait(None if wait == math.inf else wait)
+        return reservation
+
+    async def areserve(self, tokens: float) -> TokenReservation:
+        """Async version of reserve."""
+        reservation = TokenReservation(min(tokens, self.tokens_per_minute))
+        event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        waiter = self._take_or_enqueue(
+            reservation.tokens, lambda: loop.call_soon_threadsafe(event.set)
+        )
+        try:
+            while waiter is not None:
+                with self._lock:
+                    event.clear()
+                    wait = self._serve(waiter)
+                if wait == 0:
+                    break
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        event.wait(), None if wait == math.inf else wait
+                    )
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    heapq.heapify(self._waiters)
+                    self._wake_first()
+            raise
+        return reservation
+
+    def reconcile(self, reservation: TokenReservation, used_tokens: float) -> None:
+        """
+        Settle a reservation with the tokens the call actually used.
+
+        Args:
+            reservation: Reservation of the call
+            used_tokens: Input and output tokens reported by the provider
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(
+                self.tokens_per_minute,
+                self._tokens + reservation.tokens - used_tokens,
+            )
+            refunded = used_tokens < reservation.tokens
+            reservation.tokens = used_tokens
+            if refunded:
+                self._wake_first()
+
+    def _take_or_enqueue(
+        self, tokens: float, wake: Callable[[], None]
+    ) -> _TokenWaiter | None:
+        """Take tokens if nobody waits and they are available, else queue up."""
+        with self._lock:
+            self._refill()
+            if not self._waiters and self._tokens >= tokens:
+                self._tokens -= tokens
+                return None
+            waiter = _TokenWaiter(
+                self._last_update + tokens / self._tokens_per_second,
+                next(self._sequence),
+                tokens,
+                wake,
+            )
+            heapq.heappush(self._waiters, waiter)
+            return waiter
+
+    def _serve(self, waiter: _TokenWaiter) -> float:
+        """
+        Give a waiter its tokens if it is first in line and they are available.
+
+        Returns:
+            0 if the waiter was served, else the seconds until it can be,
+            which is infinite while other waiters are ahead of it
+        """
+        self._refill()
+        if self._waiters[0] is not waiter:
+            return math.inf
+        if self._tokens < waiter.tokens:
+            return (waiter.tokens - self._tokens) / self._tokens_per_second
+        heapq.heappop(self._waiters)
+        self._tokens -= waiter.tokens
+        self._wake_first()
+        return 0
+
+    def _wake_first(self) -> None:
+        """Wake the first waiter to recheck the budget."""
+        if self._waiters:
+            self._waiters[0].wake()
+
+    def _refill(self) -> None:
+        """Add the tokens refilled since the last update."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.tokens_per_minute,
+            self._tokens + (now - self._last_update) * self._tokens_per_second,
+        )
+        self._last_update = now
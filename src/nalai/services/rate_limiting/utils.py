@@ -113,23 +113,15 @@ def get_default_rate_limiter_class() -> type[RateLimiterInterface]:
         f"Getting rate limiter class: is_test={is_test}, enable_cross_process={enable_cross_process}"
     )
 
-    if is_test or enable_cross_process:
-        from .rate_limiters import FileLockRateLimiter
+    # Shared-memory buckets outlive their processes, so test runs and xdist
+    # workers would share and leak them; tests get in-process buckets
+    if enable_cross_process:
+        from .rate_limiters import SharedMemoryRateLimiter
 
-        _write_debug_message("Selected FileLockRateLimiter")
-        # Log when FileLockRateLimiter is actually instantiated
-        original_init = FileLockRateLimiter.__init__
-
-        def wrapped_init(self, *args, **kwargs):
-            _write_debug_message(
-                f"FileLockRateLimiter instantiated with args={args}, kwargs={kwargs}"
-            )
-            return original_init(self, *args, **kwargs)
-
-        FileLockRateLimiter.__init__ = wrapped_init
-        return FileLockRateLimiter
+        _write_debug_message("Selected SharedMemoryRateLimiter")
+        return SharedMemoryRateLimiter
     else:
-        from langchain_core.rate_limiters import InMemoryRateLimiter
+        from .rate_limiters import AsyncTokenBucketRateLimiter
 
-        _write_debug_message("Selected InMemoryRateLimiter")
-        return InMemoryRateLimiter
+        _write_debug_message("Selected AsyncTokenBucketRateLimiter")
+        return AsyncTokenBucketRateLimiter
@@ -7,6 +7,7 @@ and other common operations.
 
 from .chat_history import (
     compress_conversation_history_if_needed,
+    estimate_messages_tokens,
     get_token_ids_simplistic,
     get_token_ids_with_tiktoken,
     summarize_conversation,
@@ -19,6 +20,7 @@ __all__ = [
     "get_token_ids_simplistic",
     "get_token_ids_with_tiktoken",
     "compress_conversation_history_if_needed",
+    "estimate_messages_tokens",
     "trim_conversation_history_if_needed",
     "summarize_conversation",
     "stream_events_with_interruptions",
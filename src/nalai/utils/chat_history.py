@@ -1,3 +1,4 @@
+import json
 from collections.abc import Callable
 from functools import cache
 
@@ -48,6 +49,30 @@ def get_token_ids_simplistic(text: str) -> list[int]:
     return [0] * int(len(text.split()) * 1.3)
 
 
+def estimate_messages_tokens(
+    messages: list[BaseMessage],
+    custom_get_token_ids: Callable[[str], list[int]] = get_token_ids_simplistic,
+) -> int:
+    """Estimate the input tokens of messages without calling a model.
+    Counts message content and tool call arguments with the given tokenizer,
+    plus a small per-message overhead for roles and separators.
+    Args:
+        messages: Messages sent to the model
+        custom_get_token_ids: Custom token counting function
+    Returns:
+        int: Estimated token count
+    """
+    token_count = 0
+    for message in messages:
+        content = message.content
+        text = content if isinstance(content, str) else json.dumps(content)
+        tool_calls = getattr(message, "tool_calls", None)
+        if tool_calls:
+            text += json.dumps([call.get("args") for call in tool_calls])
+        token_count += len(custom_get_token_ids(text)) + 4
+    return token_count
+
+
 def trim_conversation_history_if_needed(
     messages: list[BaseMessage],
     model: BaseChatModel,
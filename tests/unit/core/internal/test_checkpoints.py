@@ -0,0 +1,383 @@
+"""
+Unit tests for the Checkpoints conversation index.
+
+Tests cover:
+- Index maintenance on create_conversation, put and delete_conversation
+- Refreshing entries from checkpoints written by graph runs
+- Checkpoint counts kept in the index instead of recounted
+- One-time index bootstrap from existing checkpoints
+- Index refresh from the thread changes of a shared checkpointer
+- Turn leases in a shared checkpointer
+- Cursor pagination and bulk conversation summaries
+- Summaries from message channel headers without loading messages
+- Conversation metadata records updated after graph runs
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.memory import MemorySaver
+
+from nalai.core.internal.checkpoints import Checkpoints, ConversationIndex
+from nalai.services.checkpointing_serde import CompactSerializer
+from nalai.services.checkpointing_sqlite import SQLiteCheckpointSaver
+
+
+@pytest.fixture
+def checkpoints():
+    """Create a Checkpoints instance over a fresh MemorySaver."""
+    service = MagicMock()
+    service.get_checkpointer.return_value = MemorySaver()
+    with patch(
+        "nalai.core.internal.checkpoints.get_checkpointing_service",
+        return_value=service,
+    ):
+        return Checkpoints()
+
+
+def write_checkpoint(checkpointer, thread_id: str, messages: list) -> None:
+    """Write a checkpoint directly, as a graph run does."""
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": messages}
+    checkpoint["channel_versions"] = {"messages": 1}
+    checkpointer.put(
+        {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}},
+        checkpoint,
+        {},
+        {"messages": 1},
+    )
+
+
+class TestConversationIndex:
+    """Test the user to conversation index."""
+
+    def test_conversations_ordered_by_last_update(self):
+        index = ConversationIndex()
+        index.add("user1", "a", "2024-01-01T00:00:00+00:00")
+        index.add("user1", "b", "2024-01-02T00:00:00+00:00")
+        index.update("user1", "a", "2024-01-03T00:00:00+00:00", 4)
+        index.add("user2", "c", "2024-01-01T00:00:00+00:00")
+
+        entries = index.conversations("user1")
+        assert [entry.conversation_id for entry in entries] == ["a", "b"]
+        assert entries[0].message_count == 4
+        assert entries[0].created_at == "2024-01-01T00:00:00+00:00"
+        assert len(index) == 3
+
+    def test_remove(self):
+        index = ConversationIndex()
+        index.add("user1", "a", "2024-01-01T00:00:00+00:00")
+
+        assert index.remove("user1", "a") is True
+        assert index.remove("user1", "a") is False
+        assert index.conversations("user1") == []
+
+
+class TestCheckpointsConversationIndex:
+    """Test conversation index maintenance in Checkpoints."""
+
+    @pytest.mark.asyncio
+    async def test_create_put_and_delete_update_index(self, checkpoints):
+        await checkpoints.create_conversation("user1", "conv1")
+        await checkpoints.create_conversation("user2", "conv2")
+
+        config = {
+            "configurable": {"thread_id": "user:user1:conv1", "checkpoint_ns": ""}
+        }
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {"messages": [HumanMessage(content="Hi")]}
+        await checkpoints.put(config, checkpoint)
+
+        assert await checkpoints.list_user_conversations("user1") == ["conv1"]
+        assert checkpoints.conversation_index.get("user1", "conv1").message_count == 1
+
+        await checkpoints.delete_conversation("user1", "conv1")
+        assert await checkpoints.list_user_conversations("user1") == []
+        assert await checkpoints.list_user_conversations("user2") == ["conv2"]
+
+    @pytest.mark.asyncio
+    async def test_graph_writes_refreshed_on_read(self, checkpoints):
+        await checkpoints.list_user_conversations("user1")
+        await checkpoints.create_conversation("user1", "conv1")
+        write_checkpoint(
+            checkpoints.checkpointer,
+            "user:user1:conv1",
+            [HumanMessage(content="Hi"), AIMessage(content="Hello")],
+        )
+
+        await checkpoints.validate_user_access("user1", "conv1")
+
+        entry = checkpoints.conversation_index.get("user1", "conv1")
+        assert entry.message_count == 2
+
+    @pytest.mark.asyncio
+    async def test_indexed_checkpoints_not_counted_again(self, checkpoints):
+        await checkpoints.create_conversation("user1", "conv1")
+        write_checkpoint(
+            checkpoints.checkpointer, "user:user1:conv1", [HumanMessage(content="Hi")]
+        )
+        config = {
+            "configurable": {"thread_id": "user:user1:conv1", "checkpoint_ns": ""}
+        }
+        await checkpoints.get(config)
+
+        with patch.object(
+            checkpoints, "_count_checkpoints", wraps=checkpoints._count_checkpoints
+        ) as count_checkpoints:
+            # The checkpoint read is already indexed
+            await checkpoints.validate_user_access("user1", "conv1")
+            # A put adds one checkpoint to the indexed count
+            checkpoint = empty_checkpoint()
+            checkpoint["channel_values"] = {"messages": [HumanMessage(content="Hi")]}
+            await checkpoints.put(config, checkpoint)
+
+        count_checkpoints.assert_not_called()
+        entry = checkpoints.conversation_index.get("user1", "conv1")
+        assert entry.checkpoint_count == 2
+
+    @pytest.mark.asyncio
+    async def test_index_built_once_from_existing_checkpoints(self, checkpoints):
+        write_checkpoint(
+            checkpoints.checkpointer, "user:user1:old", [HumanMessage(content="Hi")]
+        )
+        write_checkpoint(
+            checkpoints.checkpointer, "user:user2:other", [HumanMessage(content="Hi")]
+        )
+        write_checkpoint(checkpoints.checkpointer, "unscoped-thread", [])
+
+        with patch.object(
+            checkpoints.checkpointer, "list", wraps=checkpoints.checkpointer.list
+        ) as list_checkpoints:
+            assert await checkpoints.list_user_conversations("user1") == ["old"]
+            assert await checkpoints.list_user_conversations("user2") == ["other"]
+
+        # Only the latest checkpoint of each thread is read
+        list_checkpoints.assert_not_called()
+        assert len(checkpoints.conversation_index) == 2
+        entry = checkpoints.conversation_index.get("user1", "old")
+        assert entry.checkpoint_count == 1
+        assert entry.preview == "Hi"
+
+    @pytest.mark.asyncio
+    async def test_threads_reclaimed_by_compaction_leave_index(self, checkpoints):
+        await checkpoints.create_conversation("user1", "conv1")
+        await checkpoints.create_conversation("user1", "conv2")
+        listener = checkpoints.checkpointing_service.add_compaction_listener
+        listener.assert_called_once_with(checkpoints._forget_threads)
+
+        checkpoints._forget_threads(["user:user1:conv1", "unscoped-thread"])
+
+        assert await checkpoints.list_user_conversations("user1") == ["conv2"]
+
+
+class TestSharedCheckpointerIndex:
+    """Test the conversation index over a checkpointer shared by workers."""
+
+    def _make_worker(self, path):
+        service = MagicMock()
+        service.get_checkpointer.return_value = SQLiteCheckpointSaver(str(path))
+        with patch(
+            "nalai.core.internal.checkpoints.get_checkpointing_service",
+            return_value=service,
+        ):
+            return Checkpoints()
+
+    @pytest.mark.asyncio
+    async def test_writes_of_other_workers_are_listed(self, tmp_path):
+        worker1 = self._make_worker(tmp_path / "checkpoints.db")
+        worker2 = self._make_worker(tmp_path / "checkpoints.db")
+        write_checkpoint(
+            worker1.checkpointer, "user:user1:old", [HumanMessage(content="Hi")]
+        )
+        assert await worker2.list_user_conversations("user1") == ["old"]
+
+        write_checkpoint(
+            worker1.checkpointer,
+            "user:user1:new",
+            [HumanMessage(content="Next"), AIMessage(content="Sure")],
+        )
+        with patch.object(
+            worker2.checkpointer, "aget_tuple", wraps=worker2.checkpointer.aget_tuple
+        ) as aget_tuple:
+            assert await worker2.list_user_conversations("user1") == ["new", "old"]
+            # Only the thread written since the last listing is read
+            aget_tuple.assert_called_once()
+        entry = worker2.conversation_index.get("user1", "new")
+        assert entry.message_count == 2
+        assert entry.preview == "Next"
+
+        await worker1.delete_conversation("user1", "old")
+        assert await worker2.list_user_conversations("user1") == ["new"]
+
+    @pytest.mark.asyncio
+    async def test_turn_leases_shared_by_workers(self, tmp_path, checkpoints):
+        worker1 = self._make_worker(tmp_path / "checkpoints.db")
+        worker2 = self._make_worker(tmp_path / "checkpoints.db")
+
+        assert await worker1.acquire_turn_lease("user:user1:a", "lease1", 60)
+        assert not await worker2.acquire_turn_lease("user:user1:a", "lease2", 60)
+        await worker1.release_turn_lease("user:user1:a", "lease1")
+        assert await worker2.acquire_turn_lease("user:user1:a", "lease2", 60)
+        # Checkpointers of a single process leave leases to the caller
+        assert await checkpoints.acquire_turn_lease("user:user1:a", "lease3", 60)
+
+    @pytest.mark.asyncio
+    async def test_workers_serve_the_same_pages(self, tmp_path):
+        worker1 = self._make_worker(tmp_path / "checkpoints.db")
+        worker2 = self._make_worker(tmp_path / "checkpoints.db")
+        for name in ("a", "b", "c"):
+            config = {"configurable": {"thread_id": f"user:user1:{name}"}}
+            messages = [HumanMessage(content=f"Hi {name}")]
+            write_checkpoint(
+                worker1.checkpointer, config["configurable"]["thread_id"], messages
+            )
+            # Records of the writing worker follow the shared checkpoints
+            await worker1.record_messages(config, messages)
+
+        first, cursor, total = await worker1.page_user_conversations("user1", 2)
+        assert await worker2.page_user_conversations("user1", 2) == (
+            first,
+            cursor,
+            total,
+        )
+        assert total == 3
+        rest1 = await worker1.page_user_conversations("user1", 2, cursor)
+        rest2 = await worker2.page_user_conversations("user1", 2, cursor)
+        assert rest1 == rest2
+        assert sorted(first + rest1[0]) == ["a", "b", "c"]
+
+        summaries1 = await worker1.get_conversation_summaries("user1", ["a", "c"])
+        summaries2 = await worker2.get_conversation_summaries("user1", ["a", "c"])
+        assert [s["last_accessed"] for s in summaries1] == [
+            s["last_accessed"] for s in summaries2
+        ]
+
+
+class TestConversationPagination:
+    """Test cursor pagination and bulk summaries of a user's conversations."""
+
+    def test_index_pages_most_recent_first(self):
+        index = ConversationIndex()
+        for day in range(1, 6):
+            index.add("user1", f"conv{day}", f"2024-01-0{day}T00:00:00+00:00")
+        index.update("user1", "conv1", "2024-01-09T00:00:00+00:00", 2)
+
+        first, last = index.page("user1", 2)
+        second, after_second = index.page("user1", 2, last)
+        third, end = index.page("user1", 2, after_second)
+
+        assert [entry.conversation_id for entry in first] == ["conv1", "conv5"]
+        assert [entry.conversation_id for entry in second] == ["conv4", "conv3"]
+        assert [entry.conversation_id for entry in third] == ["conv2"]
+        assert end is None
+
+    @pytest.mark.asyncio
+    async def test_page_user_conversations_cursor(self, checkpoints):
+        for name in ("a", "b", "c"):
+            await checkpoints.create_conversation("user1", f"conv_{name}")
+
+        ids, cursor, total = await checkpoints.page_user_conversations("user1", 2)
+        rest, end, _ = await checkpoints.page_user_conversations("user1", 2, cursor)
+
+        assert total == 3
+        assert ids == ["conv_c", "conv_b"]
+        assert rest == ["conv_a"]
+        assert end is None
+
+    @pytest.mark.asyncio
+    async def test_page_user_conversations_invalid_cursor(self, checkpoints):
+        with pytest.raises(ValueError, match="Invalid conversation cursor"):
+            await checkpoints.page_user_conversations("user1", 2, "not-a-cursor")
+
+    @pytest.mark.asyncio
+    async def test_get_conversation_summaries_reads_each_state_once(self, checkpoints):
+        await checkpoints.create_conversation("user1", "conv1")
+        await checkpoints.create_conversation("user1", "empty")
+        write_checkpoint(
+            checkpoints.checkpointer,
+            "user:user1:conv1",
+            [HumanMessage(content="First question"), AIMessage(content="Answer")],
+        )
+        write_checkpoint(
+            checkpoints.checkpointer,
+            "user:user1:conv1",
+            [HumanMessage(content="First question"), AIMessage(content="Answer")],
+        )
+
+        with patch.object(
+            checkpoints.checkpointer, "aget", wraps=checkpoints.checkpointer.aget
+        ) as aget:
+            summaries = await checkpoints.get_conversation_summaries(
+                "user1", ["conv1", "empty"]
+            )
+
+        # conv1 is indexed when the index is built, only "empty" is read
+        assert aget.call_count == 1
+        assert summaries[0]["message_count"] == 2
+        assert summaries[0]["checkpoint_count"] == 2
+        assert summaries[0]["preview"] == "First question"
+        assert summaries[0]["created_at"].endswith("Z")
+        assert summaries[1]["message_count"] == 0
+        assert summaries[1]["preview"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_conversation_summaries_from_headers(self, checkpoints):
+        checkpoints.checkpointer = MemorySaver(serde=CompactSerializer())
+        await checkpoints.create_conversation("user1", "conv1")
+        write_checkpoint(
+            checkpoints.checkpointer,
+            "user:user1:conv1",
+            [AIMessage(content="Welcome"), HumanMessage(content="First question")],
+        )
+
+        with patch.object(checkpoints.checkpointer, "aget") as aget:
+            summaries = await checkpoints.get_conversation_summaries("user1", ["conv1"])
+            preview, status, message_count = await checkpoints.get_metadata(
+                {"configurable": {"thread_id": "user:user1:conv1"}}
+            )
+
+        aget.assert_not_called()
+        assert summaries[0]["message_count"] == message_count == 2
+        assert summaries[0]["preview"] == preview == "First question"
+        assert summaries[0]["checkpoint_count"] == 1
+        assert status == "active"
+
+
+class TestConversationMetadataRecord:
+    """Test conversation metadata served from the index record."""
+
+    @pytest.mark.asyncio
+    async def test_metadata_served_from_record_after_run(self, checkpoints):
+        await checkpoints.create_conversation("user1", "conv1")
+        messages = [HumanMessage(content="First question"), AIMessage(content="A")]
+        write_checkpoint(checkpoints.checkpointer, "user:user1:conv1", messages)
+        config = {"configurable": {"thread_id": "user:user1:conv1"}}
+        await checkpoints.record_messages(config, messages)
+
+        with (
+            patch.object(checkpoints.checkpointer, "aget") as aget,
+            patch.object(checkpoints.checkpointer, "list") as list_checkpoints,
+        ):
+            metadata = await checkpoints.get_conversation_metadata("user1", "conv1")
+            summaries = await checkpoints.get_conversation_summaries("user1", ["conv1"])
+
+        aget.assert_not_called()
+        list_checkpoints.assert_not_called()
+        assert summaries == [metadata]
+        assert metadata["message_count"] == 2
+        assert metadata["checkpoint_count"] == 1
+        assert metadata["preview"] == "First question"
+        assert metadata["status"] == "active"
+        assert metadata["created_at"].endswith("Z")
+
+    @pytest.mark.asyncio
+    async def test_metadata_without_checkpoint_reads_state(self, checkpoints):
+        await checkpoints.create_conversation("user1", "conv1")
+
+        metadata = await checkpoints.get_conversation_metadata("user1", "conv1")
+
+        assert metadata["created_at"] is None
+        assert metadata["checkpoint_count"] == 0
+        assert metadata["preview"] is None
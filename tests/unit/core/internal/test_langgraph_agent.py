@@ -4,6 +4,7 @@ Unit tests for agent API implementation.
 Tests the agent API implementation using data-driven tests.
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -11,6 +12,7 @@ import yaml
 
 from nalai.core import (
     AccessDeniedError,
+    ConversationBusyError,
     ConversationNotFoundError,
     InvocationError,
     ValidationError,
@@ -18,6 +20,10 @@ from nalai.core import (
 
 # Internal types for unit testing
 from nalai.core.internal.lc_agent import LangGraphAgent
+from nalai.services.checkpointing_conflicts import (
+    CHECKPOINT_CAS_KEY,
+    CheckpointConflictError,
+)
 
 
 def load_test_cases():
@@ -860,3 +866,150 @@ class TestLangGraphAgent:
 
         # Assert - Verify audit service was called
         mock_audit_service.log_conversation_access_event.assert_called()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_turns_rejected(self, langgraph_agent, mock_agent):
+        """Test that a second turn on a busy conversation fails fast."""
+        from nalai.core.messages import HumanInputMessage
+
+        conversation_id = "conv_2b1c3d4e5f6g7h8i9j2k3m4n5p6q7r8s9"
+        config = {"configurable": {"user_id": "user123"}}
+        messages = [HumanInputMessage(content="Hello")]
+        release = asyncio.Event()
+
+        async def slow_invoke(*args, **kwargs):
+            await release.wait()
+            return {"messages": []}
+
+        mock_agent.ainvoke.side_effect = slow_invoke
+        first = asyncio.create_task(
+            langgraph_agent.chat(messages, conversation_id, config)
+        )
+        await asyncio.sleep(0)
+
+        with pytest.raises(ConversationBusyError):
+            await langgraph_agent.chat(messages, conversation_id, config)
+
+        release.set()
+        await first
+        await langgraph_agent.chat(messages, conversation_id, config)
+        assert mock_agent.ainvoke.call_count == 2
+        assert mock_agent.ainvoke.call_args.kwargs["config"]["configurable"][
+            CHECKPOINT_CAS_KEY
+        ]
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_conflict_maps_to_busy(self, langgraph_agent, mock_agent):
+        """Test that a turn stored first by another process fails as busy."""
+        from nalai.core.messages import HumanInputMessage
+
+        conversation_id = "conv_2b1c3d4e5f6g7h8i9j2k3m4n5p6q7r8s9"
+        config = {"configurable": {"user_id": "user123"}}
+        mock_agent.ainvoke.side_effect = CheckpointConflictError("moved")
+
+        with pytest.raises(ConversationBusyError):
+            await langgraph_agent.chat(
+                [HumanInputMessage(content="Hello")], conversation_id, config
+            )
+
+        assert langgraph_agent._turns == {}
+
+    @pytest.mark.asyncio
+    async def test_streamed_checkpoint_conflict_ends_with_busy_event(
+        self, langgraph_agent, mock_agent
+    ):
+        """Test that a streamed turn stored first elsewhere ends with an error event."""
+        from nalai.core.messages import HumanInputMessage, ToolCallDecision
+        from nalai.core.streaming import ResponseErrorEvent
+
+        conversation_id = "conv_2b1c3d4e5f6g7h8i9j2k3m4n5p6q7r8s9"
+        config = {"configurable": {"user_id": "user123"}}
+
+        async def conflicting_stream(*args, **kwargs):
+            raise CheckpointConflictError("moved")
+            yield
+
+        mock_agent.astream = conflicting_stream
+        turns = [
+            langgraph_agent.chat_streaming(
+                [HumanInputMessage(content="Hello")], conversation_id, config
+            ),
+            langgraph_agent.resume_interrupted_streaming(
+                ToolCallDecision(tool_call_id="call_1", decision="accept"),
+                conversation_id,
+                config,
+            ),
+        ]
+
+        for turn in turns:
+            stream, _ = await turn
+            events = [event async for event in stream]
+            assert isinstance(events[-1], ResponseErrorEvent)
+            assert events[-1].error == ConversationBusyError().message
+            assert events[-1].conversation_id == conversation_id
+        assert langgraph_agent._turns == {}
+
+    @pytest.mark.asyncio
+    async def test_stream_closed_after_first_event_releases_turn(
+        self, langgraph_agent, mock_agent
+    ):
+        """Test that a client disconnect after the first event frees the conversation."""
+        from nalai.core.messages import HumanInputMessage
+
+        conversation_id = "conv_2b1c3d4e5f6g7h8i9j2k3m4n5p6q7r8s9"
+        config = {"configurable": {"user_id": "user123"}}
+        messages = [HumanInputMessage(content="Hello")]
+
+        stream, _ = await langgraph_agent.chat_streaming(
+            messages, conversation_id, config
+        )
+        await stream.__anext__()
+        await stream.aclose()
+
+        assert langgraph_agent._turns == {}
+
+    @pytest.mark.asyncio
+    async def test_stream_never_started_releases_turn(
+        self, langgraph_agent, mock_agent
+    ):
+        """Test that a stream dropped before iteration frees the conversation."""
+        from nalai.core.messages import HumanInputMessage
+
+        conversation_id = "conv_2b1c3d4e5f6g7h8i9j2k3m4n5p6q7r8s9"
+        config = {"configurable": {"user_id": "user123"}}
+        messages = [HumanInputMessage(content="Hello")]
+
+        stream, _ = await langgraph_agent.chat_streaming(
+            messages, conversation_id, config
+        )
+        with pytest.raises(ConversationBusyError):
+            await langgraph_agent.chat_streaming(messages, conversation_id, config)
+
+        del stream
+        stream, _ = await langgraph_agent.chat_streaming(
+            messages, conversation_id, config
+        )
+        del stream
+        await asyncio.sleep(0)
+        assert langgraph_agent._turns == {}
+        assert langgraph_agent.checkpoints.release_turn_lease.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_turn_leased_by_another_worker_rejected(
+        self, langgraph_agent, mock_agent, mock_access_control
+    ):
+        """Test that a turn fails before the graph runs if another worker holds it."""
+        from nalai.core.messages import HumanInputMessage
+
+        conversation_id = "conv_2b1c3d4e5f6g7h8i9j2k3m4n5p6q7r8s9"
+        config = {"configurable": {"user_id": "user123"}}
+        mock_access_control.acquire_turn_lease.return_value = False
+
+        with pytest.raises(ConversationBusyError):
+            await langgraph_agent.chat(
+                [HumanInputMessage(content="Hello")], conversation_id, config
+            )
+
+        mock_agent.ainvoke.assert_not_called()
+        assert langgraph_agent._turns == {}
+        mock_access_control.release_turn_lease.assert_not_called()
@@ -29,6 +29,7 @@ from nalai.core.internal.constants import (
     NODE_CHECK_CACHE,
     NODE_LOAD_API_SPECS,
     NODE_LOAD_API_SUMMARIES,
+    NODE_SELECT_AND_LOAD_APIS,
     NODE_SELECT_RELEVANT_APIS,
 )
 from nalai.core.internal.states import AgentState, InputSchema, OutputSchema
@@ -131,7 +132,7 @@ class TestWorkflowCreation:
 
         # Verify nodes were added
         mock_graph_instance.add_node.assert_any_call(
-            NODE_CHECK_CACHE, mock_agent.check_cache_with_similarity
+            NODE_CHECK_CACHE, mock_agent.check_cache_with_similarity_async
         )
         # Check that API service methods were called (they're bound to service instances)
         api_service_calls = [
@@ -147,7 +148,7 @@ class TestWorkflowCreation:
             NODE_SELECT_RELEVANT_APIS, mock_agent.select_relevant_apis
         )
         mock_graph_instance.add_node.assert_any_call(
-            NODE_CALL_MODEL, mock_agent.generate_model_response
+            NODE_CALL_MODEL, mock_agent.generate_model_response_async
         )
         mock_graph_instance.add_node.assert_any_call(
             NODE_CALL_API, mock_tool_node_instance
@@ -181,6 +182,37 @@ class TestWorkflowCreation:
         mock_graph_instance.compile.assert_called_once_with(checkpointer=None)
         assert result == mock_compiled_graph
 
+    @patch("nalai.core.internal.workflow.settings")
+    @patch("nalai.core.internal.workflow.StateGraph")
+    @patch("nalai.core.internal.workflow.ToolNode")
+    def test_create_and_compile_workflow_speculative(
+        self, mock_tool_node, mock_state_graph, mock_settings, mock_agent
+    ):
+        """Test that speculative mode selects and loads APIs in one node."""
+        mock_settings.api_selection_speculative = True
+        mock_graph_instance = MagicMock(spec=StateGraph)
+        mock_state_graph.return_value = mock_graph_instance
+
+        create_and_compile_workflow(mock_agent)
+
+        added_nodes = [
+            call[0][0] for call in mock_graph_instance.add_node.call_args_list
+        ]
+        assert NODE_SELECT_AND_LOAD_APIS in added_nodes
+        assert NODE_LOAD_API_SUMMARIES not in added_nodes
+        assert NODE_SELECT_RELEVANT_APIS not in added_nodes
+        mock_graph_instance.add_conditional_edges.assert_any_call(
+            NODE_CHECK_CACHE,
+            mock_agent.determine_cache_action,
+            {
+                NODE_LOAD_API_SUMMARIES: NODE_SELECT_AND_LOAD_APIS,
+                NODE_CALL_MODEL: NODE_CALL_MODEL,
+            },
+        )
+        mock_graph_instance.add_edge.assert_any_call(
+            NODE_SELECT_AND_LOAD_APIS, NODE_CALL_MODEL
+        )
+
     @patch("nalai.core.internal.workflow.StateGraph")
     def test_create_and_compile_workflow_with_custom_tools(
         self, mock_state_graph, mock_agent, mock_available_tools
@@ -295,7 +327,7 @@ class TestWorkflowCreation:
         check_cache_call = next(
             call for call in add_node_calls if call[0][0] == NODE_CHECK_CACHE
         )
-        assert check_cache_call[0][1] == mock_agent.check_cache_with_similarity
+        assert check_cache_call[0][1] == mock_agent.check_cache_with_similarity_async
 
         # Find the call for load_api_summaries
         load_api_call = next(
@@ -321,7 +353,7 @@ class TestWorkflowCreation:
         call_model_call = next(
             call for call in add_node_calls if call[0][0] == NODE_CALL_MODEL
         )
-        assert call_model_call[0][1] == mock_agent.generate_model_response
+        assert call_model_call[0][1] == mock_agent.generate_model_response_async
 
     @patch("nalai.core.internal.workflow.StateGraph")
     @patch("nalai.core.internal.workflow.ToolNode")
@@ -2,12 +2,13 @@
 Unit tests for WorkflowNodes core functionality.
 
 Tests cover workflow node initialization, response parsing, template formatting,
-API selection, workflow actions, and model response generation.
+API selection (sequential and speculative), workflow actions, and model response
+generation.
 """
 
 import os
 import sys
-from unittest.mock import ANY, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 import yaml
@@ -30,6 +31,7 @@ from nalai.core.internal.constants import (
 from nalai.core.internal.states import AgentState
 from nalai.core.internal.workflow_nodes import WorkflowNodes
 from nalai.prompts.prompts import format_template_with_variables
+from nalai.services.cache_service import conversation_digest
 
 
 @pytest.fixture
@@ -152,6 +154,93 @@ class TestWorkflowNodes:
         assert "messages" in result
         assert len(result["messages"]) == case_data["expected"]["messages_count"]
 
+    @pytest.mark.asyncio
+    @patch("nalai.core.internal.workflow_nodes.settings")
+    @patch("nalai.core.internal.workflow_nodes.get_api_service")
+    @patch.object(WorkflowNodes, "create_prompt_and_model")
+    async def test_select_and_load_apis_async_prefetches_likely_specs(
+        self,
+        mock_create_prompt_and_model,
+        mock_get_api_service,
+        mock_settings,
+        assistant,
+        mock_config,
+    ):
+        """Test that likely specs load during selection and unselected ones are dropped."""
+        mock_settings.api_selection_skip_token_budget = 0
+        mock_settings.api_selection_prefetch_count = 2
+        summaries = [
+            {"title": "Orders API", "version": "1.0"},
+            {"title": "Users API", "version": "1.0"},
+            {"title": "Billing API", "version": "2.0"},
+        ]
+        mock_api_service = MagicMock()
+        mock_api_service.get_api_summaries.return_value = summaries
+        mock_api_service.rank_api_summaries.return_value = summaries[:2]
+        mock_api_service.load_api_spec.side_effect = (
+            lambda title, version, api_summaries: {"title": title}
+        )
+        mock_get_api_service.return_value = mock_api_service
+
+        mock_prompt = MagicMock()
+        mock_prompt.invoke.return_value = "test prompt"
+        mock_model = MagicMock()
+        mock_structured_model = MagicMock()
+        mock_structured_model.ainvoke = AsyncMock(
+            return_value=SelectedApis(
+                selected_apis=[
+                    SelectApi(api_title="Orders API", api_version="1.0"),
+                    SelectApi(api_title="Billing API", api_version="2.0"),
+                ]
+            )
+        )
+        mock_model.with_structured_output.return_value = mock_structured_model
+        mock_create_prompt_and_model.return_value = (mock_prompt, mock_model)
+
+        state = AgentState(messages=[HumanMessage(content="Where are my orders?")])
+        result = await assistant.select_and_load_apis_async(state, mock_config)
+
+        mock_api_service.rank_api_summaries.assert_called_once_with(
+            "Where are my orders?", summaries, 2
+        )
+        assert result["api_summaries"] == summaries
+        assert result["api_specs"] == [
+            {"title": "Orders API"},
+            {"title": "Billing API"},
+        ]
+        # Orders and Users were prefetched; only Billing was loaded afterwards
+        assert mock_api_service.load_api_spec.call_count == 3
+
+    @pytest.mark.asyncio
+    @patch("nalai.core.internal.workflow_nodes.settings")
+    @patch("nalai.core.internal.workflow_nodes.get_api_service")
+    @patch.object(WorkflowNodes, "create_prompt_and_model")
+    async def test_select_and_load_apis_async_skips_selection_under_budget(
+        self,
+        mock_create_prompt_and_model,
+        mock_get_api_service,
+        mock_settings,
+        assistant,
+        mock_config,
+    ):
+        """Test that a small catalog is used whole without a selection call."""
+        mock_settings.api_selection_skip_token_budget = 1000
+        summaries = [{"title": "Orders API", "version": 1.0}]
+        mock_api_service = MagicMock()
+        mock_api_service.get_api_summaries.return_value = summaries
+        mock_api_service.estimate_catalog_tokens.return_value = 500
+        mock_api_service.load_api_spec.return_value = {"openapi": "3.0.0"}
+        mock_get_api_service.return_value = mock_api_service
+
+        state = AgentState(messages=[HumanMessage(content="Hi")])
+        result = await assistant.select_and_load_apis_async(state, mock_config)
+
+        mock_create_prompt_and_model.assert_not_called()
+        assert result["selected_apis"] == [
+            SelectApi(api_title="Orders API", api_version="1.0")
+        ]
+        assert result["api_specs"] == [{"openapi": "3.0.0"}]
+
     @pytest.mark.parametrize(
         "test_case", ["tool_calls_present", "no_tool_calls", "empty_messages"]
     )
@@ -388,6 +477,45 @@ class TestWorkflowNodes:
             response="Test response",
             tool_calls=[],
             user_id="test-user",
+            message_digest=conversation_digest(messages)["digest"],
+        )
+
+    @patch("nalai.core.internal.workflow_nodes.get_cache_service")
+    @patch("nalai.core.internal.workflow_nodes.settings")
+    def test_cache_key_digest_reused_across_nodes(
+        self, mock_settings, mock_get_cache_service, assistant, mock_config
+    ):
+        """Test that the cache check digest is extended when caching the response."""
+        mock_settings.cache_enabled = True
+        mock_settings.cache_similarity_enabled = False
+        mock_cache_service = MagicMock()
+        mock_cache_service.get.return_value = None
+        mock_get_cache_service.return_value = mock_cache_service
+        mock_config["configurable"] = {"user_id": "test-user"}
+
+        messages = [
+            HumanMessage(content="First question", id="1"),
+            AIMessage(content="First answer", id="2"),
+            HumanMessage(content="Second question", id="3"),
+        ]
+        previous = conversation_digest(messages[:2])
+        result = assistant.check_cache_with_similarity(
+            AgentState(messages=messages, cache_key_digest=previous), mock_config
+        )
+
+        digest = result["cache_key_digest"]
+        assert digest == conversation_digest(messages)
+        mock_cache_service.get.assert_called_once_with(
+            messages, "test-user", message_digest=digest["digest"]
+        )
+
+        cached = assistant._cache_model_response(
+            messages, AIMessage(content="Second answer"), mock_config, digest
+        )
+        assert cached == digest
+        assert (
+            mock_cache_service.set.call_args.kwargs["message_digest"]
+            == digest["digest"]
         )
 
     @patch("nalai.core.internal.workflow_nodes.settings")
@@ -432,6 +560,116 @@ class TestWorkflowNodes:
         # Should not raise any exceptions and should not call cache service
         assistant._cache_model_response(messages, response, mock_config)
 
+    @pytest.mark.asyncio
+    @patch("nalai.core.internal.workflow_nodes.get_cache_service")
+    @patch("nalai.core.internal.workflow_nodes.settings")
+    async def test_check_cache_with_similarity_async_awaits_cache(
+        self, mock_settings, mock_get_cache_service, assistant, mock_config
+    ):
+        """Test that the async cache node awaits the cache instead of its wrappers."""
+        mock_settings.cache_enabled = True
+        mock_settings.cache_similarity_enabled = True
+        mock_settings.cache_similarity_threshold = 0.8
+        mock_cache_service = MagicMock()
+        mock_cache_service.get_async = AsyncMock(return_value=None)
+        mock_cache_service.find_similar_cached_responses_async = AsyncMock(
+            return_value=[("Similar question", "Cached answer", None, 0.9)]
+        )
+        mock_get_cache_service.return_value = mock_cache_service
+        mock_config["configurable"] = {"user_id": "test-user"}
+
+        messages = [HumanMessage(content="Test question", id="1")]
+        result = await assistant.check_cache_with_similarity_async(
+            AgentState(messages=messages), mock_config
+        )
+
+        digest = conversation_digest(messages)
+        mock_cache_service.get_async.assert_awaited_once_with(
+            messages, "test-user", message_digest=digest["digest"]
+        )
+        mock_cache_service.find_similar_cached_responses_async.assert_awaited_once_with(
+            "Test question", "test-user", 0.8
+        )
+        mock_cache_service.get.assert_not_called()
+        assert result["cache_hit"] is True
+        assert result["cache_key_digest"] == digest
+        assert result["messages"][-1].content == "Cached answer"
+
+    @pytest.mark.asyncio
+    @patch("nalai.core.internal.workflow_nodes.settings")
+    async def test_check_cache_with_similarity_async_disabled(
+        self, mock_settings, assistant, mock_config
+    ):
+        """Test that the async cache node skips the cache when disabled."""
+        mock_settings.cache_enabled = False
+
+        messages = [HumanMessage(content="Test question")]
+        result = await assistant.check_cache_with_similarity_async(
+            AgentState(messages=messages), mock_config
+        )
+
+        assert result == {"messages": messages, "cache_miss": True}
+
+    @pytest.mark.asyncio
+    @patch.object(WorkflowNodes, "create_prompt_and_model")
+    @patch("nalai.core.internal.workflow_nodes.compress_conversation_history_if_needed")
+    @patch("nalai.core.internal.workflow_nodes.get_cache_service")
+    @patch("nalai.core.internal.workflow_nodes.settings")
+    async def test_generate_model_response_async(
+        self,
+        mock_settings,
+        mock_get_cache_service,
+        mock_compress_history,
+        mock_create_prompt_and_model,
+        assistant,
+        mock_config,
+    ):
+        """Test that the async model node awaits the model and the cache."""
+        mock_settings.api_calls_enabled = False
+        mock_settings.cache_enabled = True
+        mock_prompt = MagicMock()
+        mock_prompt.invoke.return_value = "test prompt"
+        mock_model = MagicMock()
+        mock_model.ainvoke = AsyncMock(
+            return_value=AIMessage(content="This is the AI response")
+        )
+        mock_create_prompt_and_model.return_value = (mock_prompt, mock_model)
+        messages = [HumanMessage(content="Test message", id="1")]
+        mock_compress_history.return_value = (messages, None)
+        mock_cache_service = MagicMock()
+        mock_cache_service.set_async = AsyncMock()
+        mock_get_cache_service.return_value = mock_cache_service
+
+        result = await assistant.generate_model_response_async(
+            AgentState(messages=messages), mock_config
+        )
+
+        mock_model.ainvoke.assert_awaited_once_with("test prompt", mock_config)
+        mock_model.invoke.assert_not_called()
+        mock_cache_service.set_async.assert_awaited_once()
+        mock_cache_service.set.assert_not_called()
+        assert result["messages"][-1].content == "This is the AI response"
+        assert result["cache_key_digest"] == conversation_digest(messages)
+
+    @pytest.mark.asyncio
+    @patch("nalai.core.internal.workflow_nodes.settings")
+    async def test_generate_model_response_async_cache_hit(
+        self, mock_settings, assistant, mock_config
+    ):
+        """Test that the async model node replays a cached response."""
+        mock_settings.cache_enabled = True
+
+        messages = [
+            HumanMessage(content="Test question"),
+            AIMessage(content="This is a cached response"),
+        ]
+        result = await assistant.generate_model_response_async(
+            AgentState(messages=messages, cache_hit=True), mock_config
+        )
+
+        assert len(result["messages"]) == 3
+        assert result["messages"][-1].content == "This is a cached response"
+
     def test_workflow_nodes_with_service_factory_mocking(self):
         """Test workflow nodes using service factory pattern for dependency injection."""
         # Arrange
@@ -1215,6 +1215,68 @@ class TestListConversations:
         elif expected_detail_keyword:
             assert expected_detail_keyword in response.json()["detail"]
 
+    @patch("nalai.server.runtime_config.get_user_context")
+    def test_list_conversations_page(
+        self, mock_get_user_context, client, app_and_agent
+    ):
+        """Should return a page of conversations with the next page cursor."""
+        from nalai.core import ConversationInfo, ConversationPage
+
+        mock_user_context = MagicMock()
+        mock_user_context.user_id = "test-user"
+        mock_get_user_context.return_value = mock_user_context
+
+        _, mock_agent = app_and_agent
+        mock_agent.list_conversations_page.return_value = ConversationPage(
+            conversations=[
+                ConversationInfo(
+                    conversation_id="conv_2b1c3d4e5f6g7h8i9j2k3m4n5p6q7r8s9",
+                    created_at="2023-01-01T12:00:00",
+                    last_accessed="2023-01-02T12:00:00",
+                )
+            ],
+            next_cursor="next-page",
+            total_count=3,
+        )
+
+        response = client.get(
+            "/api/v1/conversations?limit=1&cursor=this-page",
+            headers={"Authorization": "Bearer test-token"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["conversations"]) == 1
+        assert data["total_count"] == 3
+        assert data["next_cursor"] == "next-page"
+        _, limit, cursor = mock_agent.list_conversations_page.call_args.args
+        assert (limit, cursor) == (1, "this-page")
+        mock_agent.list_conversations.assert_not_called()
+
+    @patch("nalai.server.runtime_config.get_user_context")
+    def test_list_conversations_invalid_cursor(
+        self, mock_get_user_context, client, app_and_agent
+    ):
+        """Should reject an invalid pagination cursor."""
+        from nalai.core.agent import ValidationError
+
+        mock_user_context = MagicMock()
+        mock_user_context.user_id = "test-user"
+        mock_get_user_context.return_value = mock_user_context
+
+        _, mock_agent = app_and_agent
+        mock_agent.list_conversations_page.side_effect = ValidationError(
+            "Invalid conversation cursor: bad"
+        )
+
+        response = client.get(
+            "/api/v1/conversations?cursor=bad",
+            headers={"Authorization": "Bearer test-token"},
+        )
+
+        assert response.status_code == 422
+        assert "Invalid conversation cursor" in response.json()["detail"]
+
 
 class TestDeleteConversation:
     """Test delete conversation endpoint."""
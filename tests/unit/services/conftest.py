@@ -0,0 +1,66 @@
+"""
+Shared helpers for the checkpointing service tests.
+
+This module provides the checkpoint factory used by the checkpoint saver,
+cache, serializer, spill and compaction tests.
+"""
+
+from datetime import datetime
+from typing import Any
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+
+def write_checkpoint(
+    saver,
+    thread_id: str,
+    value: Any,
+    parent: dict | None = None,
+    *,
+    channel: str = "messages",
+    ts: datetime | None = None,
+    metadata: dict | None = None,
+) -> dict:
+    """
+    Write a checkpoint holding one channel value and return its config.
+
+    A checkpoint written after parent is put under the parent's config and
+    continues the parent's channel version.
+    """
+    checkpoint = empty_checkpoint()
+    if ts is not None:
+        checkpoint["ts"] = ts.isoformat()
+    version = saver.get_next_version(None, None)
+    if parent:
+        previous = saver.get_tuple(parent).checkpoint["channel_versions"][channel]
+        version = saver.get_next_version(previous, None)
+    checkpoint["channel_values"] = {channel: value}
+    checkpoint["channel_versions"] = {channel: version}
+    config = parent or {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    return saver.put(
+        config,
+        checkpoint,
+        {"source": "loop", "step": 1} if metadata is None else metadata,
+        {channel: version},
+    )
+
+
+def write_history(
+    saver,
+    thread_id: str,
+    values: list,
+    timestamps: list[datetime] | None = None,
+) -> list[dict]:
+    """Write one checkpoint per value, each after the previous one."""
+    configs: list[dict] = []
+    for position, value in enumerate(values):
+        configs.append(
+            write_checkpoint(
+                saver,
+                thread_id,
+                value,
+                configs[-1] if configs else None,
+                ts=timestamps[position] if timestamps else None,
+            )
+        )
+    return configs
@@ -0,0 +1,163 @@
+"""
+Unit tests for the compiled, memory-mapped similarity corpus.
+
+Tests cover:
+- Round trip of word classes and antonyms through the artifact
+- Rebuilds of missing, corrupt and stale artifacts
+- Matcher scores with a mapped corpus matching in-memory word sets
+"""
+
+import pytest
+
+from nalai.services.cache_corpus import (
+    CompiledCorpus,
+    CorpusFormatError,
+    compile_corpus,
+    load_compiled_corpus,
+)
+from nalai.services.cache_service import (
+    Cache,
+    TokenSimilarityMatcher,
+    create_similarity_matcher,
+    get_compiled_corpus,
+)
+
+FINGERPRINT = "ab" * 32
+
+VERBS = {"create", "delete", "list", "get", "record", "café"}
+NOUNS = {"product", "user", "record", "order"}
+ADJECTIVES = {"active", "new", "old"}
+ANTONYMS = {
+    "create": ["delete", "destroy"],
+    "delete": ["create"],
+    "new": ["old"],
+    "old": ["new"],
+}
+
+
+def make_builder(calls: list):
+    def builder():
+        calls.append(1)
+        return VERBS, NOUNS, ADJECTIVES, ANTONYMS
+
+    return builder
+
+
+class TestCompiledCorpus:
+    """Test compiling and mapping corpus artifacts."""
+
+    def test_round_trip(self, tmp_path):
+        path = compile_corpus(
+            tmp_path / "corpus.bin", VERBS, NOUNS, ADJECTIVES, ANTONYMS, FINGERPRINT
+        )
+        corpus = CompiledCorpus(path)
+
+        assert corpus.fingerprint == FINGERPRINT
+        assert set(corpus.verbs) == VERBS
+        assert set(corpus.nouns) == NOUNS
+        assert set(corpus.adjectives) == ADJECTIVES
+        assert len(corpus.verbs) == len(VERBS)
+        assert "record" in corpus.verbs and "record" in corpus.nouns
+        assert "missing" not in corpus.nouns
+        assert corpus.antonyms["create"] == ("delete", "destroy")
+        assert corpus.antonyms.get("product") is None
+        assert set(corpus.antonyms) == set(ANTONYMS)
+
+    def test_invalid_artifact_rejected(self, tmp_path):
+        path = tmp_path / "corpus.bin"
+        with pytest.raises(CorpusFormatError):
+            CompiledCorpus(path)
+
+        path.write_bytes(b"not a corpus")
+        with pytest.raises(CorpusFormatError):
+            CompiledCorpus(path)
+
+    def test_rebuilds_only_when_missing_or_stale(self, tmp_path):
+        path = tmp_path / "corpus" / "corpus.bin"
+        calls = []
+
+        load_compiled_corpus(path, make_builder(calls), fingerprint=FINGERPRINT)
+        load_compiled_corpus(path, make_builder(calls), fingerprint=FINGERPRINT)
+        assert len(calls) == 1
+
+        corpus = load_compiled_corpus(path, make_builder(calls), fingerprint="cd" * 32)
+        assert len(calls) == 2
+        assert corpus.fingerprint == "cd" * 32
+
+        path.write_bytes(b"\0" * 16)
+        load_compiled_corpus(path, make_builder(calls), fingerprint="cd" * 32)
+        assert len(calls) == 3
+        assert list(path.parent.glob("*.tmp")) == []
+
+
+class TestMappedCorpusMatcher:
+    """Test similarity matching backed by a mapped corpus."""
+
+    def test_scores_match_in_memory_corpus(self, tmp_path):
+        path = compile_corpus(
+            tmp_path / "corpus.bin", VERBS, NOUNS, ADJECTIVES, ANTONYMS, FINGERPRINT
+        )
+        mapped = TokenSimilarityMatcher.from_corpus(CompiledCorpus(path))
+        in_memory = TokenSimilarityMatcher(
+            verbs=set(VERBS),
+            nouns=set(NOUNS),
+            adjectives=set(ADJECTIVES),
+            antonyms=dict(ANTONYMS),
+        )
+
+        pairs = [
+            ("create product", "create a new product"),
+            ("create product", "delete product"),
+            ("list the active orders", "list old orders for user"),
+            ("record café order", "get record of café orders"),
+        ]
+        for intent1, intent2 in pairs:
+            assert mapped.similarity(intent1, intent2) == pytest.approx(
+                in_memory.similarity(intent1, intent2)
+            )
+        assert mapped.word_weights["record"] == 2.0
+        assert mapped.word_weights["the"] == 0.5
+        assert "xyz" not in mapped.word_weights
+
+    def test_cache_uses_compiled_corpus(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "corpus.bin")
+        calls = []
+        monkeypatch.setattr(
+            "nalai.services.cache_service.load_nlp_corpus", make_builder(calls)
+        )
+        get_compiled_corpus.cache_clear()
+        try:
+            cache = Cache(
+                backend="memory",
+                config={"similarity_corpus": "nlp", "corpus_path": path},
+            )
+            Cache(
+                backend="memory",
+                config={"similarity_corpus": "nlp", "corpus_path": path},
+            )
+        finally:
+            get_compiled_corpus.cache_clear()
+
+        assert len(calls) == 1
+        assert (
+            cache.similarity_matcher.similarity("create product", "delete product")
+            == 0.0
+        )
+        assert cache.similarity_matcher.word_weights["café"] == 2.0
+
+    def test_empty_nlp_corpus_falls_back(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            "nalai.services.cache_service.load_nlp_corpus",
+            lambda: (set(), set(), set(), {}),
+        )
+        get_compiled_corpus.cache_clear()
+        try:
+            matcher = create_similarity_matcher("nlp", str(tmp_path / "corpus.bin"))
+        finally:
+            get_compiled_corpus.cache_clear()
+
+        assert len(matcher.verbs) > 0
+
+    def test_unknown_corpus_rejected(self):
+        with pytest.raises(ValueError, match="Unsupported similarity corpus"):
+            create_similarity_matcher("embeddings")
@@ -0,0 +1,183 @@
+"""
+Unit tests for cache eviction policies and the expiry sweeper.
+
+Tests cover:
+- LRU, LFU and TTL victim selection
+- Eviction through InMemoryCacheBackend when full
+- Expired entry reclamation without full scans
+- Incrementally maintained backend statistics
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from nalai.services.cache_eviction import (
+    CacheExpirySweeper,
+    ExpiryQueue,
+    LFUEvictionPolicy,
+    LRUEvictionPolicy,
+    TTLEvictionPolicy,
+    create_eviction_policy,
+)
+from nalai.services.cache_service import CacheEntry, InMemoryCacheBackend
+
+
+def make_entry(response: str = "response", user_id: str = "user1", ttl: int = 3600):
+    """Create a cache entry expiring after ttl seconds."""
+    return CacheEntry(
+        response=response,
+        user_id=user_id,
+        expires_at=datetime.now() + timedelta(seconds=ttl),
+    )
+
+
+class TestEvictionPolicies:
+    """Test eviction policy victim selection."""
+
+    def test_lru_evicts_least_recently_used(self):
+        policy = LRUEvictionPolicy()
+        entries = {key: make_entry() for key in ("a", "b", "c")}
+        for key, entry in entries.items():
+            policy.on_insert(key, entry)
+
+        policy.on_access("a", entries["a"])
+        assert policy.select_victim() == "b"
+
+        policy.on_remove("b")
+        assert policy.select_victim() == "c"
+
+    def test_lfu_evicts_least_frequently_used(self):
+        policy = LFUEvictionPolicy()
+        entries = {key: make_entry() for key in ("a", "b", "c")}
+        for key, entry in entries.items():
+            policy.on_insert(key, entry)
+
+        for key, hits in (("a", 3), ("b", 1), ("c", 2)):
+            for _ in range(hits):
+                entries[key].hit_count += 1
+                policy.on_access(key, entries[key])
+
+        assert policy.select_victim() == "b"
+        policy.on_remove("b")
+        assert policy.select_victim() == "c"
+
+        # New entries start with the lowest frequency
+        policy.on_insert("d", make_entry())
+        assert policy.select_victim() == "d"
+
+    def test_ttl_evicts_soonest_expiring(self):
+        policy = TTLEvictionPolicy()
+        policy.on_insert("long", make_entry(ttl=3600))
+        policy.on_insert("short", make_entry(ttl=60))
+        policy.on_insert("medium", make_entry(ttl=600))
+
+        assert policy.select_victim() == "short"
+        policy.on_remove("short")
+        assert policy.select_victim() == "medium"
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError, match="Unsupported cache eviction policy"):
+            create_eviction_policy("random")
+
+    def test_expiry_queue_pops_only_expired(self):
+        queue = ExpiryQueue()
+        now = datetime.now()
+        queue.push("expired", now - timedelta(seconds=1))
+        queue.push("live", now + timedelta(seconds=60))
+        queue.push("overwritten", now - timedelta(seconds=5))
+        queue.push("overwritten", now + timedelta(seconds=60))
+
+        assert queue.pop_expired(now) == ["expired"]
+        assert len(queue) == 2
+
+
+class TestInMemoryBackendEviction:
+    """Test eviction and expiry handling in the in-memory backend."""
+
+    @pytest.mark.parametrize(
+        "policy,expected_evicted",
+        [("lru", "b"), ("lfu", "b"), ("ttl", "c")],
+    )
+    def test_full_cache_evicts_by_policy(self, policy, expected_evicted):
+        backend = InMemoryCacheBackend(
+            max_size=3, eviction_policy=policy, sweep_expired=False
+        )
+
+        async def scenario():
+            await backend.set("a", make_entry(ttl=3600))
+            await backend.set("b", make_entry(ttl=1800))
+            await backend.set("c", make_entry(ttl=60))
+            await backend.get("a")
+            await backend.get("c")
+            await backend.set("d", make_entry(ttl=3600))
+            return await backend.get_stats()
+
+        stats = asyncio.run(scenario())
+
+        assert expected_evicted not in backend._cache
+        assert stats["total_entries"] == 3
+        assert stats["evictions"] == 1
+        assert stats["eviction_policy"] == policy
+
+    def test_expired_entries_evicted_first(self):
+        backend = InMemoryCacheBackend(max_size=2, sweep_expired=False)
+
+        async def scenario():
+            await backend.set("expired", make_entry(ttl=-1))
+            await backend.set("live", make_entry())
+            await backend.set("new", make_entry())
+
+        asyncio.run(scenario())
+
+        assert set(backend._cache) == {"live", "new"}
+
+    def test_reclaim_expired(self):
+        backend = InMemoryCacheBackend(max_size=10, sweep_expired=False)
+
+        async def scenario():
+            await backend.set("expired1", make_entry(ttl=-1))
+            await backend.set("expired2", make_entry(ttl=-1, user_id="user2"))
+            await backend.set("live", make_entry())
+            reclaimed = await backend.purge_expired()
+            return reclaimed, await backend.get_stats()
+
+        reclaimed, stats = asyncio.run(scenario())
+
+        assert reclaimed == 2
+        assert stats["total_entries"] == 1
+        assert stats["entries_per_user"] == {"user1": 1}
+        assert stats["expired_entries"] == 2
+
+    def test_stats_maintained_incrementally(self):
+        backend = InMemoryCacheBackend(max_size=10, sweep_expired=False)
+
+        async def scenario():
+            await backend.set("user:user1:a", make_entry("abc"))
+            await backend.set("user:user1:b", make_entry("de"))
+            await backend.set("user:user2:c", make_entry("f", user_id="user2"))
+            await backend.get("user:user1:a")
+            await backend.get("user:user1:a")
+            await backend.delete("user:user1:b")
+            await backend.clear_user_entries("user2")
+            return await backend.get_stats()
+
+        stats = asyncio.run(scenario())
+
+        assert stats["total_entries"] == 1
+        assert stats["total_size_bytes"] == 3
+        assert stats["total_hits"] == 2
+        assert stats["entries_per_user"] == {"user1": 1}
+
+    def test_sweeper_reclaims_registered_backends(self):
+        backend = InMemoryCacheBackend(max_size=10, sweep_expired=False)
+        sweeper = CacheExpirySweeper(interval_seconds=60)
+
+        asyncio.run(backend.set("expired", make_entry(ttl=-1)))
+        sweeper.register(backend)
+        try:
+            assert sweeper.sweep_once() == 1
+            assert backend._cache == {}
+        finally:
+            sweeper.stop()
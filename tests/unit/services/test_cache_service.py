@@ -9,13 +9,20 @@ Tests cover:
 - Comprehensive similarity matching
 """
 
+import asyncio
+import sqlite3
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage
 
-from nalai.services.cache_service import Cache
+from nalai.services.cache_service import (
+    Cache,
+    SimilarityIndex,
+    TokenSimilarityMatcher,
+    conversation_digest,
+)
 
 
 class TestEnhancedCache:
@@ -440,6 +447,46 @@ class TestTokenSimilarityMatcher:
         empty_similarity = token_similarity_matcher._weighted_jaccard_similarity({}, {})
         assert empty_similarity == 0.0, "Empty tokens should have similarity 0.0"
 
+    def test_word_weight_table_follows_corpus_changes(self):
+        """Test that the merged weight table and memo are rebuilt on corpus changes."""
+        matcher = TokenSimilarityMatcher(
+            verbs={"create"}, nouns={"create", "user"}, adjectives=set(), antonyms={}
+        )
+
+        # Verbs take precedence over nouns, as in the original lookup chain
+        assert matcher.word_weights["create"] == 2.0
+        assert matcher.vectorize("create user").tokens == {"create": 2.0, "user": 1.5}
+
+        matcher.verbs = set()
+        assert matcher.vectorize("create user").tokens == {"create": 1.5, "user": 1.5}
+
+    def test_vector_memo_is_bounded(self):
+        """Test that vectorized intents are memoized up to the configured size."""
+        matcher = TokenSimilarityMatcher(
+            verbs=set(), nouns=set(), adjectives=set(), antonyms={}, vector_cache_size=2
+        )
+
+        first = matcher.vectorize("create user")
+        assert matcher.vectorize("create user") is first
+
+        matcher.vectorize("get user")
+        matcher.vectorize("list users")
+        assert matcher.vectorize("create user") is not first
+        assert matcher._cached_vectorize.cache_info().currsize == 2
+
+    def test_antonyms_use_tokenized_words(self):
+        """Test that antonym detection sees the same tokens as the weighting."""
+        matcher = TokenSimilarityMatcher(
+            verbs={"create", "delete"},
+            nouns={"product"},
+            adjectives=set(),
+            antonyms={"create": ["delete"], "delete": ["create"]},
+        )
+
+        assert matcher.vectorize("Create, product").words == {"create", "product"}
+        assert matcher.similarity("Create, product!", "delete product") == 0.0
+        assert matcher._is_likely_false_positive("create product", "delete: product")
+
     def test_fallback_graceful_degradation(self, token_similarity_matcher):
         """Test that the system gracefully degrades when NLP libraries are unavailable."""
         with (
@@ -808,3 +855,584 @@ class TestTokenSimilarityMatcher:
                 assert similarity_score <= 0.3, (
                     f"Antonym pair '{positive}' vs '{negative}' should have low similarity, got {similarity_score}"
                 )
+
+
+class TestConversationDigest:
+    """Test chained conversation digests used as cache keys."""
+
+    def _conversation(self):
+        return [
+            HumanMessage(content="list products", id="1"),
+            AIMessage(content="Here are the products", id="2"),
+            AIMessage(content="", id="3"),
+            HumanMessage(content="show the first one", id="4"),
+        ]
+
+    def test_incremental_digest_matches_full_digest(self):
+        messages = self._conversation()
+
+        digest = conversation_digest(messages[:1])
+        for count in range(2, len(messages) + 1):
+            digest = conversation_digest(messages[:count], digest)
+            assert digest == conversation_digest(messages[:count])
+
+        assert digest["count"] == 4
+        assert digest["message_id"] == "4"
+
+    def test_previous_digest_reused_only_for_same_prefix(self):
+        messages = self._conversation()
+        previous = {"count": 2, "message_id": "2", "digest": "seed"}
+
+        # The prefix is trusted, so only the new messages extend the digest
+        reused = conversation_digest(messages, previous)
+        assert reused != conversation_digest(messages)
+
+        # A rewritten history (different ids) is hashed from the start
+        rewritten = {"count": 2, "message_id": "other", "digest": "seed"}
+        assert conversation_digest(messages, rewritten) == conversation_digest(messages)
+
+    def test_digest_is_order_sensitive_and_ignores_empty_content(self):
+        first = [HumanMessage(content="a"), HumanMessage(content="b")]
+        swapped = [HumanMessage(content="b"), HumanMessage(content="a")]
+        with_empty = [
+            HumanMessage(content="a"),
+            AIMessage(content=""),
+            HumanMessage(content="b"),
+        ]
+
+        assert (
+            conversation_digest(first)["digest"]
+            != (conversation_digest(swapped)["digest"])
+        )
+        assert (
+            conversation_digest(first)["digest"]
+            == (conversation_digest(with_empty)["digest"])
+        )
+        assert conversation_digest([AIMessage(content="")])["digest"] == ""
+
+    def test_cache_lookup_with_precomputed_digest(self):
+        cache_service = Cache(
+            backend="memory", config={"max_size": 10, "ttl_seconds": 3600}
+        )
+        messages = self._conversation()
+        digest = conversation_digest(messages)["digest"]
+
+        cache_service.set(messages, "cached", user_id="user1", message_digest=digest)
+
+        assert cache_service.get(messages, "user1") == ("cached", None)
+        assert cache_service.get([], "user1", message_digest=digest) == (
+            "cached",
+            None,
+        )
+
+
+class TestSimilarityIndex:
+    """Test the inverted token index used for similarity lookups."""
+
+    def _brute_force(self, cache_service, messages, query, threshold):
+        """Score every cached message the way the original full scan did."""
+        scores = [
+            (message, cache_service.similarity_matcher.similarity(query, message))
+            for message in messages
+        ]
+        return sorted(
+            (message, score) for message, score in scores if score >= threshold
+        )
+
+    @pytest.mark.parametrize("threshold", [0.3, 0.5, 0.7, 0.9])
+    def test_index_matches_full_scan(self, threshold):
+        """Test that indexed lookups return the same matches as a full scan."""
+        cache_service = Cache(
+            backend="memory", config={"max_size": 100, "ttl_seconds": 3600}
+        )
+        messages = [
+            "create product",
+            "create a product",
+            "create item",
+            "list products",
+            "show products",
+            "get user",
+            "fetch the user",
+            "delete product",
+            "update user profile",
+            "list all orders for the user",
+        ]
+        for message in messages:
+            cache_service.set(
+                [HumanMessage(content=message)],
+                f"Response for {message}",
+                user_id="user1",
+            )
+
+        for query in ["create the product", "get user", "list orders", "xyz"]:
+            similar = cache_service.find_similar_cached_responses(
+                query, user_id="user1", similarity_threshold=threshold
+            )
+            assert sorted((match[0], match[3]) for match in similar) == (
+                self._brute_force(cache_service, messages, query, threshold)
+            )
+
+    def test_index_drops_cleared_and_evicted_entries(self):
+        """Test that the index does not return entries removed from the backend."""
+        cache_service = Cache(
+            backend="memory", config={"max_size": 2, "ttl_seconds": 3600}
+        )
+
+        cache_service.set(
+            [HumanMessage(content="create product")], "1", user_id="user1"
+        )
+        cache_service.set([HumanMessage(content="create item")], "2", user_id="user1")
+        cache_service.set([HumanMessage(content="get user")], "3", user_id="user2")
+
+        # The oldest entry was evicted by the backend
+        similar = cache_service.find_similar_cached_responses(
+            "create product", user_id="user1", similarity_threshold=0.9
+        )
+        assert similar == []
+
+        cache_service.clear_user_cache("user2")
+        assert (
+            cache_service.find_similar_cached_responses(
+                "get user", user_id="user2", similarity_threshold=0.9
+            )
+            == []
+        )
+        assert len(cache_service.similarity_index) == 1
+
+    def test_index_stays_bounded(self):
+        """Test that keys evicted by the backend are reconciled out of the index."""
+        cache_service = Cache(
+            backend="memory", config={"max_size": 5, "ttl_seconds": 3600}
+        )
+
+        for i in range(50):
+            cache_service.set(
+                [HumanMessage(content=f"create product {i}")], f"{i}", user_id="user1"
+            )
+
+        assert len(cache_service.similarity_index) <= 10
+
+    def test_lookup_scales_with_candidates(self):
+        """Test that lookups stay fast with many unrelated cached entries."""
+        import time
+
+        cache_service = Cache(
+            backend="memory", config={"max_size": 20000, "ttl_seconds": 3600}
+        )
+        for i in range(10000):
+            cache_service.similarity_index.add(
+                f"user{i % 10}", f"user:user{i % 10}:{i}", f"describe record r{i}"
+            )
+
+        query = cache_service.similarity_matcher.vectorize("create product")
+        start_time = time.perf_counter()
+        for _ in range(100):
+            cache_service.similarity_index.search("user1", query, 0.8)
+        elapsed = (time.perf_counter() - start_time) / 100
+
+        assert elapsed < 0.001, f"Indexed lookup too slow: {elapsed * 1000:.3f}ms"
+
+
+class TestVectorizedSimilarity:
+    """Test batch similarity scoring against a sparse term matrix."""
+
+    MESSAGES = [
+        "create product",
+        "create a product",
+        "delete product",
+        "list products",
+        "show all products",
+        "get user",
+        "update user profile",
+        "list all orders for the user",
+        "",
+    ]
+
+    def test_batch_scores_match_scalar(self):
+        """Test that batch scores equal the scalar scores, antonyms included."""
+        pytest.importorskip("numpy")
+        matcher = TokenSimilarityMatcher()
+        vectors = [matcher.vectorize(message) for message in self.MESSAGES]
+
+        for query in ["create the product", "remove product", "list orders", "xyz"]:
+            query_vector = matcher.vectorize(query)
+            expected = [
+                matcher.vector_similarity(query_vector, vector) for vector in vectors
+            ]
+            assert matcher.batch_similarity(query_vector, vectors) == pytest.approx(
+                expected
+            )
+
+    def test_batch_scores_without_numpy(self):
+        """Test that batch scoring falls back to scalar scoring without NumPy."""
+        matcher = TokenSimilarityMatcher()
+        vectors = [matcher.vectorize(message) for message in self.MESSAGES]
+        query = matcher.vectorize("create the product")
+
+        with patch("nalai.services.cache_service.NUMPY_AVAILABLE", False):
+            scores = matcher.batch_similarity(query, vectors)
+
+        assert scores == [matcher.vector_similarity(query, v) for v in vectors]
+
+    @pytest.mark.parametrize("threshold", [0.0, 0.3, 0.5, 0.7, 0.9])
+    def test_vectorized_engine_matches_index(self, threshold):
+        """Test that the vectorized engine returns the same matches as the index."""
+        pytest.importorskip("numpy")
+        matcher = TokenSimilarityMatcher()
+        index = SimilarityIndex(matcher)
+        vectorized = SimilarityIndex(matcher, engine="vectorized")
+        for i, message in enumerate(self.MESSAGES):
+            for similarity_index in (index, vectorized):
+                similarity_index.add("user1", f"key{i}", message)
+
+        # Removed rows are masked out and eventually compacted
+        for similarity_index in (index, vectorized):
+            similarity_index.remove("key0")
+            similarity_index.remove("key6")
+
+        for query in ["create the product", "remove product", "list orders", "xyz"]:
+            query_vector = matcher.vectorize(query)
+            expected = sorted(index.search("user1", query_vector, threshold))
+            actual = sorted(vectorized.search("user1", query_vector, threshold))
+            assert [key for key, _ in actual] == [key for key, _ in expected]
+            assert [score for _, score in actual] == pytest.approx(
+                [score for _, score in expected]
+            )
+
+    def test_vectorized_engine_falls_back_without_numpy(self):
+        """Test that the vectorized engine degrades to index scoring."""
+        with patch("nalai.services.cache_service.NUMPY_AVAILABLE", False):
+            similarity_index = SimilarityIndex(
+                TokenSimilarityMatcher(), engine="vectorized"
+            )
+
+        assert similarity_index.engine == "index"
+
+    def test_unknown_engine_rejected(self):
+        with pytest.raises(ValueError, match="Unsupported similarity engine"):
+            SimilarityIndex(TokenSimilarityMatcher(), engine="embeddings")
+
+
+class TestLSHSimilarity:
+    """Test MinHash/LSH candidate generation for similarity lookups."""
+
+    def _build(self, messages, threshold=0.8):
+        matcher = TokenSimilarityMatcher()
+        exact = SimilarityIndex(matcher)
+        lsh = SimilarityIndex(matcher, engine="lsh", threshold=threshold)
+        for i, message in enumerate(messages):
+            for similarity_index in (exact, lsh):
+                similarity_index.add("user1", f"key{i}", message)
+        return matcher, exact, lsh
+
+    def test_band_parameters_follow_threshold(self):
+        from nalai.services.cache_similarity import lsh_parameters
+
+        bands_low, rows_low = lsh_parameters(0.5)
+        bands_high, rows_high = lsh_parameters(0.9)
+        assert bands_low * rows_low <= 128
+        assert bands_high * rows_high <= 128
+        # Higher thresholds need more rows per band to reject dissimilar pairs
+        assert rows_high > rows_low
+
+    def test_lsh_results_are_exact_matches(self):
+        """Test that LSH finds near-duplicates and never returns false matches."""
+        pytest.importorskip("numpy")
+        messages = [
+            f"{verb} {noun} {i}"
+            for i, (verb, noun) in enumerate(
+                (verb, noun)
+                for verb in ("create", "list", "get", "delete")
+                for noun in ("product", "order", "user", "invoice", "payment")
+            )
+        ]
+        matcher, exact, lsh = self._build(messages)
+
+        found = relevant = 0
+        for message in messages:
+            query = matcher.vectorize(f"please {message}")
+            expected = dict(exact.search("user1", query, 0.8))
+            actual = dict(lsh.search("user1", query, 0.8))
+            assert actual.items() <= expected.items()
+            relevant += len(expected)
+            found += len(actual)
+
+        assert relevant > 0
+        assert found / relevant >= 0.9
+
+    def test_lsh_drops_removed_entries(self):
+        pytest.importorskip("numpy")
+        matcher, _, lsh = self._build(["create product", "delete order"])
+        query = matcher.vectorize("create product")
+
+        assert [key for key, _ in lsh.search("user1", query, 0.8)] == ["key0"]
+        lsh.remove("key0")
+        assert lsh.search("user1", query, 0.8) == []
+        lsh.clear_user("user1")
+        assert lsh._buckets == {}
+
+
+class TestRedisCacheBackend:
+    """Test the shared redis cache backend against an in-process fake server."""
+
+    @pytest.fixture
+    def redis_server(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        return fakeredis.FakeServer()
+
+    def _make_cache(self, redis_server, max_size=10):
+        """Create a cache whose backend talks to the fake redis server."""
+        import fakeredis
+
+        from nalai.services.cache_service import RedisCacheBackend
+
+        cache_service = Cache(
+            backend="memory", config={"max_size": max_size, "ttl_seconds": 3600}
+        )
+        cache_service.backend = RedisCacheBackend(
+            max_size=max_size,
+            client_factory=lambda: fakeredis.aioredis.FakeRedis(
+                server=redis_server, decode_responses=True
+            ),
+        )
+        return cache_service
+
+    @pytest.mark.asyncio
+    async def test_entries_shared_between_workers(self, redis_server):
+        """Test that entries written by one worker are visible to another."""
+        worker1 = self._make_cache(redis_server)
+        worker2 = self._make_cache(redis_server)
+        messages = [HumanMessage(content="create product")]
+
+        await worker1.set_async(messages, "Product created", user_id="user1")
+
+        result = await worker2.get_async(messages, user_id="user1")
+        assert result is not None
+        assert result[0] == "Product created"
+        assert await worker2.get_async(messages, user_id="user2") is None
+
+        similar = await worker2.find_similar_cached_responses_async(
+            "create a product", user_id="user1", similarity_threshold=0.7
+        )
+        assert [match[0] for match in similar] == ["create product"]
+
+    @pytest.mark.asyncio
+    async def test_similarity_sync_skipped_until_user_version_changes(
+        self, redis_server
+    ):
+        """Test that lookups only list a user's keys after entries were added."""
+        worker1 = self._make_cache(redis_server)
+        worker2 = self._make_cache(redis_server)
+        await worker1.set_async(
+            [HumanMessage(content="create product")], "1", user_id="user1"
+        )
+
+        with patch.object(
+            worker2.backend, "get_user_keys", wraps=worker2.backend.get_user_keys
+        ) as get_user_keys:
+            for _ in range(3):
+                similar = await worker2.find_similar_cached_responses_async(
+                    "create a product", user_id="user1", similarity_threshold=0.7
+                )
+                assert len(similar) == 1
+            assert get_user_keys.call_count == 1
+
+            await worker1.set_async(
+                [HumanMessage(content="delete product")], "2", user_id="user1"
+            )
+            similar = await worker2.find_similar_cached_responses_async(
+                "delete a product", user_id="user1", similarity_threshold=0.7
+            )
+            assert [match[0] for match in similar] == ["delete product"]
+            assert get_user_keys.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_clear_user_entries_uses_user_index(self, redis_server):
+        """Test that clearing a user removes only that user's entries."""
+        cache_service = self._make_cache(redis_server)
+
+        await cache_service.set_async(
+            [HumanMessage(content="create product")], "1", user_id="user1"
+        )
+        await cache_service.set_async(
+            [HumanMessage(content="list products")], "2", user_id="user1"
+        )
+        await cache_service.set_async(
+            [HumanMessage(content="get user")], "3", user_id="user2"
+        )
+
+        assert await cache_service.clear_user_cache_async("user1") == 2
+
+        stats = await cache_service.get_stats_async()
+        assert stats["total_entries"] == 1
+        assert stats["entries_per_user"] == {"user2": 1}
+
+    @pytest.mark.asyncio
+    async def test_stats_report_hit_ratio(self, redis_server):
+        """Test that hits and misses are counted server-side."""
+        cache_service = self._make_cache(redis_server)
+        messages = [HumanMessage(content="create product")]
+
+        await cache_service.set_async(messages, "Product created", user_id="user1")
+        await cache_service.get_async(messages, user_id="user1")
+        await cache_service.get_async(messages, user_id="user1")
+        await cache_service.get_async(messages, user_id="user2")
+
+        stats = await cache_service.get_stats_async()
+        assert stats["backend"] == "redis"
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+    @pytest.mark.asyncio
+    async def test_max_size_evicts_soonest_expiring(self, redis_server):
+        """Test that the backend enforces its size limit."""
+        cache_service = self._make_cache(redis_server, max_size=2)
+
+        await cache_service.set_async(
+            [HumanMessage(content="short")], "1", user_id="user1", ttl_seconds=60
+        )
+        await cache_service.set_async(
+            [HumanMessage(content="long")], "2", user_id="user1", ttl_seconds=3600
+        )
+        await cache_service.set_async(
+            [HumanMessage(content="longer")], "3", user_id="user1", ttl_seconds=7200
+        )
+
+        assert (
+            await cache_service.get_async([HumanMessage(content="short")], "user1")
+            is None
+        )
+        stats = await cache_service.get_stats_async()
+        assert stats["total_entries"] == 2
+        assert stats["evictions"] == 1
+
+
+class TestSQLiteCacheBackend:
+    """Test the persistent sqlite cache backend."""
+
+    def _make_cache(self, path, max_size=10):
+        return Cache(
+            backend="sqlite",
+            config={
+                "max_size": max_size,
+                "ttl_seconds": 3600,
+                "sqlite_path": str(path),
+            },
+        )
+
+    @pytest.mark.asyncio
+    async def test_entries_survive_restart(self, tmp_path):
+        """Test that a new cache instance warm-starts from the database file."""
+        path = tmp_path / "cache.db"
+        cache_service = self._make_cache(path)
+        messages = [HumanMessage(content="create product")]
+        await cache_service.set_async(messages, "Product created", user_id="user1")
+
+        restarted = self._make_cache(path)
+        result = await restarted.get_async(messages, user_id="user1")
+        assert result is not None
+        assert result[0] == "Product created"
+
+        similar = await restarted.find_similar_cached_responses_async(
+            "create a product", user_id="user1", similarity_threshold=0.7
+        )
+        assert [match[0] for match in similar] == ["create product"]
+
+    @pytest.mark.asyncio
+    async def test_clear_user_entries_and_expiry(self, tmp_path):
+        """Test per-user clears and expiry as range deletes."""
+        cache_service = self._make_cache(tmp_path / "cache.db")
+
+        await cache_service.set_async(
+            [HumanMessage(content="create product")], "1", user_id="user1"
+        )
+        await cache_service.set_async(
+            [HumanMessage(content="list products")], "2", user_id="user2"
+        )
+        await cache_service.set_async(
+            [HumanMessage(content="get user")], "3", user_id="user2", ttl_seconds=-1
+        )
+
+        assert await cache_service.clear_expired_async() == 1
+        assert await cache_service.clear_user_cache_async("user1") == 1
+
+        stats = await cache_service.get_stats_async()
+        assert stats["backend"] == "sqlite"
+        assert stats["total_entries"] == 1
+        assert stats["entries_per_user"] == {"user2": 1}
+
+    @pytest.mark.asyncio
+    async def test_user_version_tracks_added_entries(self, tmp_path):
+        """Test that the user version changes on writes and clears only."""
+        path = tmp_path / "cache.db"
+        worker1 = self._make_cache(path)
+        worker2 = self._make_cache(path)
+        messages = [HumanMessage(content="create product")]
+
+        assert await worker2.backend.get_user_version("user1") == 0
+        await worker1.set_async(messages, "1", user_id="user1")
+        version = await worker2.backend.get_user_version("user1")
+        assert version > 0
+        await worker2.get_async(messages, user_id="user1")
+        assert await worker2.backend.get_user_version("user1") == version
+        assert await worker2.backend.get_user_version("user2") == 0
+
+        similar = await worker2.find_similar_cached_responses_async(
+            "create a product", user_id="user1", similarity_threshold=0.7
+        )
+        assert [match[0] for match in similar] == ["create product"]
+
+        await worker1.clear_user_cache_async("user1")
+        assert await worker2.backend.get_user_version("user1") > version
+
+    @pytest.mark.asyncio
+    async def test_locked_database_does_not_block_event_loop(self, tmp_path):
+        """Test that a write waiting for the database lock runs off the loop."""
+        path = tmp_path / "cache.db"
+        cache_service = self._make_cache(path)
+        other_process = sqlite3.connect(path, isolation_level=None)
+        other_process.execute("BEGIN IMMEDIATE")
+
+        write = asyncio.create_task(
+            cache_service.set_async(
+                [HumanMessage(content="create product")], "1", user_id="user1"
+            )
+        )
+        # The loop keeps running other tasks while the write waits
+        await asyncio.sleep(0.05)
+        assert not write.done()
+
+        other_process.execute("COMMIT")
+        other_process.close()
+        await write
+        assert await cache_service.get_async(
+            [HumanMessage(content="create product")], user_id="user1"
+        )
+
+    @pytest.mark.asyncio
+    async def test_max_size_and_hit_counts(self, tmp_path):
+        """Test size enforcement and persisted hit counts."""
+        cache_service = self._make_cache(tmp_path / "cache.db", max_size=2)
+
+        for i in range(4):
+            await cache_service.set_async(
+                [HumanMessage(content=f"create product {i}")],
+                f"{i}",
+                user_id="user1",
+                ttl_seconds=60 * (i + 1),
+            )
+        await cache_service.get_async(
+            [HumanMessage(content="create product 3")], user_id="user1"
+        )
+
+        stats = await cache_service.get_stats_async()
+        assert stats["total_entries"] == 2
+        assert stats["total_hits"] == 1
+        assert stats["evictions"] == 2
+        assert (
+            await cache_service.get_async(
+                [HumanMessage(content="create product 0")], user_id="user1"
+            )
+            is None
+        )
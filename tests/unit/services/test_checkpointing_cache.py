@@ -0,0 +1,185 @@
+"""
+Unit tests for the checkpoint read cache.
+
+Tests cover:
+- Repeated reads of a thread served from the cache
+- Invalidation on put, put_writes and delete_thread
+- Reads racing with writes are not cached
+- Cached versions by checkpoint id and the thread LRU
+- Validation against writes of other processes sharing a SQLite backend
+- The cache in the checkpointing service and in graph runs
+"""
+
+import operator
+from typing import Annotated, TypedDict
+from unittest.mock import patch
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from nalai.services.checkpointing_cache import CachedCheckpointSaver
+from nalai.services.checkpointing_service import Checkpointer
+from nalai.services.checkpointing_sqlite import SQLiteCheckpointSaver
+
+from .conftest import write_checkpoint
+
+
+def thread(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+
+
+@pytest.fixture
+def saver():
+    return MemorySaver()
+
+
+@pytest.fixture
+def cache(saver):
+    return CachedCheckpointSaver(saver, max_threads=2, max_versions=2)
+
+
+class TestCachedCheckpointSaver:
+    """Test reads and invalidation of the cache."""
+
+    def test_repeated_reads_hit_cache(self, saver, cache):
+        write_checkpoint(cache, "a", 1, channel="step")
+
+        with patch.object(saver, "get_tuple", wraps=saver.get_tuple) as get_tuple:
+            first = cache.get_tuple(thread("a"))
+            first.checkpoint["channel_values"]["step"] = 99
+            first.metadata["edited"] = True
+            second = cache.get_tuple(thread("a"))
+
+        get_tuple.assert_called_once()
+        assert second.checkpoint["channel_values"]["step"] == 1
+        assert "edited" not in second.metadata
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_async_reads_hit_cache(self, saver, cache):
+        write_checkpoint(cache, "a", 1, channel="step")
+
+        with patch.object(saver, "aget_tuple", wraps=saver.aget_tuple) as aget_tuple:
+            await cache.aget(thread("a"))
+            checkpoint = await cache.aget(thread("a"))
+
+        aget_tuple.assert_called_once()
+        assert checkpoint["channel_values"]["step"] == 1
+
+    def test_put_invalidates_thread(self, cache):
+        config = write_checkpoint(cache, "a", 1, channel="step")
+        assert cache.get_tuple(thread("a")).config == config
+
+        latest = write_checkpoint(cache, "a", 2, config, channel="step")
+
+        assert cache.get_tuple(thread("a")).config == latest
+        assert cache.get_tuple(config).checkpoint["channel_values"]["step"] == 1
+
+    def test_put_writes_and_delete_invalidate_thread(self, cache):
+        config = write_checkpoint(cache, "a", 1, channel="step")
+        cache.get_tuple(thread("a"))
+
+        cache.put_writes(config, [("step", 2)], "task")
+        assert cache.get_tuple(thread("a")).pending_writes == [("task", "step", 2)]
+
+        cache.delete_thread("a")
+        assert cache.get_tuple(thread("a")) is None
+
+    def test_read_racing_with_write_not_cached(self, saver, cache):
+        write_checkpoint(cache, "a", 1, channel="step")
+        read = saver.get_tuple
+
+        def read_then_write(config):
+            result = read(config)
+            write_checkpoint(cache, "a", 2, channel="step")
+            return result
+
+        with patch.object(saver, "get_tuple", side_effect=read_then_write):
+            stale = cache.get_tuple(thread("a"))
+
+        assert stale.checkpoint["channel_values"]["step"] == 1
+        assert cache.get_tuple(thread("a")).checkpoint["channel_values"]["step"] == 2
+
+    def test_versions_and_threads_bounded(self, cache):
+        configs = [
+            write_checkpoint(cache, "a", step, channel="step") for step in range(3)
+        ]
+        for config in configs:
+            cache.get_tuple(config)
+        cache.get_tuple(thread("a"))
+        assert cache.get_stats()["checkpoints"] == 2
+        write_checkpoint(cache, "b", 1, channel="step")
+        write_checkpoint(cache, "c", 1, channel="step")
+        cache.get_tuple(thread("b"))
+        cache.get_tuple(thread("c"))
+
+        stats = cache.get_stats()
+        assert stats["threads"] == 2
+        assert stats["checkpoints"] == 2
+        assert cache.get_stats()["misses"] == 6
+
+    def test_wrapped_saver_extras_pass_through(self, saver, cache):
+        write_checkpoint(cache, "a", 1, channel="step")
+
+        assert cache.storage is saver.storage
+        assert cache.serde is saver.serde
+
+
+class TestSharedBackendCache:
+    """Test the cache over a backend written by other processes."""
+
+    @pytest.mark.asyncio
+    async def test_writes_of_other_workers_invalidate(self, tmp_path):
+        path = str(tmp_path / "checkpoints.db")
+        cache = CachedCheckpointSaver(SQLiteCheckpointSaver(path), max_threads=8)
+        other_worker = SQLiteCheckpointSaver(path)
+        write_checkpoint(cache, "a", 1, channel="step")
+        await cache.aget_tuple(thread("a"))
+        assert (await cache.aget_tuple(thread("a"))).checkpoint["channel_values"] == {
+            "step": 1
+        }
+
+        write_checkpoint(other_worker, "a", 2, channel="step")
+
+        latest = await cache.aget_tuple(thread("a"))
+        assert latest.checkpoint["channel_values"] == {"step": 2}
+        assert cache.get_tuple(thread("a")).checkpoint["channel_values"] == {"step": 2}
+        stats = cache.get_stats()
+        assert stats["hits"] == 2
+        assert stats["stale"] == 1
+
+
+class TestReadCacheService:
+    """Test the read cache in the checkpointing service."""
+
+    @pytest.mark.asyncio
+    async def test_service_wraps_backend_saver(self):
+        service = Checkpointer(backend="memory", config={"read_cache_threads": 8})
+        cache = service.get_checkpointer()
+        write_checkpoint(cache, "a", 1, channel="step")
+        cache.get_tuple(thread("a"))
+
+        stats = await service.get_stats()
+
+        assert isinstance(cache, CachedCheckpointSaver)
+        assert cache.saver is service.backend.get_checkpointer()
+        assert stats["read_cache"]["threads"] == 1
+        assert Checkpointer(backend="memory").read_cache is None
+
+    def test_graph_runs_through_cache(self, cache):
+        class State(TypedDict):
+            steps: Annotated[list[int], operator.add]
+
+        builder = StateGraph(State)
+        builder.add_node("step", lambda state: {"steps": [len(state["steps"])]})
+        builder.add_edge(START, "step")
+        builder.add_edge("step", END)
+        graph = builder.compile(checkpointer=cache)
+        config = {"configurable": {"thread_id": "graph"}}
+
+        graph.invoke({"steps": []}, config)
+        result = graph.invoke({"steps": []}, config)
+
+        assert result["steps"] == [0, 1]
+        assert graph.get_state(config).values == result
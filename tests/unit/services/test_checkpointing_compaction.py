@@ -0,0 +1,257 @@
+"""
+Unit tests for checkpoint compaction.
+
+Tests cover:
+- Selection by age, keep_latest and byte budget
+- Protection of pending interrupts
+- Compaction of MemorySaver and SQLite checkpoint stores
+- Compaction of locked in-memory savers off the event loop
+- The background compactor and its metrics
+"""
+
+import asyncio
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.constants import INTERRUPT
+
+from nalai.services.checkpointing_compaction import (
+    CheckpointCompactor,
+    CheckpointRecord,
+    CompactionPolicy,
+    CompactionResult,
+    compact_memory_saver,
+    select_expired,
+    select_over_budget,
+)
+from nalai.services.checkpointing_service import (
+    Checkpointer,
+    MemoryCheckpointingBackend,
+)
+from nalai.services.checkpointing_sqlite import SQLiteCheckpointSaver
+
+from .conftest import write_checkpoint, write_history
+
+NOW = datetime(2024, 6, 1, tzinfo=UTC).timestamp()
+
+
+def record(thread_id: str, checkpoint_id: str, hours_ago: float, **kwargs):
+    return CheckpointRecord(
+        thread_id=thread_id,
+        checkpoint_ns="",
+        checkpoint_id=checkpoint_id,
+        parent_checkpoint_id=kwargs.get("parent"),
+        timestamp=NOW - hours_ago * 3600,
+        interrupted=kwargs.get("interrupted", False),
+    )
+
+
+def message(content: str = "Hi") -> list:
+    return [HumanMessage(content=content)]
+
+
+def ago(hours: float) -> datetime:
+    return datetime.fromtimestamp(NOW, UTC) - timedelta(hours=hours)
+
+
+class TestCompactionSelection:
+    """Test which checkpoints a policy reclaims."""
+
+    def test_age_and_keep_latest(self):
+        records = [
+            record("stale", "1", 30),
+            record("stale", "2", 26),
+            record("live", "1", 30),
+            record("live", "2", 3),
+            record("live", "3", 2),
+            record("live", "4", 1),
+        ]
+
+        by_age = select_expired(records, CompactionPolicy(max_age_hours=24), NOW)
+        by_count = select_expired(records, CompactionPolicy(keep_latest=2), NOW)
+
+        assert sorted(by_age) == [
+            ("live", "", "1"),
+            ("stale", "", "1"),
+            ("stale", "", "2"),
+        ]
+        assert sorted(by_count) == [("live", "", "1"), ("live", "", "2")]
+
+    def test_pending_interrupts_are_kept(self):
+        records = [
+            record("paused", "1", 30),
+            record("paused", "2", 29, parent="1", interrupted=True),
+            record("resumed", "1", 30, interrupted=True),
+            record("resumed", "2", 29, parent="1"),
+        ]
+
+        expired = select_expired(records, CompactionPolicy(max_age_hours=24), NOW)
+
+        assert sorted(expired) == [
+            ("paused", "", "1"),
+            ("resumed", "", "1"),
+            ("resumed", "", "2"),
+        ]
+
+    def test_over_budget_evicts_least_recently_updated(self):
+        usage = {"old": (1.0, 40), "protected": (2.0, 40), "new": (3.0, 40)}
+
+        assert select_over_budget(usage, 100, set()) == ["old"]
+        assert select_over_budget(usage, 50, {"protected"}) == ["old", "new"]
+        assert select_over_budget(usage, 120, set()) == []
+
+
+class TestMemorySaverCompaction:
+    """Test compaction of MemorySaver storage."""
+
+    def test_reclaims_checkpoints_writes_and_blobs(self):
+        saver = MemorySaver()
+        write_checkpoint(saver, "stale", message(), ts=ago(48))
+        configs = write_history(
+            saver, "live", [message()] * 3, [ago(30), ago(2), ago(1)]
+        )
+        saver.put_writes(configs[0], [("messages", "pending")], "task1")
+
+        result = compact_memory_saver(
+            saver, CompactionPolicy(max_age_hours=24, keep_latest=1), NOW
+        )
+
+        assert result.checkpoints_reclaimed == 3
+        assert result.threads_reclaimed == ["stale"]
+        assert result.bytes_reclaimed > 0
+        assert list(saver.storage) == ["live"]
+        assert len(saver.storage["live"][""]) == 1
+        assert len(saver.blobs) == 1
+        assert not saver.writes
+        assert saver.get_tuple(configs[-1]).checkpoint["channel_values"]["messages"]
+
+    def test_interrupted_thread_survives(self):
+        saver = MemorySaver()
+        config = write_checkpoint(saver, "paused", message(), ts=ago(48))
+        saver.put_writes(config, [(INTERRUPT, {"value": "approve?"})], "task1")
+
+        result = compact_memory_saver(
+            saver, CompactionPolicy(max_age_hours=24, max_bytes=0), NOW
+        )
+
+        assert result.checkpoints_reclaimed == 0
+        assert saver.get_tuple(config) is not None
+
+    def test_byte_budget(self):
+        saver = MemorySaver()
+        write_checkpoint(saver, "older", message("x" * 1000), ts=ago(3))
+        write_checkpoint(saver, "newer", message("y" * 1000), ts=ago(1))
+
+        result = compact_memory_saver(saver, CompactionPolicy(max_bytes=1500), NOW)
+
+        assert result.threads_reclaimed == ["older"]
+        assert list(saver.storage) == ["newer"]
+
+    @pytest.mark.asyncio
+    async def test_memory_backend_compacts_off_event_loop(self):
+        backend = MemoryCheckpointingBackend()
+        saver = backend.get_checkpointer()
+        write_checkpoint(saver, "stale", message(), ts=ago(48))
+        acquired = threading.Event()
+
+        def hold_lock():
+            with saver._lock:
+                acquired.set()
+                time.sleep(0.2)
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        acquired.wait()
+        task = asyncio.create_task(backend.compact(CompactionPolicy(max_age_hours=24)))
+        await asyncio.sleep(0.05)
+
+        # The pass waits for the lock in a worker thread, not on the loop
+        assert not task.done()
+        assert (await task).threads_reclaimed == ["stale"]
+        holder.join()
+
+
+class TestSQLiteCompaction:
+    """Test compaction of the SQLite checkpoint saver."""
+
+    def test_keep_latest_budget_and_interrupts(self, tmp_path):
+        saver = SQLiteCheckpointSaver(str(tmp_path / "checkpoints.db"))
+        configs = write_history(
+            saver, "live", [message()] * 3, [ago(3), ago(2), ago(1)]
+        )
+        paused = write_checkpoint(saver, "paused", message("x" * 1000), ts=ago(5))
+        saver.put_writes(paused, [(INTERRUPT, {"value": "approve?"})], "task1")
+        write_checkpoint(saver, "idle", message("y" * 1000), ts=ago(4))
+
+        result = saver.compact(CompactionPolicy(keep_latest=2, max_bytes=2500), NOW)
+
+        assert result.threads_reclaimed == ["idle"]
+        assert result.checkpoints_reclaimed == 2
+        assert result.bytes_reclaimed > 0
+        assert [
+            t.config for t in saver.list({"configurable": {"thread_id": "live"}})
+        ] == (configs[:0:-1])
+        assert saver.get_tuple(paused) is not None
+        saver.close()
+
+
+class TestCheckpointCompactor:
+    """Test the background compactor."""
+
+    @pytest.mark.asyncio
+    async def test_run_once_records_metrics(self):
+        async def compact(policy):
+            return CompactionResult(3, 100, ["thread1"], 0.01)
+
+        compactor = CheckpointCompactor(compact, CompactionPolicy(), 60)
+        await compactor.run_once()
+        await compactor.run_once()
+
+        metrics = compactor.get_metrics()
+        assert metrics["runs"] == 2
+        assert metrics["checkpoints_reclaimed"] == 6
+        assert metrics["threads_reclaimed"] == 2
+        assert metrics["bytes_reclaimed"] == 200
+        assert metrics["total_seconds"] >= metrics["last_run_seconds"]
+        assert metrics["running"] is False
+
+    @pytest.mark.asyncio
+    async def test_background_task_survives_failures(self):
+        calls = []
+
+        async def compact(policy):
+            calls.append(policy)
+            raise RuntimeError("backend down")
+
+        compactor = CheckpointCompactor(compact, CompactionPolicy(), 0.01)
+        compactor.start()
+        await asyncio.sleep(0.05)
+        await compactor.stop()
+
+        metrics = compactor.get_metrics()
+        assert len(calls) >= 2
+        assert metrics["failures"] == len(calls)
+        assert metrics["last_error"] == "backend down"
+        assert metrics["running"] is False
+
+    @pytest.mark.asyncio
+    async def test_service_compaction_notifies_listeners(self):
+        service = Checkpointer(backend="memory")
+        write_checkpoint(
+            service.get_checkpointer(), "user:user1:conv1", message(), ts=ago(48)
+        )
+        reclaimed = []
+        service.add_compaction_listener(reclaimed.extend)
+
+        compactor = service.start_compaction(CompactionPolicy(max_age_hours=24), 3600)
+        await compactor.run_once()
+        stats = await service.get_stats()
+        await service.stop_compaction()
+
+        assert reclaimed == ["user:user1:conv1"]
+        assert stats["compaction"]["checkpoints_reclaimed"] == 1
+        assert stats["compaction"]["running"] is True
@@ -0,0 +1,134 @@
+"""
+Unit tests for the compact checkpoint serializer.
+
+Tests cover:
+- Round trips of message lists and other values
+- Reading values written by the default serializer, and the reverse
+- Header-only reads of message channels in MemorySaver and SQLite savers
+"""
+
+import pytest
+from langchain_core.messages import (
+    AIMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from nalai.services.checkpointing_serde import (
+    MESSAGES_TYPE,
+    CompactSerializer,
+    get_serde,
+    load_header,
+    read_messages_header,
+)
+from nalai.services.checkpointing_sqlite import SQLiteCheckpointSaver
+
+from .conftest import write_checkpoint
+
+
+def conversation() -> list:
+    return [
+        SystemMessage(content="You are an API assistant", id="s1"),
+        HumanMessage(content="List the orders", id="h1"),
+        AIMessage(
+            content="",
+            id="a1",
+            tool_calls=[{"name": "get_orders", "args": {"limit": 3}, "id": "call1"}],
+        ),
+        ToolMessage(content='{"orders": []}', tool_call_id="call1", id="t1"),
+        AIMessage(content="There are no orders.", id="a2"),
+    ]
+
+
+class TestCompactSerializer:
+    """Test encoding and decoding of checkpoint values."""
+
+    def test_message_list_round_trip(self):
+        serde = CompactSerializer()
+        messages = conversation()
+
+        data = serde.dumps_typed(messages)
+
+        assert data[0] == MESSAGES_TYPE
+        assert serde.loads_typed(data) == messages
+        assert len(data[1]) < len(JsonPlusSerializer().dumps_typed(messages)[1])
+
+    def test_header_read_without_decoding(self):
+        data = CompactSerializer().dumps_typed(conversation())
+
+        assert load_header(data) == {"count": 5, "preview": "List the orders"}
+        assert load_header(JsonPlusSerializer().dumps_typed(conversation())) is None
+
+    def test_other_values_use_default_encoding(self):
+        serde = CompactSerializer()
+        value = {"messages": conversation(), "step": 3}
+
+        data = serde.dumps_typed(value)
+
+        assert data[0] == "msgpack"
+        assert serde.loads_typed(data) == value
+        assert serde.loads_typed(serde.dumps_typed([])) == []
+
+    def test_reads_default_serializer_data(self):
+        data = JsonPlusSerializer().dumps_typed(conversation())
+
+        assert CompactSerializer().loads_typed(data) == conversation()
+
+    def test_default_serde_reads_compact_data(self):
+        data = CompactSerializer().dumps_typed(conversation())
+        serde = get_serde("default")
+
+        assert serde.loads_typed(data) == conversation()
+        assert serde.dumps_typed(conversation())[0] == "msgpack"
+
+    def test_get_serde(self):
+        assert isinstance(get_serde("compact"), CompactSerializer)
+        assert isinstance(get_serde("default"), CompactSerializer)
+        with pytest.raises(ValueError, match="Unsupported checkpoint serializer"):
+            get_serde("pickle")
+
+
+class TestMessagesHeader:
+    """Test header-only reads through checkpoint savers."""
+
+    def test_memory_saver_header(self):
+        saver = MemorySaver(serde=CompactSerializer())
+        write_checkpoint(saver, "thread", conversation())
+
+        header = read_messages_header(saver, {"configurable": {"thread_id": "thread"}})
+
+        assert header.message_count == 5
+        assert header.preview == "List the orders"
+        assert header.last_timestamp == header.checkpoint["ts"]
+        assert read_messages_header(saver, {"configurable": {"thread_id": "x"}}) is None
+        assert "x" not in saver.storage
+
+    def test_default_serde_has_no_header(self):
+        saver = MemorySaver()
+        write_checkpoint(saver, "thread", conversation())
+
+        assert (
+            read_messages_header(saver, {"configurable": {"thread_id": "thread"}})
+            is None
+        )
+
+    def test_sqlite_header_of_snapshots_and_deltas(self, tmp_path):
+        saver = SQLiteCheckpointSaver(
+            str(tmp_path / "checkpoints.db"), serde=CompactSerializer()
+        )
+        messages = conversation()
+        config = write_checkpoint(saver, "thread", messages[:2])
+        first = read_messages_header(saver, config)
+        write_checkpoint(saver, "thread", messages, config)
+
+        latest = read_messages_header(saver, {"configurable": {"thread_id": "thread"}})
+
+        assert first.message_count == 2
+        assert latest.message_count == 5
+        assert latest.preview == "List the orders"
+        restored = saver.get_tuple(config).checkpoint["channel_values"]["messages"]
+        assert restored == messages[:2]
+        saver.close()
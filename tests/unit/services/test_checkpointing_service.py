@@ -236,6 +236,9 @@ class TestCheckpointerGlobal:
         """Mock settings for testing."""
         with patch("nalai.services.checkpointing_service.settings") as mock_settings:
             mock_settings.checkpointing_backend = "memory"
+            mock_settings.checkpointing_serde = "compact"
+            mock_settings.checkpointing_read_cache_threads = 16
+            mock_settings.checkpointing_memory_max_bytes = 0
             mock_settings.checkpointing_file_path = "./checkpoints"
             mock_settings.checkpointing_postgres_url = ""
             mock_settings.checkpointing_redis_url = ""
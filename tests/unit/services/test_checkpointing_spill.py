@@ -0,0 +1,219 @@
+"""
+Unit tests for the spilling in-memory checkpoint saver.
+
+Tests cover:
+- Spilling least recently touched threads over the byte budget
+- Transparent fault-in on get_tuple, list and writes
+- Listing all threads lazily without faulting spilled ones in
+- Async methods running off the event loop
+- Deletion, compaction and statistics of spilled threads
+"""
+
+import asyncio
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.constants import INTERRUPT
+from langgraph.graph import MessagesState, StateGraph
+
+from nalai.services.checkpointing_compaction import CompactionPolicy
+from nalai.services.checkpointing_service import MemoryCheckpointingBackend
+from nalai.services.checkpointing_spill import SpillingMemorySaver
+
+from .conftest import write_checkpoint
+
+
+@pytest.fixture
+def saver(tmp_path):
+    """Create a saver that holds about two small threads in memory."""
+    return SpillingMemorySaver(max_bytes=3000, spill_path=str(tmp_path / "spill"))
+
+
+def message(content: str = "x" * 1000) -> list:
+    return [HumanMessage(content=content)]
+
+
+def hours_ago(hours: float) -> datetime:
+    return datetime.now(UTC) - timedelta(hours=hours)
+
+
+def messages(saver, thread_id: str) -> list:
+    latest = saver.get_tuple({"configurable": {"thread_id": thread_id}})
+    return latest.checkpoint["channel_values"]["messages"]
+
+
+class TestSpillingMemorySaver:
+    """Test spilling and faulting in threads."""
+
+    def test_spills_least_recently_touched_thread(self, saver):
+        write_checkpoint(saver, "a", message())
+        write_checkpoint(saver, "b", message())
+        messages(saver, "a")
+        write_checkpoint(saver, "c", message())
+
+        stats = saver.get_stats()
+        assert list(saver.storage) == ["a", "c"]
+        assert stats["spilled_threads"] == 1
+        assert stats["resident_bytes"] <= saver.max_bytes
+        assert len(list(saver.spill_path.glob("*.spill"))) == 1
+
+    def test_spilled_thread_faults_in_on_read(self, saver):
+        config = write_checkpoint(saver, "a", message("first"))
+        saver.put_writes(config, [("messages", "pending")], "task1")
+        for thread_id in ("b", "c", "d"):
+            write_checkpoint(saver, thread_id, message())
+
+        assert "a" not in saver.storage
+        latest = saver.get_tuple({"configurable": {"thread_id": "a"}})
+
+        assert latest.checkpoint["channel_values"]["messages"][0].content == "first"
+        assert latest.pending_writes == [("task1", "messages", "pending")]
+        assert saver.get_stats()["fault_ins"] == 1
+
+    def test_list_faults_in_spilled_threads(self, saver):
+        for thread_id in ("a", "b", "c", "d"):
+            write_checkpoint(saver, thread_id, message())
+
+        one = list(saver.list({"configurable": {"thread_id": "a"}}))
+
+        assert len(one) == 1
+        assert "a" in saver.storage
+        assert saver.get_stats()["resident_bytes"] <= saver.max_bytes
+
+    def test_list_all_reads_spilled_threads_in_place(self, saver):
+        for thread_id in ("a", "b", "c", "d"):
+            write_checkpoint(saver, thread_id, message(thread_id * 1000))
+        spilled = saver.get_stats()["spilled_threads"]
+
+        with patch.object(
+            saver, "_list_thread", wraps=saver._list_thread
+        ) as list_thread:
+            listed = saver.list(None)
+            next(listed)
+            # Threads are listed one at a time as the listing is consumed
+            assert list_thread.call_count == 1
+            rest = list(listed)
+
+        assert len(rest) == 3
+        stats = saver.get_stats()
+        assert stats["fault_ins"] == 0
+        assert stats["spilled_threads"] == spilled
+        assert messages(saver, "a")[0].content == "a" * 1000
+        assert len(list(saver.list(None, limit=2))) == 2
+
+    def test_delete_spilled_thread(self, saver):
+        for thread_id in ("a", "b", "c"):
+            write_checkpoint(saver, thread_id, message())
+
+        saver.delete_thread("a")
+
+        assert saver.get_tuple({"configurable": {"thread_id": "a"}}) is None
+        assert not list(saver.spill_path.glob("*.spill"))
+
+    def test_compaction_ages_out_spilled_threads(self, saver):
+        write_checkpoint(saver, "old", message(), ts=hours_ago(48))
+        paused = write_checkpoint(saver, "paused", message(), ts=hours_ago(48))
+        saver.put_writes(paused, [(INTERRUPT, {"value": "approve?"})], "task1")
+        for thread_id in ("b", "c"):
+            write_checkpoint(saver, thread_id, message())
+
+        result = saver.compact(CompactionPolicy(max_age_hours=24))
+
+        assert result.threads_reclaimed == ["old"]
+        assert result.checkpoints_reclaimed == 1
+        assert saver.get_tuple(paused) is not None
+
+    @pytest.mark.asyncio
+    async def test_async_reads_do_not_block_event_loop(self, saver):
+        config = write_checkpoint(saver, "a", message())
+        acquired = threading.Event()
+
+        def hold_lock():
+            with saver._lock:
+                acquired.set()
+                time.sleep(0.2)
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        acquired.wait()
+        task = asyncio.create_task(saver.aget_tuple(config))
+        await asyncio.sleep(0.05)
+
+        assert not task.done()
+        assert (await task) is not None
+        assert len([t async for t in saver.alist(None)]) == 1
+        holder.join()
+
+    @pytest.mark.asyncio
+    async def test_graph_runs_over_spilled_threads(self, tmp_path):
+        saver = SpillingMemorySaver(max_bytes=1, spill_path=str(tmp_path / "spill"))
+
+        def respond(state: MessagesState) -> dict:
+            return {"messages": [AIMessage(content=f"turn {len(state['messages'])}")]}
+
+        builder = StateGraph(MessagesState)
+        builder.add_node("respond", respond)
+        builder.set_entry_point("respond")
+        builder.set_finish_point("respond")
+        graph = builder.compile(checkpointer=saver)
+
+        for thread_id in ("a", "b", "a"):
+            config = {"configurable": {"thread_id": thread_id}}
+            result = await graph.ainvoke(
+                {"messages": [HumanMessage(content="hi")]}, config
+            )
+
+        assert [m.content for m in result["messages"]] == [
+            "hi",
+            "turn 1",
+            "hi",
+            "turn 3",
+        ]
+        assert saver.get_stats()["spills"] >= 2
+
+
+class TestMemoryBackendSpilling:
+    """Test the memory backend with a byte budget."""
+
+    @pytest.mark.asyncio
+    async def test_backend_reports_spill_stats(self, tmp_path):
+        backend = MemoryCheckpointingBackend(
+            max_bytes=1000, spill_path=str(tmp_path / "spill")
+        )
+        write_checkpoint(backend.get_checkpointer(), "a", message())
+        write_checkpoint(backend.get_checkpointer(), "b", message())
+
+        stats = await backend.get_stats()
+
+        assert stats["backend"] == "memory"
+        assert stats["spill"]["spilled_threads"] == 1
+        assert stats["spill"]["max_bytes"] == 1000
+
+    @pytest.mark.asyncio
+    async def test_backend_compacts_off_event_loop(self, tmp_path):
+        backend = MemoryCheckpointingBackend(
+            max_bytes=1000, spill_path=str(tmp_path / "spill")
+        )
+        write_checkpoint(backend.get_checkpointer(), "old", message(), ts=hours_ago(48))
+        write_checkpoint(backend.get_checkpointer(), "b", message())
+        compact = backend.get_checkpointer().compact
+        threads = []
+
+        def record_thread(policy):
+            threads.append(threading.current_thread())
+            return compact(policy)
+
+        with patch.object(backend.get_checkpointer(), "compact", record_thread):
+            result = await backend.compact(CompactionPolicy(max_age_hours=24))
+
+        assert threads and threads[0] is not threading.main_thread()
+        assert result.threads_reclaimed == ["old"]
+
+    def test_unbounded_backend_keeps_memory_saver(self):
+        backend = MemoryCheckpointingBackend()
+
+        assert not isinstance(backend.get_checkpointer(), SpillingMemorySaver)
@@ -0,0 +1,386 @@
+"""
+Unit tests for the SQLite checkpoint saver.
+
+Tests cover:
+- Checkpoint, channel value and pending write round trips
+- Listing with filters, before and limit
+- Durability across saver instances
+- Cleanup of old checkpoints and unreferenced blobs
+- Delta-encoded message channels and their reconstruction
+- Compare-and-set puts on the parent checkpoint across saver instances
+- Turn leases across saver instances
+- Thread versions and changes seen by other saver instances
+- Use as a LangGraph checkpointer and through the checkpointing service
+"""
+
+from typing import Annotated
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.graph import StateGraph
+from langgraph.graph.message import add_messages
+from typing_extensions import TypedDict
+
+from nalai.services.checkpointing_conflicts import (
+    CHECKPOINT_CAS_KEY,
+    CheckpointConflictError,
+)
+from nalai.services.checkpointing_service import (
+    Checkpointer,
+    SQLiteCheckpointingBackend,
+)
+from nalai.services.checkpointing_sqlite import SQLiteCheckpointSaver
+
+from .conftest import write_checkpoint, write_history
+
+
+@pytest.fixture
+def saver(tmp_path):
+    """Create a saver over a temporary database."""
+    saver = SQLiteCheckpointSaver(str(tmp_path / "checkpoints.db"))
+    yield saver
+    saver.close()
+
+
+class TestSQLiteCheckpointSaver:
+    """Test checkpoint storage in SQLite."""
+
+    def test_put_and_get_tuple(self, saver):
+        config = write_checkpoint(saver, "thread1", [HumanMessage(content="Hi")])
+
+        latest = saver.get_tuple({"configurable": {"thread_id": "thread1"}})
+
+        assert latest.config == config
+        assert latest.checkpoint["channel_values"]["messages"][0].content == "Hi"
+        assert latest.metadata["step"] == 1
+        assert latest.parent_config is None
+        assert saver.get_tuple({"configurable": {"thread_id": "missing"}}) is None
+
+    def test_get_tuple_by_checkpoint_id_and_parent(self, saver):
+        first = write_checkpoint(saver, "thread1", [HumanMessage(content="Hi")])
+        second = write_checkpoint(
+            saver,
+            "thread1",
+            [HumanMessage(content="Hi"), AIMessage(content="Hello")],
+            parent=first,
+        )
+
+        latest = saver.get_tuple({"configurable": {"thread_id": "thread1"}})
+        earlier = saver.get_tuple(first)
+
+        assert latest.config == second
+        assert latest.parent_config == first
+        assert len(latest.checkpoint["channel_values"]["messages"]) == 2
+        assert len(earlier.checkpoint["channel_values"]["messages"]) == 1
+        assert saver.count_checkpoints("thread1") == 2
+        assert saver.count_checkpoints("missing") == 0
+
+    def test_list_filter_before_and_limit(self, saver):
+        first = write_checkpoint(saver, "thread1", [HumanMessage(content="Hi")])
+        second = write_checkpoint(saver, "thread1", [], parent=first)
+        write_checkpoint(saver, "thread2", [])
+
+        thread1 = {"configurable": {"thread_id": "thread1"}}
+        ids = [t.config["configurable"]["checkpoint_id"] for t in saver.list(thread1)]
+
+        assert ids == [
+            second["configurable"]["checkpoint_id"],
+            first["configurable"]["checkpoint_id"],
+        ]
+        assert len(list(saver.list(None))) == 3
+        assert len(list(saver.list(thread1, limit=1))) == 1
+        assert [t.config for t in saver.list(thread1, before=second)] == [first]
+        assert len(list(saver.list(None, filter={"source": "loop"}))) == 3
+        assert list(saver.list(None, filter={"source": "input"})) == []
+
+    def test_pending_writes(self, saver):
+        config = write_checkpoint(saver, "thread1", [])
+
+        saver.put_writes(config, [("messages", "a"), ("messages", "b")], "task1")
+        saver.put_writes(config, [("messages", "ignored")], "task1")
+
+        writes = saver.get_tuple(config).pending_writes
+        assert writes == [("task1", "messages", "a"), ("task1", "messages", "b")]
+
+    def test_delete_thread(self, saver):
+        config = write_checkpoint(saver, "thread1", [HumanMessage(content="Hi")])
+        saver.put_writes(config, [("messages", "a")], "task1")
+        write_checkpoint(saver, "thread2", [])
+
+        saver.delete_thread("thread1")
+
+        assert saver.get_tuple({"configurable": {"thread_id": "thread1"}}) is None
+        assert saver.get_stats()["threads"] == 1
+        assert saver.get_stats()["writes"] == 0
+
+    def test_thread_changes_across_saver_instances(self, tmp_path):
+        path = str(tmp_path / "checkpoints.db")
+        first, second = SQLiteCheckpointSaver(path), SQLiteCheckpointSaver(path)
+        config = write_checkpoint(first, "thread1", [])
+        write_checkpoint(first, "thread2", [])
+
+        version, changes = second.list_thread_changes()
+        assert changes == [("thread1", False), ("thread2", False)]
+        assert second.list_thread_changes(version) == (version, [])
+
+        first.put_writes(config, [("messages", "a")], "task1")
+        assert second.get_thread_version("thread1") > version
+        first.delete_thread("thread2")
+        latest, changes = second.list_thread_changes(version)
+        assert latest > version
+        assert changes == [("thread1", False), ("thread2", True)]
+        assert second.get_thread_version("missing") == 0
+        first.close()
+        second.close()
+
+    def test_compare_and_set_put(self, tmp_path):
+        path = str(tmp_path / "checkpoints.db")
+        first, second = SQLiteCheckpointSaver(path), SQLiteCheckpointSaver(path)
+        cas = {"thread_id": "thread1", "checkpoint_ns": "", CHECKPOINT_CAS_KEY: True}
+        base = write_checkpoint(first, "thread1", [])
+        stale = {"configurable": {**cas, **base["configurable"]}}
+        write_checkpoint(second, "thread1", [HumanMessage(content="Hi")], stale)
+
+        with pytest.raises(CheckpointConflictError, match="moved to checkpoint"):
+            write_checkpoint(first, "thread1", [HumanMessage(content="Hey")], stale)
+        with pytest.raises(CheckpointConflictError):
+            write_checkpoint(first, "thread1", [], {"configurable": cas})
+        # Puts without the flag may branch from any checkpoint
+        write_checkpoint(first, "thread1", [HumanMessage(content="Hey")], base)
+
+        assert first.count_checkpoints("thread1") == 3
+        first.close()
+
+    def test_turn_leases_across_instances(self, tmp_path):
+        path = str(tmp_path / "checkpoints.db")
+        first, second = SQLiteCheckpointSaver(path), SQLiteCheckpointSaver(path)
+
+        assert first.acquire_turn_lease("thread1", "lease1", 60)
+        assert not second.acquire_turn_lease("thread1", "lease2", 60)
+        assert second.acquire_turn_lease("thread2", "lease2", 60)
+        # Only the holder of a lease releases it
+        second.release_turn_lease("thread1", "lease2")
+        assert not second.acquire_turn_lease("thread1", "lease2", 60)
+        first.release_turn_lease("thread1", "lease1")
+        assert second.acquire_turn_lease("thread1", "lease2", 0)
+        # Expired leases are taken over
+        assert first.acquire_turn_lease("thread1", "lease3", 60)
+        first.close()
+        second.close()
+        second.close()
+
+    def test_checkpoints_survive_reopen(self, tmp_path):
+        path = str(tmp_path / "checkpoints.db")
+        first = SQLiteCheckpointSaver(path)
+        write_checkpoint(first, "thread1", [HumanMessage(content="Hi")])
+        first.close()
+
+        second = SQLiteCheckpointSaver(path)
+        latest = second.get_tuple({"configurable": {"thread_id": "thread1"}})
+        second.close()
+
+        assert latest.checkpoint["channel_values"]["messages"][0].content == "Hi"
+
+    def test_cleanup_old_checkpoints(self, saver):
+        first = write_checkpoint(saver, "live", [HumanMessage(content="Hi")])
+        write_checkpoint(saver, "stale", [HumanMessage(content="Old")])
+        with saver._writer() as connection:
+            connection.execute("UPDATE checkpoints SET checkpoint_ts = 0")
+        latest = write_checkpoint(saver, "live", [], parent=first)
+
+        deleted = saver.cleanup_old_checkpoints(max_age_hours=1)
+
+        stats = saver.get_stats()
+        assert deleted == 2
+        assert stats["threads"] == 1
+        assert stats["checkpoints"] == 1
+        # Only the blob referenced by the surviving checkpoint is kept
+        assert stats["blobs"] == 1
+        assert saver.get_tuple({"configurable": {"thread_id": "live"}}).config == (
+            latest
+        )
+        assert saver.cleanup_old_checkpoints(max_age_hours=1) == 0
+
+    @pytest.mark.asyncio
+    async def test_async_methods(self, saver):
+        checkpoint = empty_checkpoint()
+        config = await saver.aput(
+            {"configurable": {"thread_id": "thread1", "checkpoint_ns": ""}},
+            checkpoint,
+            {},
+            {},
+        )
+        await saver.aput_writes(config, [("messages", "a")], "task1")
+
+        latest = await saver.aget_tuple(config)
+        listed = [t async for t in saver.alist(None)]
+        await saver.adelete_thread("thread1")
+
+        assert latest.pending_writes == [("task1", "messages", "a")]
+        assert len(listed) == 1
+        assert await saver.aget_tuple(config) is None
+
+    @pytest.mark.asyncio
+    async def test_graph_runs_resume_from_sqlite(self, saver):
+        class State(TypedDict):
+            messages: Annotated[list, add_messages]
+
+        def respond(state: State) -> dict:
+            return {"messages": [AIMessage(content=f"turn {len(state['messages'])}")]}
+
+        builder = StateGraph(State)
+        builder.add_node("respond", respond)
+        builder.set_entry_point("respond")
+        builder.set_finish_point("respond")
+        graph = builder.compile(checkpointer=saver)
+        config = {"configurable": {"thread_id": "thread1", CHECKPOINT_CAS_KEY: True}}
+
+        await graph.ainvoke({"messages": [HumanMessage(content="one")]}, config)
+        result = await graph.ainvoke(
+            {"messages": [HumanMessage(content="two")]}, config
+        )
+
+        assert [m.content for m in result["messages"]] == [
+            "one",
+            "turn 1",
+            "two",
+            "turn 3",
+        ]
+        state = await graph.aget_state(config)
+        assert state.values == result
+        assert CHECKPOINT_CAS_KEY not in state.metadata
+
+
+def message_turns(turns: int) -> list[list]:
+    """Get the messages channel after each of a number of turns."""
+    messages, history = [], []
+    for turn in range(turns):
+        messages = messages + [
+            HumanMessage(content=f"question {turn}", id=f"h{turn}"),
+            AIMessage(content=f"answer {turn}", id=f"a{turn}"),
+        ]
+        history.append(messages)
+    return history
+
+
+def blob_rows(saver) -> list[tuple]:
+    """Get the (version, base_version) of all stored blobs in version order."""
+    with saver.pool.connection() as connection:
+        return connection.execute(
+            "SELECT version, base_version FROM blobs ORDER BY version"
+        ).fetchall()
+
+
+class TestMessageDeltas:
+    """Test delta encoding of the messages channel."""
+
+    def test_message_ops(self):
+        first = HumanMessage(content="Hi", id="1")
+        second = AIMessage(content="Hello", id="2")
+        third = HumanMessage(content="Bye", id="3")
+
+        ops = SQLiteCheckpointSaver._message_ops([first, second], [second, third])
+
+        assert [type(op) for op in ops] == [RemoveMessage, HumanMessage]
+        assert ops[0].id == "1"
+        assert SQLiteCheckpointSaver._apply_delta([first, second], ops) == [
+            second,
+            third,
+        ]
+        # Rewriting a kept message is not an append
+        edited = AIMessage(content="Edited", id="2")
+        assert SQLiteCheckpointSaver._message_ops([first, second], [first, edited]) is (
+            None
+        )
+
+    def test_deltas_between_snapshots(self, tmp_path):
+        saver = SQLiteCheckpointSaver(
+            str(tmp_path / "checkpoints.db"), snapshot_interval=4
+        )
+        history = message_turns(10)
+        configs = write_history(saver, "thread1", history)
+
+        rows = blob_rows(saver)
+        snapshots = [index for index, (_, base) in enumerate(rows) if base is None]
+        assert snapshots == [0, 4, 8]
+        for config, messages in zip(configs, history, strict=True):
+            stored = saver.get_tuple(config).checkpoint["channel_values"]["messages"]
+            assert stored == messages
+        saver.close()
+
+    def test_compressed_history_is_delta_encoded(self, saver):
+        first = write_checkpoint(saver, "thread1", message_turns(2)[-1])
+        # History compression removes all messages and appends a summary
+        compressed = [
+            AIMessage(content="summary", id="s"),
+            HumanMessage(content="question 1", id="h2"),
+        ]
+        write_checkpoint(saver, "thread1", compressed, first)
+
+        latest = saver.get_tuple({"configurable": {"thread_id": "thread1"}})
+
+        assert latest.checkpoint["channel_values"]["messages"] == compressed
+        assert blob_rows(saver)[1][1] is not None
+
+    def test_delta_chain_continues_after_reopen(self, tmp_path):
+        path = str(tmp_path / "checkpoints.db")
+        history = message_turns(3)
+        first = SQLiteCheckpointSaver(path)
+        configs = write_history(first, "thread1", history[:2])
+        first.close()
+
+        second = SQLiteCheckpointSaver(path)
+        write_checkpoint(second, "thread1", history[2], configs[-1])
+        latest = second.get_tuple({"configurable": {"thread_id": "thread1"}})
+        second.close()
+
+        assert latest.checkpoint["channel_values"]["messages"] == history[2]
+        assert [base is None for _, base in blob_rows(second)] == [True, False, False]
+
+    def test_cleanup_keeps_delta_bases(self, saver):
+        history = message_turns(3)
+        configs = write_history(saver, "thread1", history[:2])
+        with saver._writer() as connection:
+            connection.execute("UPDATE checkpoints SET checkpoint_ts = 0")
+        write_checkpoint(saver, "thread1", history[2], configs[-1])
+
+        assert saver.cleanup_old_checkpoints(max_age_hours=1) == 2
+
+        latest = saver.get_tuple({"configurable": {"thread_id": "thread1"}})
+        assert latest.checkpoint["channel_values"]["messages"] == history[2]
+        assert saver.get_stats()["blobs"] == 3
+
+    def test_delta_base_deleted_by_another_writer(self, saver):
+        history = message_turns(2)
+        write_checkpoint(saver, "thread1", history[0])
+        with saver._writer() as connection:
+            connection.execute("DELETE FROM blobs")
+
+        write_checkpoint(saver, "thread1", history[1])
+
+        assert blob_rows(saver)[0][1] is None
+
+
+class TestSQLiteCheckpointingBackend:
+    """Test the sqlite checkpointing backend."""
+
+    @pytest.mark.asyncio
+    async def test_backend_stats_and_cleanup(self, tmp_path):
+        backend = SQLiteCheckpointingBackend(str(tmp_path / "checkpoints.db"))
+        write_checkpoint(backend.get_checkpointer(), "thread1", [])
+
+        stats = await backend.get_stats()
+
+        assert stats["backend"] == "sqlite"
+        assert stats["type"] == "database"
+        assert stats["checkpoints"] == 1
+        assert await backend.health_check() is True
+        assert await backend.cleanup_old_checkpoints(max_age_hours=1) == 0
+
+    def test_service_selects_sqlite_backend(self, tmp_path):
+        path = str(tmp_path / "service.db")
+        service = Checkpointer(backend="sqlite", config={"sqlite_path": path})
+
+        assert isinstance(service.get_checkpointer(), SQLiteCheckpointSaver)
+        assert service.get_checkpointer().path == path
@@ -1,8 +1,9 @@
 """
 Unit tests for ModelManager functionality.
 
-Tests cover model initialization, configuration extraction, context window
-management, and message content extraction across different providers.
+Tests cover model initialization, pooling and token rate limiters, configuration
+extraction, context window management, and message content extraction across
+different providers.
 """
 
 import os
@@ -212,6 +213,61 @@ class TestModelManager:
         )
         assert result == mock_model
 
+    @patch("nalai.services.model_service.ModelManager.initialize_chat_model")
+    def test_get_model_from_config_reuses_pooled_models(
+        self, mock_initialize_model, mock_config
+    ):
+        """Test that initialized models are pooled by platform, model and kwargs."""
+        mock_initialize_model.side_effect = lambda **kwargs: MagicMock(
+            spec=BaseChatModel
+        )
+        model_manager = ModelManager(pool_size=2)
+
+        first = model_manager.get_model_from_config(mock_config)
+        again = model_manager.get_model_from_config(mock_config, temperature=0)
+        streaming = model_manager.get_model_from_config(
+            mock_config, disable_streaming=True, stop=["\n"]
+        )
+        assert mock_initialize_model.call_count == 2
+        assert again is first
+        assert streaming is not first
+        assert (
+            model_manager.get_model_from_config(
+                mock_config, disable_streaming=True, stop=["\n"]
+            )
+            is streaming
+        )
+
+        # A third key evicts the least recently used model
+        model_manager.get_model_from_config(mock_config, temperature=0.5)
+        assert model_manager.get_model_from_config(mock_config) is not first
+        assert mock_initialize_model.call_count == 4
+
+    @patch("nalai.services.model_service.ModelManager.initialize_chat_model")
+    def test_get_model_from_config_without_pool(
+        self, mock_initialize_model, mock_config
+    ):
+        """Test that a pool size of 0 initializes a model per call."""
+        model_manager = ModelManager(pool_size=0)
+
+        model_manager.get_model_from_config(mock_config)
+        model_manager.get_model_from_config(mock_config)
+
+        assert mock_initialize_model.call_count == 2
+
+    @patch("nalai.services.model_service.create_model_token_rate_limiter")
+    def test_get_token_rate_limiter_shared_per_model(
+        self, mock_create_limiter, mock_config
+    ):
+        """Test that calls to a model share one token rate limiter."""
+        model_manager = ModelManager()
+
+        first = model_manager.get_token_rate_limiter(mock_config)
+        again = model_manager.get_token_rate_limiter(mock_config)
+
+        assert again is first
+        mock_create_limiter.assert_called_once_with("test-platform", "test-model")
+
     def test_extract_message_content_edge_cases(self):
         """Test message content extraction with edge cases."""
         # Test with None content
@@ -2,9 +2,11 @@
 Unit tests for OpenAPI service.
 
 Tests the OpenAPIManager class functionality including loading API summaries
-and OpenAPI specifications.
+and OpenAPI specifications, the indexed spec registry with hot reload and cached
+JSON, ranking summaries and estimating catalog tokens.
 """
 
+import json
 import os
 import sys
 import tempfile
@@ -316,6 +318,118 @@ class TestOpenAPIManager:
                 len(result["api_specs"]) == 0
             )  # No specs loaded due to version mismatch
 
+    def test_api_summaries_read_once(self, openapi_manager, temp_api_specs_dir):
+        """Test that API summaries are read once and then served from memory."""
+        with patch("nalai.services.openapi_service.settings") as mock_settings:
+            mock_settings.api_specs_path = temp_api_specs_dir
+
+            first = openapi_manager.load_api_summaries({})["api_summaries"]
+            with patch("nalai.services.openapi_service.yaml") as mock_yaml:
+                second = openapi_manager.load_api_summaries({})["api_summaries"]
+
+            mock_yaml.safe_load.assert_not_called()
+            assert second is first
+
+    def test_rank_api_summaries(self, openapi_manager):
+        """Test ranking API summaries by the words they share with a text."""
+        api_summaries = [
+            {"title": "Users API", "description": "Manage user profiles"},
+            {"title": "Products API", "description": "List products and prices"},
+            {"title": "Orders API", "description": "Create orders of products"},
+        ]
+
+        ranked = openapi_manager.rank_api_summaries(
+            "Which products are in my orders?", api_summaries, 2
+        )
+
+        assert [summary["title"] for summary in ranked] == [
+            "Orders API",
+            "Products API",
+        ]
+        assert openapi_manager.rank_api_summaries("hello", api_summaries, 2) == []
+
+    def test_estimate_catalog_tokens(self, openapi_manager, temp_api_specs_dir):
+        """Test that the spec tokens of the whole catalog are estimated once."""
+        with patch("nalai.services.openapi_service.settings") as mock_settings:
+            mock_settings.api_specs_path = temp_api_specs_dir
+
+            tokens = openapi_manager.estimate_catalog_tokens()
+            with patch("nalai.services.openapi_service.yaml") as mock_yaml:
+                assert openapi_manager.estimate_catalog_tokens() == tokens
+
+            mock_yaml.safe_load.assert_not_called()
+            assert tokens > 0
+
+    def test_specs_parsed_once_and_indexed(self, openapi_manager, temp_api_specs_dir):
+        """Test that specs are parsed once and found by title and version."""
+        with patch("nalai.services.openapi_service.settings") as mock_settings:
+            mock_settings.api_specs_path = temp_api_specs_dir
+            api_summaries = openapi_manager.get_api_summaries()
+
+            spec = openapi_manager.load_api_spec("Test API 2", "2.0.0", api_summaries)
+            with patch("nalai.services.openapi_service.yaml") as mock_yaml:
+                again = openapi_manager.load_api_spec(
+                    "Test API 2", "2.0.0", api_summaries
+                )
+
+            mock_yaml.safe_load.assert_not_called()
+            assert again is spec
+            assert spec["info"]["title"] == "Test API 2"
+
+    def test_specs_hot_reloaded_on_change(self, temp_api_specs_dir):
+        """Test that modified spec and summaries files are reparsed."""
+        openapi_manager = OpenAPIManager(reload_check_seconds=0)
+        with patch("nalai.services.openapi_service.settings") as mock_settings:
+            mock_settings.api_specs_path = temp_api_specs_dir
+            spec = openapi_manager.load_api_spec(
+                "Test API 1", "1.0.0", openapi_manager.get_api_summaries()
+            )
+
+            spec_file = os.path.join(temp_api_specs_dir, "test_api_1.yaml")
+            with open(spec_file, "w", encoding="utf-8") as f:
+                yaml.dump({"openapi": "3.1.0", "info": {"title": "Changed"}}, f)
+            os.utime(spec_file, ns=(0, os.stat(spec_file).st_mtime_ns + 1))
+            summaries_file = os.path.join(temp_api_specs_dir, "api_summaries.yaml")
+            with open(summaries_file, "w", encoding="utf-8") as f:
+                yaml.dump(
+                    [
+                        {
+                            "title": "Renamed",
+                            "version": 1,
+                            "openapi_file": "test_api_1.yaml",
+                        }
+                    ],
+                    f,
+                )
+            os.utime(summaries_file, ns=(0, os.stat(summaries_file).st_mtime_ns + 1))
+
+            api_summaries = openapi_manager.get_api_summaries()
+            changed = openapi_manager.load_api_spec("Renamed", 1, api_summaries)
+
+        assert spec["info"]["title"] == "Test API 1"
+        assert [summary["title"] for summary in api_summaries] == ["Renamed"]
+        assert changed["info"]["title"] == "Changed"
+
+    def test_serialize_api_specs_reuses_cached_json(
+        self, openapi_manager, temp_api_specs_dir
+    ):
+        """Test that registry specs serialize as json.dumps would, from cache."""
+        with patch("nalai.services.openapi_service.settings") as mock_settings:
+            mock_settings.api_specs_path = temp_api_specs_dir
+            spec = openapi_manager.load_api_spec(
+                "Test API 1", "1.0.0", openapi_manager.get_api_summaries()
+            )
+            api_specs = [spec, {"openapi": "3.0.0"}]
+            expected = json.dumps(api_specs)
+
+            with patch(
+                "nalai.services.openapi_service.json.dumps", wraps=json.dumps
+            ) as dumps:
+                serialized = openapi_manager.serialize_api_specs(api_specs)
+
+        assert serialized == expected
+        dumps.assert_called_once_with({"openapi": "3.0.0"})
+
     def test_openapi_manager_implements_protocol(self, openapi_manager):
         """Test that OpenAPIManager implements the APIService protocol."""
 
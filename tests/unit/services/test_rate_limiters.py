@@ -0,0 +1,179 @@
+"""
+Unit tests for the rate limiters.
+
+Tests cover:
+- Token bucket bursts and non-blocking acquires
+- Blocked callers waiting at the configured rate
+- Buckets shared across instances through shared memory
+- Rate limiter selection in the factory
+- Token reservations, reconciliation and short calls served first
+"""
+
+import asyncio
+import time
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from nalai.services.rate_limiting import (
+    AsyncTokenBucketRateLimiter,
+    DefaultRateLimiterFactory,
+    RateLimiterConfig,
+    SharedMemoryRateLimiter,
+    TokenRateLimiter,
+    create_model_token_rate_limiter,
+)
+
+
+@pytest.fixture
+def shared_key():
+    """Unique shared bucket key, unlinked after the test."""
+    key = f"test/{uuid.uuid4()}"
+    yield key
+    SharedMemoryRateLimiter(1, 1, key=key).unlink()
+
+
+class TestAsyncTokenBucketRateLimiter:
+    """Test the in-process token bucket."""
+
+    def test_burst_then_non_blocking_refused(self):
+        limiter = AsyncTokenBucketRateLimiter(requests_per_second=1, max_bucket_size=2)
+
+        assert limiter.acquire(blocking=False) is True
+        assert limiter.acquire(blocking=False) is True
+        assert limiter.acquire(blocking=False) is False
+
+    @pytest.mark.asyncio
+    async def test_waiters_served_at_rate(self):
+        limiter = AsyncTokenBucketRateLimiter(requests_per_second=50, max_bucket_size=1)
+
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.aacquire() for _ in range(6)))
+
+        # One token from the bucket, five refilled at 50 per second
+        assert 0.09 <= time.monotonic() - started < 0.5
+
+    @pytest.mark.asyncio
+    async def test_cancelled_wait_refunds_tokens(self):
+        limiter = AsyncTokenBucketRateLimiter(requests_per_second=1, max_bucket_size=1)
+        limiter.acquire()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(limiter.aacquire(), timeout=0.05)
+
+        # The debt of the cancelled wait is gone
+        assert limiter._tokens > -0.5
+
+
+class TestSharedMemoryRateLimiter:
+    """Test the bucket shared through shared memory."""
+
+    def test_instances_with_same_key_share_bucket(self, shared_key):
+        first = SharedMemoryRateLimiter(1, 1, key=shared_key)
+        second = SharedMemoryRateLimiter(1, 1, key=shared_key)
+        other = SharedMemoryRateLimiter(1, 1, key=f"{shared_key}/other")
+
+        assert first.acquire(blocking=False) is True
+        assert second.acquire(blocking=False) is False
+        assert other.acquire(blocking=False) is True
+        other.unlink()
+
+    @pytest.mark.asyncio
+    async def test_waiters_served_at_rate(self, shared_key):
+        limiters = [SharedMemoryRateLimiter(50, 1, key=shared_key) for _ in range(2)]
+
+        started = time.monotonic()
+        await asyncio.gather(*(limiters[i % 2].aacquire() for i in range(6)))
+
+        assert 0.09 <= time.monotonic() - started < 0.5
+
+
+class TestRateLimiterFactory:
+    """Test rate limiter selection in the factory."""
+
+    def test_cross_process_uses_shared_memory_per_model(self, shared_key):
+        with patch("nalai.services.rate_limiting.factory.settings") as mock_settings:
+            mock_settings.cross_process_rate_limiter_enabled = True
+            factory = DefaultRateLimiterFactory()
+
+        platform, model = shared_key.split("/", 1)
+        limiter = factory.create_rate_limiter(
+            platform, model, RateLimiterConfig(requests_per_second=1, max_bucket_size=1)
+        )
+
+        assert isinstance(limiter, SharedMemoryRateLimiter)
+        assert limiter.key == shared_key
+
+    def test_tests_use_in_process_buckets(self):
+        with (
+            patch("nalai.services.rate_limiting.factory.settings") as mock_settings,
+            patch("nalai.services.rate_limiting.utils.settings", mock_settings),
+        ):
+            mock_settings.cross_process_rate_limiter_enabled = False
+            factory = DefaultRateLimiterFactory()
+
+        # Shared-memory segments would outlive the test run
+        assert factory.rate_limiter_class is AsyncTokenBucketRateLimiter
+
+    def test_explicit_class_wins(self):
+        with patch("nalai.services.rate_limiting.factory.settings") as mock_settings:
+            mock_settings.cross_process_rate_limiter_enabled = True
+            factory = DefaultRateLimiterFactory(AsyncTokenBucketRateLimiter)
+
+        limiter = factory.create_rate_limiter(
+            "aws_bedrock",
+            "model",
+            RateLimiterConfig(requests_per_second=1, max_bucket_size=1),
+        )
+
+        assert isinstance(limiter, AsyncTokenBucketRateLimiter)
+
+
+class TestTokenRateLimiter:
+    """Test the tokens-per-minute rate limiter."""
+
+    def test_reserve_and_reconcile(self):
+        limiter = TokenRateLimiter(tokens_per_minute=600)
+
+        reservation = limiter.reserve(1000)
+        assert reservation.tokens == 600
+
+        limiter.reconcile(reservation, 100)
+
+        assert reservation.tokens == 100
+        assert limiter._tokens >= 500
+
+    @pytest.mark.asyncio
+    async def test_short_calls_overtake_long_ones(self):
+        # 10 tokens per second
+        limiter = TokenRateLimiter(tokens_per_minute=600)
+        limiter.reserve(600)
+        served = []
+
+        async def call(name: str, tokens: int, delay: float):
+            await asyncio.sleep(delay)
+            await limiter.areserve(tokens)
+            served.append(name)
+
+        await asyncio.gather(call("long", 20, 0), call("short", 1, 0.01))
+
+        assert served == ["short", "long"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_wait_leaves_queue(self):
+        limiter = TokenRateLimiter(tokens_per_minute=60)
+        limiter.reserve(60)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(limiter.areserve(30), timeout=0.05)
+
+        assert limiter._waiters == []
+
+    def test_factory_creates_limiter_for_models_with_token_limit(self):
+        limiter = create_model_token_rate_limiter(
+            "aws_bedrock", "us.anthropic.claude-3-5-sonnet-20241022-v2:0"
+        )
+
+        assert isinstance(limiter, TokenRateLimiter)
+        assert create_model_token_rate_limiter("ollama", "llama3.1:8b") is None
@@ -20,6 +20,7 @@ sys.path.insert(
 
 from nalai.utils.chat_history import (
     compress_conversation_history_if_needed,
+    estimate_messages_tokens,
     get_token_ids_simplistic,
     get_token_ids_with_tiktoken,
     summarize_conversation,
@@ -100,6 +101,20 @@ class TestTokenCounting:
             # Should only be called once due to caching
             mock_tiktoken.encoding_for_model.assert_called_once_with("gpt-2")
 
+    def test_estimate_messages_tokens(self):
+        """Test input token estimation of content and tool call arguments."""
+        messages = [
+            HumanMessage(content="one two three four five six seven eight nine ten"),
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "get", "args": {"url": "a b c"}, "id": "1"}],
+            ),
+        ]
+
+        # 13 tokens of content, 5 of tool call arguments, 4 per message
+        assert estimate_messages_tokens(messages) == 13 + 5 + 8
+        assert estimate_messages_tokens(messages, lambda text: [0]) == 1 + 1 + 8
+
 
 class TestConversationTrimming:
     """Test suite for conversation trimming functionality."""